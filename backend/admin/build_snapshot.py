@@ -0,0 +1,143 @@
+#!/usr/bin/env python3
+"""
+Warehouse Snapshot Script - Administrative tool for the memory-mapped warehouse snapshot.
+Version 4.4.3 - Portfolio Analysis & Visualization
+
+This script provides functionality to:
+- Build the read-only snapshot that all API workers map and serve batch
+  price and dividend history from, for the tickers of stored portfolios,
+  given symbols or the whole warehouse
+- Keep rebuilding it whenever the warehouse has been written to
+- Show the current snapshot
+
+Each build replaces the snapshot file atomically; running workers pick up the
+new file within a second, without a restart.
+
+Usage:
+    python backend/admin/build_snapshot.py --status
+    python backend/admin/build_snapshot.py --portfolios
+    python backend/admin/build_snapshot.py --symbols AAPL MSFT KO
+    python backend/admin/build_snapshot.py --portfolios --every 300
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+import time
+from datetime import datetime
+from typing import List
+
+# Add backend root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.infrastructure.config.warehouse_config import WarehouseConfig
+from src.infrastructure.config.session_config import SessionConfig
+from src.infrastructure.services.portfolio_session_store import PortfolioSessionStore
+from src.infrastructure.warehouse.snapshot import SnapshotBuilder, get_ingest_generation, read_info
+
+
+def format_size(size_bytes: int) -> str:
+    """Format file size in human-readable format."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} TB"
+
+
+def portfolio_symbols(session_db_path: str) -> List[str]:
+    """Tickers held in any stored portfolio."""
+    if not os.path.exists(session_db_path):
+        return []
+    store = PortfolioSessionStore(session_db_path)
+    symbols = set()
+    for portfolio_id in store.list_ids():
+        portfolio = store.get_portfolio(portfolio_id)
+        if portfolio is not None:
+            symbols.update(ticker.symbol for ticker in portfolio.get_tickers())
+    return sorted(symbols)
+
+
+def warehouse_symbols(conn: sqlite3.Connection) -> List[str]:
+    """Every symbol with stored prices."""
+    return [row[0] for row in conn.execute("""
+        SELECT symbol FROM symbols s WHERE EXISTS (SELECT 1 FROM market_data WHERE symbol_id = s.symbol_id)
+    """).fetchall()]
+
+
+def show_status(snapshot_path: str) -> None:
+    """Print the snapshot header."""
+    info = read_info(snapshot_path)
+    if info is None:
+        print(f"ℹ️  No snapshot at {snapshot_path}")
+        return
+    print(f"📁 Snapshot Path: {info.path}")
+    print(f"💾 Snapshot Size: {format_size(info.file_bytes)}")
+    print(f"📊 Symbols: {info.symbols:,}  Price rows: {info.price_rows:,}  Dividend rows: {info.dividend_rows:,}")
+    print(f"🕒 Built: {datetime.fromtimestamp(info.built_at).isoformat(timespec='seconds')} "
+          f"(ingest generation {info.generation})")
+
+
+def build(args) -> None:
+    """Build the snapshot once for the selected symbols."""
+    start = time.perf_counter()
+    with sqlite3.connect(args.warehouse_path, timeout=30.0) as conn:
+        if args.all:
+            symbols = warehouse_symbols(conn)
+        else:
+            symbols = set(args.symbols or [])
+            if args.portfolios or not symbols:
+                symbols.update(portfolio_symbols(args.session_db_path))
+        info = SnapshotBuilder().build(conn, symbols, args.snapshot_path)
+    print(f"✅ Snapshot of {info.symbols:,} symbols ({info.price_rows:,} price rows, "
+          f"{format_size(info.file_bytes)}) in {time.perf_counter() - start:.2f}s")
+
+
+def main():
+    """Main function for the warehouse snapshot script."""
+    parser = argparse.ArgumentParser(
+        description="Warehouse Snapshot Script - Build the memory-mapped snapshot served by API workers",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--status", action="store_true", help="Show the current snapshot")
+    parser.add_argument("--portfolios", action="store_true", help="Include tickers of stored portfolios (default)")
+    parser.add_argument("--symbols", nargs="+", help="Include these symbols")
+    parser.add_argument("--all", action="store_true", help="Include every symbol with stored prices")
+    parser.add_argument("--every", type=float, metavar="SECONDS",
+                        help="Keep running; rebuild when the warehouse was written to, checking every SECONDS")
+    parser.add_argument("--warehouse-path", type=str, default=WarehouseConfig().get_db_path(),
+                        help="Path to warehouse database file (default: WAREHOUSE_DB_PATH or database/warehouse)")
+    parser.add_argument("--snapshot-path", type=str, default=WarehouseConfig().get_snapshot_path(),
+                        help="Snapshot file (default: WAREHOUSE_SNAPSHOT_PATH or database/warehouse/snapshot.bin)")
+    parser.add_argument("--session-db-path", type=str, default=SessionConfig().get_db_path(),
+                        help="Portfolio session database (default: PORTFOLIO_SESSION_DB_PATH)")
+    args = parser.parse_args()
+
+    if args.status:
+        show_status(args.snapshot_path)
+        return
+
+    if not os.path.exists(args.warehouse_path):
+        print(f"ℹ️  Warehouse database does not exist: {args.warehouse_path}")
+        return
+
+    try:
+        build(args)
+        while args.every:
+            time.sleep(args.every)
+            info = read_info(args.snapshot_path)
+            with sqlite3.connect(args.warehouse_path, timeout=30.0) as conn:
+                generation = get_ingest_generation(conn)
+            if info is None or info.generation != generation:
+                build(args)
+    except KeyboardInterrupt:
+        print()
+    except (sqlite3.Error, ValueError) as e:
+        print(f"❌ Error building snapshot: {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -8,7 +8,8 @@ This script provides functionality to:
 - Clear data for specific tickers
 - Clear benchmark data (S&P 500, NASDAQ)
 - Show warehouse statistics including benchmark data
-- Backup warehouse data before clearing (optional)
+- Backup warehouse data before clearing (optional), online and optionally incremental
+- Restore a full backup plus its incremental backups atomically
 - Reset warehouse metrics
 
 Usage:
@@ -18,12 +19,12 @@ Usage:
     python backend/admin/clear_warehouse.py --clear-benchmarks
     python backend/admin/clear_warehouse.py --stats
     python backend/admin/clear_warehouse.py --backup-and-clear
+    python backend/admin/clear_warehouse.py --backup --incremental
     python backend/admin/clear_warehouse.py --reset-metrics
 """
 
 import os
 import sys
-import shutil
 import sqlite3
 import argparse
 from datetime import datetime
@@ -33,11 +34,15 @@ from typing import List, Dict, Any, Optional
 # Add src to Python path for imports
 project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 sys.path.insert(0, os.path.join(project_root, 'src'))
+sys.path.insert(0, project_root)
 
 try:
     from src.infrastructure.warehouse.warehouse_service import WarehouseService
+    from src.infrastructure.warehouse.backup import WarehouseBackup, list_backup_chain
     from src.infrastructure.config.warehouse_config import WarehouseConfig
 except ImportError:
+    WarehouseBackup = None
+    
     # Fallback: create minimal classes if imports fail
     class WarehouseService:
         def __init__(self, db_path: str):
@@ -48,15 +53,20 @@ except ImportError:
                 return
             with sqlite3.connect(self.db_path) as conn:
                 if ticker:
-                    conn.execute("DELETE FROM market_data WHERE ticker = ?", (ticker.symbol,))
-                    conn.execute("DELETE FROM dividend_data WHERE ticker = ?", (ticker.symbol,))
-                    conn.execute("DELETE FROM dividend_coverage WHERE ticker = ?", (ticker.symbol,))
+                    symbol_id = "(SELECT symbol_id FROM symbols WHERE symbol = ?)"
+                    conn.execute(f"DELETE FROM market_data WHERE symbol_id = {symbol_id}", (ticker.symbol,))
+                    conn.execute(f"DELETE FROM dividend_data WHERE symbol_id = {symbol_id}", (ticker.symbol,))
+                    conn.execute(f"DELETE FROM dividend_coverage WHERE symbol_id = {symbol_id}", (ticker.symbol,))
+                    conn.execute(f"DELETE FROM corporate_actions WHERE symbol_id = {symbol_id}", (ticker.symbol,))
                 else:
                     conn.execute("DELETE FROM market_data")
                     conn.execute("DELETE FROM dividend_data")
                     conn.execute("DELETE FROM dividend_coverage")
                     conn.execute("DELETE FROM benchmark_data")
                     conn.execute("DELETE FROM benchmark_coverage")
+                    conn.execute("DELETE FROM corporate_actions")
+                # Record the clear as a batch so readers of the warehouse notice it
+                conn.execute("INSERT INTO ingest_batches (source, created_at) VALUES ('clear', datetime('now'))")
                 conn.commit()
     
     class WarehouseConfig:
@@ -106,55 +116,60 @@ class WarehouseClearManager:
             with sqlite3.connect(self.warehouse_db_path) as conn:
                 # Get price data statistics
                 cursor = conn.execute("""
-                    SELECT ticker, COUNT(*) as record_count, 
-                           MIN(date) as earliest_date, MAX(date) as latest_date
-                    FROM market_data 
-                    GROUP BY ticker
-                    ORDER BY ticker
+                    SELECT s.symbol, COUNT(*) as record_count, 
+                           date(MIN(t.day) * 86400, 'unixepoch') as earliest_date,
+                           date(MAX(t.day) * 86400, 'unixepoch') as latest_date
+                    FROM market_data t JOIN symbols s ON s.symbol_id = t.symbol_id
+                    GROUP BY t.symbol_id
+                    ORDER BY s.symbol
                 """)
                 
                 price_data = cursor.fetchall()
                 
                 # Get dividend data statistics
                 cursor = conn.execute("""
-                    SELECT ticker, COUNT(*) as record_count, 
-                           MIN(date) as earliest_date, MAX(date) as latest_date
-                    FROM dividend_data 
-                    GROUP BY ticker
-                    ORDER BY ticker
+                    SELECT s.symbol, COUNT(*) as record_count, 
+                           date(MIN(t.day) * 86400, 'unixepoch') as earliest_date,
+                           date(MAX(t.day) * 86400, 'unixepoch') as latest_date
+                    FROM dividend_data t JOIN symbols s ON s.symbol_id = t.symbol_id
+                    GROUP BY t.symbol_id
+                    ORDER BY s.symbol
                 """)
                 
                 dividend_data = cursor.fetchall()
                 
                 # Get dividend coverage statistics
                 cursor = conn.execute("""
-                    SELECT ticker, COUNT(*) as coverage_count, 
-                           MIN(start_date) as earliest_coverage, MAX(end_date) as latest_coverage
-                    FROM dividend_coverage 
-                    GROUP BY ticker
-                    ORDER BY ticker
+                    SELECT s.symbol, COUNT(*) as coverage_count, 
+                           date(MIN(t.start_day) * 86400, 'unixepoch') as earliest_coverage,
+                           date(MAX(t.end_day) * 86400, 'unixepoch') as latest_coverage
+                    FROM dividend_coverage t JOIN symbols s ON s.symbol_id = t.symbol_id
+                    GROUP BY t.symbol_id
+                    ORDER BY s.symbol
                 """)
                 
                 dividend_coverage = cursor.fetchall()
                 
                 # Get benchmark data statistics
                 cursor = conn.execute("""
-                    SELECT symbol, COUNT(*) as record_count, 
-                           MIN(date) as earliest_date, MAX(date) as latest_date
-                    FROM benchmark_data 
-                    GROUP BY symbol
-                    ORDER BY symbol
+                    SELECT s.symbol, COUNT(*) as record_count, 
+                           date(MIN(t.day) * 86400, 'unixepoch') as earliest_date,
+                           date(MAX(t.day) * 86400, 'unixepoch') as latest_date
+                    FROM benchmark_data t JOIN symbols s ON s.symbol_id = t.symbol_id
+                    GROUP BY t.symbol_id
+                    ORDER BY s.symbol
                 """)
                 
                 benchmark_data = cursor.fetchall()
                 
                 # Get benchmark coverage statistics
                 cursor = conn.execute("""
-                    SELECT symbol, COUNT(*) as coverage_count, 
-                           MIN(start_date) as earliest_coverage, MAX(end_date) as latest_coverage
-                    FROM benchmark_coverage 
-                    GROUP BY symbol
-                    ORDER BY symbol
+                    SELECT s.symbol, COUNT(*) as coverage_count, 
+                           date(MIN(t.start_day) * 86400, 'unixepoch') as earliest_coverage,
+                           date(MAX(t.end_day) * 86400, 'unixepoch') as latest_coverage
+                    FROM benchmark_coverage t JOIN symbols s ON s.symbol_id = t.symbol_id
+                    GROUP BY t.symbol_id
+                    ORDER BY s.symbol
                 """)
                 
                 benchmark_coverage = cursor.fetchall()
@@ -320,49 +335,74 @@ class WarehouseClearManager:
             print(f"❌ Error clearing benchmark data: {str(e)}")
             return False
     
-    def backup_warehouse(self, backup_name: Optional[str] = None) -> Optional[Path]:
-        """Create a backup of the warehouse database."""
+    def backup_warehouse(self, backup_name: Optional[str] = None, incremental: bool = False) -> Optional[Path]:
+        """
+        Back up the warehouse online with the SQLite backup API.
+        
+        Incremental backups hold only the ingest batches written since the
+        latest backup; the first backup is always full.
+        """
         if not self.warehouse_db_path.exists():
             print("ℹ️  Warehouse database does not exist. Nothing to backup.")
             return None
+        if WarehouseBackup is None:
+            print("❌ Backups need the backend package on the Python path.")
+            return None
         
         try:
             # Create backup directory if it doesn't exist
             self.backup_dir.mkdir(parents=True, exist_ok=True)
+            backups = self.list_backups()
+            if incremental and not backups:
+                print("ℹ️  No backup to build on yet. Taking a full backup.")
+                incremental = False
             
             # Generate backup filename
             if backup_name is None:
                 timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-                backup_name = f"warehouse_backup_{timestamp}.sqlite"
+                backup_name = f"warehouse_{'delta' if incremental else 'backup'}_{timestamp}.sqlite"
             
             backup_path = self.backup_dir / backup_name
+            backup = WarehouseBackup(str(self.warehouse_db_path))
             
-            # Copy the database file
-            shutil.copy2(self.warehouse_db_path, backup_path)
-            
-            print(f"✅ Warehouse backed up to: {backup_path}")
+            if incremental:
+                result = backup.backup_delta(str(backup_path), str(backups[0]))
+                batches = result.info.generation - result.info.base_generation
+                print(f"✅ Incremental backup of {result.rows:,} rows from {batches:,} ingest batches "
+                      f"written to: {backup_path}")
+            else:
+                result = backup.backup(str(backup_path))
+                print(f"✅ Warehouse backed up online to: {backup_path}")
+            print(f"   {self.format_size(result.size_bytes)} in {result.seconds:.1f}s")
             return backup_path
         
         except Exception as e:
             print(f"❌ Error creating backup: {str(e)}")
             return None
     
-    def restore_warehouse(self, backup_path: str) -> bool:
-        """Restore warehouse from a backup."""
+    def restore_warehouse(self, backup_path: str, apply_deltas: bool = True) -> bool:
+        """Restore a full backup, plus the incremental backups that follow it, in one atomic swap."""
         backup_file = Path(backup_path)
+        if not backup_file.exists() and (self.backup_dir / backup_path).exists():
+            backup_file = self.backup_dir / backup_path
         
         if not backup_file.exists():
             print(f"❌ Backup file not found: {backup_path}")
             return False
+        if WarehouseBackup is None:
+            print("❌ Restores need the backend package on the Python path.")
+            return False
         
         try:
-            # Create warehouse directory if it doesn't exist
-            self.warehouse_db_path.parent.mkdir(parents=True, exist_ok=True)
+            deltas = list_backup_chain(str(backup_file.parent), str(backup_file)) if apply_deltas else []
+            for delta in deltas:
+                print(f"   + {Path(delta).name}")
             
-            # Copy backup to warehouse location
-            shutil.copy2(backup_file, self.warehouse_db_path)
+            result = WarehouseBackup(str(self.warehouse_db_path)).restore(str(backup_file), deltas)
             
-            print(f"✅ Warehouse restored from: {backup_path}")
+            print(f"✅ Warehouse restored from: {backup_file} ({len(deltas)} incremental backups, "
+                  f"{result.rows:,} rows) in {result.seconds:.1f}s")
+            print("ℹ️  Rebuild the warehouse snapshot if API workers serve one.")
             return True
         
         except Exception as e:
@@ -370,11 +410,11 @@ class WarehouseClearManager:
             return False
     
     def list_backups(self) -> List[Path]:
-        """List available backup files."""
+        """List available full and incremental backup files, newest first."""
         if not self.backup_dir.exists():
             return []
         
-        backup_files = list(self.backup_dir.glob("warehouse_backup_*.sqlite"))
+        backup_files = [*self.backup_dir.glob("warehouse_backup_*.sqlite"), *self.backup_dir.glob("warehouse_delta_*.sqlite")]
         return sorted(backup_files, key=lambda x: x.stat().st_mtime, reverse=True)
     
     def format_size(self, size_bytes: int) -> str:
@@ -473,6 +513,7 @@ Examples:
   python backend/admin/clear_warehouse.py --clear-ticker AAPL
   python backend/admin/clear_warehouse.py --clear-benchmarks
   python backend/admin/clear_warehouse.py --backup-and-clear
+  python backend/admin/clear_warehouse.py --backup --incremental
   python backend/admin/clear_warehouse.py --restore warehouse_backup_20241201_143022.sqlite
         """
     )
@@ -511,14 +552,26 @@ Examples:
     parser.add_argument(
         "--backup", 
         action="store_true", 
-        help="Create a backup of warehouse data"
+        help="Create an online backup of warehouse data"
+    )
+    
+    parser.add_argument(
+        "--incremental", 
+        action="store_true", 
+        help="With --backup: only back up batches written since the latest backup"
     )
     
     parser.add_argument(
         "--restore", 
         type=str, 
         metavar="BACKUP_FILE",
-        help="Restore warehouse from backup file"
+        help="Restore warehouse from a full backup file and the incremental backups after it"
+    )
+    
+    parser.add_argument(
+        "--no-deltas", 
+        action="store_true", 
+        help="With --restore: restore the full backup only"
     )
     
     parser.add_argument(
@@ -585,10 +638,10 @@ Examples:
                 print("❌ Operation cancelled.")
     
     elif args.backup:
-        manager.backup_warehouse()
+        manager.backup_warehouse(incremental=args.incremental)
     
     elif args.restore:
-        manager.restore_warehouse(args.restore)
+        manager.restore_warehouse(args.restore, apply_deltas=not args.no_deltas)
     
     elif args.list_backups:
         backups = manager.list_backups()
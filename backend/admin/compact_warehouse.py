@@ -0,0 +1,118 @@
+#!/usr/bin/env python3
+"""
+Warehouse Compact Script - Administrative tool for the compact (v2) warehouse layout.
+Version 4.4.3 - Portfolio Analysis & Visualization
+
+This script provides functionality to:
+- Show the warehouse schema version and file size
+- Convert a live warehouse to the compact layout while the server keeps
+  serving it (chunked copy, short write transactions, quick cutover)
+- Reclaim the space freed by the conversion with VACUUM
+
+Servers still running a version without the compact layout must be restarted
+after the conversion. A server started on an unconverted warehouse converts
+it inline at startup instead.
+
+Usage:
+    python backend/admin/compact_warehouse.py --status
+    python backend/admin/compact_warehouse.py --migrate
+    python backend/admin/compact_warehouse.py --migrate --chunk-size 20 --pause 0.05 --vacuum
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+import time
+
+# Add backend root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.infrastructure.config.warehouse_config import WarehouseConfig
+from src.infrastructure.warehouse.compaction import CompactSchemaMigrator
+from src.infrastructure.warehouse.migrations import COMPACT_SCHEMA_VERSION, get_schema_version
+
+
+def format_size(size_bytes: int) -> str:
+    """Format file size in human-readable format."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} TB"
+
+
+def show_status(db_path: str) -> None:
+    """Print the schema version and file size."""
+    with sqlite3.connect(db_path) as conn:
+        version = get_schema_version(conn)
+    layout = "compact (v2)" if version >= COMPACT_SCHEMA_VERSION else "v1"
+    print(f"📁 Database Path: {db_path}")
+    print(f"💾 Database Size: {format_size(os.path.getsize(db_path))}")
+    print(f"🧱 Schema Version: {version} ({layout} layout)")
+
+
+def migrate_online(db_path: str, chunk_size: int, pause: float, vacuum: bool) -> bool:
+    """Convert the warehouse in short transactions, then optionally VACUUM."""
+    conn = sqlite3.connect(db_path, timeout=30.0)
+    try:
+        conn.execute("PRAGMA journal_mode=WAL")
+        if get_schema_version(conn) >= COMPACT_SCHEMA_VERSION:
+            print("ℹ️  Warehouse already uses the compact layout.")
+        else:
+            start = time.perf_counter()
+
+            def report(done: int, total: int) -> None:
+                print(f"   Copied {done:,}/{total:,} symbols", end="\r", flush=True)
+
+            applied = CompactSchemaMigrator().run_online(conn, chunk_size, pause, report)
+            print()
+            print(f"✅ Applied migrations {[migration.version for migration in applied]} "
+                  f"in {time.perf_counter() - start:.1f}s")
+
+        if vacuum:
+            size_before = os.path.getsize(db_path)
+            conn.execute("VACUUM")
+            # In WAL mode the rewritten pages reach the main file at checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            print(f"✅ VACUUM: {format_size(size_before)} -> {format_size(os.path.getsize(db_path))}")
+        return True
+
+    except sqlite3.Error as e:
+        print(f"❌ Error converting warehouse: {str(e)}")
+        return False
+    finally:
+        conn.close()
+
+
+def main():
+    """Main function for the warehouse compact script."""
+    parser = argparse.ArgumentParser(
+        description="Warehouse Compact Script - Convert the warehouse to the compact layout online",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--status", action="store_true", help="Show schema version and file size")
+    parser.add_argument("--migrate", action="store_true", help="Convert to the compact layout online")
+    parser.add_argument("--chunk-size", type=int, default=20, help="Symbols copied per transaction (default: 20)")
+    parser.add_argument("--pause", type=float, default=0.0, help="Seconds to pause between chunks (default: 0)")
+    parser.add_argument("--vacuum", action="store_true", help="VACUUM afterwards to return freed pages to the OS")
+    parser.add_argument("--warehouse-path", type=str, default=WarehouseConfig().get_db_path(),
+                        help="Path to warehouse database file (default: WAREHOUSE_DB_PATH or database/warehouse)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.warehouse_path):
+        print(f"ℹ️  Warehouse database does not exist: {args.warehouse_path}")
+        return
+
+    if args.migrate:
+        if not migrate_online(args.warehouse_path, args.chunk_size, args.pause, args.vacuum):
+            sys.exit(1)
+    elif args.status:
+        show_status(args.warehouse_path)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
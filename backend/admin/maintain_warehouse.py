@@ -0,0 +1,112 @@
+#!/usr/bin/env python3
+"""
+Warehouse Maintenance Script - Administrative tool for WAL and free-space management.
+Version 4.4.3 - Portfolio Analysis & Visualization
+
+This script provides functionality to:
+- Show the WAL size, free space and auto-vacuum mode
+- Run maintenance ticks now: coverage retention, incremental vacuum,
+  checkpoints and PRAGMA optimize (API workers run them in the background)
+- Switch an existing warehouse to incremental auto-vacuum (one offline VACUUM)
+
+Usage:
+    python backend/admin/maintain_warehouse.py --status
+    python backend/admin/maintain_warehouse.py --run
+    python backend/admin/maintain_warehouse.py --run --ticks 10
+    python backend/admin/maintain_warehouse.py --enable-incremental-vacuum
+"""
+
+import os
+import sys
+import sqlite3
+import argparse
+
+# Add backend root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.infrastructure.config.warehouse_config import WarehouseConfig
+from src.infrastructure.warehouse.maintenance import get_warehouse_maintenance
+
+
+def format_size(size_bytes: int) -> str:
+    """Format file size in human-readable format."""
+    for unit in ['B', 'KB', 'MB', 'GB']:
+        if size_bytes < 1024.0:
+            return f"{size_bytes:.1f} {unit}"
+        size_bytes /= 1024.0
+    return f"{size_bytes:.1f} TB"
+
+
+def show_status(db_path: str) -> None:
+    """Print the file, WAL and free-space sizes."""
+    metrics = get_warehouse_maintenance(db_path).get_metrics()
+    print(f"📁 Database Path: {db_path}")
+    print(f"💾 Database Size: {format_size(metrics['database_bytes'])}")
+    print(f"📝 WAL Size: {format_size(metrics['wal_bytes'])}")
+    print(f"🧹 Free Space: {format_size(metrics['free_bytes'])} (auto_vacuum: {metrics['auto_vacuum']})")
+    if metrics["auto_vacuum"] != "incremental":
+        print("ℹ️  Free pages are only released after --enable-incremental-vacuum.")
+
+
+def run_ticks(db_path: str, ticks: int) -> bool:
+    """Run maintenance ticks back to back and print what each reclaimed."""
+    maintenance = get_warehouse_maintenance(db_path)
+    try:
+        for number in range(1, ticks + 1):
+            tick = maintenance.run_once(optimize=number == ticks)
+            expired = ", ".join(f"{table} {rows:,}" for table, rows in tick.retention_rows.items()) or "none"
+            print(f"✅ Tick {number}: expired rows {expired}; vacuum {format_size(tick.reclaimed_bytes)}; "
+                  f"WAL {'truncated, ' + format_size(tick.wal_reclaimed_bytes) if tick.truncated else 'checkpointed'} "
+                  f"({tick.seconds:.2f}s)")
+        return True
+    except sqlite3.Error as e:
+        print(f"❌ Error running warehouse maintenance: {str(e)}")
+        return False
+
+
+def enable_incremental_vacuum(db_path: str) -> bool:
+    """Rewrite the warehouse with auto_vacuum=INCREMENTAL."""
+    print("⚠️  VACUUM rewrites the whole file and blocks writers; stop the API server first.")
+    try:
+        reclaimed = get_warehouse_maintenance(db_path).enable_incremental_vacuum()
+        print(f"✅ Incremental auto-vacuum enabled; file shrank by {format_size(max(reclaimed, 0))}")
+        return True
+    except sqlite3.Error as e:
+        print(f"❌ Error enabling incremental vacuum: {str(e)}")
+        return False
+
+
+def main():
+    """Main function for the warehouse maintenance script."""
+    parser = argparse.ArgumentParser(
+        description="Warehouse Maintenance Script - Checkpoints, space reclamation and coverage retention",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--status", action="store_true", help="Show file, WAL and free-space sizes")
+    parser.add_argument("--run", action="store_true", help="Run maintenance ticks now")
+    parser.add_argument("--ticks", type=int, default=1, help="Ticks to run with --run (default: 1)")
+    parser.add_argument("--enable-incremental-vacuum", action="store_true",
+                        help="Switch to auto_vacuum=INCREMENTAL with one VACUUM (offline)")
+    parser.add_argument("--warehouse-path", type=str, default=WarehouseConfig().get_db_path(),
+                        help="Path to warehouse database file (default: WAREHOUSE_DB_PATH or database/warehouse)")
+    args = parser.parse_args()
+
+    if not os.path.exists(args.warehouse_path):
+        print(f"ℹ️  Warehouse database does not exist: {args.warehouse_path}")
+        return
+
+    if args.enable_incremental_vacuum:
+        if not enable_incremental_vacuum(args.warehouse_path):
+            sys.exit(1)
+    elif args.run:
+        if not run_ticks(args.warehouse_path, max(1, args.ticks)):
+            sys.exit(1)
+    elif args.status:
+        show_status(args.warehouse_path)
+    else:
+        parser.print_help()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,133 @@
+#!/usr/bin/env python3
+"""
+Warehouse Transfer Script - Administrative tool for bulk warehouse export and import.
+Version 4.4.3 - Portfolio Analysis & Visualization
+
+This script provides functionality to:
+- Export prices, dividends, benchmarks and coverage to partitioned Parquet,
+  Arrow or gzip CSV files
+- Import such an export into another warehouse, e.g. to seed a new environment
+- Preload vendor CSV dumps of prices, dividends or benchmarks offline
+- List the exports in the export directory
+
+CSV (the default) always works; Parquet needs pyarrow or fastparquet and Arrow needs pyarrow.
+
+Usage:
+    python backend/admin/warehouse_transfer.py --export snapshot-2024
+    python backend/admin/warehouse_transfer.py --export snapshot-2024 --format parquet
+    python backend/admin/warehouse_transfer.py --import snapshot-2024
+    python backend/admin/warehouse_transfer.py --import-csv prices.csv.gz --table market_data
+    python backend/admin/warehouse_transfer.py --import-csv AAPL.csv --symbol AAPL --column close_price=PX_LAST
+    python backend/admin/warehouse_transfer.py --list
+"""
+
+import os
+import sys
+import argparse
+
+# Add backend root to Python path for imports
+project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, project_root)
+
+from src.infrastructure.config.warehouse_config import WarehouseConfig
+from src.infrastructure.warehouse.bulk_transfer import (FORMATS, TABLES, VENDOR_VALUE_ALIASES, TransferResult,
+                                                        WarehouseBulkTransfer, list_exports)
+
+
+def resolve_directory(export_dir: str, name_or_path: str) -> str:
+    """A bare name refers to the export directory; anything with a separator is a path."""
+    if os.sep in name_or_path or (os.altsep and os.altsep in name_or_path):
+        return name_or_path
+    return os.path.join(export_dir, name_or_path)
+
+
+def print_result(action: str, result: TransferResult) -> None:
+    """Print rows per table and throughput."""
+    print(f"✅ {action} {result.total_rows:,} rows in {result.seconds:.1f}s "
+          f"({result.rows_per_minute / 1e6:.1f}M rows/min)")
+    for table, rows in result.rows.items():
+        print(f"   {table}: {rows:,}")
+    if result.skipped_rows:
+        print(f"⚠️  Skipped {result.skipped_rows:,} rows without a symbol, a valid date or a valid value")
+
+
+def parse_columns(pairs) -> dict:
+    """Parse repeated NAME=HEADER options."""
+    columns = {}
+    for pair in pairs or []:
+        name, separator, header = pair.partition("=")
+        if not separator:
+            raise ValueError(f"Expected NAME=HEADER, got: {pair}")
+        columns[name.strip()] = header
+    return columns
+
+
+def report(table: str, rows: int) -> None:
+    print(f"   {table}: {rows:,} rows", end="\r", flush=True)
+
+
+def main():
+    """Main function for the warehouse transfer script."""
+    parser = argparse.ArgumentParser(
+        description="Warehouse Transfer Script - Bulk export and import of warehouse data",
+        formatter_class=argparse.RawDescriptionHelpFormatter
+    )
+    parser.add_argument("--export", type=str, metavar="NAME", help="Export to NAME in the export directory (or a path)")
+    parser.add_argument("--import", dest="import_name", type=str, metavar="NAME", help="Import the export NAME (or a path)")
+    parser.add_argument("--import-csv", type=str, metavar="FILE", help="Import a vendor CSV dump (optionally gzipped)")
+    parser.add_argument("--list", action="store_true", help="List exports in the export directory")
+    parser.add_argument("--format", choices=sorted(FORMATS), default="csv", help="Export file format (default: csv)")
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), help="Tables to export or import (default: all)")
+    parser.add_argument("--rows-per-file", type=int, default=1_000_000, help="Rows per export part file (default: 1000000)")
+    parser.add_argument("--table", choices=sorted(VENDOR_VALUE_ALIASES), default="market_data",
+                        help="Table a vendor CSV holds (default: market_data)")
+    parser.add_argument("--symbol", type=str, help="Symbol for a single-symbol CSV without a symbol column")
+    parser.add_argument("--column", action="append", metavar="NAME=HEADER",
+                        help="Map a column (symbol, date or the table's value column) to a CSV header")
+    parser.add_argument("--no-normalize", action="store_true", help="Keep vendor symbols as written (no BRK.B -> BRK-B)")
+    parser.add_argument("--transaction-rows", type=int, default=500_000, help="Rows per import transaction (default: 500000)")
+    parser.add_argument("--warehouse-path", type=str, default=WarehouseConfig().get_db_path(),
+                        help="Path to warehouse database file (default: WAREHOUSE_DB_PATH or database/warehouse)")
+    parser.add_argument("--export-dir", type=str, default=WarehouseConfig().get_export_dir(),
+                        help="Directory holding exports (default: WAREHOUSE_EXPORT_DIR or database/warehouse/exports)")
+    args = parser.parse_args()
+
+    transfer = WarehouseBulkTransfer(args.warehouse_path, args.transaction_rows)
+
+    try:
+        if args.export:
+            directory = resolve_directory(args.export_dir, args.export)
+            print(f"📦 Exporting {args.warehouse_path} to {directory} ({args.format})")
+            print_result("Exported", transfer.export(directory, args.tables, args.format, args.rows_per_file))
+        elif args.import_name:
+            directory = resolve_directory(args.export_dir, args.import_name)
+            print(f"📥 Importing {directory} into {args.warehouse_path}")
+            result = transfer.import_export(directory, args.tables, report)
+            print()
+            print_result("Imported", result)
+        elif args.import_csv:
+            if not os.path.exists(args.import_csv):
+                print(f"❌ CSV file does not exist: {args.import_csv}")
+                sys.exit(1)
+            print(f"📥 Importing {args.import_csv} into {args.table} of {args.warehouse_path}")
+            result = transfer.import_csv(args.import_csv, args.table, args.symbol, parse_columns(args.column),
+                                         not args.no_normalize, progress=report)
+            print()
+            print_result("Imported", result)
+        elif args.list:
+            exports = list_exports(args.export_dir)
+            if not exports:
+                print(f"ℹ️  No exports in {args.export_dir}")
+            for export in exports:
+                rows = sum(export["rows"].values())
+                print(f"📦 {export['name']}: {rows:,} rows ({export['format']}, exported {export['exported_at']})")
+        else:
+            parser.print_help()
+
+    except ValueError as e:
+        print(f"❌ {str(e)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -7,33 +7,55 @@ Provides REST API endpoints for frontend integration
 import sys
 import os
 import json
-from pathlib import Path
 from typing import Optional, List
 from datetime import datetime, timedelta
-from fastapi import FastAPI, File, UploadFile, HTTPException
+from fastapi import FastAPI, File, UploadFile, HTTPException, Request, Response
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
-import uvicorn
+import numpy as np
 
 # Add src to Python path for imports
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), 'src'))
 
 from src.presentation.controllers.main_controller import MainController
 from src.infrastructure.repositories.csv_portfolio_repository import CsvPortfolioRepository
+from src.infrastructure.repositories.csv_transaction_repository import CsvTransactionRepository
 from src.infrastructure.repositories.warehouse_market_repository import WarehouseMarketRepository
 from src.infrastructure.config.warehouse_config import WarehouseConfig
+from src.infrastructure.config.simulation_config import SimulationConfig
+from src.infrastructure.config.session_config import SessionConfig
+from src.infrastructure.services.monte_carlo_simulator import MonteCarloSimulator
+from src.infrastructure.services.portfolio_optimizer import PortfolioOptimizer
+from src.infrastructure.services.holdings_engine import HoldingsEngine
+from src.infrastructure.services.portfolio_session_store import PortfolioSessionStore
+from src.infrastructure.services.warehouse_optimizer import get_warehouse_optimizer
+from src.infrastructure.warehouse.maintenance import get_warehouse_maintenance
+from src.infrastructure.warehouse.bulk_transfer import TransferResult, WarehouseBulkTransfer, export_path, list_exports
 from src.application.use_cases.load_portfolio import LoadPortfolioUseCase, LoadPortfolioRequest
 from src.application.use_cases.analyze_portfolio import (
     AnalyzePortfolioUseCase, 
     AnalyzePortfolioRequest
 )
-from src.application.use_cases.analyze_ticker import AnalyzeTickerUseCase, AnalyzeTickerRequest, AnalyzeTickersRequest
+from src.application.use_cases.analyze_ticker import AnalyzeTickerUseCase, AnalyzeTickerRequest, AnalyzeTickersRequest, AnalyzeTickersResponse
 from src.application.use_cases.compare_tickers import CompareTickersUseCase
+from src.application.use_cases.get_quotes import GetQuotesUseCase
+from src.application.use_cases.analyze_rolling import AnalyzeRollingUseCase
+from src.application.use_cases.analyze_horizons import AnalyzeHorizonsUseCase, HORIZONS
+from src.application.use_cases.screen_tickers import ScreenTickersUseCase
+from src.application.use_cases.simulate_portfolio import SimulatePortfolioUseCase
+from src.application.use_cases.optimize_portfolio import OptimizePortfolioUseCase
+from src.application.use_cases.evaluate_scenario import EvaluateScenarioUseCase, PositionChange
+from src.application.use_cases.load_ledger import LoadLedgerUseCase
+from src.application.use_cases.analyze_ledger import AnalyzeLedgerUseCase
 from src.infrastructure.color_metrics_service import ColorMetricsService
+from src.application.interfaces.metrics_color_service import LEVEL_CODES
+from src.infrastructure.services.metric_ranker import MetricRanker, RankedMetric
 from src.domain.entities.portfolio import Portfolio
-from src.domain.entities.position import Position
 from src.domain.entities.ticker import Ticker
+from src.domain.entities.transaction_ledger import TransactionLedger
 from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.utils.serialization import series_to_columnar, series_to_date_dict, dumps
 from src.infrastructure.utils.date_utils import is_date_after_previous_working_day, get_previous_working_day_string
 
 # Pydantic models for API responses
@@ -82,18 +104,85 @@ def _get_sort_value(metric, sort_key):
     value = getattr(metric, sort_key)
     return value.value if hasattr(value, 'value') else value
 
-def _get_top_performers(metrics_list, sort_key, reverse=True, limit=5):
-    """Get top performers sorted by specified criteria."""
-    sorted_metrics = sorted(metrics_list, 
-                          key=lambda metric: _get_sort_value(metric, sort_key), 
-                          reverse=reverse)
-    return [_convert_metrics_to_api(metric) for metric in sorted_metrics[:limit]]
+# Metrics the compare leaderboards can rank, by API field, with the direction that is better
+TICKER_RANKINGS = {
+    ranked.name: ranked for ranked in (
+        RankedMetric("totalReturn", "total_return"),
+        RankedMetric("annualizedReturn", "annualized_return"),
+        RankedMetric("volatility", "volatility", higher_is_better=False),
+        RankedMetric("sharpeRatio", "sharpe_ratio"),
+        RankedMetric("maxDrawdown", "max_drawdown"),  # Less negative is better
+        RankedMetric("sortinoRatio", "sortino_ratio"),
+        RankedMetric("beta", "beta", higher_is_better=False),
+        RankedMetric("var95", "var_95"),  # Less negative is better
+        RankedMetric("momentum12to1", "momentum_12_1"),
+        RankedMetric("dividendYield", "dividend_yield"),
+        RankedMetric("calmarRatio", "calmar_ratio"),
+        RankedMetric("ulcerIndex", "ulcer_index", higher_is_better=False),
+        RankedMetric("timeUnderWater", "time_under_water", higher_is_better=False),
+        RankedMetric("cvar95", "cvar_95", higher_is_better=False),
+        RankedMetric("correlationToPortfolio", "correlation_to_portfolio", higher_is_better=False),
+        RankedMetric("riskContributionAbsolute", "risk_contribution_absolute", higher_is_better=False),
+        RankedMetric("riskContributionPercent", "risk_contribution_percent", higher_is_better=False),
+    )
+}
+
+# Fixed compare leaderboards: response key -> (ranked metric, best or worst end)
+COMPARE_LEADERBOARDS = {
+    "bestPerformers": ("annualizedReturn", "best"),
+    "worstPerformers": ("annualizedReturn", "worst"),
+    "bestSharpe": ("sharpeRatio", "best"),
+    "lowestRisk": ("volatility", "best"),
+    "bestCalmar": ("calmarRatio", "best"),
+    "worstCalmar": ("calmarRatio", "worst"),
+    "bestSortino": ("sortinoRatio", "best"),
+    "worstSortino": ("sortinoRatio", "worst"),
+    "bestMaxDrawdown": ("maxDrawdown", "best"),
+    "worstMaxDrawdown": ("maxDrawdown", "worst"),
+    "bestUlcer": ("ulcerIndex", "best"),
+    "worstUlcer": ("ulcerIndex", "worst"),
+    "bestTimeUnderWater": ("timeUnderWater", "best"),
+    "worstTimeUnderWater": ("timeUnderWater", "worst"),
+    "bestCvar": ("cvar95", "best"),
+    "worstCvar": ("cvar95", "worst"),
+    "bestCorrelation": ("correlationToPortfolio", "best"),
+    "worstCorrelation": ("correlationToPortfolio", "worst"),
+    "bestRiskContribution": ("riskContributionPercent", "best"),
+    "worstRiskContribution": ("riskContributionPercent", "worst"),
+}
+
+def _parse_rank_by(rank_by: Optional[str]) -> List[str]:
+    """Parse comma-separated metric fields to rank, e.g. "sharpeRatio,beta"."""
+    if not rank_by:
+        return []
+    names = list(dict.fromkeys(name.strip() for name in rank_by.split(",") if name.strip()))
+    unknown = [name for name in names if name not in TICKER_RANKINGS]
+    if unknown:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Cannot rank by: {', '.join(unknown)}. Use any of: {', '.join(TICKER_RANKINGS)}"
+        )
+    return names
 
-async def _save_uploaded_file(file: UploadFile, temp_file_path: str) -> None:
-    """Save uploaded file to temporary location."""
-    with open(temp_file_path, "wb") as buffer:
-        content = await file.read()
-        buffer.write(content)
+def _rank_compare_metrics(metrics_list, requested: List[str], k: int) -> tuple:
+    """Fixed leaderboards and requested rankings from one ranking pass over the metrics matrix."""
+    names = list(dict.fromkeys([name for name, _ in COMPARE_LEADERBOARDS.values()] + requested))
+    rankings = MetricRanker([TICKER_RANKINGS[name] for name in names]).rank(metrics_list, k)
+    converted = {}
+    
+    def to_api(indices: List[int]) -> List[dict]:
+        for index in indices:
+            if index not in converted:
+                converted[index] = _convert_metrics_to_api(metrics_list[index])
+        return [converted[index] for index in indices]
+    
+    leaderboards = {
+        key: to_api(getattr(rankings[name], end)) for key, (name, end) in COMPARE_LEADERBOARDS.items()
+    }
+    requested_rankings = {
+        name: {"best": to_api(rankings[name].best), "worst": to_api(rankings[name].worst)} for name in requested
+    }
+    return leaderboards, requested_rankings
 
 def _create_portfolio_response(portfolio: Portfolio) -> PortfolioResponse:
     """Create portfolio response from portfolio object."""
@@ -185,55 +274,233 @@ app.add_middleware(
 
 # Global variables for dependency injection
 _controller: Optional[MainController] = None
-_current_portfolio: Optional[Portfolio] = None
+_session_store: Optional[PortfolioSessionStore] = None
 
-# Persistent portfolio storage to survive server reloads
-PORTFOLIO_STORAGE_FILE = Path("/tmp/current_portfolio.json")
+# Portfolio used when a request does not name one
+DEFAULT_PORTFOLIO_ID = "default"
 
-def save_portfolio_to_disk(portfolio: Optional[Portfolio]) -> None:
-    """Save portfolio to disk for persistence across server reloads."""
-    if portfolio is None:
-        if PORTFOLIO_STORAGE_FILE.exists():
-            PORTFOLIO_STORAGE_FILE.unlink()
-        return
+# Time-series formats for portfolio analysis, selectable via Accept header
+SERIES_FORMATS = ("dict", "columnar", "columnar-base64")
+SERIES_MEDIA_TYPES = {
+    "application/vnd.omen.columnar-base64+json": "columnar-base64",
+    "application/vnd.omen.columnar+json": "columnar"
+}
+
+# Rolling analytics windows (trading days) and API metric names
+DEFAULT_ROLLING_WINDOWS = (63, 126, 252)
+MAX_ROLLING_WINDOW = 2520
+ROLLING_METRIC_NAMES = {
+    "volatility": "volatility",
+    "sharpe_ratio": "sharpeRatio",
+    "sortino_ratio": "sortinoRatio",
+    "beta": "beta",
+    "max_drawdown": "maxDrawdown"
+}
+
+# Upper bound on efficient frontier points per optimization request
+MAX_FRONTIER_POINTS = 200
+
+# Media types for streamed ticker analysis
+STREAM_MEDIA_TYPES = {
+    "ndjson": "application/x-ndjson",
+    "sse": "text/event-stream"
+}
+
+def _get_position_quantities(portfolio: Portfolio) -> dict:
+    """Map ticker symbols to position quantities."""
+    return {pos.ticker.symbol: float(pos.quantity) for pos in portfolio.get_positions()}
+
+def _convert_allocation_to_api(allocation, symbols: List[str]) -> dict:
+    """Convert an optimizer allocation to API format, with weights keyed by symbol."""
+    return {
+        "expectedReturn": f"{allocation.expected_return:.2f}%",
+        "volatility": f"{allocation.volatility:.2f}%",
+        "sharpeRatio": f"{allocation.sharpe_ratio:.2f}" if allocation.sharpe_ratio is not None else None,
+        "weights": {symbol: f"{weight * 100:.2f}%" for symbol, weight in zip(symbols, allocation.weights)},
+        "riskContributions": {
+            symbol: f"{share * 100:.2f}%" for symbol, share in zip(symbols, allocation.risk_contributions)
+        }
+    }
+
+def _convert_ticker_metrics_to_api(metrics, position_quantity: float) -> dict:
+    """Convert ticker metrics to API response format."""
+    # Calculate market value (position * end price)
+    market_value = position_quantity * float(metrics.end_price.amount)
     
-    # Convert portfolio to serializable format
-    portfolio_data = {
-        "positions": [
-            {
-                "ticker": pos.ticker.symbol,
-                "quantity": float(pos.quantity)
-            }
-            for pos in portfolio.get_positions()
-        ]
+    return {
+        "ticker": metrics.ticker.symbol,
+        "totalReturn": f"{metrics.total_return.value:.2f}%",
+        "annualizedReturn": f"{metrics.annualized_return.value:.2f}%",
+        "volatility": f"{metrics.volatility.value:.2f}%",
+        "sharpeRatio": f"{metrics.sharpe_ratio:.3f}",
+        "maxDrawdown": f"{metrics.max_drawdown.value:.2f}%",
+        "sortinoRatio": f"{metrics.sortino_ratio:.3f}",
+        "calmarRatio": f"{metrics.calmar_ratio:.2f}",
+        "ulcerIndex": f"{metrics.ulcer_index:.4f}",
+        "timeUnderWater": f"{metrics.time_under_water:.2f}",
+        "cvar95": f"{metrics.cvar_95:.2f}",
+        "correlationToPortfolio": f"{metrics.correlation_to_portfolio:.2f}",
+        "riskContributionAbsolute": f"{metrics.risk_contribution_absolute:.4f}",
+        "riskContributionPercent": f"{metrics.risk_contribution_percent:.2f}%",
+        "beta": f"{metrics.beta:.3f}",
+        "var95": f"{metrics.var_95.value:.2f}%",
+        "momentum12to1": f"{metrics.momentum_12_1.value:.2f}%",
+        "dividendYield": f"{metrics.dividend_yield.value:.2f}%",
+        "dividendAmount": f"${metrics.dividend_amount.amount:.2f}",
+        "dividendFrequency": metrics.dividend_frequency,
+        "annualizedDividend": f"${metrics.annualized_dividend.amount:.2f}",
+        "startPrice": f"${metrics.start_price.amount:.2f}",
+        "endPrice": f"${metrics.end_price.amount:.2f}",
+        "hasDataAtStart": True,  # All successful tickers have data at start
+        "firstAvailableDate": None,  # Not available in batch response
+        "position": position_quantity,
+        "marketValue": f"${market_value:,.2f}"
     }
+
+# API field -> ticker-context metric with color thresholds; the level codes are sent next to the formatted values
+TICKER_LEVEL_METRICS = {
+    "annualizedReturn": "annualized_return",
+    "volatility": "volatility",
+    "sharpeRatio": "sharpe_ratio",
+    "maxDrawdown": "max_drawdown",
+    "sortinoRatio": "sortino_ratio",
+    "beta": "beta",
+    "var95": "var_95",
+    "momentum12to1": "momentum_12_1",
+    "dividendYield": "dividend_yield",
+}
+
+LEVEL_CODE_NAMES = {str(code): level.value for level, code in LEVEL_CODES.items()}
+
+def _ticker_metric_levels(color_service: ColorMetricsService, metrics_list) -> List[dict]:
+    """Level code of each thresholded metric per ticker, classified as one matrix."""
+    names = list(TICKER_LEVEL_METRICS.values())
+    values = np.array(
+        [[_get_sort_value(metrics, name) for name in names] for metrics in metrics_list], dtype=float
+    ).reshape(len(metrics_list), len(names))
+    codes = color_service.get_levels_for_metrics(names, values, context="ticker")
+    return [dict(zip(TICKER_LEVEL_METRICS, row)) for row in codes.tolist()]
+
+def _resolve_series_format(series_format: Optional[str], accept: str) -> str:
+    """Pick the time-series format from the query parameter, then the Accept header."""
+    if series_format is None:
+        series_format = next(
+            (name for media_type, name in SERIES_MEDIA_TYPES.items() if media_type in accept),
+            "dict"
+        )
     
-    with open(PORTFOLIO_STORAGE_FILE, 'w') as f:
-        json.dump(portfolio_data, f)
+    if series_format not in SERIES_FORMATS:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Unsupported series format: {series_format}. Use one of {', '.join(SERIES_FORMATS)}"
+        )
+    
+    return series_format
 
-def load_portfolio_from_disk() -> Optional[Portfolio]:
-    """Load portfolio from disk if it exists."""
-    if not PORTFOLIO_STORAGE_FILE.exists():
-        return None
+def _parse_rolling_windows(windows: Optional[str]) -> tuple:
+    """Parse a comma-separated list of rolling windows in trading days."""
+    if not windows:
+        return DEFAULT_ROLLING_WINDOWS
     
     try:
-        with open(PORTFOLIO_STORAGE_FILE, 'r') as f:
-            portfolio_data = json.load(f)
-        
-        # Reconstruct portfolio from saved data
-        
-        positions = []
-        for pos_data in portfolio_data["positions"]:
-            ticker = Ticker(pos_data["ticker"])
-            position = Position(ticker, pos_data["quantity"])
-            positions.append(position)
-        
-        return Portfolio(positions)
-    except Exception as e:
-        print(f"Error loading portfolio from disk: {e}")
-        return None
+        parsed = tuple(sorted({int(window) for window in windows.split(",") if window.strip()}))
+    except ValueError:
+        raise HTTPException(status_code=400, detail=f"Invalid windows: {windows}. Use comma-separated trading-day counts")
+    
+    if not parsed or any(window < 2 or window > MAX_ROLLING_WINDOW for window in parsed):
+        raise HTTPException(status_code=400, detail=f"Windows must be between 2 and {MAX_ROLLING_WINDOW} trading days")
+    
+    return parsed
+
+def _parse_horizons(horizons: Optional[str]) -> tuple:
+    """Parse a comma-separated list of analysis horizons (1M, 3M, YTD, 1Y, 3Y, 5Y, MAX)."""
+    if not horizons:
+        return HORIZONS
+    
+    parsed = tuple(horizon.strip().upper() for horizon in horizons.split(",") if horizon.strip())
+    invalid = [horizon for horizon in parsed if horizon not in HORIZONS]
+    if not parsed or invalid:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid horizons: {', '.join(invalid) or horizons}. Use any of {', '.join(HORIZONS)}"
+        )
+    
+    return parsed
+
+def _parse_position_changes(changes) -> List[PositionChange]:
+    """Parse ``[{"ticker": str, "quantityDelta": number}]`` scenario changes."""
+    if not isinstance(changes, list) or not changes:
+        raise HTTPException(status_code=400, detail="changes must be a non-empty list of {ticker, quantityDelta}")
+    
+    parsed = []
+    for change in changes:
+        try:
+            parsed.append(PositionChange(Ticker(str(change["ticker"])), float(change["quantityDelta"])))
+        except (KeyError, TypeError, ValueError) as e:
+            raise HTTPException(status_code=400, detail=f"Invalid scenario change {change!r}: {str(e)}")
+    
+    return parsed
+
+def _encode_series(series, series_format: str):
+    """Encode a time series in the requested format, dropping empty points."""
+    series = series.dropna()
+    if series_format == "dict":
+        return series_to_date_dict(series)
+    return series_to_columnar(series, series_format == "columnar-base64")
+
+def _create_ticker_analysis_summary(response: AnalyzeTickersResponse) -> dict:
+    """Build the ticker analysis summary (status, timings, warnings)."""
+    summary = {
+        "success": response.success,
+        "message": response.message,
+        "processingTimeSeconds": response.processing_time_seconds,
+        "timings": {
+            "fetchSeconds": response.fetch_time_seconds,
+            "calculationSeconds": response.calculation_time_seconds
+        },
+        "levelCodes": LEVEL_CODE_NAMES,
+        "warnings": {
+            "missingTickers": response.missing_tickers or [],
+            "tickersWithoutStartData": response.tickers_without_start_data or [],
+            "firstAvailableDates": response.first_available_dates or {}
+        }
+    }
+    
+    if response.failed_tickers:
+        summary["failedTickers"] = [
+            {"ticker": ticker, "firstAvailableDate": None} 
+            for ticker in response.failed_tickers
+        ]
+    
+    return summary
 
+def _encode_stream_record(record: dict, stream_format: str) -> str:
+    """Encode one record as an NDJSON line or a server-sent event."""
+    payload = json.dumps(record)
+    if stream_format == "sse":
+        return f"event: {record['type']}\ndata: {payload}\n\n"
+    return payload + "\n"
 
+def _stream_ticker_analysis(controller: MainController, request: AnalyzeTickersRequest,
+                            portfolio: Portfolio, stream_format: str) -> StreamingResponse:
+    """Stream ticker metrics as they complete, then a summary record."""
+    position_quantities = _get_position_quantities(portfolio)
+    
+    def records():
+        for item in controller._analyze_ticker_use_case.execute_stream(request):
+            if isinstance(item, AnalyzeTickersResponse):
+                record = {"type": "summary", **_create_ticker_analysis_summary(item)}
+            else:
+                data = _convert_ticker_metrics_to_api(item, position_quantities.get(item.ticker.symbol, 0.0))
+                data["levels"] = _ticker_metric_levels(controller._color_service, [item])[0]
+                record = {"type": "ticker", "data": data}
+            yield _encode_stream_record(record, stream_format)
+    
+    return StreamingResponse(
+        records(),
+        media_type=STREAM_MEDIA_TYPES[stream_format],
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 def get_controller() -> MainController:
     """Get or create portfolio controller instance."""
@@ -245,8 +512,12 @@ def get_controller() -> MainController:
         warehouse_config = WarehouseConfig()
         market_repo = WarehouseMarketRepository(
             warehouse_enabled=warehouse_config.is_enabled(),
-            warehouse_db_path=warehouse_config.get_db_path()
+            warehouse_db_path=warehouse_config.get_db_path(),
+            warehouse_snapshot_path=warehouse_config.get_snapshot_path()
         )
+        if warehouse_config.is_enabled() and warehouse_config.is_maintenance_enabled():
+            # Checkpoints, space reclamation and coverage retention off the request path
+            get_warehouse_maintenance(warehouse_config.get_db_path()).start()
         
         color_service = ColorMetricsService()
         
@@ -254,34 +525,70 @@ def get_controller() -> MainController:
         analyze_portfolio_use_case = AnalyzePortfolioUseCase(market_repo)
         analyze_ticker_use_case = AnalyzeTickerUseCase(market_repo)
         compare_tickers_use_case = CompareTickersUseCase(analyze_ticker_use_case, market_repo)
+        get_quotes_use_case = GetQuotesUseCase(market_repo)
+        analyze_rolling_use_case = AnalyzeRollingUseCase(market_repo, analyze_portfolio_use_case)
+        analyze_horizons_use_case = AnalyzeHorizonsUseCase(market_repo, analyze_portfolio_use_case, analyze_ticker_use_case)
+        screen_tickers_use_case = ScreenTickersUseCase(market_repo)
+        simulate_portfolio_use_case = SimulatePortfolioUseCase(
+            market_repo, MonteCarloSimulator(SimulationConfig().memory_limit_bytes)
+        )
+        optimize_portfolio_use_case = OptimizePortfolioUseCase(market_repo, PortfolioOptimizer())
+        evaluate_scenario_use_case = EvaluateScenarioUseCase(market_repo, analyze_portfolio_use_case)
+        load_ledger_use_case = LoadLedgerUseCase(CsvTransactionRepository())
+        analyze_ledger_use_case = AnalyzeLedgerUseCase(market_repo, HoldingsEngine())
         
         _controller = MainController(
             load_portfolio_use_case,
             analyze_portfolio_use_case,
             analyze_ticker_use_case,
             compare_tickers_use_case,
-            color_service
+            color_service,
+            get_quotes_use_case,
+            analyze_rolling_use_case,
+            analyze_horizons_use_case,
+            screen_tickers_use_case,
+            simulate_portfolio_use_case,
+            optimize_portfolio_use_case,
+            evaluate_scenario_use_case,
+            load_ledger_use_case,
+            analyze_ledger_use_case
         )
     
     return _controller
 
-def get_current_portfolio() -> Optional[Portfolio]:
-    """Get current portfolio from controller."""
-    global _current_portfolio
-    
-    # If portfolio is None (e.g., after server reload), try to load from disk
-    if _current_portfolio is None:
-        _current_portfolio = load_portfolio_from_disk()
-    
-    return _current_portfolio
+def get_session_store() -> PortfolioSessionStore:
+    """Get or create the portfolio session store."""
+    global _session_store
+    if _session_store is None:
+        config = SessionConfig()
+        _session_store = PortfolioSessionStore(config.get_db_path(), config.cache_size)
+    return _session_store
 
-def set_current_portfolio(portfolio: Optional[Portfolio]) -> None:
-    """Set current portfolio."""
-    global _current_portfolio
-    _current_portfolio = portfolio
-    
-    # Save to disk for persistence across server reloads
-    save_portfolio_to_disk(portfolio)
+def _validate_portfolio_id(portfolio_id: str) -> None:
+    """Reject malformed portfolio IDs with a 400."""
+    try:
+        PortfolioSessionStore.validate_id(portfolio_id)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+
+def get_current_portfolio(portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[Portfolio]:
+    """Get a stored portfolio by ID."""
+    _validate_portfolio_id(portfolio_id)
+    return get_session_store().get_portfolio(portfolio_id)
+
+def set_current_portfolio(portfolio: Optional[Portfolio], portfolio_id: str = DEFAULT_PORTFOLIO_ID,
+                          ledger: Optional[TransactionLedger] = None) -> None:
+    """Store a portfolio (and the ledger it came from, if any) under an ID; None removes it."""
+    _validate_portfolio_id(portfolio_id)
+    if portfolio is None:
+        get_session_store().delete(portfolio_id)
+    else:
+        get_session_store().save(portfolio_id, portfolio, ledger)
+
+def get_current_ledger(portfolio_id: str = DEFAULT_PORTFOLIO_ID) -> Optional[TransactionLedger]:
+    """Get the transaction ledger behind a portfolio, if it was uploaded as one."""
+    _validate_portfolio_id(portfolio_id)
+    return get_session_store().get_ledger(portfolio_id)
 
 
 # API Endpoints
@@ -293,30 +600,30 @@ async def health_check():
 
 
 @app.post("/portfolio/upload")
-async def upload_portfolio(file: UploadFile = File(...)):
-    """Upload portfolio CSV file."""
-    temp_file_path = None
+async def upload_portfolio(file: UploadFile = File(...), portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Upload a holdings file (CSV, gzip CSV or Parquet).
+    
+    The upload is parsed straight from the request stream; rows for the same
+    ticker are summed into one position.
+    """
     try:
         # Validate file type
-        if not file.filename.lower().endswith('.csv'):
-            raise HTTPException(status_code=400, detail="File must be a CSV file")
-        
-        # Save uploaded file temporarily
-        temp_file_path = f"/tmp/uploaded_portfolio_{file.filename}"
-        await _save_uploaded_file(file, temp_file_path)
+        if not file.filename.lower().endswith(CsvPortfolioRepository.SUPPORTED_EXTENSIONS):
+            raise HTTPException(status_code=400, detail="File must be a CSV, gzip-compressed CSV or Parquet file")
         
         # Load portfolio using controller
         controller = get_controller()
-        request = LoadPortfolioRequest(file_path=temp_file_path)
+        request = LoadPortfolioRequest(file_path=file.filename, stream=file.file)
         response = controller._load_portfolio_use_case.execute(request)
         
         if response.success and response.portfolio:
-            set_current_portfolio(response.portfolio)
+            set_current_portfolio(response.portfolio, portfolio_id)
             portfolio_response = _create_portfolio_response(response.portfolio)
             
             return {
                 "success": True,
                 "message": f"Portfolio loaded successfully with {len(response.portfolio.get_positions())} positions",
+                "portfolioId": portfolio_id,
                 "portfolio": portfolio_response.model_dump()
             }
         else:
@@ -329,15 +636,118 @@ async def upload_portfolio(file: UploadFile = File(...)):
         print("FULL TRACEBACK:")
         print(traceback.format_exc())
         raise HTTPException(status_code=500, detail=str(e))
-    finally:
-        # Clean up temp file
-        if temp_file_path and os.path.exists(temp_file_path):
-            os.remove(temp_file_path)
+
+@app.post("/portfolio/ledger/upload")
+async def upload_ledger(file: UploadFile = File(...), portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Upload a transaction ledger CSV (``date,ticker,quantity,price``).
+    
+    The upload is parsed straight from the request stream. The net holdings
+    become the current portfolio, so fixed-quantity endpoints keep working;
+    /portfolio/ledger/performance uses the full history.
+    """
+    try:
+        # Validate file type
+        if not file.filename.lower().endswith('.csv'):
+            raise HTTPException(status_code=400, detail="File must be a CSV file")
+        
+        response = get_controller().load_ledger(file.filename, stream=file.file)
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        ledger = response.ledger
+        try:
+            portfolio = ledger.to_portfolio()
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        set_current_portfolio(portfolio, portfolio_id, ledger)
+        
+        return {
+            "success": True,
+            "message": response.message,
+            "portfolioId": portfolio_id,
+            "portfolio": _create_portfolio_response(portfolio).model_dump(),
+            "ledger": {
+                "transactions": len(ledger),
+                "tickers": ledger.unique_symbols,
+                "startDate": ledger.start_date.isoformat(),
+                "endDate": ledger.end_date.isoformat()
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=str(e))
+
+@app.get("/portfolio/ledger/performance")
+async def ledger_performance(http_request: Request, end_date: str = None, series_format: str = None,
+                             portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Daily value, cash flows and time-weighted return of the uploaded transaction ledger."""
+    ledger = get_current_ledger(portfolio_id)
+    
+    if ledger is None:
+        raise HTTPException(status_code=404, detail="No transaction ledger loaded")
+    
+    series_format = _resolve_series_format(series_format, http_request.headers.get("accept", ""))
+    
+    if not end_date:
+        end_date = get_previous_working_day_string()
+    
+    # Validate end date (the start is the first transaction)
+    _validate_date_range(end_date, end_date)
+    
+    try:
+        response = get_controller().analyze_ledger(
+            ledger, datetime.strptime(end_date, '%Y-%m-%d').date(), risk_free_rate=0.03
+        )
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        metrics, holdings = response.metrics, response.holdings
+        payload = {
+            "success": True,
+            "message": response.message,
+            "data": {
+                "timeWeightedReturn": f"{metrics.time_weighted_return.value:.2f}%",
+                "annualizedReturn": f"{metrics.annualized_return.value:.2f}%",
+                "volatility": f"{metrics.volatility.value:.2f}%",
+                "sharpeRatio": f"{metrics.sharpe_ratio:.3f}",
+                "maxDrawdown": f"{metrics.max_drawdown.value:.2f}%",
+                "sortinoRatio": f"{metrics.sortino_ratio:.3f}",
+                "endValue": f"${metrics.end_value.amount:,.2f}",
+                "netInvested": f"${metrics.net_invested:,.2f}",
+                "totalGain": f"${metrics.total_gain:,.2f}",
+                "positions": [
+                    {"ticker": symbol, "position": float(quantity)}
+                    for symbol, quantity in zip(holdings.symbols, holdings.quantities[-1])
+                    if quantity != 0
+                ]
+            },
+            "warnings": {
+                "missingTickers": response.missing_tickers or [],
+                "transactionsIgnored": response.transactions_ignored
+            },
+            "timeSeriesFormat": series_format,
+            "timeSeriesData": {
+                "portfolioValues": _encode_series(holdings.values, series_format),
+                "cashFlows": _encode_series(holdings.cash_flows[holdings.cash_flows != 0], series_format),
+                "twrIndex": _encode_series(holdings.twr_index, series_format)
+            }
+        }
+        
+        return Response(content=dumps(payload), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ledger analysis failed: {str(e)}")
 
 @app.get("/portfolio")
-async def get_portfolio():
-    """Get current portfolio."""
-    portfolio = get_current_portfolio()
+async def get_portfolio(portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Get a stored portfolio."""
+    portfolio = get_current_portfolio(portfolio_id)
     
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio loaded")
@@ -345,19 +755,72 @@ async def get_portfolio():
     return _create_portfolio_response(portfolio)
 
 @app.delete("/portfolio")
-async def clear_portfolio():
-    """Clear current portfolio."""
-    set_current_portfolio(None)  # This will also clear disk storage
+async def clear_portfolio(portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Clear a stored portfolio and its ledger."""
+    set_current_portfolio(None, portfolio_id)
     return ApiResponse(success=True, message="Portfolio cleared successfully")
 
+@app.get("/portfolios")
+async def list_portfolios():
+    """IDs of all stored portfolios, most recently updated first."""
+    return {"portfolioIds": get_session_store().list_ids()}
+
+@app.get("/portfolio/quotes")
+async def get_portfolio_quotes(portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Get current quotes and market value for the loaded portfolio."""
+    portfolio = get_current_portfolio(portfolio_id)
+    
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="No portfolio loaded")
+    
+    try:
+        response = get_controller().get_quotes(portfolio)
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        quotes_data = [
+            {
+                "ticker": quote.ticker.symbol,
+                "position": float(quote.quantity),
+                "price": f"${float(quote.price.amount):,.2f}",
+                "marketValue": f"${float(quote.market_value.amount):,.2f}"
+            }
+            for quote in response.quotes
+        ]
+        
+        return {
+            "success": True,
+            "message": response.message,
+            "data": {
+                "quotes": quotes_data,
+                "totalMarketValue": f"${float(response.total_market_value.amount):,.2f}"
+            },
+            "warnings": {
+                "missingTickers": response.missing_tickers or []
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Quote refresh failed: {str(e)}")
+
 @app.get("/portfolio/analysis")
-async def analyze_portfolio(start_date: str = None, end_date: str = None):
-    """Analyze current portfolio with date range parameters."""
-    portfolio = get_current_portfolio()
+async def analyze_portfolio(http_request: Request, start_date: str = None, end_date: str = None,
+                            series_format: str = None, portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Analyze current portfolio with date range parameters.
+    
+    Time series default to ``{'YYYY-MM-DD': value}`` dicts. ``series_format``
+    (or the Accept header) selects ``columnar`` or ``columnar-base64``.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
     
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio loaded")
     
+    series_format = _resolve_series_format(series_format, http_request.headers.get("accept", ""))
+    
     # Set default date range if not provided
     start_date, end_date = _get_default_date_range(start_date, end_date)
     
@@ -371,7 +834,8 @@ async def analyze_portfolio(start_date: str = None, end_date: str = None):
         request = AnalyzePortfolioRequest(
             portfolio=portfolio,
             date_range=date_range,
-            risk_free_rate=0.03
+            risk_free_rate=0.03,
+            date_keyed_series=series_format == "dict"
         )
         
         response = controller._analyze_portfolio_use_case.execute(request)
@@ -385,7 +849,21 @@ async def analyze_portfolio(start_date: str = None, end_date: str = None):
         # Convert metrics to API response format
         portfolio_data = _convert_metrics_to_api_response(response.metrics)
         
-        return {
+        if series_format == "dict":
+            time_series_data = {
+                "portfolioValues": response.portfolio_values_over_time or {},
+                "sp500Values": response.sp500_values_over_time or {},
+                "nasdaqValues": response.nasdaq_values_over_time or {}
+            }
+        else:
+            binary = series_format == "columnar-base64"
+            time_series_data = {
+                "portfolioValues": series_to_columnar(response.time_series['portfolio'], binary),
+                "sp500Values": series_to_columnar(response.time_series['sp500'], binary),
+                "nasdaqValues": series_to_columnar(response.time_series['nasdaq'], binary)
+            }
+        
+        payload = {
             "success": True,
             "message": response.message,
             "data": portfolio_data,
@@ -394,26 +872,357 @@ async def analyze_portfolio(start_date: str = None, end_date: str = None):
                 "tickersWithoutStartData": response.tickers_without_start_data or [],
                 "firstAvailableDates": response.first_available_dates or {}
             },
+            "timeSeriesFormat": series_format,
+            "timeSeriesData": time_series_data
+        }
+        
+        # Serialize directly (orjson when installed) instead of FastAPI's generic encoder
+        return Response(content=dumps(payload), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+
+@app.get("/portfolio/analysis/horizons")
+async def analyze_horizons(horizons: str = None, end_date: str = None,
+                           portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Portfolio and ticker metrics for several horizons ending at ``end_date``.
+    
+    Market data is loaded once for the longest horizon and sliced for the others,
+    so this replaces one /portfolio/analysis plus /portfolio/tickers/analysis call per horizon.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
+    
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="No portfolio loaded")
+    
+    parsed_horizons = _parse_horizons(horizons)
+    
+    if not end_date:
+        end_date = get_previous_working_day_string()
+    
+    # Validate end date (start dates are derived from the horizons)
+    _validate_date_range(end_date, end_date)
+    
+    try:
+        response = get_controller().analyze_horizons(
+            portfolio, datetime.strptime(end_date, '%Y-%m-%d').date(), parsed_horizons
+        )
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        position_quantities = _get_position_quantities(portfolio)
+        horizons_data = {}
+        for horizon, analysis in response.horizons.items():
+            horizons_data[horizon] = {
+                "startDate": analysis.date_range.start.strftime('%Y-%m-%d'),
+                "endDate": analysis.date_range.end.strftime('%Y-%m-%d'),
+                "message": analysis.message,
+                "portfolio": _convert_metrics_to_api_response(analysis.portfolio_metrics) if analysis.portfolio_metrics else None,
+                "tickers": [
+                    _convert_ticker_metrics_to_api(metrics, position_quantities.get(metrics.ticker.symbol, 0.0))
+                    for metrics in analysis.ticker_metrics
+                ],
+                "failedTickers": analysis.failed_tickers,
+                "warnings": {
+                    "missingTickers": analysis.missing_tickers,
+                    "tickersWithoutStartData": analysis.tickers_without_start_data,
+                    "firstAvailableDates": analysis.first_available_dates
+                }
+            }
+        
+        payload = {
+            "success": True,
+            "message": response.message,
+            "data": horizons_data,
+            "processingTimeSeconds": response.processing_time_seconds,
+            "timings": {
+                "fetchSeconds": response.fetch_time_seconds,
+                "calculationSeconds": response.processing_time_seconds - response.fetch_time_seconds
+            }
+        }
+        
+        return Response(content=dumps(payload), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Multi-horizon analysis failed: {str(e)}")
+
+@app.get("/portfolio/simulation")
+async def simulate_portfolio(start_date: str = None, end_date: str = None, paths: int = 10000,
+                             horizon_days: int = 252, method: str = "bootstrap", seed: int = None,
+                             portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Monte Carlo VaR, expected shortfall and fan chart for the current holdings.
+    
+    Returns are estimated from the ``start_date``..``end_date`` history and paths are
+    simulated ``horizon_days`` forward by ``method`` (``bootstrap`` or ``mvn``).
+    """
+    portfolio = get_current_portfolio(portfolio_id)
+    
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="No portfolio loaded")
+    
+    config = SimulationConfig()
+    if method not in MonteCarloSimulator.METHODS:
+        raise HTTPException(status_code=400, detail=f"Unsupported method: {method}. Use 'bootstrap' or 'mvn'")
+    if not 1 <= paths <= config.max_paths:
+        raise HTTPException(status_code=400, detail=f"paths must be between 1 and {config.max_paths}")
+    if not 1 <= horizon_days <= config.max_horizon_days:
+        raise HTTPException(status_code=400, detail=f"horizon_days must be between 1 and {config.max_horizon_days}")
+    
+    # Set default date range if not provided
+    start_date, end_date = _get_default_date_range(start_date, end_date)
+    
+    # Validate date range
+    _validate_date_range(start_date, end_date)
+    
+    try:
+        response = get_controller().simulate_portfolio(
+            portfolio, DateRange(start_date, end_date), paths, horizon_days, method, seed
+        )
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        result = response.result
+        payload = {
+            "success": True,
+            "message": response.message,
+            "data": {
+                "method": result.method,
+                "paths": result.paths,
+                "horizonDays": result.steps,
+                "historyDays": response.history_days,
+                "initialValue": f"${result.initial_value:,.2f}",
+                "expectedValue": f"${result.expected_value:,.2f}",
+                "var": {f"{level:.0%}": f"{value:.2f}%" for level, value in result.var.items()},
+                "expectedShortfall": {f"{level:.0%}": f"{value:.2f}%" for level, value in result.expected_shortfall.items()},
+                "fanChart": {
+                    f"p{percentile:g}": values
+                    for percentile, values in zip(result.percentiles, result.fan_chart)
+                }
+            },
+            "warnings": {
+                "missingTickers": response.missing_tickers or []
+            }
+        }
+        
+        return Response(content=dumps(payload), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Simulation failed: {str(e)}")
+
+@app.get("/portfolio/optimization")
+async def optimize_portfolio(start_date: str = None, end_date: str = None, frontier_points: int = 20,
+                             shrinkage: bool = True, portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Suggested weights for the current portfolio's tickers.
+    
+    Returns minimum variance, maximum Sharpe and risk parity allocations plus
+    ``frontier_points`` efficient frontier points, estimated from the
+    ``start_date``..``end_date`` return history (Ledoit-Wolf shrinkage unless
+    ``shrinkage=false``). The current holdings are reported under the same estimates.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
+    
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="No portfolio loaded")
+    
+    if not 0 <= frontier_points <= MAX_FRONTIER_POINTS:
+        raise HTTPException(status_code=400, detail=f"frontier_points must be between 0 and {MAX_FRONTIER_POINTS}")
+    
+    # Default to three years of history for stable covariance estimates
+    if not start_date:
+        start_date = (datetime.now() - timedelta(days=3 * 365)).strftime('%Y-%m-%d')
+    start_date, end_date = _get_default_date_range(start_date, end_date)
+    
+    # Validate date range
+    _validate_date_range(start_date, end_date)
+    
+    try:
+        response = get_controller().optimize_portfolio(
+            portfolio, DateRange(start_date, end_date), frontier_points, shrinkage, risk_free_rate=0.03
+        )
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        result = response.result
+        return {
+            "success": True,
+            "message": response.message,
+            "data": {
+                "historyDays": response.history_days,
+                "shrinkage": round(result.shrinkage, 4),
+                "current": _convert_allocation_to_api(response.current, response.symbols),
+                "minVariance": _convert_allocation_to_api(result.min_variance, response.symbols),
+                "maxSharpe": _convert_allocation_to_api(result.max_sharpe, response.symbols),
+                "riskParity": _convert_allocation_to_api(result.risk_parity, response.symbols),
+                "frontier": [
+                    _convert_allocation_to_api(point, response.symbols)
+                    for point in result.frontier
+                ]
+            },
+            "warnings": {
+                "missingTickers": response.missing_tickers or []
+            }
+        }
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Portfolio optimization failed: {str(e)}")
+
+@app.post("/portfolio/scenario")
+async def evaluate_scenario(http_request: Request, request_data: dict, series_format: str = None,
+                            portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Metrics for the current portfolio with hypothetical position changes applied.
+    
+    The body lists ``changes`` as ``{"ticker", "quantityDelta"}`` (negative to sell)
+    plus optional ``start_date``/``end_date``. The loaded portfolio is not modified;
+    the baseline is cached so repeated scenarios only recompute the metrics.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
+    
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="No portfolio loaded")
+    
+    series_format = _resolve_series_format(series_format, http_request.headers.get("accept", ""))
+    changes = _parse_position_changes(request_data.get('changes'))
+    
+    # Set default date range if not provided
+    start_date, end_date = _get_default_date_range(request_data.get('start_date'), request_data.get('end_date'))
+    
+    # Validate date range
+    _validate_date_range(start_date, end_date)
+    
+    try:
+        response = get_controller().evaluate_scenario(
+            portfolio, DateRange(start_date, end_date), changes, risk_free_rate=0.03
+        )
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        payload = {
+            "success": True,
+            "message": response.message,
+            "data": {
+                "baseline": _convert_metrics_to_api_response(response.baseline_metrics),
+                "scenario": _convert_metrics_to_api_response(response.scenario_metrics),
+                "positions": [
+                    {"ticker": symbol, "position": quantity} for symbol, quantity in response.quantities.items()
+                ],
+                "baselineCached": response.baseline_cached,
+                "evaluationTimeMs": round(response.evaluation_time_seconds * 1000, 2)
+            },
+            "warnings": {
+                "missingTickers": response.missing_tickers or [],
+                "tickersWithoutStartData": response.tickers_without_start_data or [],
+                "firstAvailableDates": response.first_available_dates or {}
+            },
+            "timeSeriesFormat": series_format,
             "timeSeriesData": {
-                "portfolioValues": response.portfolio_values_over_time or {},
-                "sp500Values": response.sp500_values_over_time or {},
-                "nasdaqValues": response.nasdaq_values_over_time or {}
+                "portfolioValues": _encode_series(response.portfolio_values, series_format)
             }
         }
         
+        return Response(content=dumps(payload), media_type="application/json")
+        
     except HTTPException:
         raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Scenario evaluation failed: {str(e)}")
+
+@app.get("/portfolio/rolling")
+async def analyze_rolling(http_request: Request, start_date: str = None, end_date: str = None,
+                          windows: str = None, series_format: str = None,
+                          portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Rolling volatility, Sharpe, Sortino, beta and max drawdown for the portfolio and each ticker.
+    
+    ``windows`` is a comma-separated list of trading-day windows (default 63,126,252).
+    Time series use the same ``series_format`` / Accept negotiation as /portfolio/analysis.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
+    
+    if not portfolio:
+        raise HTTPException(status_code=404, detail="No portfolio loaded")
+    
+    series_format = _resolve_series_format(series_format, http_request.headers.get("accept", ""))
+    parsed_windows = _parse_rolling_windows(windows)
+    
+    # Default to three years so the longest default window has history to roll over
+    if not start_date:
+        start_date = (datetime.now() - timedelta(days=3 * 365)).strftime('%Y-%m-%d')
+    start_date, end_date = _get_default_date_range(start_date, end_date)
+    
+    # Validate date range
+    _validate_date_range(start_date, end_date)
+    
+    try:
+        date_range = DateRange(start_date, end_date)
+        response = get_controller().analyze_rolling(portfolio, date_range, parsed_windows)
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        portfolio_data = {
+            str(window): {
+                ROLLING_METRIC_NAMES[name]: _encode_series(series, series_format)
+                for name, series in metrics.items()
+            }
+            for window, metrics in response.portfolio_metrics.items()
+        }
+        
+        tickers_data = {}
+        for window, metrics in response.ticker_metrics.items():
+            for name, frame in metrics.items():
+                for symbol in frame.columns:
+                    tickers_data.setdefault(symbol, {}).setdefault(str(window), {})[
+                        ROLLING_METRIC_NAMES[name]
+                    ] = _encode_series(frame[symbol], series_format)
+        
+        payload = {
+            "success": True,
+            "message": response.message,
+            "data": {
+                "windows": list(parsed_windows),
+                "portfolio": portfolio_data,
+                "tickers": tickers_data
+            },
+            "warnings": {
+                "missingTickers": response.missing_tickers or []
+            },
+            "timeSeriesFormat": series_format
+        }
+        
+        return Response(content=dumps(payload), media_type="application/json")
+        
+    except HTTPException:
+        raise
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Rolling analysis failed: {str(e)}")
 
 @app.get("/portfolio/tickers/analysis")
-async def analyze_tickers(start_date: str = None, end_date: str = None):
-    """Analyze individual tickers in portfolio with smart batch processing."""
-    portfolio = get_current_portfolio()
+async def analyze_tickers(start_date: str = None, end_date: str = None, stream: str = None,
+                          portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Analyze individual tickers in portfolio with smart batch processing.
+    
+    With ``stream=ndjson`` or ``stream=sse`` each ticker is sent as soon as its
+    metrics are calculated, followed by a final summary record.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
     
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio loaded")
     
+    if stream is not None and stream not in STREAM_MEDIA_TYPES:
+        raise HTTPException(status_code=400, detail=f"Unsupported stream format: {stream}. Use 'ndjson' or 'sse'")
+    
     # Set default date range if not provided
     start_date, end_date = _get_default_date_range(start_date, end_date)
     
@@ -431,6 +1240,8 @@ async def analyze_tickers(start_date: str = None, end_date: str = None):
             risk_free_rate=0.03
         )
         
+        if stream:
+            return _stream_ticker_analysis(controller, request, portfolio, stream)
         
         response = controller._analyze_ticker_use_case.execute_batch(request)
         
@@ -438,84 +1249,100 @@ async def analyze_tickers(start_date: str = None, end_date: str = None):
             raise HTTPException(status_code=400, detail=response.message)
         
         # Convert metrics to API response format
+        position_quantities = _get_position_quantities(portfolio)
         ticker_results = []
-        for metrics in response.ticker_metrics:
-            # Find position quantity for this ticker
-            position_quantity = 0
-            for pos in portfolio.get_positions():
-                if pos.ticker.symbol == metrics.ticker.symbol:
-                    position_quantity = float(pos.quantity)
-                    break
-            
-            # Calculate market value (position * end price)
-            end_price_value = float(metrics.end_price.amount)
-            market_value = position_quantity * end_price_value
-            
-            ticker_data = {
-                "ticker": metrics.ticker.symbol,
-                "totalReturn": f"{metrics.total_return.value:.2f}%",
-                "annualizedReturn": f"{metrics.annualized_return.value:.2f}%",
-                "volatility": f"{metrics.volatility.value:.2f}%",
-                "sharpeRatio": f"{metrics.sharpe_ratio:.3f}",
-                "maxDrawdown": f"{metrics.max_drawdown.value:.2f}%",
-                "sortinoRatio": f"{metrics.sortino_ratio:.3f}",
-                "calmarRatio": f"{metrics.calmar_ratio:.2f}",
-                "ulcerIndex": f"{metrics.ulcer_index:.4f}",
-                "timeUnderWater": f"{metrics.time_under_water:.2f}",
-                "cvar95": f"{metrics.cvar_95:.2f}",
-                "correlationToPortfolio": f"{metrics.correlation_to_portfolio:.2f}",
-                "riskContributionAbsolute": f"{metrics.risk_contribution_absolute:.4f}",
-                "riskContributionPercent": f"{metrics.risk_contribution_percent:.2f}%",
-                "beta": f"{metrics.beta:.3f}",
-                "var95": f"{metrics.var_95.value:.2f}%",
-                "momentum12to1": f"{metrics.momentum_12_1.value:.2f}%",
-                "dividendYield": f"{metrics.dividend_yield.value:.2f}%",
-                "dividendAmount": f"${metrics.dividend_amount.amount:.2f}",
-                "dividendFrequency": metrics.dividend_frequency,
-                "annualizedDividend": f"${metrics.annualized_dividend.amount:.2f}",
-                "startPrice": f"${metrics.start_price.amount:.2f}",
-                "endPrice": f"${metrics.end_price.amount:.2f}",
-                "hasDataAtStart": True,  # All successful tickers have data at start
-                "firstAvailableDate": None,  # Not available in batch response
-                "position": position_quantity,
-                "marketValue": f"${market_value:,.2f}"
-            }
+        levels = _ticker_metric_levels(controller._color_service, response.ticker_metrics)
+        for metrics, metric_levels in zip(response.ticker_metrics, levels):
+            ticker_data = _convert_ticker_metrics_to_api(metrics, position_quantities.get(metrics.ticker.symbol, 0.0))
+            ticker_data["levels"] = metric_levels
             ticker_results.append(ticker_data)
         
-            
-        
         # Prepare response
-        response_data = {
+        response_data = _create_ticker_analysis_summary(response)
+        response_data["data"] = ticker_results
+        
+        return response_data
+        
+    except Exception as e:
+        raise HTTPException(status_code=500, detail=f"Ticker analysis failed: {str(e)}")
+
+@app.get("/tickers/screen")
+async def screen_tickers(tickers: str = None, start_date: str = None, end_date: str = None,
+                         portfolio_id: str = DEFAULT_PORTFOLIO_ID):
+    """Total return, annualized return, volatility and dividends for stored tickers over any range.
+    
+    Answers come from warehouse prefix sums (two lookups per ticker), so thousands of
+    tickers can be screened without loading price histories. ``tickers`` is a
+    comma-separated list and defaults to the loaded portfolio.
+    """
+    if tickers:
+        ticker_list = [Ticker(symbol.strip()) for symbol in tickers.split(",") if symbol.strip()]
+    else:
+        portfolio = get_current_portfolio(portfolio_id)
+        if not portfolio:
+            raise HTTPException(status_code=400, detail="Provide tickers or load a portfolio")
+        ticker_list = portfolio.get_tickers()
+    
+    # Set default date range if not provided
+    start_date, end_date = _get_default_date_range(start_date, end_date)
+    
+    # Validate date range
+    _validate_date_range(start_date, end_date)
+    
+    try:
+        response = get_controller().screen_tickers(ticker_list, DateRange(start_date, end_date))
+        
+        if not response.success:
+            raise HTTPException(status_code=400, detail=response.message)
+        
+        results = []
+        for result in response.results:
+            stats = result.statistics
+            results.append({
+                "ticker": result.ticker.symbol,
+                "startDate": stats.start_date,
+                "endDate": stats.end_date,
+                "tradingDays": stats.trading_days,
+                "totalReturn": f"{stats.total_return:.2f}%",
+                "annualizedReturn": f"{stats.annualized_return:.2f}%",
+                "volatility": f"{stats.volatility:.2f}%" if stats.volatility is not None else None,
+                "dividendAmount": f"${stats.dividend_amount:.2f}",
+                "startPrice": f"${stats.start_price:.2f}",
+                "endPrice": f"${stats.end_price:.2f}"
+            })
+        
+        return {
             "success": True,
             "message": response.message,
-            "data": ticker_results,
-            "processingTimeSeconds": response.processing_time_seconds,
+            "data": results,
             "warnings": {
-                "missingTickers": response.missing_tickers or [],
-                "tickersWithoutStartData": response.tickers_without_start_data or [],
-                "firstAvailableDates": response.first_available_dates or {}
+                "missingTickers": response.missing_tickers or []
             }
         }
         
-        if response.failed_tickers:
-            response_data["failedTickers"] = [
-                {"ticker": ticker, "firstAvailableDate": None} 
-                for ticker in response.failed_tickers
-            ]
-        
-        return response_data
-        
+    except HTTPException:
+        raise
     except Exception as e:
-        raise HTTPException(status_code=500, detail=f"Ticker analysis failed: {str(e)}")
+        raise HTTPException(status_code=500, detail=f"Ticker screening failed: {str(e)}")
 
 @app.post("/portfolio/tickers/compare")
-async def compare_tickers(request_data: dict):
-    """Compare tickers in portfolio."""
-    portfolio = get_current_portfolio()
+async def compare_tickers(request_data: dict, portfolio_id: str = DEFAULT_PORTFOLIO_ID,
+                          rank_by: str = None, k: int = 5):
+    """Compare tickers in portfolio.
+    
+    Every leaderboard holds the ``k`` best or worst tickers. ``rank_by`` adds
+    best and worst lists for any other metric fields (comma-separated, e.g.
+    ``rank_by=beta,dividendYield``) under ``rankings``.
+    """
+    portfolio = get_current_portfolio(portfolio_id)
     
     if not portfolio:
         raise HTTPException(status_code=404, detail="No portfolio loaded")
     
+    if k < 1:
+        raise HTTPException(status_code=400, detail="k must be at least 1")
+    requested_rankings = _parse_rank_by(rank_by)
+    
     # Extract date range from request
     start_date = request_data.get('start_date')
     end_date = request_data.get('end_date')
@@ -552,7 +1379,8 @@ async def compare_tickers(request_data: dict):
         
         # Convert metrics to API format
         metrics_data = []
-        for metrics in comparison_data.metrics:
+        levels = _ticker_metric_levels(controller._color_service, comparison_data.metrics)
+        for metrics, metric_levels in zip(comparison_data.metrics, levels):
             # Find position quantity for this ticker
             position_quantity = 0
             for pos in portfolio.get_positions():
@@ -591,33 +1419,13 @@ async def compare_tickers(request_data: dict):
                 "cvar95": f"{metrics.cvar_95:.2f}",
                 "correlationToPortfolio": f"{metrics.correlation_to_portfolio:.2f}",
                 "riskContributionAbsolute": f"{metrics.risk_contribution_absolute:.4f}",
-                "riskContributionPercent": f"{metrics.risk_contribution_percent:.2f}%"
+                "riskContributionPercent": f"{metrics.risk_contribution_percent:.2f}%",
+                "levels": metric_levels
             }
             metrics_data.append(ticker_data)
         
-        # Get top 5 performers in each category
-        best_performers = _get_top_performers(comparison_data.metrics, 'annualized_return', True, 5)
-        worst_performers = _get_top_performers(comparison_data.metrics, 'annualized_return', False, 5)
-        best_sharpe = _get_top_performers(comparison_data.metrics, 'sharpe_ratio', True, 5)
-        lowest_risk = _get_top_performers(comparison_data.metrics, 'volatility', False, 5)
-        
-        # Advanced metrics rankings
-        best_calmar = _get_top_performers(comparison_data.metrics, 'calmar_ratio', True, 5)  # Higher is better
-        worst_calmar = _get_top_performers(comparison_data.metrics, 'calmar_ratio', False, 5)
-        best_sortino = _get_top_performers(comparison_data.metrics, 'sortino_ratio', True, 5)  # Higher is better
-        worst_sortino = _get_top_performers(comparison_data.metrics, 'sortino_ratio', False, 5)
-        best_max_drawdown = _get_top_performers(comparison_data.metrics, 'max_drawdown', True, 5)  # Less negative is better
-        worst_max_drawdown = _get_top_performers(comparison_data.metrics, 'max_drawdown', False, 5)  # More negative is worse
-        best_ulcer = _get_top_performers(comparison_data.metrics, 'ulcer_index', False, 5)  # Lower is better
-        worst_ulcer = _get_top_performers(comparison_data.metrics, 'ulcer_index', True, 5)
-        best_time_under_water = _get_top_performers(comparison_data.metrics, 'time_under_water', False, 5)  # Lower is better
-        worst_time_under_water = _get_top_performers(comparison_data.metrics, 'time_under_water', True, 5)
-        best_cvar = _get_top_performers(comparison_data.metrics, 'cvar_95', False, 5)  # Lower is better (more negative)
-        worst_cvar = _get_top_performers(comparison_data.metrics, 'cvar_95', True, 5)
-        best_correlation = _get_top_performers(comparison_data.metrics, 'correlation_to_portfolio', False, 5)  # Lower absolute correlation is better
-        worst_correlation = _get_top_performers(comparison_data.metrics, 'correlation_to_portfolio', True, 5)
-        best_risk_contribution = _get_top_performers(comparison_data.metrics, 'risk_contribution_percent', False, 5)  # Lower is better
-        worst_risk_contribution = _get_top_performers(comparison_data.metrics, 'risk_contribution_percent', True, 5)
+        # Top and bottom k of every leaderboard metric, ranked together
+        leaderboards, rankings = _rank_compare_metrics(comparison_data.metrics, requested_rankings, k)
         
         # Build response data
         response_data = {
@@ -625,28 +1433,10 @@ async def compare_tickers(request_data: dict):
             "message": response.message,
             "data": {
                 "metrics": metrics_data,
-                "bestPerformers": best_performers,
-                "worstPerformers": worst_performers,
-                "bestSharpe": best_sharpe,
-                "lowestRisk": lowest_risk,
-                # Advanced metrics rankings
-                "bestCalmar": best_calmar,
-                "worstCalmar": worst_calmar,
-                "bestSortino": best_sortino,
-                "worstSortino": worst_sortino,
-                "bestMaxDrawdown": best_max_drawdown,
-                "worstMaxDrawdown": worst_max_drawdown,
-                "bestUlcer": best_ulcer,
-                "worstUlcer": worst_ulcer,
-                "bestTimeUnderWater": best_time_under_water,
-                "worstTimeUnderWater": worst_time_under_water,
-                "bestCvar": best_cvar,
-                "worstCvar": worst_cvar,
-                "bestCorrelation": best_correlation,
-                "worstCorrelation": worst_correlation,
-                "bestRiskContribution": best_risk_contribution,
-                "worstRiskContribution": worst_risk_contribution
+                **leaderboards,
+                "rankings": rankings
             },
+            "levelCodes": LEVEL_CODE_NAMES,
             "warnings": {
                 "missingTickers": [],
                 "tickersWithoutStartData": [],
@@ -861,6 +1651,8 @@ async def clear_warehouse_ticker(request: dict):
         )
         
         if result.returncode == 0:
+            # The clear records no ingest batch, so drop this worker's cached closes explicitly
+            get_warehouse_optimizer(WarehouseConfig().get_db_path()).price_cache.invalidate(Ticker(ticker).symbol)
             return {"success": True, "message": f"Data cleared for ticker: {ticker}"}
         else:
             return {"success": False, "message": f"Error clearing ticker {ticker}: {result.stderr}"}
@@ -870,5 +1662,158 @@ async def clear_warehouse_ticker(request: dict):
     except Exception as e:
         return {"success": False, "message": f"Error executing ticker clear: {str(e)}"}
 
+@app.get("/api/admin/warehouse/price-cache")
+def get_price_cache_stats():
+    """Hit ratio and resident bytes of this worker's in-memory close history cache."""
+    try:
+        return {"success": True, "data": get_warehouse_optimizer(WarehouseConfig().get_db_path()).price_cache.stats()}
+    except Exception as e:
+        return {"success": False, "message": f"Error getting price cache stats: {str(e)}"}
+
+def _slow_query_log():
+    """This worker's slow-query log, or None when WAREHOUSE_SLOW_QUERY_MS is 0."""
+    return get_warehouse_optimizer(WarehouseConfig().get_db_path()).slow_query_log
+
+@app.get("/api/admin/warehouse/slow-queries")
+def get_slow_queries(limit: int = 20):
+    """Warehouse statement shapes with the most slow time in this worker, with their query plans."""
+    try:
+        log = _slow_query_log()
+        if log is None:
+            return {"success": False, "message": "Slow-query log is disabled (WAREHOUSE_SLOW_QUERY_MS=0)"}
+        return {
+            "success": True,
+            "data": {
+                **log.stats(),
+                "queries": [
+                    {
+                        "shape": stats.shape,
+                        "count": stats.count,
+                        "totalMs": round(stats.total_seconds * 1000, 3),
+                        "meanMs": round(stats.mean_seconds * 1000, 3),
+                        "maxMs": round(stats.max_seconds * 1000, 3),
+                        "sampleSql": stats.sample_sql,
+                        "plan": stats.plan
+                    }
+                    for stats in log.top(limit)
+                ]
+            }
+        }
+    except Exception as e:
+        return {"success": False, "message": f"Error getting slow queries: {str(e)}"}
+
+@app.post("/api/admin/warehouse/slow-queries/reset")
+def reset_slow_queries():
+    """Forget the slow queries recorded by this worker."""
+    try:
+        log = _slow_query_log()
+        if log is None:
+            return {"success": False, "message": "Slow-query log is disabled (WAREHOUSE_SLOW_QUERY_MS=0)"}
+        log.reset()
+        return {"success": True, "message": "Slow-query log cleared"}
+    except Exception as e:
+        return {"success": False, "message": f"Error clearing slow queries: {str(e)}"}
+
+@app.get("/api/admin/warehouse/maintenance")
+def get_warehouse_maintenance_metrics():
+    """WAL size, free space and the work done by this worker's maintenance thread."""
+    try:
+        return {"success": True, "data": get_warehouse_maintenance(WarehouseConfig().get_db_path()).get_metrics()}
+    except Exception as e:
+        return {"success": False, "message": f"Error getting warehouse maintenance metrics: {str(e)}"}
+
+@app.post("/api/admin/warehouse/maintenance/run")
+def run_warehouse_maintenance():
+    """Run one maintenance tick now, including PRAGMA optimize."""
+    try:
+        tick = get_warehouse_maintenance(WarehouseConfig().get_db_path()).run_once(optimize=True)
+        return {
+            "success": True,
+            "message": f"Reclaimed {tick.reclaimed_bytes + tick.wal_reclaimed_bytes:,} bytes in {tick.seconds:.2f}s",
+            "data": {
+                "retentionRows": tick.retention_rows,
+                "reclaimedBytes": tick.reclaimed_bytes,
+                "checkpointedFrames": tick.checkpointed_frames,
+                "truncated": tick.truncated,
+                "walReclaimedBytes": tick.wal_reclaimed_bytes,
+                "seconds": f"{tick.seconds:.2f}"
+            }
+        }
+    except Exception as e:
+        return {"success": False, "message": f"Error running warehouse maintenance: {str(e)}"}
+
+def _transfer_result_to_api(result: TransferResult) -> dict:
+    return {
+        "rows": result.rows,
+        "totalRows": result.total_rows,
+        "skippedRows": result.skipped_rows,
+        "seconds": f"{result.seconds:.2f}",
+        "rowsPerMinute": f"{result.rows_per_minute:.0f}"
+    }
+
+# Bulk transfer endpoints run in-process as plain functions, so FastAPI moves
+# them to its thread pool and long imports do not block the event loop.
+
+@app.get("/api/admin/warehouse/exports")
+def get_warehouse_exports():
+    """List bulk exports in the export directory, newest first."""
+    try:
+        return {"success": True, "data": {"exports": list_exports(WarehouseConfig().get_export_dir())}}
+    except Exception as e:
+        return {"success": False, "message": f"Error listing warehouse exports: {str(e)}"}
+
+@app.post("/api/admin/warehouse/export")
+def export_warehouse(request: dict):
+    """Export warehouse tables to partitioned Parquet, Arrow or gzip CSV files under a name."""
+    try:
+        config = WarehouseConfig()
+        directory = export_path(config.get_export_dir(), request.get("name"))
+        result = WarehouseBulkTransfer(config.get_db_path()).export(
+            directory, request.get("tables"), request.get("format", "csv"),
+            int(request.get("rowsPerFile", 1_000_000))
+        )
+        return {
+            "success": True,
+            "message": f"Exported {result.total_rows:,} rows to {request['name']}",
+            "data": {**_transfer_result_to_api(result), "files": result.files}
+        }
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    except Exception as e:
+        return {"success": False, "message": f"Error exporting warehouse: {str(e)}"}
+
+@app.post("/api/admin/warehouse/import")
+def import_warehouse(request: dict):
+    """Import a named bulk export, replacing rows with the same symbol and date."""
+    try:
+        config = WarehouseConfig()
+        directory = export_path(config.get_export_dir(), request.get("name"))
+        result = WarehouseBulkTransfer(config.get_db_path()).import_export(directory, request.get("tables"))
+        return {
+            "success": True,
+            "message": f"Imported {result.total_rows:,} rows from {request['name']}",
+            "data": _transfer_result_to_api(result)
+        }
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    except Exception as e:
+        return {"success": False, "message": f"Error importing warehouse export: {str(e)}"}
+
+@app.post("/api/admin/warehouse/import-csv")
+def import_warehouse_csv(file: UploadFile = File(...), table: str = "market_data", symbol: str = None):
+    """Import a vendor CSV dump (optionally gzipped), parsed in chunks from the upload stream."""
+    try:
+        result = WarehouseBulkTransfer(WarehouseConfig().get_db_path()).import_csv(file.file, table, symbol)
+        return {
+            "success": True,
+            "message": f"Imported {result.total_rows:,} rows from {file.filename}",
+            "data": _transfer_result_to_api(result)
+        }
+    except ValueError as e:
+        return {"success": False, "message": str(e)}
+    except Exception as e:
+        return {"success": False, "message": f"Error importing vendor CSV: {str(e)}"}
+
 if __name__ == "__main__":
+    import uvicorn
     uvicorn.run(app, host="0.0.0.0", port=8000)
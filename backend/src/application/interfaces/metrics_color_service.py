@@ -4,7 +4,10 @@ Interface for metrics color coding service.
 
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import Union
+from typing import Sequence, Union
+
+import numpy as np
+
 from ..use_cases.analyze_portfolio import PortfolioMetrics
 from ..use_cases.analyze_ticker import TickerMetrics
 
@@ -28,6 +31,10 @@ class MetricLevel(Enum):
     EXCELLENT = "excellent"
 
 
+# Compact integer codes for metric levels, embedded next to metric values in API payloads
+LEVEL_CODES = {MetricLevel.BAD: 0, MetricLevel.NORMAL: 1, MetricLevel.EXCELLENT: 2}
+
+
 class MetricsColorService(ABC):
     """Interface for color-coding financial metrics based on performance thresholds."""
     
@@ -61,6 +68,22 @@ class MetricsColorService(ABC):
         """
         pass
     
+    @abstractmethod
+    def get_levels_for_metrics(self, metric_names: Sequence[str], values: np.ndarray,
+                               context: str = "portfolio") -> np.ndarray:
+        """
+        Get performance level codes for a matrix of metric values.
+        
+        Args:
+            metric_names: Name of the metric in each column
+            values: Metric values, one row per ticker and one column per metric
+            context: Context for the metrics ('portfolio' or 'ticker')
+            
+        Returns:
+            int8 array of ``LEVEL_CODES`` with the shape of ``values``
+        """
+        pass
+    
     @abstractmethod
     def colorize_text(self, text: str, color: ColorCode) -> str:
         """
@@ -1,7 +1,8 @@
 from abc import ABC, abstractmethod
-from typing import List, Dict
+from typing import BinaryIO, List, Dict
 import pandas as pd
 from ...domain.entities.portfolio import Portfolio
+from ...domain.entities.transaction_ledger import TransactionLedger
 from ...domain.entities.ticker import Ticker
 from ...domain.value_objects.date_range import DateRange
 from ...domain.value_objects.money import Money
@@ -12,6 +13,11 @@ class PortfolioRepository(ABC):
         """Load portfolio from file."""
         pass
     
+    @abstractmethod
+    def load_stream(self, stream: BinaryIO, file_name: str) -> Portfolio:
+        """Load portfolio from an open binary stream; ``file_name`` hints the format."""
+        pass
+    
     @abstractmethod
     def save(self, portfolio: Portfolio, file_path: str) -> None:
         """Save portfolio to file."""
@@ -39,4 +45,20 @@ class MarketDataRepository(ABC):
     def get_benchmark_data(self, benchmark_symbol: str, 
                           date_range: DateRange) -> pd.Series:
         """Get benchmark data (e.g., S&P 500) for Beta calculation."""
-        pass
\ No newline at end of file
+        pass
+
+class TransactionRepository(ABC):
+    @abstractmethod
+    def load(self, file_path: str) -> TransactionLedger:
+        """Load a transaction ledger from file."""
+        pass
+    
+    @abstractmethod
+    def load_stream(self, stream: BinaryIO, file_name: str) -> TransactionLedger:
+        """Load a transaction ledger from an open binary stream."""
+        pass
+    
+    @abstractmethod
+    def save(self, ledger: TransactionLedger, file_path: str) -> None:
+        """Save a transaction ledger to file."""
+        pass
@@ -0,0 +1,237 @@
+from dataclasses import dataclass, field
+from datetime import date
+from typing import Optional, Dict, List, Tuple
+import time
+import pandas as pd
+from ..interfaces.repositories import MarketDataRepository
+from .analyze_portfolio import AnalyzePortfolioUseCase, PortfolioMetrics
+from .analyze_ticker import AnalyzeTickerUseCase, TickerMetrics
+from ...domain.entities.portfolio import Portfolio
+from ...domain.entities.ticker import Ticker
+from ...domain.value_objects.date_range import DateRange
+
+# Supported horizons, shortest first
+HORIZONS = ('1M', '3M', 'YTD', '1Y', '3Y', '5Y', 'MAX')
+
+# Calendar offsets for fixed-length horizons
+HORIZON_OFFSETS = {
+    '1M': pd.DateOffset(months=1),
+    '3M': pd.DateOffset(months=3),
+    '1Y': pd.DateOffset(years=1),
+    '3Y': pd.DateOffset(years=3),
+    '5Y': pd.DateOffset(years=5)
+}
+
+# How far back MAX looks for history
+MAX_HORIZON_YEARS = 20
+
+@dataclass
+class AnalyzeHorizonsRequest:
+    portfolio: Portfolio
+    end_date: date
+    horizons: Tuple[str, ...] = HORIZONS
+    risk_free_rate: float = 0.03
+
+@dataclass
+class HorizonAnalysis:
+    date_range: DateRange
+    portfolio_metrics: Optional[PortfolioMetrics]
+    ticker_metrics: List[TickerMetrics]
+    message: str
+    failed_tickers: List[str] = field(default_factory=list)
+    missing_tickers: List[str] = field(default_factory=list)
+    tickers_without_start_data: List[str] = field(default_factory=list)
+    first_available_dates: Dict[str, str] = field(default_factory=dict)
+
+@dataclass
+class AnalyzeHorizonsResponse:
+    horizons: Dict[str, HorizonAnalysis]
+    success: bool
+    message: str
+    processing_time_seconds: float = 0.0
+    fetch_time_seconds: float = 0.0
+
+class AnalyzeHorizonsUseCase:
+    """Analyze the portfolio and its tickers over several horizons from a single data load.
+
+    Market data is fetched once for the longest requested horizon. Each shorter
+    horizon is a positional slice of the same date-sorted series, located with a
+    binary search, so extra horizons add calculation time but no I/O.
+    """
+
+    def __init__(self, market_data_repo: MarketDataRepository,
+                 analyze_portfolio_use_case: AnalyzePortfolioUseCase,
+                 analyze_ticker_use_case: AnalyzeTickerUseCase):
+        self._market_data_repo = market_data_repo
+        self._analyze_portfolio_use_case = analyze_portfolio_use_case
+        self._analyze_ticker_use_case = analyze_ticker_use_case
+
+    def execute(self, request: AnalyzeHorizonsRequest) -> AnalyzeHorizonsResponse:
+        """Compute portfolio and ticker metrics for every requested horizon."""
+        start_time = time.time()
+
+        try:
+            tickers = request.portfolio.get_tickers()
+            horizons = [horizon for horizon in HORIZONS if horizon in request.horizons]
+            end = pd.Timestamp(request.end_date)
+            load_start = min(self._horizon_start(horizon, end) for horizon in horizons)
+            full_range = DateRange(load_start.date(), request.end_date)
+
+            # Single load for the longest horizon
+            all_price_data = self._market_data_repo.get_price_history_batch(tickers, full_range)
+            all_dividend_data = self._market_data_repo.get_dividend_history_batch(tickers, full_range)
+            benchmark_data = self._market_data_repo.get_benchmark_data("^GSPC", full_range)
+            fetch_time = time.time() - start_time
+
+            all_price_data = {
+                ticker: prices.sort_index()
+                for ticker, prices in all_price_data.items()
+                if prices is not None and not prices.empty
+            }
+            all_dividend_data = {
+                ticker: dividends.sort_index()
+                for ticker, dividends in all_dividend_data.items()
+                if dividends is not None
+            }
+            if benchmark_data is not None:
+                benchmark_data = benchmark_data.sort_index()
+
+            # Position values over the full range, computed once and sliced per horizon
+            position_values = pd.DataFrame({
+                position.ticker.symbol: all_price_data[position.ticker] * float(position.quantity)
+                for position in request.portfolio
+                if position.ticker in all_price_data
+            })
+
+            results = {}
+            for horizon in horizons:
+                start = self._resolve_start(horizon, end, all_price_data)
+                results[horizon] = self._analyze_horizon(
+                    request, DateRange(start.date(), request.end_date), all_price_data,
+                    all_dividend_data, benchmark_data, position_values
+                )
+
+            total_time = time.time() - start_time
+            return AnalyzeHorizonsResponse(
+                horizons=results,
+                success=True,
+                message=f"Analyzed {len(horizons)} horizons for {len(tickers)} tickers in {total_time:.2f} seconds",
+                processing_time_seconds=total_time,
+                fetch_time_seconds=fetch_time
+            )
+
+        except Exception as e:
+            return AnalyzeHorizonsResponse(
+                horizons={},
+                success=False,
+                message=f"Multi-horizon analysis failed: {str(e)}",
+                processing_time_seconds=time.time() - start_time
+            )
+
+    def _analyze_horizon(self, request: AnalyzeHorizonsRequest, date_range: DateRange,
+                         all_price_data: Dict[Ticker, pd.Series], all_dividend_data: Dict[Ticker, pd.Series],
+                         benchmark_data: pd.Series, position_values: pd.DataFrame) -> HorizonAnalysis:
+        """Slice the loaded data to one horizon and calculate its metrics."""
+        start = pd.Timestamp(date_range.start)
+        prices = {ticker: self._slice(series, start) for ticker, series in all_price_data.items()}
+        prices = {ticker: series for ticker, series in prices.items() if not series.empty}
+        dividends = {ticker: self._slice(series, start) for ticker, series in all_dividend_data.items()}
+        benchmark = self._slice(benchmark_data, start) if benchmark_data is not None else benchmark_data
+
+        tickers = request.portfolio.get_tickers()
+        missing_tickers, tickers_without_start_data, first_available_dates = self._analyze_ticker_use_case._categorize_tickers(
+            tickers, prices, date_range
+        )
+
+        ticker_metrics, failed_tickers = [], []
+        for ticker in tickers:
+            series = prices.get(ticker)
+            if series is None or len(series) < 2:
+                failed_tickers.append(ticker.symbol)
+                continue
+            try:
+                ticker_metrics.append(self._analyze_ticker_use_case._calculate_metrics(
+                    ticker, series, dividends.get(ticker, pd.Series(dtype='float64')),
+                    request.risk_free_rate, date_range, benchmark
+                ))
+            except Exception:
+                failed_tickers.append(ticker.symbol)
+
+        portfolio_metrics, message = self._calculate_portfolio_metrics(
+            request, date_range, prices, dividends, benchmark, position_values
+        )
+
+        return HorizonAnalysis(
+            date_range=date_range,
+            portfolio_metrics=portfolio_metrics,
+            ticker_metrics=ticker_metrics,
+            message=message,
+            failed_tickers=failed_tickers,
+            missing_tickers=missing_tickers,
+            tickers_without_start_data=tickers_without_start_data,
+            first_available_dates=first_available_dates
+        )
+
+    def _calculate_portfolio_metrics(self, request: AnalyzeHorizonsRequest, date_range: DateRange,
+                                     prices: Dict[Ticker, pd.Series], dividends: Dict[Ticker, pd.Series],
+                                     benchmark: pd.Series,
+                                     position_values: pd.DataFrame) -> Tuple[Optional[PortfolioMetrics], str]:
+        """Portfolio metrics for one horizon, using the same rules as the single-range analysis."""
+        portfolio_use_case = self._analyze_portfolio_use_case
+        _, tickers_without_start_data, _ = portfolio_use_case._identify_data_issues(
+            request.portfolio.get_tickers(), prices, date_range.start, date_range.end
+        )
+
+        values = self._slice(position_values, pd.Timestamp(date_range.start))
+        symbols = [ticker.symbol for ticker in prices]
+        values = values[[symbol for symbol in values.columns if symbol in symbols]]
+        if values.empty or values.shape[1] == 0:
+            return None, "No price data available for portfolio analysis"
+
+        without_start = values.columns.isin(tickers_without_start_data)
+        portfolio_values = values.sum(axis=1)
+        portfolio_values_analysis = values.loc[:, ~without_start].sum(axis=1)
+        portfolio_values_missing = values.loc[:, without_start].sum(axis=1)
+
+        # Use total data if analysis data is empty (same fallback as AnalyzePortfolioUseCase)
+        if portfolio_values_analysis.sum() == 0:
+            portfolio_values_analysis = portfolio_values
+            portfolio_values_missing = pd.Series(dtype=float)
+
+        try:
+            metrics = portfolio_use_case._calculate_metrics(
+                portfolio_values_analysis,
+                portfolio_values,
+                portfolio_values_missing,
+                request.risk_free_rate,
+                request.portfolio,
+                prices,
+                benchmark,
+                date_range,
+                dividends
+            )
+        except ValueError as e:
+            return None, f"Portfolio metrics calculation failed: {str(e)}"
+
+        return metrics, "Portfolio analysis completed successfully"
+
+    def _resolve_start(self, horizon: str, end: pd.Timestamp,
+                       all_price_data: Dict[Ticker, pd.Series]) -> pd.Timestamp:
+        """Start date of a horizon; MAX starts where every ticker has data."""
+        start = self._horizon_start(horizon, end)
+        if horizon == 'MAX' and all_price_data:
+            start = max(start, max(prices.index[0] for prices in all_price_data.values()))
+        return start
+
+    def _horizon_start(self, horizon: str, end: pd.Timestamp) -> pd.Timestamp:
+        """Calendar start date of a horizon ending at ``end``."""
+        if horizon == 'YTD':
+            return pd.Timestamp(end.year, 1, 1)
+        if horizon == 'MAX':
+            return end - pd.DateOffset(years=MAX_HORIZON_YEARS)
+        return end - HORIZON_OFFSETS[horizon]
+
+    @staticmethod
+    def _slice(data, start: pd.Timestamp):
+        """Rows of a date-sorted series or frame from ``start`` onwards, without copying."""
+        return data.iloc[data.index.searchsorted(start):]
@@ -0,0 +1,110 @@
+from dataclasses import dataclass
+from datetime import date
+from typing import Optional, List
+import pandas as pd
+from ..interfaces.repositories import MarketDataRepository
+from ...domain.entities.transaction_ledger import TransactionLedger
+from ...domain.value_objects.date_range import DateRange
+from ...domain.value_objects.money import Money
+from ...domain.value_objects.percentage import Percentage
+from ...infrastructure.services.holdings_engine import HoldingsEngine, HoldingsResult
+from ...infrastructure.services.metrics_calculator import MetricsCalculator
+
+@dataclass
+class AnalyzeLedgerRequest:
+    ledger: TransactionLedger
+    end_date: date
+    risk_free_rate: float = 0.03
+
+@dataclass
+class LedgerMetrics:
+    time_weighted_return: Percentage
+    annualized_return: Percentage
+    volatility: Percentage
+    sharpe_ratio: float
+    max_drawdown: Percentage
+    sortino_ratio: float
+    end_value: Money
+    net_invested: float  # Buys minus sells at transaction prices; negative once more is withdrawn than paid in
+    total_gain: float  # End value minus net invested
+
+@dataclass
+class AnalyzeLedgerResponse:
+    holdings: Optional[HoldingsResult]
+    metrics: Optional[LedgerMetrics]
+    success: bool
+    message: str
+    missing_tickers: List[str] = None
+    transactions_ignored: int = 0  # After end_date or without price data
+
+class AnalyzeLedgerUseCase:
+    def __init__(self, market_data_repo: MarketDataRepository, holdings_engine: HoldingsEngine):
+        self._market_data_repo = market_data_repo
+        self._holdings_engine = holdings_engine
+
+    def execute(self, request: AnalyzeLedgerRequest) -> AnalyzeLedgerResponse:
+        """Value a transaction ledger day by day and measure its time-weighted performance."""
+        try:
+            ledger = request.ledger
+            date_range = DateRange(ledger.start_date, request.end_date)
+            tickers = ledger.get_tickers()
+            price_history = self._market_data_repo.get_price_history_batch(tickers, date_range)
+
+            price_df = pd.DataFrame({
+                ticker.symbol: prices for ticker, prices in price_history.items()
+                if prices is not None and not prices.empty
+            })
+            missing_tickers = [ticker.symbol for ticker in tickers if ticker.symbol not in price_df.columns]
+
+            holdings = self._holdings_engine.calculate(ledger, price_df)
+            metrics = self._calculate_metrics(holdings, request.risk_free_rate)
+
+            return AnalyzeLedgerResponse(
+                holdings=holdings,
+                metrics=metrics,
+                success=True,
+                message=f"Applied {holdings.transactions_applied} transactions over {len(holdings.dates)} trading days",
+                missing_tickers=missing_tickers,
+                transactions_ignored=len(ledger) - holdings.transactions_applied
+            )
+        except ValueError as e:
+            return AnalyzeLedgerResponse(
+                holdings=None,
+                metrics=None,
+                success=False,
+                message=str(e)
+            )
+        except Exception as e:
+            return AnalyzeLedgerResponse(
+                holdings=None,
+                metrics=None,
+                success=False,
+                message=f"Ledger analysis failed: {str(e)}"
+            )
+
+    def _calculate_metrics(self, holdings: HoldingsResult, risk_free_rate: float) -> LedgerMetrics:
+        """Risk and return metrics on the time-weighted daily returns since the first trade."""
+        invested = (holdings.values > 0) | (holdings.cash_flows != 0)
+        returns = holdings.daily_returns[invested.cummax()]
+
+        twr = holdings.time_weighted_return
+        annualized = ((1 + twr / 100) ** (252 / len(returns)) - 1) * 100 if len(returns) > 0 else 0.0
+        if len(returns) > 1:
+            volatility, sharpe_ratio, max_drawdown, sortino_ratio = MetricsCalculator.calculate_risk_metrics(
+                returns, risk_free_rate
+            )
+        else:
+            volatility, sharpe_ratio, max_drawdown, sortino_ratio = Percentage(0), 0.0, Percentage(0), 0.0
+
+        end_value = float(holdings.values.iloc[-1])
+        return LedgerMetrics(
+            time_weighted_return=Percentage(twr),
+            annualized_return=Percentage(annualized),
+            volatility=volatility,
+            sharpe_ratio=sharpe_ratio,
+            max_drawdown=max_drawdown,
+            sortino_ratio=sortino_ratio,
+            end_value=Money(end_value),
+            net_invested=holdings.net_invested,
+            total_gain=end_value - holdings.net_invested
+        )
@@ -9,12 +9,14 @@ from ...domain.value_objects.date_range import DateRange
 from ...domain.value_objects.money import Money
 from ...domain.value_objects.percentage import Percentage
 from ...infrastructure.services.metrics_calculator import MetricsCalculator
+from ...infrastructure.utils.serialization import series_to_date_dict
 
 @dataclass
 class AnalyzePortfolioRequest:
     portfolio: Portfolio
     date_range: DateRange
     risk_free_rate: float = 0.03
+    date_keyed_series: bool = True  # Build {'YYYY-MM-DD': value} dicts for time series
 
 @dataclass
 class PortfolioMetrics:
@@ -47,6 +49,7 @@ class AnalyzePortfolioResponse:
     portfolio_values_over_time: Optional[Dict[str, float]] = None
     sp500_values_over_time: Optional[Dict[str, float]] = None
     nasdaq_values_over_time: Optional[Dict[str, float]] = None
+    time_series: Optional[Dict[str, pd.Series]] = None  # Raw 'portfolio', 'sp500', 'nasdaq' series
 
 class AnalyzePortfolioUseCase:
     def __init__(self, market_data_repo: MarketDataRepository):
@@ -125,10 +128,18 @@ class AnalyzePortfolioUseCase:
                     missing_tickers, tickers_without_start_data, first_available_dates
                 )
             
+            time_series = {
+                'portfolio': portfolio_values_analysis,
+                'sp500': benchmark_data,
+                'nasdaq': nasdaq_data
+            }
+            
             # Convert time series data to dictionaries
-            time_series_data = self._convert_time_series_to_dicts(
-                portfolio_values_analysis, benchmark_data, nasdaq_data
-            )
+            time_series_data = {}
+            if request.date_keyed_series:
+                time_series_data = self._convert_time_series_to_dicts(
+                    portfolio_values_analysis, benchmark_data, nasdaq_data
+                )
             
             return AnalyzePortfolioResponse(
                 metrics=metrics,
@@ -137,9 +148,10 @@ class AnalyzePortfolioUseCase:
                 missing_tickers=missing_tickers,
                 tickers_without_start_data=tickers_without_start_data,
                 first_available_dates=first_available_dates,
-                portfolio_values_over_time=time_series_data['portfolio'],
-                sp500_values_over_time=time_series_data['sp500'],
-                nasdaq_values_over_time=time_series_data['nasdaq']
+                portfolio_values_over_time=time_series_data.get('portfolio'),
+                sp500_values_over_time=time_series_data.get('sp500'),
+                nasdaq_values_over_time=time_series_data.get('nasdaq'),
+                time_series=time_series
             )
             
         except Exception as e:
@@ -179,32 +191,10 @@ class AnalyzePortfolioUseCase:
                                     benchmark_data: pd.Series, 
                                     nasdaq_data: pd.Series) -> Dict[str, Dict[str, float]]:
         """Convert time series data to dictionaries for API response."""
-        portfolio_dict = {}
-        sp500_dict = {}
-        nasdaq_dict = {}
-        
-        if not portfolio_values.empty:
-            portfolio_dict = {
-                date.strftime('%Y-%m-%d'): float(value) 
-                for date, value in portfolio_values.items()
-            }
-        
-        if not benchmark_data.empty:
-            sp500_dict = {
-                date.strftime('%Y-%m-%d'): float(value) 
-                for date, value in benchmark_data.items()
-            }
-        
-        if not nasdaq_data.empty:
-            nasdaq_dict = {
-                date.strftime('%Y-%m-%d'): float(value) 
-                for date, value in nasdaq_data.items()
-            }
-        
         return {
-            'portfolio': portfolio_dict,
-            'sp500': sp500_dict,
-            'nasdaq': nasdaq_dict
+            'portfolio': series_to_date_dict(portfolio_values),
+            'sp500': series_to_date_dict(benchmark_data),
+            'nasdaq': series_to_date_dict(nasdaq_data)
         }
     
     def _calculate_portfolio_values(self, 
@@ -377,6 +367,34 @@ class AnalyzePortfolioUseCase:
                           dividend_history: Dict[Ticker, pd.Series] = None) -> PortfolioMetrics:  # Dividend history for dividend metrics
         """Calculate portfolio performance metrics using only complete data tickers."""
         
+        # Calculate beta
+        beta = self._calculate_portfolio_beta_safe(portfolio, price_history, benchmark_data, date_range)
+        
+        # Calculate dividend totals
+        dividend_amount, annualized_dividend = self._calculate_portfolio_dividend_totals(
+            portfolio, dividend_history, price_history
+        )
+        
+        return self._calculate_value_metrics(
+            portfolio_values_analysis,
+            portfolio_values_total,
+            portfolio_values_missing,
+            risk_free_rate,
+            beta,
+            dividend_amount,
+            annualized_dividend
+        )
+    
+    def _calculate_value_metrics(self,
+                                 portfolio_values_analysis: pd.Series,
+                                 portfolio_values_total: pd.Series,
+                                 portfolio_values_missing: pd.Series,
+                                 risk_free_rate: float,
+                                 beta: float,
+                                 dividend_amount: float,
+                                 annualized_dividend: float) -> PortfolioMetrics:
+        """Calculate metrics from portfolio value series, given beta and dividend totals."""
+        
         # Validate and prepare data
         portfolio_values_analysis = self._prepare_portfolio_data(portfolio_values_analysis, portfolio_values_total)
         returns = portfolio_values_analysis.pct_change().dropna()
@@ -394,12 +412,9 @@ class AnalyzePortfolioUseCase:
         calmar_ratio = MetricsCalculator.calculate_calmar_ratio(annualized_return, max_drawdown)
         var_95 = MetricsCalculator.calculate_var_95(returns)
         
-        # Calculate beta
-        beta = self._calculate_portfolio_beta_safe(portfolio, price_history, benchmark_data, date_range)
-        
         # Calculate dividend metrics
-        dividend_amount, annualized_dividend_yield, total_dividend_yield = self._calculate_portfolio_dividend_metrics(
-            portfolio, dividend_history, price_history, start_value, end_value_analysis
+        dividend_amount, annualized_dividend_yield, total_dividend_yield = self._calculate_dividend_yields(
+            dividend_amount, annualized_dividend, start_value, end_value_analysis
         )
         
         return PortfolioMetrics(
@@ -469,16 +484,15 @@ class AnalyzePortfolioUseCase:
         else:
             return 1.0
     
-    def _calculate_portfolio_dividend_metrics(self, portfolio: Portfolio, dividend_history: Dict[Ticker, pd.Series], 
-                                            price_history: Dict[Ticker, pd.Series], start_value: Money, 
-                                            end_value: Money) -> tuple[Money, Percentage, Percentage]:
-        """Calculate portfolio-level dividend metrics."""
+    def _calculate_portfolio_dividend_totals(self, portfolio: Portfolio, dividend_history: Dict[Ticker, pd.Series], 
+                                           price_history: Dict[Ticker, pd.Series]) -> tuple[float, float]:
+        """Total and annualized dividends received across all positions."""
         total_dividend_amount = 0.0
         total_annualized_dividend = 0.0
         currency = "USD"  # Default currency
         
         if not portfolio or not dividend_history or not price_history:
-            return Money(0, currency), Percentage(0), Percentage(0)
+            return total_dividend_amount, total_annualized_dividend
         
         # Calculate total dividends received across all positions
         for position in portfolio.get_positions():
@@ -499,6 +513,13 @@ class AnalyzePortfolioUseCase:
                     )
                     total_annualized_dividend += annualized_dividend
         
+        return total_dividend_amount, total_annualized_dividend
+    
+    def _calculate_dividend_yields(self, total_dividend_amount: float, total_annualized_dividend: float,
+                                   start_value: Money, end_value: Money) -> tuple[Money, Percentage, Percentage]:
+        """Dividend amount and yields from dividend totals and portfolio start/end values."""
+        currency = "USD"  # Default currency
+        
         # Calculate yields
         dividend_amount = Money(total_dividend_amount, currency)
         
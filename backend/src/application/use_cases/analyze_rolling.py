@@ -0,0 +1,85 @@
+from dataclasses import dataclass
+from typing import Optional, Dict, List, Tuple
+import pandas as pd
+from ..interfaces.repositories import MarketDataRepository
+from .analyze_portfolio import AnalyzePortfolioUseCase
+from ...domain.entities.portfolio import Portfolio
+from ...domain.value_objects.date_range import DateRange
+from ...infrastructure.services.rolling_metrics_calculator import RollingMetricsCalculator
+
+@dataclass
+class AnalyzeRollingRequest:
+    portfolio: Portfolio
+    date_range: DateRange
+    windows: Tuple[int, ...] = (63, 126, 252)
+    risk_free_rate: float = 0.03
+
+@dataclass
+class AnalyzeRollingResponse:
+    portfolio_metrics: Optional[Dict[int, Dict[str, pd.Series]]]  # window -> metric -> series
+    ticker_metrics: Optional[Dict[int, Dict[str, pd.DataFrame]]]   # window -> metric -> dates x tickers
+    success: bool
+    message: str
+    missing_tickers: List[str] = None
+
+class AnalyzeRollingUseCase:
+    def __init__(self, market_data_repo: MarketDataRepository, analyze_portfolio_use_case: AnalyzePortfolioUseCase):
+        self._market_data_repo = market_data_repo
+        self._analyze_portfolio_use_case = analyze_portfolio_use_case
+
+    def execute(self, request: AnalyzeRollingRequest) -> AnalyzeRollingResponse:
+        """Calculate rolling metrics for every ticker and the portfolio curve."""
+        try:
+            tickers = request.portfolio.get_tickers()
+            price_history = self._market_data_repo.get_price_history(tickers, request.date_range)
+
+            missing_tickers, tickers_without_start_data, _ = self._analyze_portfolio_use_case._identify_data_issues(
+                tickers, price_history, request.date_range.start, request.date_range.end
+            )
+
+            if not price_history:
+                return AnalyzeRollingResponse(
+                    portfolio_metrics=None,
+                    ticker_metrics=None,
+                    success=False,
+                    message="No price data available for rolling analysis",
+                    missing_tickers=missing_tickers
+                )
+
+            # Same portfolio curve as the portfolio analysis (tickers with complete data)
+            _, portfolio_values, _ = self._analyze_portfolio_use_case._calculate_portfolio_values(
+                request.portfolio, price_history, tickers_without_start_data
+            )
+
+            benchmark_returns = self._market_data_repo.get_benchmark_data(
+                "^GSPC", request.date_range
+            ).pct_change(fill_method=None)
+
+            price_df = pd.DataFrame({ticker.symbol: prices for ticker, prices in price_history.items()}).sort_index()
+            ticker_returns = price_df.pct_change(fill_method=None).iloc[1:]
+            portfolio_returns = portfolio_values.pct_change(fill_method=None).iloc[1:].to_frame('portfolio')
+
+            ticker_metrics = RollingMetricsCalculator.calculate(
+                ticker_returns, request.windows, request.risk_free_rate, benchmark_returns
+            )
+            portfolio_metrics = {
+                window: {name: frame['portfolio'] for name, frame in metrics.items()}
+                for window, metrics in RollingMetricsCalculator.calculate(
+                    portfolio_returns, request.windows, request.risk_free_rate, benchmark_returns
+                ).items()
+            }
+
+            return AnalyzeRollingResponse(
+                portfolio_metrics=portfolio_metrics,
+                ticker_metrics=ticker_metrics,
+                success=True,
+                message=f"Rolling metrics calculated for {len(price_df.columns)} tickers over {len(ticker_returns)} days",
+                missing_tickers=missing_tickers
+            )
+        except Exception as e:
+            return AnalyzeRollingResponse(
+                portfolio_metrics=None,
+                ticker_metrics=None,
+                success=False,
+                message=f"Rolling analysis failed: {str(e)}"
+            )
@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, List, Dict
+from typing import Optional, List, Dict, Iterator, Union
 import pandas as pd
 import numpy as np
 import time
@@ -68,6 +68,8 @@ class AnalyzeTickersResponse:
     missing_tickers: List[str] = None
     tickers_without_start_data: List[str] = None
     first_available_dates: Optional[Dict[str, str]] = None
+    fetch_time_seconds: float = 0.0
+    calculation_time_seconds: float = 0.0
 
 class AnalyzeTickerUseCase:
     def __init__(self, market_data_repo: MarketDataRepository):
@@ -155,7 +157,24 @@ class AnalyzeTickerUseCase:
     
     def execute_batch(self, request: AnalyzeTickersRequest) -> AnalyzeTickersResponse:
         """Execute multiple ticker analysis with smart batching and performance monitoring."""
+        ticker_metrics = []
+        for item in self.execute_stream(request):
+            if isinstance(item, AnalyzeTickersResponse):
+                if item.success:
+                    item.ticker_metrics = ticker_metrics
+                return item
+            ticker_metrics.append(item)
+    
+    def execute_stream(self, request: AnalyzeTickersRequest) -> Iterator[Union[TickerMetrics, AnalyzeTickersResponse]]:
+        """
+        Execute multiple ticker analysis, yielding metrics as each ticker completes.
+        
+        The last item is always an AnalyzeTickersResponse summary (warnings,
+        failures, timings) whose ticker_metrics is left empty so results are
+        not held in memory twice.
+        """
         start_time = time.time()
+        ticker_count = 0
         
         try:
             # Step 1: Batch fetch all data (3 calls instead of 3 * N calls)
@@ -172,31 +191,16 @@ class AnalyzeTickerUseCase:
                 "^GSPC", request.date_range
             )
             
-            # Step 2: Analyze data availability and categorize tickers
-            # Categorize tickers based on data availability
-            missing_tickers = []
-            tickers_without_start_data = []
-            first_available_dates = {}
+            fetch_time = time.time() - start_time
             
-            for ticker in request.tickers:
-                if ticker not in all_price_data or all_price_data[ticker].empty:
-                    missing_tickers.append(ticker.symbol)
-                else:
-                    # Check if data is available at start date
-                    prices = all_price_data[ticker]
-                    start_timestamp = pd.Timestamp(request.date_range.start)
-                    first_available_date = prices.index[0]
-                    
-                    # Allow up to 5 business days tolerance for start date
-                    tolerance_days = 5
-                    max_allowed_start = start_timestamp + pd.Timedelta(days=tolerance_days)
-                    
-                    if first_available_date > max_allowed_start:
-                        tickers_without_start_data.append(ticker.symbol)
-                        first_available_dates[ticker.symbol] = first_available_date.strftime('%Y-%m-%d')
+            # Step 2: Analyze data availability and categorize tickers
+            missing_tickers, tickers_without_start_data, first_available_dates = self._categorize_tickers(
+                request.tickers, all_price_data, request.date_range
+            )
             
             # Use parallel calculation service for better performance
-            ticker_metrics, failed_tickers = self._parallel_calculation_service.calculate_ticker_metrics_parallel(
+            failed_tickers = []
+            for symbol, metrics in self._parallel_calculation_service.iter_ticker_metrics_parallel(
                 tickers=request.tickers,
                 all_price_data=all_price_data,
                 all_dividend_data=all_dividend_data,
@@ -204,24 +208,31 @@ class AnalyzeTickerUseCase:
                 date_range=request.date_range,
                 benchmark_data=benchmark_data,
                 calculation_func=lambda ticker, prices, dividends, risk_free_rate, date_range, benchmark_data: self._calculate_metrics(ticker, prices, dividends, risk_free_rate, date_range, benchmark_data)
-            )
+            ):
+                if metrics is None:
+                    failed_tickers.append(symbol)
+                    continue
+                ticker_count += 1
+                yield metrics
             
             total_time = time.time() - start_time
             
-            return AnalyzeTickersResponse(
-                ticker_metrics=ticker_metrics,
+            yield AnalyzeTickersResponse(
+                ticker_metrics=[],
                 failed_tickers=failed_tickers,
                 success=True,
-                message=f"Analyzed {len(ticker_metrics)} tickers in {total_time:.2f} seconds",
+                message=f"Analyzed {ticker_count} tickers in {total_time:.2f} seconds",
                 processing_time_seconds=total_time,
                 missing_tickers=missing_tickers,
                 tickers_without_start_data=tickers_without_start_data,
-                first_available_dates=first_available_dates
+                first_available_dates=first_available_dates,
+                fetch_time_seconds=fetch_time,
+                calculation_time_seconds=total_time - fetch_time
             )
             
         except Exception as e:
             total_time = time.time() - start_time
-            return AnalyzeTickersResponse(
+            yield AnalyzeTickersResponse(
                 ticker_metrics=[],
                 failed_tickers=[t.symbol for t in request.tickers],
                 success=False,
@@ -232,6 +243,30 @@ class AnalyzeTickerUseCase:
                 first_available_dates={}
             )
     
+    def _categorize_tickers(self, tickers: List[Ticker], all_price_data: Dict[Ticker, pd.Series],
+                            date_range: DateRange) -> tuple[List[str], List[str], Dict[str, str]]:
+        """Categorize tickers by data availability: missing entirely or starting after the range start."""
+        missing_tickers = []
+        tickers_without_start_data = []
+        first_available_dates = {}
+        
+        start_timestamp = pd.Timestamp(date_range.start)
+        # Allow up to 5 business days tolerance for start date
+        tolerance_days = 5
+        max_allowed_start = start_timestamp + pd.Timedelta(days=tolerance_days)
+        
+        for ticker in tickers:
+            if ticker not in all_price_data or all_price_data[ticker].empty:
+                missing_tickers.append(ticker.symbol)
+            else:
+                # Check if data is available at start date
+                first_available_date = all_price_data[ticker].index[0]
+                if first_available_date > max_allowed_start:
+                    tickers_without_start_data.append(ticker.symbol)
+                    first_available_dates[ticker.symbol] = first_available_date.strftime('%Y-%m-%d')
+        
+        return missing_tickers, tickers_without_start_data, first_available_dates
+    
     def _calculate_metrics(self,
                           ticker: Ticker,
                           prices: pd.Series,
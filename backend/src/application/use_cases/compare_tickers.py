@@ -6,6 +6,7 @@ from .analyze_ticker import AnalyzeTickerUseCase, AnalyzeTickerRequest, TickerMe
 from ...domain.entities.ticker import Ticker
 from ...domain.value_objects.date_range import DateRange
 from ...infrastructure.services.metrics_calculator import MetricsCalculator
+from ...infrastructure.services.metric_ranker import MetricRanker, RankedMetric
 
 @dataclass
 class CompareTickersRequest:
@@ -44,6 +45,22 @@ class CompareTickersResponse:
     success: bool
     message: str
 
+# Best/worst comparison criteria, ranked together for TickerComparison
+COMPARISON_RANKINGS = MetricRanker([
+    RankedMetric("return", "annualized_return"),
+    RankedMetric("sharpe", "sharpe_ratio"),
+    RankedMetric("risk", "volatility", higher_is_better=False),
+    RankedMetric("calmar", "calmar_ratio"),
+    RankedMetric("sortino", "sortino_ratio"),
+    RankedMetric("max_drawdown", "max_drawdown"),  # Less negative is better (closer to 0)
+    RankedMetric("ulcer", "ulcer_index", higher_is_better=False),
+    RankedMetric("time_under_water", "time_under_water", higher_is_better=False),
+    RankedMetric("cvar", "cvar_95", higher_is_better=False),  # Lower is better (more negative)
+    # Lower absolute correlation is better for diversification
+    RankedMetric("correlation", "correlation_to_portfolio", higher_is_better=False, absolute=True),
+    RankedMetric("risk_contribution", "risk_contribution_percent", higher_is_better=False),
+])
+
 class CompareTickersUseCase:
     def __init__(self, analyze_ticker_use_case: AnalyzeTickerUseCase, market_data_repo=None):
         self._analyze_ticker_use_case = analyze_ticker_use_case
@@ -199,43 +216,36 @@ class CompareTickersUseCase:
         return portfolio_values.pct_change().dropna()
     
     def _create_comparison(self, metrics_list: List[TickerMetrics]) -> TickerComparison:
-        """Create comparison analysis from ticker metrics."""
-        # Sort by different criteria
-        by_return = sorted(metrics_list, key=lambda m: m.annualized_return.value, reverse=True)
-        by_sharpe = sorted(metrics_list, key=lambda m: m.sharpe_ratio, reverse=True)
-        by_risk = sorted(metrics_list, key=lambda m: m.volatility.value)
+        """Create comparison analysis from ticker metrics, ranking every criterion in one pass."""
+        rankings = COMPARISON_RANKINGS.rank(metrics_list, 1)
+        
+        def best(name: str) -> Optional[TickerMetrics]:
+            return metrics_list[rankings[name].best[0]] if rankings[name].best else None
         
-        # Advanced metrics sorting
-        by_calmar = sorted(metrics_list, key=lambda m: m.calmar_ratio, reverse=True)  # Higher is better
-        by_sortino = sorted(metrics_list, key=lambda m: m.sortino_ratio, reverse=True)  # Higher is better
-        by_max_drawdown = sorted(metrics_list, key=lambda m: m.max_drawdown.value, reverse=True)  # Less negative is better (closer to 0)
-        by_ulcer = sorted(metrics_list, key=lambda m: m.ulcer_index)  # Lower is better
-        by_time_under_water = sorted(metrics_list, key=lambda m: m.time_under_water)  # Lower is better
-        by_cvar = sorted(metrics_list, key=lambda m: m.cvar_95)  # Lower is better (more negative)
-        by_correlation = sorted(metrics_list, key=lambda m: abs(m.correlation_to_portfolio))  # Lower absolute correlation is better for diversification
-        by_risk_contribution = sorted(metrics_list, key=lambda m: m.risk_contribution_percent)  # Lower risk contribution is better
+        def worst(name: str) -> Optional[TickerMetrics]:
+            return metrics_list[rankings[name].worst[0]] if rankings[name].worst else None
         
         return TickerComparison(
             metrics=sorted(metrics_list, key=lambda m: m.ticker.symbol),
-            best_performer=by_return[0] if by_return else None,
-            worst_performer=by_return[-1] if by_return else None,
-            best_sharpe=by_sharpe[0] if by_sharpe else None,
-            lowest_risk=by_risk[0] if by_risk else None,
+            best_performer=best("return"),
+            worst_performer=worst("return"),
+            best_sharpe=best("sharpe"),
+            lowest_risk=best("risk"),
             # Advanced metrics rankings
-            best_calmar=by_calmar[0] if by_calmar else None,
-            worst_calmar=by_calmar[-1] if by_calmar else None,
-            best_sortino=by_sortino[0] if by_sortino else None,
-            worst_sortino=by_sortino[-1] if by_sortino else None,
-            best_max_drawdown=by_max_drawdown[0] if by_max_drawdown else None,
-            worst_max_drawdown=by_max_drawdown[-1] if by_max_drawdown else None,
-            best_ulcer=by_ulcer[0] if by_ulcer else None,
-            worst_ulcer=by_ulcer[-1] if by_ulcer else None,
-            best_time_under_water=by_time_under_water[0] if by_time_under_water else None,
-            worst_time_under_water=by_time_under_water[-1] if by_time_under_water else None,
-            best_cvar=by_cvar[0] if by_cvar else None,
-            worst_cvar=by_cvar[-1] if by_cvar else None,
-            best_correlation=by_correlation[0] if by_correlation else None,
-            worst_correlation=by_correlation[-1] if by_correlation else None,
-            best_risk_contribution=by_risk_contribution[0] if by_risk_contribution else None,
-            worst_risk_contribution=by_risk_contribution[-1] if by_risk_contribution else None
+            best_calmar=best("calmar"),
+            worst_calmar=worst("calmar"),
+            best_sortino=best("sortino"),
+            worst_sortino=worst("sortino"),
+            best_max_drawdown=best("max_drawdown"),
+            worst_max_drawdown=worst("max_drawdown"),
+            best_ulcer=best("ulcer"),
+            worst_ulcer=worst("ulcer"),
+            best_time_under_water=best("time_under_water"),
+            worst_time_under_water=worst("time_under_water"),
+            best_cvar=best("cvar"),
+            worst_cvar=worst("cvar"),
+            best_correlation=best("correlation"),
+            worst_correlation=worst("correlation"),
+            best_risk_contribution=best("risk_contribution"),
+            worst_risk_contribution=worst("risk_contribution")
         )
@@ -0,0 +1,343 @@
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Optional, Dict, List, Tuple
+import threading
+import time
+import numpy as np
+import pandas as pd
+from ..interfaces.repositories import MarketDataRepository
+from .analyze_portfolio import AnalyzePortfolioUseCase, PortfolioMetrics
+from ...domain.entities.portfolio import Portfolio
+from ...domain.entities.ticker import Ticker
+from ...domain.value_objects.date_range import DateRange
+
+# Baselines kept per use case (one per portfolio and date range)
+MAX_CACHED_BASELINES = 8
+
+@dataclass
+class PositionChange:
+    ticker: Ticker
+    quantity_delta: float  # Shares to add (positive) or remove (negative)
+
+@dataclass
+class EvaluateScenarioRequest:
+    portfolio: Portfolio
+    date_range: DateRange
+    changes: List[PositionChange]
+    risk_free_rate: float = 0.03
+
+@dataclass
+class EvaluateScenarioResponse:
+    baseline_metrics: Optional[PortfolioMetrics]
+    scenario_metrics: Optional[PortfolioMetrics]
+    success: bool
+    message: str
+    quantities: Optional[Dict[str, float]] = None  # Scenario quantity per symbol, zero when removed
+    portfolio_values: Optional[pd.Series] = None  # Scenario values of tickers with complete data
+    missing_tickers: List[str] = None
+    tickers_without_start_data: List[str] = None
+    first_available_dates: Optional[Dict[str, str]] = None
+    baseline_cached: bool = False
+    evaluation_time_seconds: float = 0.0
+
+@dataclass
+class ScenarioBaseline:
+    """Aligned price matrix and per-share inputs for one portfolio and date range."""
+    index: pd.DatetimeIndex
+    tickers: List[Ticker]  # Column order of every per-ticker array
+    prices: np.ndarray  # (days, tickers), 0 where a ticker has no close
+    present: np.ndarray  # (days, tickers), True where a ticker has a close
+    quantities: np.ndarray
+    without_start: np.ndarray  # Ticker lacks data at the start of the range
+    betas: np.ndarray  # NaN for tickers with fewer than two closes
+    last_prices: np.ndarray
+    dividend_totals: np.ndarray  # Dividends per share over the range
+    annualized_dividends: np.ndarray  # Annualized dividend per share
+    total_values: np.ndarray  # prices @ quantities
+    analysis_values: np.ndarray  # Tickers with complete data only
+    missing_values: np.ndarray  # Tickers without start data only
+    has_benchmark: bool
+    metrics: PortfolioMetrics
+    missing_tickers: List[str] = field(default_factory=list)  # Symbols with no price data
+    first_available_dates: Dict[str, str] = field(default_factory=dict)
+    price_history: Dict[Ticker, pd.Series] = field(default_factory=dict)
+    dividend_history: Dict[Ticker, pd.Series] = field(default_factory=dict)
+    benchmark_returns: Optional[pd.Series] = None
+
+class EvaluateScenarioUseCase:
+    """Evaluate hypothetical position changes against the loaded portfolio.
+
+    The first evaluation of a portfolio and date range builds a baseline with
+    the same inputs as the portfolio analysis: an aligned price matrix, each
+    ticker's beta, and dividends per share. Later evaluations add
+    ``delta quantity x price column`` to the cached value curves and rebuild
+    only the metrics that depend on them. Beta and dividends are
+    quantity-weighted sums of the cached per-ticker values.
+    """
+
+    def __init__(self, market_data_repo: MarketDataRepository, analyze_portfolio_use_case: AnalyzePortfolioUseCase):
+        self._market_data_repo = market_data_repo
+        self._analyze_portfolio_use_case = analyze_portfolio_use_case
+        self._baselines: "OrderedDict[tuple, ScenarioBaseline]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def execute(self, request: EvaluateScenarioRequest) -> EvaluateScenarioResponse:
+        """Apply position deltas to the portfolio and recompute its metrics."""
+        start_time = time.time()
+
+        try:
+            baseline, cached = self._get_baseline(request)
+
+            new_tickers = [
+                change.ticker for change in request.changes
+                if change.ticker not in baseline.tickers and change.ticker.symbol not in baseline.missing_tickers
+            ]
+            if new_tickers:
+                baseline = self._extend_baseline(request, baseline, new_tickers)
+
+            deltas = np.zeros(len(baseline.tickers))
+            column = {ticker: position for position, ticker in enumerate(baseline.tickers)}
+            for change in request.changes:
+                if change.ticker in column:
+                    deltas[column[change.ticker]] += change.quantity_delta
+
+            quantities = baseline.quantities + deltas
+            if np.any(quantities < -1e-9):
+                oversold = [baseline.tickers[i].symbol for i in np.nonzero(quantities < -1e-9)[0]]
+                raise ValueError(f"Cannot remove more shares than held: {', '.join(oversold)}")
+            quantities = np.maximum(quantities, 0.0)
+            active = quantities > 0
+            if not active.any():
+                raise ValueError("Scenario leaves no positions with price data")
+
+            scenario_metrics, portfolio_values = self._evaluate(request, baseline, quantities, deltas)
+
+            symbols = [ticker.symbol for ticker in baseline.tickers]
+            tickers_without_start_data = [
+                symbol for symbol, flag, is_active in zip(symbols, baseline.without_start, active) if flag and is_active
+            ]
+            first_available_dates = {
+                symbol: first_date for symbol, first_date in baseline.first_available_dates.items()
+                if symbol in tickers_without_start_data
+            }
+
+            evaluation_time = time.time() - start_time
+            return EvaluateScenarioResponse(
+                baseline_metrics=baseline.metrics,
+                scenario_metrics=scenario_metrics,
+                success=True,
+                message=f"Scenario evaluated in {evaluation_time * 1000:.1f} ms",
+                quantities=dict(zip(symbols, quantities.tolist())),
+                portfolio_values=portfolio_values,
+                missing_tickers=list(baseline.missing_tickers),
+                tickers_without_start_data=tickers_without_start_data,
+                first_available_dates=first_available_dates,
+                baseline_cached=cached,
+                evaluation_time_seconds=evaluation_time
+            )
+
+        except ValueError as e:
+            return EvaluateScenarioResponse(
+                baseline_metrics=None,
+                scenario_metrics=None,
+                success=False,
+                message=str(e),
+                evaluation_time_seconds=time.time() - start_time
+            )
+        except Exception as e:
+            return EvaluateScenarioResponse(
+                baseline_metrics=None,
+                scenario_metrics=None,
+                success=False,
+                message=f"Scenario evaluation failed: {str(e)}",
+                evaluation_time_seconds=time.time() - start_time
+            )
+
+    def clear_cache(self) -> None:
+        """Drop all cached baselines (e.g. after the portfolio or market data changes)."""
+        with self._lock:
+            self._baselines.clear()
+
+    def _evaluate(self, request: EvaluateScenarioRequest, baseline: ScenarioBaseline,
+                  quantities: np.ndarray, deltas: np.ndarray) -> Tuple[PortfolioMetrics, pd.Series]:
+        """Scenario metrics from the baseline curves plus the changed price columns."""
+        changed = np.nonzero(deltas)[0]
+        changed_complete = changed[~baseline.without_start[changed]]
+        changed_without_start = changed[baseline.without_start[changed]]
+
+        total_values = baseline.total_values + baseline.prices[:, changed] @ deltas[changed]
+        analysis_values = baseline.analysis_values + baseline.prices[:, changed_complete] @ deltas[changed_complete]
+        missing_values = baseline.missing_values + baseline.prices[:, changed_without_start] @ deltas[changed_without_start]
+
+        # Portfolio analysis aligns on the dates of the tickers it holds; drop
+        # days only a removed ticker traded
+        active = quantities > 0
+        rows = baseline.present[:, active].any(axis=1)
+        index = baseline.index
+        if not rows.all():
+            index = index[rows]
+            total_values, analysis_values, missing_values = total_values[rows], analysis_values[rows], missing_values[rows]
+
+        total_series = pd.Series(total_values, index=index)
+        analysis_series = pd.Series(analysis_values, index=index)
+        missing_series = pd.Series(missing_values, index=index)
+
+        # Same fallback as AnalyzePortfolioUseCase when no ticker has complete data
+        if analysis_series.sum() == 0:
+            analysis_series = total_series
+            missing_series = pd.Series(dtype=float)
+
+        metrics = self._analyze_portfolio_use_case._calculate_value_metrics(
+            analysis_series,
+            total_series,
+            missing_series,
+            request.risk_free_rate,
+            self._beta(baseline, quantities),
+            float(baseline.dividend_totals @ quantities),
+            float(baseline.annualized_dividends @ quantities)
+        )
+        return metrics, analysis_series
+
+    @staticmethod
+    def _beta(baseline: ScenarioBaseline, quantities: np.ndarray) -> float:
+        """Portfolio beta as the value-weighted average of cached ticker betas."""
+        if not baseline.has_benchmark:
+            return 1.0
+
+        with_beta = ~np.isnan(baseline.betas)
+        weights = (quantities * baseline.last_prices)[with_beta]
+        total_weight = weights.sum()
+        if total_weight == 0:
+            return 1.0
+        return float(baseline.betas[with_beta] @ weights / total_weight)
+
+    def _get_baseline(self, request: EvaluateScenarioRequest) -> Tuple[ScenarioBaseline, bool]:
+        """Cached baseline for the request's portfolio and date range, built on a miss."""
+        key = self._cache_key(request)
+        with self._lock:
+            baseline = self._baselines.get(key)
+            if baseline is not None:
+                self._baselines.move_to_end(key)
+                return baseline, True
+
+        tickers = request.portfolio.get_tickers()
+        price_history = self._market_data_repo.get_price_history(tickers, request.date_range)
+        dividend_history = self._analyze_portfolio_use_case._fetch_dividend_history(tickers, request.date_range)
+        benchmark_data = self._market_data_repo.get_benchmark_data("^GSPC", request.date_range)
+        if not price_history:
+            raise ValueError("No price data available for portfolio analysis")
+
+        quantities = {position.ticker: float(position.quantity) for position in request.portfolio.get_positions()}
+        baseline = self._build_baseline(request, quantities, price_history, dividend_history, benchmark_data)
+        self._store(key, baseline)
+        return baseline, False
+
+    def _extend_baseline(self, request: EvaluateScenarioRequest, baseline: ScenarioBaseline,
+                         new_tickers: List[Ticker]) -> ScenarioBaseline:
+        """Add columns for tickers the portfolio does not hold, fetching only their data."""
+        price_history = dict(baseline.price_history)
+        price_history.update(self._market_data_repo.get_price_history(new_tickers, request.date_range))
+        dividend_history = dict(baseline.dividend_history)
+        dividend_history.update(self._analyze_portfolio_use_case._fetch_dividend_history(new_tickers, request.date_range))
+
+        quantities = {position.ticker: float(position.quantity) for position in request.portfolio.get_positions()}
+        quantities.update({ticker: 0.0 for ticker in new_tickers})
+        extended = self._build_baseline(
+            request, quantities, price_history, dividend_history, None,
+            benchmark_returns=baseline.benchmark_returns, known_betas=dict(zip(baseline.tickers, baseline.betas)),
+            metrics=baseline.metrics
+        )
+        self._store(self._cache_key(request), extended)
+        return extended
+
+    def _build_baseline(self, request: EvaluateScenarioRequest, quantities: Dict[Ticker, float],
+                        price_history: Dict[Ticker, pd.Series], dividend_history: Dict[Ticker, pd.Series],
+                        benchmark_data: Optional[pd.Series], benchmark_returns: Optional[pd.Series] = None,
+                        known_betas: Optional[Dict[Ticker, float]] = None,
+                        metrics: Optional[PortfolioMetrics] = None) -> ScenarioBaseline:
+        """Build the aligned matrices and per-share inputs once."""
+        portfolio_use_case = self._analyze_portfolio_use_case
+        all_tickers = list(quantities)
+        missing_tickers, tickers_without_start_data, first_available_dates = portfolio_use_case._identify_data_issues(
+            all_tickers, price_history, request.date_range.start, request.date_range.end
+        )
+
+        tickers = [ticker for ticker in all_tickers if ticker.symbol not in missing_tickers]
+        price_df = pd.DataFrame({ticker: price_history[ticker] for ticker in tickers})
+        if price_df.empty:
+            raise ValueError("Unable to calculate portfolio values")
+
+        present = price_df.notna().to_numpy()
+        prices = price_df.fillna(0.0).to_numpy(dtype=float)
+        quantity_vector = np.array([quantities[ticker] for ticker in tickers])
+        without_start = np.array([ticker.symbol in tickers_without_start_data for ticker in tickers])
+
+        if benchmark_returns is None and benchmark_data is not None and not benchmark_data.empty:
+            benchmark_returns = benchmark_data.pct_change().dropna()
+
+        known_betas = known_betas or {}
+        betas = np.full(len(tickers), np.nan)
+        last_prices = np.zeros(len(tickers))
+        dividend_totals = np.zeros(len(tickers))
+        annualized_dividends = np.zeros(len(tickers))
+        for position, ticker in enumerate(tickers):
+            series = price_history[ticker]
+            last_prices[position] = float(series.iloc[-1])
+            if len(series) >= 2:
+                betas[position] = known_betas.get(ticker, np.nan)
+                if np.isnan(betas[position]) and benchmark_returns is not None:
+                    betas[position] = portfolio_use_case._calculate_individual_beta(
+                        ticker, series.pct_change().dropna(), benchmark_returns
+                    )
+
+            dividends = dividend_history.get(ticker)
+            if dividends is not None and not dividends.empty:
+                dividend_totals[position] = dividends.sum()
+                annualized_dividends[position] = portfolio_use_case._calculate_annualized_dividend_for_position(
+                    dividends, series, 1.0, "USD"
+                )
+
+        total_values = prices @ quantity_vector
+        analysis_values = prices[:, ~without_start] @ quantity_vector[~without_start]
+        missing_values = prices[:, without_start] @ quantity_vector[without_start]
+
+        baseline = ScenarioBaseline(
+            index=price_df.index,
+            tickers=tickers,
+            prices=prices,
+            present=present,
+            quantities=quantity_vector,
+            without_start=without_start,
+            betas=betas,
+            last_prices=last_prices,
+            dividend_totals=dividend_totals,
+            annualized_dividends=annualized_dividends,
+            total_values=total_values,
+            analysis_values=analysis_values,
+            missing_values=missing_values,
+            has_benchmark=benchmark_returns is not None,
+            metrics=metrics,
+            missing_tickers=missing_tickers,
+            first_available_dates=first_available_dates,
+            price_history=price_history,
+            dividend_history=dividend_history,
+            benchmark_returns=benchmark_returns
+        )
+
+        if baseline.metrics is None:
+            baseline.metrics, _ = self._evaluate(request, baseline, quantity_vector, np.zeros(len(tickers)))
+        return baseline
+
+    def _store(self, key: tuple, baseline: ScenarioBaseline) -> None:
+        """Insert a baseline, evicting the least recently used one when full."""
+        with self._lock:
+            self._baselines[key] = baseline
+            self._baselines.move_to_end(key)
+            while len(self._baselines) > MAX_CACHED_BASELINES:
+                self._baselines.popitem(last=False)
+
+    @staticmethod
+    def _cache_key(request: EvaluateScenarioRequest) -> tuple:
+        """Baselines are keyed by holdings and date range, so a new upload never reuses stale data."""
+        holdings = tuple(sorted((position.ticker.symbol, str(position.quantity)) for position in request.portfolio))
+        return holdings, str(request.date_range.start), str(request.date_range.end)
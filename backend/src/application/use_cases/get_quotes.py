@@ -0,0 +1,65 @@
+from dataclasses import dataclass
+from decimal import Decimal
+from typing import Optional, List
+from ..interfaces.repositories import MarketDataRepository
+from ...domain.entities.portfolio import Portfolio
+from ...domain.entities.ticker import Ticker
+from ...domain.value_objects.money import Money
+
+@dataclass
+class GetQuotesRequest:
+    portfolio: Portfolio
+
+@dataclass
+class PositionQuote:
+    ticker: Ticker
+    quantity: Decimal
+    price: Money
+    market_value: Money
+
+@dataclass
+class GetQuotesResponse:
+    quotes: List[PositionQuote]
+    total_market_value: Optional[Money]
+    success: bool
+    message: str
+    missing_tickers: List[str] = None
+
+class GetQuotesUseCase:
+    def __init__(self, market_data_repo: MarketDataRepository):
+        self._market_data_repo = market_data_repo
+
+    def execute(self, request: GetQuotesRequest) -> GetQuotesResponse:
+        """Price every position at its current quote."""
+        try:
+            tickers = request.portfolio.get_tickers()
+            prices = self._market_data_repo.get_current_prices(tickers)
+
+            quotes = []
+            missing_tickers = []
+            for position in request.portfolio.get_positions():
+                price = prices.get(position.ticker)
+                if price is None:
+                    missing_tickers.append(position.ticker.symbol)
+                    continue
+                quotes.append(PositionQuote(
+                    ticker=position.ticker,
+                    quantity=position.quantity,
+                    price=price,
+                    market_value=position.get_value(price)
+                ))
+
+            return GetQuotesResponse(
+                quotes=quotes,
+                total_market_value=request.portfolio.get_total_value(prices),
+                success=True,
+                message=f"Quoted {len(quotes)} of {len(tickers)} positions",
+                missing_tickers=missing_tickers
+            )
+        except Exception as e:
+            return GetQuotesResponse(
+                quotes=[],
+                total_market_value=None,
+                success=False,
+                message=f"Failed to get quotes: {str(e)}"
+            )
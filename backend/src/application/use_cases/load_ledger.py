@@ -0,0 +1,38 @@
+from dataclasses import dataclass
+from typing import BinaryIO, Optional
+from ..interfaces.repositories import TransactionRepository
+from ...domain.entities.transaction_ledger import TransactionLedger
+
+@dataclass
+class LoadLedgerRequest:
+    file_path: str
+    stream: Optional[BinaryIO] = None  # Read instead of opening file_path, which then only names the upload
+
+@dataclass 
+class LoadLedgerResponse:
+    ledger: Optional[TransactionLedger]
+    success: bool
+    message: str
+
+class LoadLedgerUseCase:
+    def __init__(self, transaction_repo: TransactionRepository):
+        self._transaction_repo = transaction_repo
+    
+    def execute(self, request: LoadLedgerRequest) -> LoadLedgerResponse:
+        try:
+            if request.stream is not None:
+                ledger = self._transaction_repo.load_stream(request.stream, request.file_path)
+            else:
+                ledger = self._transaction_repo.load(request.file_path)
+            
+            return LoadLedgerResponse(
+                ledger=ledger,
+                success=True,
+                message=f"Successfully loaded {len(ledger)} transactions for {len(ledger.unique_symbols)} tickers"
+            )
+        except Exception as e:
+            return LoadLedgerResponse(
+                ledger=None,
+                success=False,
+                message=f"Failed to load transactions: {str(e)}"
+            )
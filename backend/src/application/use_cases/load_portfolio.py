@@ -1,11 +1,12 @@
 from dataclasses import dataclass
-from typing import Optional
+from typing import BinaryIO, Optional
 from ..interfaces.repositories import PortfolioRepository
 from ...domain.entities.portfolio import Portfolio
 
 @dataclass
 class LoadPortfolioRequest:
     file_path: str
+    stream: Optional[BinaryIO] = None  # Read instead of opening file_path, which then only names the upload
 
 @dataclass 
 class LoadPortfolioResponse:
@@ -19,7 +20,10 @@ class LoadPortfolioUseCase:
     
     def execute(self, request: LoadPortfolioRequest) -> LoadPortfolioResponse:
         try:
-            portfolio = self._portfolio_repo.load(request.file_path)
+            if request.stream is not None:
+                portfolio = self._portfolio_repo.load_stream(request.stream, request.file_path)
+            else:
+                portfolio = self._portfolio_repo.load(request.file_path)
             
             ticker_count = len(portfolio.get_tickers())
             
@@ -0,0 +1,92 @@
+from dataclasses import dataclass
+from typing import Optional, List
+import numpy as np
+import pandas as pd
+from ..interfaces.repositories import MarketDataRepository
+from ...domain.entities.portfolio import Portfolio
+from ...domain.value_objects.date_range import DateRange
+from ...infrastructure.services.portfolio_optimizer import PortfolioOptimizer, OptimizationResult, PortfolioAllocation
+
+@dataclass
+class OptimizePortfolioRequest:
+    portfolio: Portfolio
+    date_range: DateRange  # History returns and covariance are estimated from
+    frontier_points: int = 20
+    shrinkage: bool = True
+    risk_free_rate: float = 0.03
+
+@dataclass
+class OptimizePortfolioResponse:
+    result: Optional[OptimizationResult]
+    success: bool
+    message: str
+    symbols: List[str] = None  # Asset order of every weight vector
+    current: Optional[PortfolioAllocation] = None  # Current holdings under the same estimates
+    missing_tickers: List[str] = None
+    history_days: int = 0
+
+class OptimizePortfolioUseCase:
+    def __init__(self, market_data_repo: MarketDataRepository, optimizer: PortfolioOptimizer):
+        self._market_data_repo = market_data_repo
+        self._optimizer = optimizer
+
+    def execute(self, request: OptimizePortfolioRequest) -> OptimizePortfolioResponse:
+        """Suggest weights for the portfolio's tickers from their joint return history."""
+        try:
+            tickers = request.portfolio.get_tickers()
+            price_history = self._market_data_repo.get_price_history_batch(tickers, request.date_range)
+
+            price_df = pd.DataFrame({
+                ticker.symbol: prices for ticker, prices in price_history.items()
+                if prices is not None and len(prices) > 1
+            }).sort_index()
+            missing_tickers = [ticker.symbol for ticker in tickers if ticker.symbol not in price_df.columns]
+
+            # Joint history: days on which every remaining position has a close
+            prices = price_df.dropna().to_numpy()
+            if len(prices) < 4:
+                return OptimizePortfolioResponse(
+                    result=None,
+                    success=False,
+                    message="Insufficient overlapping price history for optimization",
+                    missing_tickers=missing_tickers
+                )
+
+            returns = prices[1:] / prices[:-1] - 1
+            result = self._optimizer.optimize(
+                returns,
+                risk_free_rate=request.risk_free_rate,
+                frontier_points=request.frontier_points,
+                shrinkage=request.shrinkage
+            )
+
+            quantities_by_symbol = {
+                position.ticker.symbol: float(position.quantity) for position in request.portfolio.get_positions()
+            }
+            current_values = np.array([quantities_by_symbol[symbol] for symbol in price_df.columns]) * prices[-1]
+            mean, covariance, _ = self._optimizer.estimate(returns, request.shrinkage)
+            current = self._optimizer.evaluate(
+                current_values / current_values.sum(), mean, covariance, request.risk_free_rate
+            )
+
+            return OptimizePortfolioResponse(
+                result=result,
+                success=True,
+                message=f"Optimized {len(price_df.columns)} assets over {len(returns)} days",
+                symbols=list(price_df.columns),
+                current=current,
+                missing_tickers=missing_tickers,
+                history_days=len(returns)
+            )
+        except ValueError as e:
+            return OptimizePortfolioResponse(
+                result=None,
+                success=False,
+                message=str(e)
+            )
+        except Exception as e:
+            return OptimizePortfolioResponse(
+                result=None,
+                success=False,
+                message=f"Portfolio optimization failed: {str(e)}"
+            )
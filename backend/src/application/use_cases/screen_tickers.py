@@ -0,0 +1,51 @@
+from dataclasses import dataclass
+from typing import List
+from ..interfaces.repositories import MarketDataRepository
+from ...domain.entities.ticker import Ticker
+from ...domain.value_objects.date_range import DateRange
+from ...infrastructure.warehouse.prefix_sums import RangeStatistics
+
+@dataclass
+class ScreenTickersRequest:
+    tickers: List[Ticker]
+    date_range: DateRange
+
+@dataclass
+class TickerScreenResult:
+    ticker: Ticker
+    statistics: RangeStatistics
+
+@dataclass
+class ScreenTickersResponse:
+    results: List[TickerScreenResult]
+    success: bool
+    message: str
+    missing_tickers: List[str] = None
+
+class ScreenTickersUseCase:
+    def __init__(self, market_data_repo: MarketDataRepository):
+        self._market_data_repo = market_data_repo
+
+    def execute(self, request: ScreenTickersRequest) -> ScreenTickersResponse:
+        """Range statistics for many stored tickers without loading their price histories."""
+        try:
+            statistics = self._market_data_repo.get_range_statistics(request.tickers, request.date_range)
+
+            results = [
+                TickerScreenResult(ticker=ticker, statistics=statistics[ticker])
+                for ticker in request.tickers if ticker in statistics
+            ]
+            missing_tickers = [ticker.symbol for ticker in request.tickers if ticker not in statistics]
+
+            return ScreenTickersResponse(
+                results=results,
+                success=True,
+                message=f"Screened {len(results)} of {len(request.tickers)} tickers",
+                missing_tickers=missing_tickers
+            )
+        except Exception as e:
+            return ScreenTickersResponse(
+                results=[],
+                success=False,
+                message=f"Ticker screening failed: {str(e)}"
+            )
@@ -0,0 +1,88 @@
+from dataclasses import dataclass
+from typing import Optional, List
+import numpy as np
+import pandas as pd
+from ..interfaces.repositories import MarketDataRepository
+from ...domain.entities.portfolio import Portfolio
+from ...domain.value_objects.date_range import DateRange
+from ...infrastructure.services.monte_carlo_simulator import MonteCarloSimulator, SimulationResult
+
+@dataclass
+class SimulatePortfolioRequest:
+    portfolio: Portfolio
+    date_range: DateRange  # History the return distribution is estimated from
+    paths: int = 10000
+    horizon_days: int = 252
+    method: str = 'bootstrap'
+    seed: Optional[int] = None
+
+@dataclass
+class SimulatePortfolioResponse:
+    result: Optional[SimulationResult]
+    success: bool
+    message: str
+    missing_tickers: List[str] = None
+    history_days: int = 0
+
+class SimulatePortfolioUseCase:
+    def __init__(self, market_data_repo: MarketDataRepository, simulator: MonteCarloSimulator):
+        self._market_data_repo = market_data_repo
+        self._simulator = simulator
+
+    def execute(self, request: SimulatePortfolioRequest) -> SimulatePortfolioResponse:
+        """Simulate forward portfolio value from the joint history of its positions."""
+        try:
+            tickers = request.portfolio.get_tickers()
+            price_history = self._market_data_repo.get_price_history_batch(tickers, request.date_range)
+
+            price_df = pd.DataFrame({
+                ticker.symbol: prices for ticker, prices in price_history.items()
+                if prices is not None and len(prices) > 1
+            }).sort_index()
+            missing_tickers = [ticker.symbol for ticker in tickers if ticker.symbol not in price_df.columns]
+
+            # Joint history: days on which every remaining position has a close
+            price_df = price_df.dropna()
+            if len(price_df) < 3:
+                return SimulatePortfolioResponse(
+                    result=None,
+                    success=False,
+                    message="Insufficient overlapping price history for simulation",
+                    missing_tickers=missing_tickers
+                )
+
+            quantities_by_symbol = {
+                position.ticker.symbol: float(position.quantity) for position in request.portfolio.get_positions()
+            }
+            quantities = np.array([quantities_by_symbol[symbol] for symbol in price_df.columns])
+            log_returns = np.log(price_df.to_numpy()[1:] / price_df.to_numpy()[:-1])
+            initial_values = quantities * price_df.to_numpy()[-1]
+
+            result = self._simulator.simulate(
+                log_returns,
+                initial_values,
+                paths=request.paths,
+                steps=request.horizon_days,
+                method=request.method,
+                seed=request.seed
+            )
+
+            return SimulatePortfolioResponse(
+                result=result,
+                success=True,
+                message=f"Simulated {request.paths} paths over {request.horizon_days} days ({request.method})",
+                missing_tickers=missing_tickers,
+                history_days=len(log_returns)
+            )
+        except ValueError as e:
+            return SimulatePortfolioResponse(
+                result=None,
+                success=False,
+                message=str(e)
+            )
+        except Exception as e:
+            return SimulatePortfolioResponse(
+                result=None,
+                success=False,
+                message=f"Portfolio simulation failed: {str(e)}"
+            )
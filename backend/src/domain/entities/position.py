@@ -4,6 +4,8 @@ from ..value_objects.money import Money
 from .ticker import Ticker
 
 class Position:
+    __slots__ = ('_ticker', '_quantity')
+
     def __init__(self, ticker: Ticker, quantity: Union[int, float, Decimal]):
         self._ticker = ticker
         self._quantity = Decimal(str(quantity))
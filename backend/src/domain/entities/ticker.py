@@ -1,4 +1,6 @@
 class Ticker:
+    __slots__ = ('_symbol',)
+
     def __init__(self, symbol: str):
         self._symbol = symbol.upper().strip()
         self._validate()
@@ -0,0 +1,109 @@
+from datetime import date
+from typing import List
+import numpy as np
+from .portfolio import Portfolio
+from .position import Position
+from .ticker import Ticker
+
+class TransactionLedger:
+    """Buys and sells as columnar arrays, in input order.
+
+    Each transaction is (date, ticker, quantity delta, price); positive
+    quantities are buys and negative quantities are sells. Columns are kept as
+    NumPy arrays so ledgers with many events are validated and processed
+    without per-transaction objects.
+    """
+
+    def __init__(self, dates, symbols, quantities, prices):
+        self._dates = np.asarray(dates, dtype='datetime64[D]')
+        # Normalize each distinct symbol once, then map back to the rows
+        raw_symbols, inverse = np.unique(np.asarray(symbols, dtype=str), return_inverse=True)
+        normalized = np.array([Ticker(symbol).symbol for symbol in raw_symbols], dtype=object)
+        self._symbols = normalized[inverse]
+        self._symbol_list, self._codes = np.unique(normalized.astype(str)[inverse], return_inverse=True)
+        self._quantities = np.asarray(quantities, dtype=float)
+        self._prices = np.asarray(prices, dtype=float)
+        self._validate()
+
+    def _validate(self):
+        count = len(self._dates)
+        if count == 0:
+            raise ValueError("Transaction ledger cannot be empty")
+        if not (len(self._symbols) == len(self._quantities) == len(self._prices) == count):
+            raise ValueError("Transaction columns must have the same length")
+
+        invalid_quantity = np.nonzero(~np.isfinite(self._quantities) | (self._quantities == 0))[0]
+        if len(invalid_quantity):
+            raise ValueError(f"Invalid quantity at row {invalid_quantity[0] + 1}: {self._quantities[invalid_quantity[0]]}")
+
+        invalid_price = np.nonzero(~np.isfinite(self._prices) | (self._prices <= 0))[0]
+        if len(invalid_price):
+            raise ValueError(f"Invalid price at row {invalid_price[0] + 1}: {self._prices[invalid_price[0]]}")
+
+        # Holdings may never go negative: running quantity per ticker in date order
+        # (input order within a day), from one stable sort and one cumulative sum
+        order = np.lexsort((np.arange(count), self._dates, self._codes))
+        running = np.r_[0.0, np.cumsum(self._quantities[order])]
+        group_start = np.r_[0, np.nonzero(np.diff(self._codes[order]))[0] + 1]
+        holdings = running[1:] - np.repeat(running[group_start], np.diff(np.r_[group_start, count]))
+
+        oversold = np.nonzero(holdings < -1e-9)[0]
+        if len(oversold):
+            row = order[oversold[0]]
+            raise ValueError(
+                f"Sell at row {row + 1} exceeds {self._symbols[row]} holdings on {self._dates[row]}"
+            )
+
+    @property
+    def dates(self) -> np.ndarray:
+        return self._dates
+
+    @property
+    def symbols(self) -> np.ndarray:
+        return self._symbols
+
+    @property
+    def symbol_codes(self) -> np.ndarray:
+        """Index of each transaction's symbol in ``unique_symbols``."""
+        return self._codes
+
+    @property
+    def unique_symbols(self) -> List[str]:
+        """Distinct symbols, sorted."""
+        return [str(symbol) for symbol in self._symbol_list]
+
+    @property
+    def quantities(self) -> np.ndarray:
+        return self._quantities
+
+    @property
+    def prices(self) -> np.ndarray:
+        return self._prices
+
+    @property
+    def start_date(self) -> date:
+        return self._dates.min().astype(date)
+
+    @property
+    def end_date(self) -> date:
+        return self._dates.max().astype(date)
+
+    def get_tickers(self) -> List[Ticker]:
+        return [Ticker(symbol) for symbol in self._symbol_list]
+
+    def to_portfolio(self) -> Portfolio:
+        """Net holdings after every transaction as a fixed-quantity portfolio."""
+        totals = np.bincount(self._codes, weights=self._quantities, minlength=len(self._symbol_list))
+        positions = [
+            Position(Ticker(symbol), float(total))
+            for symbol, total in zip(self._symbol_list, totals) if total > 1e-9
+        ]
+        if not positions:
+            raise ValueError("Transaction ledger has no open positions")
+        return Portfolio(positions)
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __str__(self) -> str:
+        return f"Transaction ledger with {len(self._dates)} transactions"
@@ -2,13 +2,19 @@
 Implementation of metrics color coding service based on METRICS_MEMORANDUM.md thresholds.
 """
 
-from typing import Union, Dict, Tuple
-from ..application.interfaces.metrics_color_service import MetricsColorService, ColorCode, MetricLevel
+from typing import Union, Dict, Sequence, Tuple
+
+import numpy as np
+
+from ..application.interfaces.metrics_color_service import MetricsColorService, ColorCode, MetricLevel, LEVEL_CODES
 
 
 class ColorMetricsService(MetricsColorService):
     """Service for color-coding financial metrics based on performance thresholds."""
     
+    # Metrics where a value above the thresholds is worse
+    LOWER_IS_BETTER = ("volatility", "beta")
+    
     def __init__(self):
         """Initialize the color service with thresholds from METRICS_MEMORANDUM.md."""
         self._portfolio_thresholds = self._initialize_portfolio_thresholds()
@@ -78,7 +84,7 @@ class ColorMetricsService(MetricsColorService):
         bad_threshold, excellent_threshold = thresholds[metric_name]
         
         # Handle cases for metrics where lower is better
-        if metric_name in ["volatility", "beta"]:
+        if metric_name in self.LOWER_IS_BETTER:
             # For other metrics where lower is better
             if value > bad_threshold:
                 return MetricLevel.BAD
@@ -111,6 +117,32 @@ class ColorMetricsService(MetricsColorService):
             else:
                 return MetricLevel.EXCELLENT
     
+    def get_levels_for_metrics(self, metric_names: Sequence[str], values: np.ndarray,
+                               context: str = "portfolio") -> np.ndarray:
+        """Get level codes for every value of a (tickers x metrics) matrix, one np.select over all columns.
+        
+        Codes match ``get_level_for_metric`` value by value, including NaN
+        (every comparison is false, so EXCELLENT) and unknown metrics (NORMAL).
+        """
+        values = np.asarray(values, dtype=float)
+        if values.ndim != 2 or values.shape[1] != len(metric_names):
+            raise ValueError(f"Expected a (tickers x {len(metric_names)}) matrix, got shape {values.shape}")
+        
+        thresholds = self._portfolio_thresholds if context == "portfolio" else self._ticker_thresholds
+        bad, excellent = np.array(
+            [thresholds.get(name, (np.nan, np.nan)) for name in metric_names], dtype=float
+        ).reshape(-1, 2).T
+        # Lower-is-better columns are negated: value > threshold is exactly -value < -threshold
+        sign = np.array([-1.0 if name in self.LOWER_IS_BETTER else 1.0 for name in metric_names])
+        signed = values * sign
+        codes = np.select(
+            [signed < bad * sign, signed < excellent * sign],
+            [LEVEL_CODES[MetricLevel.BAD], LEVEL_CODES[MetricLevel.NORMAL]],
+            LEVEL_CODES[MetricLevel.EXCELLENT]
+        ).astype(np.int8)
+        codes[:, [name not in thresholds for name in metric_names]] = LEVEL_CODES[MetricLevel.NORMAL]
+        return codes
+    
     def colorize_text(self, text: str, color: ColorCode) -> str:
         """Apply color to text."""
         return f"{color.value}{text}{ColorCode.RESET.value}"
@@ -0,0 +1,22 @@
+import os
+
+
+class SessionConfig:
+    """Configuration for the portfolio session store."""
+
+    def __init__(self):
+        # Go up from backend/src/infrastructure/config/ to project root, then to database
+        default_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'database', 'sessions', 'sessions.sqlite'))
+        self.db_path = os.getenv('PORTFOLIO_SESSION_DB_PATH', default_path)
+        self.cache_size = self._get_int_env('PORTFOLIO_SESSION_CACHE_SIZE', 128)
+
+    def get_db_path(self) -> str:
+        """Get the session database file path."""
+        return self.db_path
+
+    def _get_int_env(self, key: str, default: int) -> int:
+        """Get integer value from environment variable."""
+        try:
+            return int(os.getenv(key, default))
+        except ValueError:
+            return default
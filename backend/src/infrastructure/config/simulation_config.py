@@ -0,0 +1,22 @@
+import os
+
+
+class SimulationConfig:
+    """Configuration for Monte Carlo portfolio simulation."""
+
+    def __init__(self):
+        self.memory_limit_mb = self._get_int_env('MONTE_CARLO_MEMORY_LIMIT_MB', 512)
+        self.max_paths = self._get_int_env('MONTE_CARLO_MAX_PATHS', 100000)
+        self.max_horizon_days = self._get_int_env('MONTE_CARLO_MAX_HORIZON_DAYS', 1260)
+
+    @property
+    def memory_limit_bytes(self) -> int:
+        """Memory cap for one simulation in bytes."""
+        return self.memory_limit_mb * 1024 * 1024
+
+    def _get_int_env(self, key: str, default: int) -> int:
+        """Get integer value from environment variable."""
+        try:
+            return int(os.getenv(key, default))
+        except ValueError:
+            return default
@@ -11,6 +11,22 @@ class WarehouseConfig:
         # Go up from backend/src/infrastructure/config/ to project root, then to database
         default_path = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..', '..', '..', 'database', 'warehouse', 'warehouse.sqlite'))
         self.db_path = os.getenv('WAREHOUSE_DB_PATH', default_path)
+        # Bulk exports (see warehouse.bulk_transfer) are written to and imported from named sub-directories here
+        default_export_dir = os.path.join(os.path.dirname(default_path), 'exports')
+        self.export_dir = os.getenv('WAREHOUSE_EXPORT_DIR', default_export_dir)
+        # Read-only snapshot of hot tickers shared by all workers (see warehouse.snapshot)
+        default_snapshot_path = os.path.join(os.path.dirname(default_path), 'snapshot.bin')
+        self.snapshot_path = os.getenv('WAREHOUSE_SNAPSHOT_PATH', default_snapshot_path)
+        # Per-process budget for the in-memory close history cache (see warehouse.price_cache); 0 disables it
+        self.price_cache_mb = self._get_float_env('WAREHOUSE_PRICE_CACHE_MB', 64.0)
+        # Pooled statements slower than this are logged with their query plan (see services.slow_query_log); 0 disables
+        self.slow_query_ms = self._get_float_env('WAREHOUSE_SLOW_QUERY_MS', 100.0)
+        # Background checkpoints, incremental vacuum and coverage retention (see warehouse.maintenance)
+        self.maintenance_enabled = self._get_bool_env('WAREHOUSE_MAINTENANCE_ENABLED', True)
+        self.maintenance_interval = self._get_float_env('WAREHOUSE_MAINTENANCE_INTERVAL', 60.0)
+        self.wal_truncate_mb = self._get_float_env('WAREHOUSE_WAL_TRUNCATE_MB', 64.0)
+        self.free_space_budget_mb = self._get_float_env('WAREHOUSE_FREE_SPACE_BUDGET_MB', 32.0)
+        self.coverage_retention_days = self._get_float_env('WAREHOUSE_COVERAGE_RETENTION_DAYS', 90.0)
     
     def _get_bool_env(self, key: str, default: bool) -> bool:
         """Get boolean value from environment variable."""
@@ -21,6 +37,13 @@ class WarehouseConfig:
             return False
         return default
     
+    def _get_float_env(self, key: str, default: float) -> float:
+        """Get float value from environment variable."""
+        try:
+            return float(os.getenv(key, default))
+        except ValueError:
+            return default
+    
     def is_enabled(self) -> bool:
         """Check if warehouse is enabled."""
         return self.enabled
@@ -28,3 +51,39 @@ class WarehouseConfig:
     def get_db_path(self) -> str:
         """Get the database file path."""
         return self.db_path
+    
+    def get_export_dir(self) -> str:
+        """Get the directory holding bulk exports."""
+        return self.export_dir
+    
+    def get_snapshot_path(self) -> str:
+        """Get the memory-mapped snapshot file path."""
+        return self.snapshot_path
+    
+    def get_price_cache_bytes(self) -> int:
+        """Get the per-process byte budget of the close history cache."""
+        return max(0, int(self.price_cache_mb * 1024 * 1024))
+    
+    def get_slow_query_seconds(self) -> float:
+        """Get the duration above which pooled statements are logged as slow."""
+        return max(0.0, self.slow_query_ms / 1000)
+    
+    def is_maintenance_enabled(self) -> bool:
+        """Check if API workers run the background maintenance thread."""
+        return self.maintenance_enabled
+    
+    def get_maintenance_interval(self) -> float:
+        """Get the seconds between maintenance ticks."""
+        return max(1.0, self.maintenance_interval)
+    
+    def get_wal_truncate_bytes(self) -> int:
+        """Get the WAL size above which maintenance truncates it."""
+        return max(0, int(self.wal_truncate_mb * 1024 * 1024))
+    
+    def get_free_space_budget_bytes(self) -> int:
+        """Get the free page bytes kept for reuse before incremental vacuum releases the rest."""
+        return max(0, int(self.free_space_budget_mb * 1024 * 1024))
+    
+    def get_coverage_retention_days(self) -> int:
+        """Get the age after which coverage rows expire; 0 keeps them."""
+        return max(0, int(self.coverage_retention_days))
@@ -0,0 +1,32 @@
+import os
+
+
+class YahooConfig:
+    """Configuration for Yahoo Finance request throttling and retries."""
+
+    def __init__(self):
+        self.rate_per_second = self._get_float_env('YAHOO_RATE_PER_SECOND', 4.0)
+        self.burst = self._get_float_env('YAHOO_BURST', 10.0)
+        self.max_retries = self._get_int_env('YAHOO_MAX_RETRIES', 3)
+        self.backoff_base_seconds = self._get_float_env('YAHOO_BACKOFF_BASE_SECONDS', 0.5)
+        self.backoff_max_seconds = self._get_float_env('YAHOO_BACKOFF_MAX_SECONDS', 8.0)
+        self.circuit_failure_threshold = self._get_int_env('YAHOO_CIRCUIT_FAILURE_THRESHOLD', 5)
+        self.circuit_reset_seconds = self._get_float_env('YAHOO_CIRCUIT_RESET_SECONDS', 30.0)
+        self.batch_size_initial = self._get_int_env('YAHOO_BATCH_SIZE_INITIAL', 20)
+        self.batch_size_max = self._get_int_env('YAHOO_BATCH_SIZE_MAX', 50)
+        self.batch_target_latency_seconds = self._get_float_env('YAHOO_BATCH_TARGET_LATENCY_SECONDS', 5.0)
+        self.quote_ttl_seconds = self._get_float_env('QUOTE_TTL_SECONDS', 60.0)
+
+    def _get_float_env(self, key: str, default: float) -> float:
+        """Get float value from environment variable."""
+        try:
+            return float(os.getenv(key, default))
+        except ValueError:
+            return default
+
+    def _get_int_env(self, key: str, default: int) -> int:
+        """Get integer value from environment variable."""
+        try:
+            return int(os.getenv(key, default))
+        except ValueError:
+            return default
@@ -1,66 +1,114 @@
 import pandas as pd
+import numpy as np
 import os
-from typing import List
+from typing import BinaryIO
 from ...application.interfaces.repositories import PortfolioRepository
 from ...domain.entities.portfolio import Portfolio
 from ...domain.entities.position import Position
 from ...domain.entities.ticker import Ticker
 
 class CsvPortfolioRepository(PortfolioRepository):
+    """Holdings files with ``ticker`` and ``position`` columns.
+
+    Reads CSV, gzip-compressed CSV and Parquet (Parquet needs pyarrow or
+    fastparquet). Columns are parsed and validated as whole arrays; errors
+    name the first offending data row (1-based, header excluded). Rows for the
+    same ticker are summed into one position.
+    """
+
+    REQUIRED_COLUMNS = ['ticker', 'position']
+    SUPPORTED_EXTENSIONS = ('.csv', '.csv.gz', '.gz', '.parquet', '.pq')
+
+    GZIP_MAGIC = b'\x1f\x8b'
+    PARQUET_MAGIC = b'PAR1'
+
     def __init__(self):
         pass
-    
+
     def load(self, file_path: str) -> Portfolio:
-        """Load portfolio from CSV file."""
-        
+        """Load portfolio from a CSV, gzip CSV or Parquet file."""
+
+        if not os.path.exists(file_path):
+            raise ValueError(f"Error loading portfolio from CSV: Portfolio file not found: {file_path}")
+
+        with open(file_path, 'rb') as stream:
+            return self.load_stream(stream, file_path)
+
+    def load_stream(self, stream: BinaryIO, file_name: str) -> Portfolio:
+        """Load portfolio from an open binary stream, e.g. an upload, without a temp file."""
+
         try:
-            if not os.path.exists(file_path):
-                raise FileNotFoundError(f"Portfolio file not found: {file_path}")
-            
-            df = pd.read_csv(file_path)
-            
+            df = self._read_frame(stream, file_name)
+            df.columns = [str(column).strip().lower() for column in df.columns]
+
             self._validate_csv_format(df)
-            
-            positions = []
-            for idx, row in df.iterrows():
-                # Convert ticker symbol format (e.g., BRK.B -> BRK-B for Yahoo Finance)
-                ticker_symbol = str(row['ticker']).replace('.', '-')
-                ticker = Ticker(ticker_symbol)
-                position = Position(ticker, float(row['position']))
-                positions.append(position)
-            
-            if not positions:
-                raise ValueError("No valid positions found in CSV file")
-            
-            return Portfolio(positions)
-            
+
+            # Normalize each distinct raw symbol once, then map back to the rows.
+            # Convert ticker symbol format (e.g., BRK.B -> BRK-B for Yahoo Finance)
+            codes, raw_symbols = pd.factorize(df['ticker'], use_na_sentinel=False)
+            symbols = np.array([
+                str(symbol).strip().upper().replace('.', '-') if isinstance(symbol, str) else ''
+                for symbol in raw_symbols.tolist()
+            ], dtype=object)
+            tickers = symbols[codes]
+            positions = pd.to_numeric(df['position'], errors='coerce').to_numpy(dtype=float, na_value=np.nan)
+
+            self._raise_on_first_invalid(tickers == '', df['ticker'], "Empty ticker symbol at row {row}")
+            self._raise_on_first_invalid(
+                np.array([len(symbol) > 10 for symbol in symbols])[codes], df['ticker'],
+                "Ticker symbol too long at row {row}: {value}"
+            )
+            self._raise_on_first_invalid(
+                ~np.isfinite(positions) | (positions <= 0), df['position'], "Invalid position value at row {row}: {value}"
+            )
+
+            # Duplicate rows for one ticker (e.g. several lots) become one position
+            totals = pd.Series(positions).groupby(tickers, sort=False).sum()
+
+            return Portfolio([
+                Position(Ticker(symbol), quantity)
+                for symbol, quantity in zip(totals.index.tolist(), totals.to_numpy().tolist())
+            ])
+
         except Exception as e:
             raise ValueError(f"Error loading portfolio from CSV: {str(e)}")
-    
+
+    def _read_frame(self, stream: BinaryIO, file_name: str) -> pd.DataFrame:
+        """Read the stream as Parquet or (optionally gzipped) CSV, sniffing magic bytes before the name."""
+
+        head = stream.read(4)
+        stream.seek(0)
+        name = (file_name or '').lower()
+
+        if head == self.PARQUET_MAGIC or name.endswith(('.parquet', '.pq')):
+            try:
+                return pd.read_parquet(stream)
+            except ImportError:
+                raise ValueError("Parquet files require pyarrow or fastparquet to be installed")
+
+        compression = 'gzip' if head[:2] == self.GZIP_MAGIC else None
+        # Everything as text so tickers such as "NA" or "1" are kept verbatim
+        return pd.read_csv(stream, compression=compression, dtype=str, keep_default_na=False)
+
     def _validate_csv_format(self, df: pd.DataFrame) -> None:
-        """Validate that CSV has required columns and format."""
-        
-        required_columns = ['ticker', 'position']
-        missing_columns = [col for col in required_columns if col not in df.columns]
-        
+        """Validate that CSV has required columns and rows."""
+
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
+
         if missing_columns:
             raise ValueError(f"Missing required columns: {missing_columns}")
-        
+
         if df.empty:
             raise ValueError("CSV file is empty")
-        
-        # Check for valid data types
-        for idx, row in df.iterrows():
-            if pd.isna(row['ticker']) or str(row['ticker']).strip() == '':
-                raise ValueError(f"Empty ticker symbol at row {idx + 1}")
-            
-            try:
-                position_value = float(row['position'])
-                if position_value <= 0:
-                    raise ValueError(f"Invalid position value at row {idx + 1}: {position_value}")
-            except (ValueError, TypeError):
-                raise ValueError(f"Invalid position value at row {idx + 1}: {row['position']}")
-    
+
+    @staticmethod
+    def _raise_on_first_invalid(invalid, raw: pd.Series, message: str) -> None:
+        """Raise for the first row flagged invalid, quoting its raw value."""
+        invalid = np.asarray(invalid, dtype=bool)
+        if invalid.any():
+            position = int(invalid.argmax())
+            raise ValueError(message.format(row=position + 1, value=raw.iloc[position]))
+
     def save(self, portfolio: Portfolio, file_path: str) -> None:
         """Save portfolio to CSV file."""
         
@@ -0,0 +1,87 @@
+import pandas as pd
+import os
+from typing import BinaryIO
+from ...application.interfaces.repositories import TransactionRepository
+from ...domain.entities.transaction_ledger import TransactionLedger
+
+class CsvTransactionRepository(TransactionRepository):
+    """Transaction ledgers as ``date,ticker,quantity,price`` CSV files.
+
+    Columns are parsed and validated as whole arrays; errors name the first
+    offending data row (1-based, header excluded).
+    """
+
+    REQUIRED_COLUMNS = ['date', 'ticker', 'quantity', 'price']
+
+    def load(self, file_path: str) -> TransactionLedger:
+        """Load a transaction ledger from a CSV file."""
+
+        if not os.path.exists(file_path):
+            raise ValueError(f"Error loading transactions from CSV: Transaction file not found: {file_path}")
+
+        with open(file_path, 'rb') as stream:
+            return self.load_stream(stream, file_path)
+
+    def load_stream(self, stream: BinaryIO, file_name: str) -> TransactionLedger:
+        """Load a transaction ledger from an open binary stream, e.g. an upload, without a temp file."""
+
+        try:
+            df = pd.read_csv(stream, dtype={'ticker': str, 'date': str})
+            df.columns = [str(column).strip().lower() for column in df.columns]
+
+            self._validate_csv_format(df)
+
+            dates = pd.to_datetime(df['date'].str.strip(), errors='coerce', format='mixed')
+            quantities = pd.to_numeric(df['quantity'], errors='coerce')
+            prices = pd.to_numeric(df['price'], errors='coerce')
+            tickers = df['ticker'].fillna('').str.strip()
+
+            self._raise_on_first_invalid(tickers == '', df['ticker'], "ticker symbol")
+            self._raise_on_first_invalid(dates.isna(), df['date'], "date")
+            self._raise_on_first_invalid(quantities.isna(), df['quantity'], "quantity")
+            self._raise_on_first_invalid(prices.isna(), df['price'], "price")
+
+            # Convert ticker symbol format (e.g., BRK.B -> BRK-B for Yahoo Finance)
+            return TransactionLedger(
+                dates.values.astype('datetime64[D]'),
+                tickers.str.replace('.', '-', regex=False).to_numpy(),
+                quantities.to_numpy(dtype=float),
+                prices.to_numpy(dtype=float)
+            )
+
+        except Exception as e:
+            raise ValueError(f"Error loading transactions from CSV: {str(e)}")
+
+    def _validate_csv_format(self, df: pd.DataFrame) -> None:
+        """Validate that CSV has required columns and rows."""
+
+        missing_columns = [col for col in self.REQUIRED_COLUMNS if col not in df.columns]
+
+        if missing_columns:
+            raise ValueError(f"Missing required columns: {missing_columns}")
+
+        if df.empty:
+            raise ValueError("CSV file is empty")
+
+    @staticmethod
+    def _raise_on_first_invalid(invalid: pd.Series, raw: pd.Series, field: str) -> None:
+        """Raise for the first row flagged invalid, quoting its raw value."""
+        if invalid.any():
+            position = int(invalid.to_numpy().argmax())
+            raise ValueError(f"Invalid {field} at row {position + 1}: {raw.iloc[position]}")
+
+    def save(self, ledger: TransactionLedger, file_path: str) -> None:
+        """Save a transaction ledger to a CSV file."""
+
+        try:
+            df = pd.DataFrame({
+                'date': pd.to_datetime(ledger.dates).strftime('%Y-%m-%d'),
+                # Convert ticker symbol back to original format (e.g., BRK-B -> BRK.B)
+                'ticker': [symbol.replace('-', '.') for symbol in ledger.symbols],
+                'quantity': ledger.quantities,
+                'price': ledger.prices
+            })
+            df.to_csv(file_path, index=False)
+
+        except Exception as e:
+            raise ValueError(f"Error saving transactions to CSV: {str(e)}")
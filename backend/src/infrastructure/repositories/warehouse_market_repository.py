@@ -1,11 +1,15 @@
 import pandas as pd
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ...application.interfaces.repositories import MarketDataRepository
 from ...domain.entities.ticker import Ticker
 from ...domain.value_objects.date_range import DateRange
 from ...domain.value_objects.money import Money
 from ..warehouse.warehouse_service import WarehouseService
+from ..warehouse.prefix_sums import RangeStatistics
 from ..warehouse.trading_day_service import TradingDayService
+from ..services.quote_service import QuoteService
+from ..services.async_fetch_pipeline import get_async_fetch_pipeline
+from ..config.yahoo_config import YahooConfig
 from .yfinance_market_repository import YFinanceMarketRepository
 
 
@@ -20,11 +24,17 @@ class WarehouseMarketRepository(MarketDataRepository):
     - Feature flag support
     """
     
-    def __init__(self, warehouse_enabled: bool = True, warehouse_db_path: str = "../database/warehouse/warehouse.sqlite"):
+    def __init__(self, warehouse_enabled: bool = True, warehouse_db_path: str = "../database/warehouse/warehouse.sqlite",
+                 warehouse_snapshot_path: Optional[str] = None):
         self.warehouse_enabled = warehouse_enabled
-        self.warehouse_service = WarehouseService(warehouse_db_path) if warehouse_enabled else None
+        self.warehouse_service = WarehouseService(warehouse_db_path, warehouse_snapshot_path) if warehouse_enabled else None
         self.trading_day_service = TradingDayService()
         self.yahoo_repo = YFinanceMarketRepository()  # Fallback to original
+        self.quote_service = QuoteService(
+            self.yahoo_repo,
+            warehouse_service=self.warehouse_service,
+            ttl_seconds=YahooConfig().quote_ttl_seconds
+        )
         
         # Observability counters
         self.warehouse_hits = 0
@@ -64,12 +74,14 @@ class WarehouseMarketRepository(MarketDataRepository):
             # Fetch missing data from Yahoo in batch
             if batch_missing_tickers:
                 try:
-                    yahoo_result = self.yahoo_repo.get_price_history(batch_missing_tickers, date_range)
+                    yahoo_result = self.yahoo_repo.get_raw_price_history(batch_missing_tickers, date_range)
                     for ticker in batch_missing_tickers:
-                        if ticker in yahoo_result and not yahoo_result[ticker].empty:
-                            batch_warehouse_data[ticker] = yahoo_result[ticker]
-                            # Store in warehouse for future use
-                            self.warehouse_service.store_price_data(ticker, yahoo_result[ticker])
+                        if ticker in yahoo_result and not yahoo_result[ticker].closes.empty:
+                            # Store raw closes in warehouse, then read them back adjusted
+                            self.warehouse_service.store_price_data(
+                                ticker, yahoo_result[ticker].closes, yahoo_result[ticker].factors
+                            )
+                            batch_warehouse_data[ticker] = self.warehouse_service.get_price_data(ticker, date_range)
                 except Exception as yahoo_error:
                     pass
             
@@ -122,13 +134,13 @@ class WarehouseMarketRepository(MarketDataRepository):
                 # Create date range for the entire missing period
                 missing_range = DateRange(min_date, max_date)
                 
-                # Fetch from Yahoo
-                yahoo_data = self.yahoo_repo.get_price_history([ticker], missing_range)
+                # Fetch raw closes and corporate actions from Yahoo
+                yahoo_data = self.yahoo_repo.get_raw_price_history([ticker], missing_range)
                 self.yahoo_calls += 1
                 
-                if ticker in yahoo_data and not yahoo_data[ticker].empty:
+                if ticker in yahoo_data and not yahoo_data[ticker].closes.empty:
                     # Store in warehouse
-                    self.warehouse_service.store_price_data(ticker, yahoo_data[ticker])
+                    self.warehouse_service.store_price_data(ticker, yahoo_data[ticker].closes, yahoo_data[ticker].factors)
             else:
                 # Single range - use original logic
                 start_date, end_date = missing_ranges[0]
@@ -136,13 +148,13 @@ class WarehouseMarketRepository(MarketDataRepository):
                 # Create date range for this missing segment
                 missing_range = DateRange(start_date, end_date)
                 
-                # Fetch from Yahoo
-                yahoo_data = self.yahoo_repo.get_price_history([ticker], missing_range)
+                # Fetch raw closes and corporate actions from Yahoo
+                yahoo_data = self.yahoo_repo.get_raw_price_history([ticker], missing_range)
                 self.yahoo_calls += 1
                 
-                if ticker in yahoo_data and not yahoo_data[ticker].empty:
+                if ticker in yahoo_data and not yahoo_data[ticker].closes.empty:
                     # Store in warehouse
-                    self.warehouse_service.store_price_data(ticker, yahoo_data[ticker])
+                    self.warehouse_service.store_price_data(ticker, yahoo_data[ticker].closes, yahoo_data[ticker].factors)
         
         # Step 5: Read complete requested range from warehouse
         final_data = self.warehouse_service.get_price_data(ticker, date_range)
@@ -150,8 +162,8 @@ class WarehouseMarketRepository(MarketDataRepository):
         return final_data
     
     def get_current_prices(self, tickers: List[Ticker]) -> Dict[Ticker, Money]:
-        """Get current prices - always use Yahoo for real-time data."""
-        return self.yahoo_repo.get_current_prices(tickers)
+        """Get current prices from Yahoo via the quote cache, falling back to the last stored close."""
+        return self.quote_service.get_current_prices(tickers)
     
     def get_benchmark_data(self, benchmark_symbol: str, 
                           date_range: DateRange) -> pd.Series:
@@ -166,14 +178,15 @@ class WarehouseMarketRepository(MarketDataRepository):
             self.warehouse_hits += 1
             return existing_benchmark
         
-        # No coverage information in warehouse, fetch from Yahoo and store
-        benchmark_data = self.yahoo_repo.get_benchmark_data(benchmark_symbol, date_range)
-        
-        # Store in warehouse for future use (including coverage information)
-        self.warehouse_service.store_benchmark_data(benchmark_symbol, benchmark_data, date_range)
-        
+        # No coverage information in warehouse, fetch raw closes and corporate actions from Yahoo
+        history = self.yahoo_repo.get_raw_price_history([Ticker(benchmark_symbol)], date_range).get(Ticker(benchmark_symbol))
         self.warehouse_misses += 1
-        return benchmark_data
+        if history is None:
+            return pd.Series(dtype=float)
+        
+        # Store in warehouse for future use (including coverage information), read back adjusted like ticker prices
+        self.warehouse_service.store_benchmark_data(benchmark_symbol, history.closes, date_range, history.factors)
+        return self.warehouse_service.get_benchmark_data(benchmark_symbol, date_range)
     
     def get_dividend_history(self, ticker: Ticker, 
                            date_range: DateRange) -> pd.Series:
@@ -197,7 +210,7 @@ class WarehouseMarketRepository(MarketDataRepository):
         self.warehouse_misses += 1
         return dividend_data
     
-    def get_observability_metrics(self) -> Dict[str, int]:
+    def get_observability_metrics(self) -> Dict[str, object]:
         """Get observability metrics for monitoring."""
         return {
             "warehouse_hits": self.warehouse_hits,
@@ -205,7 +218,11 @@ class WarehouseMarketRepository(MarketDataRepository):
             "yahoo_calls": self.yahoo_calls,
             "missing_range_segments": self.missing_range_segments,
             "calendar_skipped_days": self.calendar_skipped_days,
-            "database_size_bytes": self.warehouse_service.get_database_size() if self.warehouse_enabled else 0
+            "database_size_bytes": self.warehouse_service.get_database_size() if self.warehouse_enabled else 0,
+            **(self.warehouse_service.get_price_cache_stats() if self.warehouse_enabled else {}),
+            **self.yahoo_repo.get_fetch_metrics(),
+            **self.quote_service.get_metrics(),
+            **get_async_fetch_pipeline().get_metrics()
         }
     
     def get_price_history_batch(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, pd.Series]:
@@ -219,11 +236,20 @@ class WarehouseMarketRepository(MarketDataRepository):
     def get_dividend_history_batch(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, pd.Series]:
         """Get dividend history for multiple tickers with warehouse caching."""
         if not self.warehouse_enabled:
-            return self.yahoo_repo.get_dividend_history_batch(tickers, date_range)
+            return get_async_fetch_pipeline().fetch_all(
+                tickers, lambda ticker: self.yahoo_repo.get_dividend_history(ticker, date_range)
+            )
         
         # Use warehouse service's optimized batch method
         return self.warehouse_service.get_dividend_history_batch(tickers, date_range)
 
+    def get_range_statistics(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, RangeStatistics]:
+        """Get range statistics for stored tickers from warehouse prefix sums (empty when the warehouse is disabled)."""
+        if not self.warehouse_enabled:
+            return {}
+        
+        return self.warehouse_service.get_range_statistics(tickers, date_range)
+
     def reset_metrics(self):
         """Reset observability metrics."""
         self.warehouse_hits = 0
@@ -1,15 +1,22 @@
-import yfinance as yf
 import pandas as pd
 import time
-from typing import List, Dict
+from typing import List, Dict, Optional
 from ...application.interfaces.repositories import MarketDataRepository
 from ...domain.entities.ticker import Ticker
 from ...domain.value_objects.date_range import DateRange
 from ...domain.value_objects.money import Money
+from ..services.yahoo_fetch_client import YahooFetchClient, get_yahoo_fetch_client
+from ..warehouse.corporate_actions import RawPriceHistory, action_factors, raw_closes
+
+# Calendar days fetched before a range so a dividend on its first day has a previous close
+ACTION_LOOKBACK_DAYS = 10
+# Bar size of the request for splits after a past range; only the split ratios are used
+LATER_SPLITS_INTERVAL = "1mo"
 
 class YFinanceMarketRepository(MarketDataRepository):
-    def __init__(self):
-        pass
+    def __init__(self, fetch_client: Optional[YahooFetchClient] = None):
+        # All Yahoo calls share one rate-limited, retrying client
+        self._fetch_client = fetch_client or get_yahoo_fetch_client()
     
     def get_price_history(self, tickers: List[Ticker], 
                          date_range: DateRange) -> Dict[Ticker, pd.Series]:
@@ -20,7 +27,7 @@ class YFinanceMarketRepository(MarketDataRepository):
             # Download data
             start_time = time.time()
             
-            data = yf.download(
+            data = self._fetch_client.download(
                 ticker_symbols,
                 start=date_range.start,
                 end=date_range.end,
@@ -34,62 +41,151 @@ class YFinanceMarketRepository(MarketDataRepository):
             if data.empty:
                 return {}
             
-            result = {}
+            return self._extract_close_prices(data, tickers)
             
-            # Handle both single and multiple ticker cases
-            for ticker in tickers:
-                symbol = ticker.symbol
-                try:
-                    # Check for multi-level columns (most common case)
-                    if hasattr(data.columns, 'levels') and len(data.columns.levels) > 1:
-                        # Multi-level columns: (symbol, 'Close')
-                        if symbol in data.columns.levels[0] and 'Close' in data.columns.levels[1]:
-                            prices = data[symbol]['Close'].dropna()
-                            if not prices.empty:
-                                result[ticker] = prices
-                    else:
-                        # Single level columns
-                        if 'Close' in data.columns:
-                            # Single ticker case
-                            prices = data['Close'].dropna()
-                            if not prices.empty:
-                                result[ticker] = prices
-                        elif f"{symbol}_Close" in data.columns:
-                            # Multiple tickers with underscore format
-                            prices = data[f"{symbol}_Close"].dropna()
-                            if not prices.empty:
-                                result[ticker] = prices
-                except (KeyError, AttributeError, IndexError) as e:
-                    # Skip tickers with no data
-                    print(f"Warning: No data found for {symbol}: {e}")
-                    continue
+        except Exception as e:
+            raise ValueError(f"Error fetching price data: {str(e)}")
+    
+    def get_raw_price_history(self, tickers: List[Ticker],
+                              date_range: DateRange) -> Dict[Ticker, RawPriceHistory]:
+        """
+        Get unadjusted closes and corporate-action factors for tickers.
+        
+        Yahoo's ``Close`` is split-adjusted even without ``auto_adjust``, for
+        every split up to today, so the splits reported with the download are
+        undone; stored closes then never change when a later action happens.
+        The daily download stops at the range end. For past ranges, a second
+        batched request with monthly bars from the range end through today
+        supplies the ratio of the later splits; every close in the range is
+        before them, so their exact ex-dates are not needed. Factors are kept
+        for actions in the daily download from the range start onwards; later
+        actions get theirs when their own range is fetched.
+        """
+        ticker_symbols = [ticker.symbol for ticker in tickers]
+        start = pd.Timestamp(date_range.start)
+        
+        try:
+            data = self._fetch_client.download(
+                ticker_symbols,
+                start=(start - pd.Timedelta(days=ACTION_LOOKBACK_DAYS)).strftime('%Y-%m-%d'),
+                end=date_range.end,
+                auto_adjust=False,
+                actions=True,
+                progress=False,
+                group_by="ticker"
+            )
             
-            return result
+            if data.empty:
+                return {}
+            
+            closes = self._extract_column(data, tickers, 'Close')
+            dividends = self._extract_column(data, tickers, 'Dividends')
+            splits = self._extract_column(data, tickers, 'Stock Splits')
+            later_ratios = self._get_later_split_ratios(list(closes), date_range)
             
         except Exception as e:
             raise ValueError(f"Error fetching price data: {str(e)}")
+        
+        result = {}
+        for ticker, split_adjusted in closes.items():
+            ticker_splits = splits.get(ticker, pd.Series(dtype=float))
+            factors = action_factors(split_adjusted, dividends.get(ticker, pd.Series(dtype=float)), ticker_splits)
+            result[ticker] = RawPriceHistory(
+                closes=(raw_closes(split_adjusted, ticker_splits) * later_ratios.get(ticker, 1.0))[
+                    split_adjusted.index >= start],
+                factors=factors[factors.index >= start]
+            )
+        
+        return result
+    
+    def _get_later_split_ratios(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, float]:
+        """Product of the split ratios from the range end through today, per ticker (past ranges only)."""
+        today = pd.Timestamp.today().normalize()
+        if not tickers or pd.Timestamp(date_range.end) >= today:
+            return {}
+        
+        # yfinance's end is exclusive: tomorrow includes today's splits
+        data = self._fetch_client.download(
+            [ticker.symbol for ticker in tickers],
+            start=date_range.end,
+            end=(today + pd.Timedelta(days=1)).strftime('%Y-%m-%d'),
+            interval=LATER_SPLITS_INTERVAL,
+            auto_adjust=False,
+            actions=True,
+            progress=False,
+            group_by="ticker"
+        )
+        if data.empty:
+            return {}
+        
+        return {
+            ticker: float(splits[splits > 0].prod())
+            for ticker, splits in self._extract_column(data, tickers, 'Stock Splits').items()
+        }
+    
+    def _extract_close_prices(self, data: pd.DataFrame, tickers: List[Ticker]) -> Dict[Ticker, pd.Series]:
+        """Extract per-ticker close price series from a yfinance download frame."""
+        return self._extract_column(data, tickers, 'Close')
+    
+    def _extract_column(self, data: pd.DataFrame, tickers: List[Ticker], column: str) -> Dict[Ticker, pd.Series]:
+        """Extract one per-ticker column (Close, Dividends, ...) from a yfinance download frame."""
+        result = {}
+        
+        # Handle both single and multiple ticker cases
+        for ticker in tickers:
+            symbol = ticker.symbol
+            try:
+                # Check for multi-level columns (most common case)
+                if hasattr(data.columns, 'levels') and len(data.columns.levels) > 1:
+                    # Multi-level columns: (symbol, column)
+                    if symbol in data.columns.levels[0] and column in data.columns.levels[1]:
+                        prices = data[symbol][column].dropna()
+                        if not prices.empty:
+                            result[ticker] = prices
+                else:
+                    # Single level columns
+                    if column in data.columns:
+                        # Single ticker case
+                        prices = data[column].dropna()
+                        if not prices.empty:
+                            result[ticker] = prices
+                    elif f"{symbol}_{column}" in data.columns:
+                        # Multiple tickers with underscore format
+                        prices = data[f"{symbol}_{column}"].dropna()
+                        if not prices.empty:
+                            result[ticker] = prices
+            except (KeyError, AttributeError, IndexError) as e:
+                # Skip tickers with no data
+                print(f"Warning: No data found for {symbol}: {e}")
+                continue
+        
+        return result
     
     def get_current_prices(self, tickers: List[Ticker]) -> Dict[Ticker, Money]:
-        """Get current prices for tickers."""
+        """Get current prices for tickers with a single batched download."""
+        if not tickers:
+            return {}
+        
         ticker_symbols = [ticker.symbol for ticker in tickers]
         
         try:
-            result = {}
+            # The latest daily bar carries the live price during market hours
+            data = self._fetch_client.download(
+                ticker_symbols,
+                period="5d",
+                interval="1d",
+                auto_adjust=False,
+                progress=False,
+                group_by="ticker"
+            )
             
-            for ticker in tickers:
-                ticker_obj = yf.Ticker(ticker.symbol)
-                info = ticker_obj.info
-                
-                # Try different price fields
-                current_price = None
-                price_fields = ['currentPrice', 'regularMarketPrice', 'previousClose']
-                
-                for field in price_fields:
-                    if field in info and info[field] is not None:
-                        current_price = float(info[field])
-                        break
-                
-                if current_price is not None and current_price > 0:
+            if data.empty:
+                return {}
+            
+            result = {}
+            for ticker, prices in self._extract_close_prices(data, tickers).items():
+                current_price = float(prices.iloc[-1])
+                if current_price > 0:
                     result[ticker] = Money(current_price)
             
             return result
@@ -99,15 +195,16 @@ class YFinanceMarketRepository(MarketDataRepository):
     
     def get_benchmark_data(self, benchmark_symbol: str, 
                           date_range: DateRange) -> pd.Series:
-        """Get benchmark data (e.g., S&P 500) for Beta calculation."""
+        """Get dividend-adjusted benchmark data (e.g., S&P 500) for Beta calculation, like ``get_price_history``."""
         try:
             # Download benchmark data
-            data = yf.download(
+            data = self._fetch_client.call(
+                self._fetch_client.transport.download,
                 benchmark_symbol,
                 start=date_range.start,
                 end=date_range.end,
                 progress=False,
-                auto_adjust=False
+                auto_adjust=True
             )
             
             if data.empty:
@@ -137,8 +234,7 @@ class YFinanceMarketRepository(MarketDataRepository):
                            date_range: DateRange) -> pd.Series:
         """Get dividend history for a ticker."""
         try:
-            ticker_obj = yf.Ticker(ticker.symbol)
-            dividends = ticker_obj.dividends
+            dividends = self._fetch_client.get_ticker_attribute(ticker.symbol, 'dividends')
             
             if dividends.empty:
                 return pd.Series(dtype='float64', name='Dividends')
@@ -165,7 +261,10 @@ class YFinanceMarketRepository(MarketDataRepository):
     def get_ticker_info(self, ticker: Ticker) -> Dict:
         """Get additional ticker information."""
         try:
-            ticker_obj = yf.Ticker(ticker.symbol)
-            return ticker_obj.info
+            return self._fetch_client.get_ticker_attribute(ticker.symbol, 'info')
         except Exception:
             return {}
+    
+    def get_fetch_metrics(self) -> Dict:
+        """Get Yahoo fetch client metrics (requests, retries, circuit state)."""
+        return self._fetch_client.get_metrics()
@@ -0,0 +1,159 @@
+"""
+Async fetch pipeline for warehouse miss handling.
+
+Fetches run as asyncio tasks on a long-lived event loop thread, each one
+offloading the blocking call to a shared thread pool under a concurrency
+bound. Completed fetches are handed to a single writer task, so persisting
+one result overlaps with the remaining downloads, and results are returned
+to the caller as they complete.
+"""
+
+import asyncio
+import concurrent.futures
+import queue
+import threading
+from typing import Any, Callable, Dict, Hashable, Iterable, Iterator, Optional, Tuple
+
+
+_DONE = object()
+
+
+class AsyncFetchPipeline:
+    """Bounded-concurrency fetch pipeline with pipelined writes."""
+
+    def __init__(self, max_concurrency: int = 8):
+        """
+        Initialize the fetch pipeline.
+
+        Args:
+            max_concurrency: Maximum number of fetches in flight at once
+        """
+        self.max_concurrency = max_concurrency
+
+        # Long-lived pools: fetches share one, writes are serialized on another
+        self._fetch_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=max_concurrency, thread_name_prefix="fetch"
+        )
+        self._write_executor = concurrent.futures.ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="fetch-write"
+        )
+
+        self._loop = asyncio.new_event_loop()
+        self._loop_thread = threading.Thread(
+            target=self._loop.run_forever, name="fetch-pipeline", daemon=True
+        )
+        self._loop_thread.start()
+
+        # Observability counters
+        self._lock = threading.Lock()
+        self.fetches = 0
+        self.fetch_failures = 0
+        self.writes = 0
+        self.write_failures = 0
+
+    def fetch_iter(self,
+                   items: Iterable[Hashable],
+                   fetch_func: Callable[[Any], Any],
+                   store_func: Optional[Callable[[Any, Any], None]] = None) -> Iterator[Tuple[Any, Any]]:
+        """
+        Fetch items concurrently, yielding (item, data) as each fetch completes.
+
+        Args:
+            items: Items to fetch (e.g. tickers or ticker batches)
+            fetch_func: Blocking function returning the data for one item
+            store_func: Blocking function persisting (item, data); runs on the
+                writer while other fetches continue
+
+        Returns:
+            Iterator of (item, data) in completion order; data is None when the
+            fetch failed. The iterator finishes once all writes are done.
+        """
+        results = queue.Queue()
+        future = asyncio.run_coroutine_threadsafe(
+            self._run(list(items), fetch_func, store_func, results.put), self._loop
+        )
+
+        try:
+            while True:
+                entry = results.get()
+                if entry is _DONE:
+                    break
+                yield entry
+        finally:
+            future.result()
+
+    def fetch_all(self,
+                  items: Iterable[Hashable],
+                  fetch_func: Callable[[Any], Any],
+                  store_func: Optional[Callable[[Any, Any], None]] = None) -> Dict[Any, Any]:
+        """Fetch items concurrently and return {item: data} for successful fetches."""
+        return {
+            item: data
+            for item, data in self.fetch_iter(items, fetch_func, store_func)
+            if data is not None
+        }
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get pipeline metrics for monitoring."""
+        return {
+            "pipeline_fetches": self.fetches,
+            "pipeline_fetch_failures": self.fetch_failures,
+            "pipeline_writes": self.writes,
+            "pipeline_write_failures": self.write_failures
+        }
+
+    async def _run(self, items, fetch_func, store_func, emit) -> None:
+        """Run all fetches under the concurrency bound, feeding the writer."""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        writes = asyncio.Queue()
+
+        async def fetch(item):
+            async with semaphore:
+                try:
+                    data = await loop.run_in_executor(self._fetch_executor, fetch_func, item)
+                    self._increment('fetches')
+                except Exception:
+                    data = None
+                    self._increment('fetch_failures')
+
+            if data is not None and store_func is not None:
+                writes.put_nowait((item, data))
+            emit((item, data))
+
+        async def write():
+            while True:
+                entry = await writes.get()
+                if entry is _DONE:
+                    return
+                try:
+                    await loop.run_in_executor(self._write_executor, store_func, *entry)
+                    self._increment('writes')
+                except Exception:
+                    self._increment('write_failures')
+
+        writer = loop.create_task(write()) if store_func is not None else None
+        try:
+            await asyncio.gather(*(fetch(item) for item in items))
+        finally:
+            if writer is not None:
+                writes.put_nowait(_DONE)
+                await writer
+            emit(_DONE)
+
+    def _increment(self, counter: str) -> None:
+        """Increment an observability counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+# Global instance
+_async_fetch_pipeline: Optional[AsyncFetchPipeline] = None
+
+
+def get_async_fetch_pipeline() -> AsyncFetchPipeline:
+    """Get or create the global async fetch pipeline instance."""
+    global _async_fetch_pipeline
+    if _async_fetch_pipeline is None:
+        _async_fetch_pipeline = AsyncFetchPipeline()
+    return _async_fetch_pipeline
@@ -0,0 +1,113 @@
+"""
+Vectorized holdings engine for transaction-ledger portfolios.
+
+Transactions are scattered into a dates x tickers matrix of quantity changes
+(one ``np.add.at``) and accumulated with a single cumulative sum, so building
+holdings costs O(events + days x tickers) rather than a pass over the date
+range per transaction. Portfolio value, external cash flows and the
+time-weighted return are then whole-array operations on that matrix.
+"""
+
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+from typing import List
+
+from ...domain.entities.transaction_ledger import TransactionLedger
+
+
+@dataclass
+class HoldingsResult:
+    """Daily holdings, value and returns of a ledger portfolio."""
+    dates: pd.DatetimeIndex
+    symbols: List[str]  # Column order of ``quantities``
+    quantities: np.ndarray  # (days, tickers) shares held at each close
+    values: pd.Series  # Portfolio market value at each close
+    cash_flows: pd.Series  # Net external flow per day: buys positive, sells negative
+    daily_returns: pd.Series  # Time-weighted daily returns
+    twr_index: pd.Series  # Growth of 1 at time-weighted return, 1.0 before the first trade
+    time_weighted_return: float  # Percent over the whole period
+    net_invested: float  # Sum of all cash flows
+    transactions_applied: int  # Transactions inside the priced date range
+
+
+class HoldingsEngine:
+    """Builds daily holdings, values and time-weighted returns from a transaction ledger."""
+
+    def calculate(self, ledger: TransactionLedger, prices: pd.DataFrame) -> HoldingsResult:
+        """
+        Calculate holdings and performance for a ledger.
+
+        Args:
+            ledger: Validated transaction ledger
+            prices: Daily closes, one column per symbol (subset of the ledger's symbols);
+                the index defines the trading days. Symbols without a column are ignored.
+
+        Returns:
+            HoldingsResult over the trading days of ``prices``
+
+        Raises:
+            ValueError: If no ledger symbol has prices or no transaction falls in the range
+        """
+        prices = prices.sort_index()
+        symbols = [symbol for symbol in ledger.unique_symbols if symbol in prices.columns]
+        if not symbols or prices.empty:
+            raise ValueError("No price data for any ledger ticker")
+
+        dates = prices.index
+        # Gaps are carried forward; a ticker traded before its first close is valued at that close
+        price_matrix = prices[symbols].ffill().bfill().to_numpy(dtype=float)
+
+        # Map ledger symbol codes to priced columns (-1 when unpriced)
+        priced = {symbol: column for column, symbol in enumerate(symbols)}
+        column_of_code = np.array([priced.get(symbol, -1) for symbol in ledger.unique_symbols])
+        columns = column_of_code[ledger.symbol_codes]
+
+        # Trades on non-trading days settle on the next trading day
+        rows = np.searchsorted(dates.values.astype('datetime64[D]'), ledger.dates, side='left')
+        applied = (columns >= 0) & (rows < len(dates))
+        rows, columns = rows[applied], columns[applied]
+        quantities = ledger.quantities[applied]
+        if not applied.any():
+            raise ValueError("No transactions fall within the priced date range")
+
+        holdings = np.zeros((len(dates), len(symbols)))
+        np.add.at(holdings, (rows, columns), quantities)
+        np.cumsum(holdings, axis=0, out=holdings)
+
+        values = np.einsum('ij,ij->i', holdings, price_matrix)
+        flows = np.bincount(rows, weights=quantities * ledger.prices[applied], minlength=len(dates))
+
+        daily_returns = self._time_weighted_returns(values, flows)
+        twr_index = np.cumprod(1 + daily_returns)
+
+        return HoldingsResult(
+            dates=dates,
+            symbols=symbols,
+            quantities=holdings,
+            values=pd.Series(values, index=dates),
+            cash_flows=pd.Series(flows, index=dates),
+            daily_returns=pd.Series(daily_returns, index=dates),
+            twr_index=pd.Series(twr_index, index=dates),
+            time_weighted_return=float((twr_index[-1] - 1) * 100),
+            net_invested=float(flows.sum()),
+            transactions_applied=int(applied.sum())
+        )
+
+    @staticmethod
+    def _time_weighted_returns(values: np.ndarray, flows: np.ndarray) -> np.ndarray:
+        """
+        Daily returns with external flows removed.
+
+        Trades are priced at their fill, which usually sits close to the day's
+        close, so flows are treated as end-of-day: the day's gain (change in value
+        less net flow) is measured against the previous close. When nothing was
+        held at the previous close, the day's inflow is the capital instead.
+        Days with no capital return zero.
+        """
+        previous = np.r_[0.0, values[:-1]]
+        gains = values - previous - flows
+        capital = np.where(previous > 0, previous, np.maximum(flows, 0.0))
+        returns = np.zeros_like(values)
+        np.divide(gains, capital, out=returns, where=capital > 0)
+        return returns
@@ -0,0 +1,96 @@
+"""
+Top-k and bottom-k leaderboards for many metrics over many tickers.
+
+Metric values are gathered once into a (metrics x tickers) matrix oriented
+so that larger is better. One ``np.argpartition`` per direction then finds
+every metric's k best and k worst tickers without sorting whole columns;
+only the selected tickers (plus any tied with the k-th) are sorted.
+
+Ties keep the order of the ranked items, like Python's stable ``sorted``.
+NaN values are never ranked, so a leaderboard can hold fewer than k entries.
+"""
+
+from dataclasses import dataclass
+from typing import Any, Dict, List, Sequence
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class RankedMetric:
+    """One leaderboard: the metric attribute and which direction is better."""
+    name: str
+    attribute: str
+    higher_is_better: bool = True
+    absolute: bool = False  # Rank by magnitude, e.g. correlation for diversification
+
+
+@dataclass
+class Leaderboard:
+    """Indices into the ranked items, best first and worst first."""
+    best: List[int]
+    worst: List[int]
+
+
+class MetricRanker:
+    """Ranks items by several metrics at once."""
+
+    def __init__(self, metrics: Sequence[RankedMetric]):
+        self.metrics = list(metrics)
+
+    def matrix(self, items: Sequence[Any]) -> np.ndarray:
+        """(metrics x items) values, negated for lower-is-better metrics."""
+        values = np.empty((len(self.metrics), len(items)), dtype=float)
+        for row, metric in enumerate(self.metrics):
+            column = [getattr(item, metric.attribute) for item in items]
+            # Value objects (Percentage) share one type per attribute, so the first one decides
+            if column and hasattr(column[0], 'value'):
+                column = [value.value for value in column]
+            values[row] = column
+        for row, metric in enumerate(self.metrics):
+            if metric.absolute:
+                np.abs(values[row], out=values[row])
+            if not metric.higher_is_better:
+                np.negative(values[row], out=values[row])
+        return values
+
+    def rank(self, items: Sequence[Any], k: int) -> Dict[str, Leaderboard]:
+        """The k best and k worst items of every metric, by index into ``items``."""
+        return self.rank_matrix(self.matrix(items), k)
+
+    def rank_matrix(self, oriented: np.ndarray, k: int) -> Dict[str, Leaderboard]:
+        """Leaderboards of an oriented (metrics x items) matrix, as built by ``matrix``."""
+        missing = np.isnan(oriented)
+        # Ascending selection keys: NaN sorts after every value in both directions and is dropped
+        best_keys, worst_keys = -oriented, oriented.copy()
+        if missing.any():
+            best_keys[missing] = worst_keys[missing] = np.inf
+        best = self._select(best_keys, k, missing)
+        worst = self._select(worst_keys, k, missing)
+        return {metric.name: Leaderboard(best[row], worst[row]) for row, metric in enumerate(self.metrics)}
+
+    @staticmethod
+    def _select(keys: np.ndarray, k: int, missing: np.ndarray) -> List[List[int]]:
+        """Per row, the indices of the k smallest keys in ascending order, ties by index."""
+        rows, count = keys.shape
+        k = min(k, count)
+        if k <= 0:
+            return [[] for _ in range(rows)]
+        if k < count:
+            partitioned = np.argpartition(keys, k - 1, axis=1)[:, :k]
+        else:
+            partitioned = np.broadcast_to(np.arange(count), keys.shape)
+        partitioned_keys = np.take_along_axis(keys, partitioned, axis=1)
+        kth = partitioned_keys.max(axis=1)
+        order = np.take_along_axis(partitioned, np.lexsort((partitioned, partitioned_keys), axis=1), axis=1)
+        # Rows with more ties at the k-th key than slots left: the partition picked arbitrary ones,
+        # so re-select every tied candidate and keep the earliest
+        tied_rows = np.flatnonzero((keys <= kth[:, np.newaxis]).sum(axis=1) > k)
+
+        selected = order.tolist()
+        for row in tied_rows:
+            candidates = np.flatnonzero(keys[row] <= kth[row])
+            selected[row] = candidates[np.lexsort((candidates, keys[row, candidates]))][:k].tolist()
+        for row in np.flatnonzero(missing.any(axis=1)):
+            selected[row] = [index for index in selected[row] if not missing[row, index]]
+        return selected
@@ -0,0 +1,174 @@
+"""
+Monte Carlo simulation service for forward portfolio value.
+
+Paths are simulated for fixed holdings (buy-and-hold) from a matrix of daily
+log returns, either by bootstrapping historical days (keeping the cross-asset
+structure of each day) or by drawing from a multivariate normal through the
+Cholesky factor of the return covariance. Paths are generated in chunks of
+vectorized NumPy work sized to a memory cap, so the number of paths is bounded
+by time rather than memory.
+"""
+
+import numpy as np
+from dataclasses import dataclass
+from typing import Dict, Optional, Sequence, Tuple
+
+
+@dataclass
+class SimulationResult:
+    """Summary of a Monte Carlo simulation."""
+    method: str
+    paths: int
+    steps: int
+    initial_value: float
+    expected_value: float  # Mean terminal portfolio value
+    var: Dict[float, float]  # Confidence -> VaR as a percent return over the horizon (negative is a loss)
+    expected_shortfall: Dict[float, float]  # Confidence -> mean percent return beyond VaR
+    percentiles: Tuple[float, ...]
+    fan_chart: np.ndarray  # (len(percentiles), steps + 1) portfolio values, step 0 is today
+
+
+class MonteCarloSimulator:
+    """Chunked, vectorized Monte Carlo simulator for buy-and-hold portfolios."""
+
+    METHODS = ('bootstrap', 'mvn')
+    BLOCK_STEPS = 21  # Steps generated per vectorized block (about one trading month)
+
+    def __init__(self, memory_limit_bytes: int = 512 * 1024 * 1024, dtype=np.float32):
+        """
+        Initialize the simulator.
+
+        Args:
+            memory_limit_bytes: Cap on simulation memory (path values plus chunk workspace)
+            dtype: Floating type for simulated draws; float32 halves memory and time
+        """
+        self.memory_limit_bytes = memory_limit_bytes
+        self.dtype = np.dtype(dtype)
+
+    def simulate(self,
+                 log_returns: np.ndarray,
+                 initial_values: np.ndarray,
+                 paths: int,
+                 steps: int,
+                 method: str = 'bootstrap',
+                 seed: Optional[int] = None,
+                 confidence_levels: Sequence[float] = (0.95, 0.99),
+                 percentiles: Sequence[float] = (5, 25, 50, 75, 95)) -> SimulationResult:
+        """
+        Simulate forward portfolio values.
+
+        Args:
+            log_returns: Historical daily log returns, shape (days, assets), no NaN
+            initial_values: Current value of each position, shape (assets,)
+            paths: Number of simulated paths
+            steps: Horizon in trading days
+            method: 'bootstrap' (resample historical days) or 'mvn' (Cholesky multivariate normal)
+            seed: Seed for the NumPy Generator; results are reproducible for the
+                same seed and memory limit
+            confidence_levels: VaR / ES confidence levels
+            percentiles: Percentiles for the fan chart
+
+        Returns:
+            SimulationResult with VaR, expected shortfall and fan chart
+
+        Raises:
+            ValueError: On invalid inputs or a memory limit too small for the request
+        """
+        if method not in self.METHODS:
+            raise ValueError(f"Unknown simulation method: {method}. Use one of {', '.join(self.METHODS)}")
+
+        log_returns = np.asarray(log_returns, dtype=float)
+        initial_values = np.asarray(initial_values, dtype=float)
+        if log_returns.ndim != 2 or log_returns.shape[0] < 2 or log_returns.shape[1] != initial_values.shape[0]:
+            raise ValueError("log_returns must be (days >= 2, assets) and match initial_values")
+        if paths < 1 or steps < 1:
+            raise ValueError("paths and steps must be positive")
+
+        initial_value = float(initial_values.sum())
+        if initial_value <= 0:
+            raise ValueError("Portfolio initial value must be positive")
+
+        assets = log_returns.shape[1]
+        chunk_paths, block_steps = self._chunk_shape(paths, steps, assets)
+        rng = np.random.default_rng(seed)
+
+        if method == 'mvn':
+            drift = log_returns.mean(axis=0).astype(self.dtype)
+            factor = self._cholesky(np.atleast_2d(np.cov(log_returns, rowvar=False))).T.astype(self.dtype)
+            sampler = lambda shape: self._mvn_draws(rng, shape, drift, factor)
+        else:
+            history = log_returns.astype(self.dtype)
+            sampler = lambda shape: history[rng.integers(0, history.shape[0], shape[:2])]
+
+        # Portfolio value of every path at every step; the only paths-sized buffer
+        values = np.empty((paths, steps + 1), dtype=self.dtype)
+        values[:, 0] = initial_value
+        weights = initial_values.astype(self.dtype)
+
+        for start in range(0, paths, chunk_paths):
+            count = min(chunk_paths, paths - start)
+            log_wealth = np.zeros((count, assets), dtype=self.dtype)
+            for step in range(0, steps, block_steps):
+                block = min(block_steps, steps - step)
+                draws = sampler((count, block, assets))
+                np.cumsum(draws, axis=1, out=draws)
+                draws += log_wealth[:, None, :]
+                log_wealth = draws[:, -1, :].copy()
+                np.exp(draws, out=draws)
+                values[start:start + count, step + 1:step + 1 + block] = draws @ weights
+
+        terminal_returns = values[:, -1].astype(float) / initial_value - 1
+        var, expected_shortfall = {}, {}
+        for level in confidence_levels:
+            threshold = np.percentile(terminal_returns, (1 - level) * 100)
+            var[level] = float(threshold * 100)
+            expected_shortfall[level] = float(terminal_returns[terminal_returns <= threshold].mean() * 100)
+
+        return SimulationResult(
+            method=method,
+            paths=paths,
+            steps=steps,
+            initial_value=initial_value,
+            expected_value=float(values[:, -1].mean(dtype=float)),
+            var=var,
+            expected_shortfall=expected_shortfall,
+            percentiles=tuple(percentiles),
+            fan_chart=np.percentile(values, percentiles, axis=0).astype(float)
+        )
+
+    def _chunk_shape(self, paths: int, steps: int, assets: int) -> Tuple[int, int]:
+        """Paths per chunk and steps per block that keep values plus workspace under the memory cap."""
+        # Path values, plus the partitioned copy np.percentile makes for the fan chart
+        values_bytes = 2 * paths * (steps + 1) * self.dtype.itemsize
+        workspace_bytes = self.memory_limit_bytes - values_bytes
+
+        block_steps = min(steps, self.BLOCK_STEPS)
+        # Draws plus one same-sized temporary (matmul / gather), plus the per-path log wealth
+        bytes_per_path = (2 * block_steps + 1) * assets * self.dtype.itemsize
+        chunk_paths = min(paths, workspace_bytes // bytes_per_path) if workspace_bytes > 0 else 0
+
+        if chunk_paths < 1:
+            raise ValueError(
+                f"Memory limit of {self.memory_limit_bytes / 1024 ** 2:.0f} MB is too small for "
+                f"{paths} paths x {steps} steps x {assets} assets"
+            )
+        return int(chunk_paths), block_steps
+
+    def _mvn_draws(self, rng: np.random.Generator, shape: Tuple[int, int, int],
+                   drift: np.ndarray, factor: np.ndarray) -> np.ndarray:
+        """Correlated normal log returns: drift + z @ L.T."""
+        draws = rng.standard_normal(shape, dtype=self.dtype) @ factor
+        draws += drift
+        return draws
+
+    @staticmethod
+    def _cholesky(covariance: np.ndarray) -> np.ndarray:
+        """Cholesky factor, adding diagonal jitter when the sample covariance is not positive definite."""
+        jitter = 0.0
+        scale = max(float(np.trace(covariance)) / covariance.shape[0], 1e-12)
+        for _ in range(8):
+            try:
+                return np.linalg.cholesky(covariance + jitter * np.eye(covariance.shape[0]))
+            except np.linalg.LinAlgError:
+                jitter = scale * 1e-10 if jitter == 0.0 else jitter * 100
+        raise ValueError("Return covariance is not positive definite")
@@ -7,7 +7,7 @@ financial calculations while maintaining error isolation and resource management
 
 import concurrent.futures
 import threading
-from typing import List, Dict, Any, Callable, Optional, Tuple
+from typing import List, Dict, Any, Callable, Iterator, Optional, Tuple
 from dataclasses import dataclass
 
 
@@ -78,6 +78,40 @@ class ParallelCalculationService:
         Returns:
             Tuple of (successful_metrics, failed_ticker_symbols)
         """
+        successful_metrics = []
+        failed_tickers = []
+        
+        for symbol, metrics in self.iter_ticker_metrics_parallel(
+            tickers, all_price_data, all_dividend_data, risk_free_rate,
+            date_range, benchmark_data, calculation_func
+        ):
+            if metrics is not None:
+                successful_metrics.append(metrics)
+            else:
+                failed_tickers.append(symbol)
+        
+        return successful_metrics, failed_tickers
+    
+    def iter_ticker_metrics_parallel(
+        self, 
+        tickers: List[Any],
+        all_price_data: Dict[Any, Any],
+        all_dividend_data: Dict[Any, Any],
+        risk_free_rate: float,
+        date_range: Any,
+        benchmark_data: Any,
+        calculation_func: Callable
+    ) -> Iterator[Tuple[str, Optional[Any]]]:
+        """
+        Calculate ticker metrics in parallel, yielding each result as it completes.
+        
+        Args:
+            Same as ``calculate_ticker_metrics_parallel``
+            
+        Returns:
+            Iterator of (ticker_symbol, metrics) in completion order; metrics is
+            None when the calculation failed
+        """
         
         # Create calculation tasks
         tasks = []
@@ -97,25 +131,16 @@ class ParallelCalculationService:
             )
             tasks.append(task)
         
-        # Execute tasks in parallel
-        results = self._execute_tasks_parallel(tasks)
-        
-        # Process results
-        successful_metrics = []
-        failed_tickers = []
-        
-        for result in results:
-            if result.success:
-                successful_metrics.append(result.result)
-            else:
-                failed_tickers.append(result.task_id.split('_', 2)[2])  # Extract ticker symbol
-        
-        return successful_metrics, failed_tickers
+        for result in self._iter_tasks_parallel(tasks):
+            symbol = result.task_id.split('_', 2)[2]  # Extract ticker symbol
+            yield symbol, (result.result if result.success else None)
     
     def _execute_tasks_parallel(self, tasks: List[CalculationTask]) -> List[CalculationResult]:
         """Execute calculation tasks in parallel using ThreadPoolExecutor."""
-        results = []
-        
+        return list(self._iter_tasks_parallel(tasks))
+    
+    def _iter_tasks_parallel(self, tasks: List[CalculationTask]) -> Iterator[CalculationResult]:
+        """Execute calculation tasks in parallel, yielding results as they complete."""
         with concurrent.futures.ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             # Submit all tasks
             future_to_task = {
@@ -123,20 +148,23 @@ class ParallelCalculationService:
                 for task in tasks
             }
             
-            # Collect results as they complete
-            for future in concurrent.futures.as_completed(future_to_task):
-                task = future_to_task[future]
-                try:
-                    result = future.result()
-                    results.append(result)
-                except Exception as e:
-                    results.append(CalculationResult(
-                        task_id=task.task_id,
-                        success=False,
-                        error=f"Unexpected error: {str(e)}"
-                    ))
-        
-        return results
+            try:
+                # Collect results as they complete
+                for future in concurrent.futures.as_completed(future_to_task):
+                    task = future_to_task[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = CalculationResult(
+                            task_id=task.task_id,
+                            success=False,
+                            error=f"Unexpected error: {str(e)}"
+                        )
+                    yield result
+            finally:
+                # Consumer stopped early (e.g. client disconnected) - drop queued work
+                for future in future_to_task:
+                    future.cancel()
     
     def _execute_single_task(self, task: CalculationTask) -> CalculationResult:
         """Execute a single calculation task."""
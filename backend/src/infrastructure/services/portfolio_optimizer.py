@@ -0,0 +1,310 @@
+"""
+Long-only portfolio optimizer: minimum variance, maximum Sharpe, risk parity
+and the efficient frontier.
+
+Expected returns and covariance are estimated from an aligned matrix of daily
+returns, optionally with Ledoit-Wolf shrinkage of the covariance towards a
+scaled identity. Mean-variance problems over the fully invested, long-only
+simplex are solved with accelerated projected gradient (FISTA with adaptive
+restart); neighbouring frontier points are warm-started from each other.
+Risk parity is solved with a damped Newton method on its convex log-barrier
+formulation. Everything is plain NumPy.
+"""
+
+import numpy as np
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
+
+TRADING_DAYS = 252
+
+
+@dataclass
+class PortfolioAllocation:
+    """One set of weights and its annualized risk and return."""
+    weights: np.ndarray
+    expected_return: float  # Annualized percent
+    volatility: float  # Annualized percent
+    sharpe_ratio: Optional[float]
+    risk_contributions: np.ndarray  # Fraction of portfolio variance per asset, sums to 1
+
+
+@dataclass
+class OptimizationResult:
+    """Optimized allocations for one return matrix."""
+    min_variance: PortfolioAllocation
+    max_sharpe: PortfolioAllocation
+    risk_parity: PortfolioAllocation
+    frontier: List[PortfolioAllocation] = field(default_factory=list)
+    shrinkage: float = 0.0  # Ledoit-Wolf intensity, 0 when shrinkage is off
+    iterations: int = 0  # Projected-gradient iterations across all solves
+
+
+class PortfolioOptimizer:
+    """Vectorized long-only mean-variance and risk-parity optimizer."""
+
+    def __init__(self, max_iterations: int = 20000, tolerance: float = 1e-10):
+        """
+        Initialize the optimizer.
+
+        Args:
+            max_iterations: Iteration cap for each projected-gradient solve
+            tolerance: Convergence threshold on the largest weight change per iteration
+        """
+        self.max_iterations = max_iterations
+        self.tolerance = tolerance
+
+    def optimize(self,
+                 returns: np.ndarray,
+                 risk_free_rate: float = 0.03,
+                 frontier_points: int = 20,
+                 shrinkage: bool = True) -> OptimizationResult:
+        """
+        Optimize weights for a matrix of daily returns.
+
+        Args:
+            returns: Aligned daily simple returns, shape (days, assets), no NaN
+            risk_free_rate: Annual risk-free rate for the Sharpe ratio
+            frontier_points: Number of efficient frontier points (0 skips the frontier)
+            shrinkage: Apply Ledoit-Wolf shrinkage to the covariance
+
+        Returns:
+            OptimizationResult with each allocation and the frontier
+
+        Raises:
+            ValueError: If the return matrix is too short or malformed
+        """
+        returns = np.asarray(returns, dtype=float)
+        if returns.ndim != 2 or returns.shape[0] < 3 or returns.shape[1] < 1:
+            raise ValueError("returns must be (days >= 3, assets >= 1)")
+
+        mean, covariance, intensity = self.estimate(returns, shrinkage)
+        lipschitz = float(np.linalg.eigvalsh(covariance)[-1])
+
+        min_variance, min_variance_iterations = self._solve_mean_variance(mean, covariance, 0.0, lipschitz)
+        frontier_weights, frontier_iterations = self.efficient_frontier(
+            mean, covariance, frontier_points, lipschitz, min_variance)
+        max_sharpe, max_sharpe_iterations = self.max_sharpe(mean, covariance, risk_free_rate, lipschitz, min_variance)
+        risk_parity = self.risk_parity(covariance)
+
+        allocate = lambda weights: self.evaluate(weights, mean, covariance, risk_free_rate)
+        return OptimizationResult(
+            min_variance=allocate(min_variance),
+            max_sharpe=allocate(max_sharpe),
+            risk_parity=allocate(risk_parity),
+            frontier=[allocate(weights) for weights in frontier_weights],
+            shrinkage=intensity,
+            iterations=min_variance_iterations + frontier_iterations + max_sharpe_iterations
+        )
+
+    def estimate(self, returns: np.ndarray, shrinkage: bool = True) -> Tuple[np.ndarray, np.ndarray, float]:
+        """
+        Annualized mean returns and covariance.
+
+        Returns:
+            Tuple of (mean, covariance, shrinkage intensity)
+        """
+        mean = returns.mean(axis=0) * TRADING_DAYS
+        if shrinkage:
+            covariance, intensity = self.ledoit_wolf(returns)
+        else:
+            covariance, intensity = np.atleast_2d(np.cov(returns, rowvar=False, ddof=0)), 0.0
+        return mean, covariance * TRADING_DAYS, intensity
+
+    @staticmethod
+    def ledoit_wolf(returns: np.ndarray) -> Tuple[np.ndarray, float]:
+        """
+        Ledoit-Wolf (2004) shrinkage of the sample covariance towards a scaled identity.
+
+        Args:
+            returns: Observations, shape (days, assets)
+
+        Returns:
+            Tuple of (shrunk covariance, shrinkage intensity in [0, 1])
+        """
+        days, assets = returns.shape
+        centered = returns - returns.mean(axis=0)
+        sample = centered.T @ centered / days
+
+        target_scale = np.trace(sample) / assets
+        dispersion = np.sum((sample - target_scale * np.eye(assets)) ** 2) / assets
+        if dispersion == 0:
+            return sample, 0.0
+
+        # Mean squared distance of each observation's outer product from the sample covariance,
+        # from row norms instead of materializing the outer products
+        row_norms = np.einsum('ij,ij->i', centered, centered)
+        estimation_error = (np.sum(row_norms ** 2) / days - np.sum(sample ** 2)) / (days * assets)
+
+        intensity = float(min(max(estimation_error, 0.0), dispersion) / dispersion)
+        shrunk = (1 - intensity) * sample
+        shrunk[np.diag_indices(assets)] += intensity * target_scale
+        return shrunk, intensity
+
+    def efficient_frontier(self, mean: np.ndarray, covariance: np.ndarray, points: int,
+                           lipschitz: float, min_variance: np.ndarray) -> Tuple[List[np.ndarray], int]:
+        """
+        Frontier weights from minimum variance to maximum return, and the solver iterations used.
+
+        Each point minimizes ``0.5 w'Cw - t mu'w`` for a risk tolerance ``t`` between 0
+        and the smallest value at which the highest-return asset alone is optimal.
+        Points are solved in order of ``t`` and each starts from the previous solution.
+        """
+        if points <= 0:
+            return [], 0
+        if points == 1:
+            return [min_variance], 0
+
+        tolerances = self._max_risk_tolerance(mean, covariance) * np.linspace(0, 1, points) ** 2
+        frontier, iterations = [min_variance], 0
+        for tolerance in tolerances[1:]:
+            weights, used = self._solve_mean_variance(mean, covariance, tolerance, lipschitz, frontier[-1])
+            frontier.append(weights)
+            iterations += used
+        return frontier, iterations
+
+    def max_sharpe(self, mean: np.ndarray, covariance: np.ndarray, risk_free_rate: float,
+                   lipschitz: float, min_variance: np.ndarray) -> Tuple[np.ndarray, int]:
+        """
+        Maximum Sharpe ratio weights, and the solver iterations used.
+
+        The tangency portfolio lies on the efficient frontier and the Sharpe ratio is
+        unimodal along it, so a golden-section search over the risk tolerance finds it;
+        each probe is warm-started from the last.
+        """
+        sharpe = lambda weights: (weights @ mean - risk_free_rate) / np.sqrt(max(weights @ covariance @ weights, 1e-18))
+        if mean.max() <= risk_free_rate:
+            # No asset beats the risk-free rate, so there is no tangency portfolio; fall back to minimum variance
+            return min_variance, 0
+
+        low, high = 0.0, self._max_risk_tolerance(mean, covariance)
+        golden = (np.sqrt(5) - 1) / 2
+        weights = min_variance
+        best_weights, best_sharpe = min_variance, sharpe(min_variance)
+        iterations = 0
+
+        while high - low > 1e-6 * max(high, 1e-12):
+            left, right = high - golden * (high - low), low + golden * (high - low)
+            left_weights, left_iterations = self._solve_mean_variance(mean, covariance, left, lipschitz, weights)
+            right_weights, right_iterations = self._solve_mean_variance(mean, covariance, right, lipschitz, left_weights)
+            weights = right_weights
+            iterations += left_iterations + right_iterations
+
+            for candidate in (left_weights, right_weights):
+                if sharpe(candidate) > best_sharpe:
+                    best_weights, best_sharpe = candidate, sharpe(candidate)
+
+            if sharpe(left_weights) >= sharpe(right_weights):
+                high = right
+            else:
+                low = left
+
+        return best_weights, iterations
+
+    def risk_parity(self, covariance: np.ndarray, max_iterations: int = 100) -> np.ndarray:
+        """
+        Equal risk contribution weights.
+
+        Minimizes the convex ``0.5 y'Cy - mean(log y)`` with damped Newton steps; at the
+        optimum every ``y_i (Cy)_i`` is equal, so ``y / sum(y)`` is the risk parity portfolio.
+        """
+        assets = covariance.shape[0]
+        budget = np.full(assets, 1.0 / assets)
+        objective = lambda y: 0.5 * y @ covariance @ y - budget @ np.log(y)
+
+        y = 1 / np.sqrt(np.diag(covariance))
+        y *= np.sqrt(1 / (y @ covariance @ y))
+        for _ in range(max_iterations):
+            gradient = covariance @ y - budget / y
+            hessian = covariance + np.diag(budget / (y * y))
+            step = np.linalg.solve(hessian, -gradient)
+
+            decrement = -gradient @ step
+            if decrement < 1e-20:
+                break
+
+            # Backtrack to stay strictly positive and decrease the objective
+            alpha = 1.0
+            negative = step < 0
+            if negative.any():
+                alpha = min(1.0, 0.99 * float(np.min(-y[negative] / step[negative])))
+            current = objective(y)
+            while objective(y + alpha * step) > current - 0.25 * alpha * decrement and alpha > 1e-12:
+                alpha *= 0.5
+            y = y + alpha * step
+
+        return y / y.sum()
+
+    def _solve_mean_variance(self, mean: np.ndarray, covariance: np.ndarray, risk_tolerance: float,
+                             lipschitz: float, initial: Optional[np.ndarray] = None) -> Tuple[np.ndarray, int]:
+        """
+        Minimize ``0.5 w'Cw - t mu'w`` over the long-only simplex with FISTA.
+
+        Returns the weights and the iterations used; the count is returned rather than
+        kept on the optimizer, which is shared across concurrent requests.
+        """
+        assets = covariance.shape[0]
+        weights = np.full(assets, 1.0 / assets) if initial is None else initial.copy()
+        if assets == 1:
+            return np.ones(1), 0
+
+        step_size = 1.0 / lipschitz
+        linear = risk_tolerance * mean
+        momentum_point, momentum = weights.copy(), 1.0
+
+        for iteration in range(1, self.max_iterations + 1):
+            gradient = covariance @ momentum_point - linear
+            updated = self._project_simplex(momentum_point - step_size * gradient)
+            change = updated - weights
+
+            if np.max(np.abs(change)) < self.tolerance:
+                return updated, iteration
+
+            # Adaptive restart when momentum points uphill
+            if gradient @ change > 0:
+                momentum = 1.0
+                momentum_point = updated
+            else:
+                next_momentum = (1 + np.sqrt(1 + 4 * momentum * momentum)) / 2
+                momentum_point = updated + ((momentum - 1) / next_momentum) * change
+                momentum = next_momentum
+            weights = updated
+
+        return weights, self.max_iterations
+
+    @staticmethod
+    def _project_simplex(values: np.ndarray) -> np.ndarray:
+        """Euclidean projection onto {w >= 0, sum(w) = 1} (sort-based)."""
+        ordered = np.sort(values)[::-1]
+        cumulative = np.cumsum(ordered) - 1
+        ranks = np.arange(1, len(values) + 1)
+        last = np.nonzero(ordered - cumulative / ranks > 0)[0][-1]
+        return np.maximum(values - cumulative[last] / (last + 1), 0.0)
+
+    @staticmethod
+    def _max_risk_tolerance(mean: np.ndarray, covariance: np.ndarray) -> float:
+        """Smallest risk tolerance at which holding only the highest-return asset is optimal."""
+        best = int(np.argmax(mean))
+        gaps = mean[best] - mean
+        others = gaps > 1e-12
+        if not others.any():
+            return 0.0
+        # KKT on the simplex: t * (mu_j - mu_i) >= C_jj - C_ij for every other asset i
+        bounds = (covariance[best, best] - covariance[best, others]) / gaps[others]
+        return float(max(bounds.max(), 0.0))
+
+    @staticmethod
+    def evaluate(weights: np.ndarray, mean: np.ndarray, covariance: np.ndarray,
+                    risk_free_rate: float) -> PortfolioAllocation:
+        """Risk, return and risk contributions of a weight vector."""
+        marginal = covariance @ weights
+        variance = float(weights @ marginal)
+        volatility = np.sqrt(max(variance, 0.0))
+        expected_return = float(weights @ mean)
+
+        return PortfolioAllocation(
+            weights=weights,
+            expected_return=expected_return * 100,
+            volatility=float(volatility * 100),
+            sharpe_ratio=float((expected_return - risk_free_rate) / volatility) if volatility > 0 else None,
+            risk_contributions=weights * marginal / variance if variance > 0 else np.zeros_like(weights)
+        )
@@ -0,0 +1,219 @@
+"""
+Portfolio session store keyed by portfolio ID.
+
+Each session holds a portfolio's holdings (and, when uploaded as one, its
+transaction ledger) as packed NumPy arrays. Sessions are written through to a
+local SQLite table, which is the shared source of truth, so several worker
+processes see the same portfolios. Each process keeps the most recently used
+sessions in memory; a cached session is reused only while its version still
+matches the stored row, and the least recently used one is dropped once the
+cache is full.
+"""
+
+import os
+import re
+import secrets
+import sqlite3
+import threading
+import numpy as np
+from collections import OrderedDict
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional
+
+from ...domain.entities.portfolio import Portfolio
+from ...domain.entities.position import Position
+from ...domain.entities.ticker import Ticker
+from ...domain.entities.transaction_ledger import TransactionLedger
+
+PORTFOLIO_ID_PATTERN = re.compile(r'^[A-Za-z0-9_.-]{1,64}$')
+
+
+@dataclass
+class PortfolioSession:
+    """One stored portfolio in compact array form."""
+    portfolio_id: str
+    symbols: np.ndarray  # Ticker symbols, in position order
+    quantities: np.ndarray  # float64 quantities aligned with symbols
+    ledger: Optional[TransactionLedger]
+    version: int  # Random token replaced on every save
+
+    def to_portfolio(self) -> Portfolio:
+        return Portfolio([
+            Position(Ticker(str(symbol)), float(quantity))
+            for symbol, quantity in zip(self.symbols, self.quantities)
+        ])
+
+
+class PortfolioSessionStore:
+    """Portfolios by ID with an in-memory LRU in front of a SQLite table."""
+
+    def __init__(self, db_path: str, cache_size: int = 128):
+        self.db_path = db_path
+        self.cache_size = max(cache_size, 1)
+        self._cache: "OrderedDict[str, PortfolioSession]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._ensure_database_exists()
+
+    def _connect(self) -> sqlite3.Connection:
+        # Other workers may be writing; wait for their lock rather than failing
+        return sqlite3.connect(self.db_path, timeout=5.0)
+
+    def _ensure_database_exists(self):
+        """Ensure the session directory and table exist."""
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+
+        with closing(self._connect()) as conn, conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS portfolio_sessions (
+                    portfolio_id TEXT PRIMARY KEY,
+                    version INTEGER NOT NULL,
+                    symbols TEXT NOT NULL,
+                    quantities BLOB NOT NULL,
+                    ledger_symbols TEXT,
+                    ledger_codes BLOB,
+                    ledger_dates BLOB,
+                    ledger_quantities BLOB,
+                    ledger_prices BLOB,
+                    updated_at TEXT NOT NULL
+                )
+            """)
+
+    @staticmethod
+    def validate_id(portfolio_id: str) -> None:
+        """Raise ValueError unless the ID is 1-64 letters, digits, '.', '_' or '-'."""
+        if not isinstance(portfolio_id, str) or not PORTFOLIO_ID_PATTERN.match(portfolio_id):
+            raise ValueError(
+                f"Invalid portfolio ID: {portfolio_id!r}. Use 1-64 letters, digits, '.', '_' or '-'"
+            )
+
+    def get(self, portfolio_id: str) -> Optional[PortfolioSession]:
+        """Get a session, from memory when the stored version is unchanged."""
+        with closing(self._connect()) as conn:
+            row = conn.execute(
+                "SELECT version FROM portfolio_sessions WHERE portfolio_id = ?", (portfolio_id,)
+            ).fetchone()
+            if row is None:
+                self._discard(portfolio_id)
+                return None
+
+            with self._lock:
+                session = self._cache.get(portfolio_id)
+                if session is not None and session.version == row[0]:
+                    self._cache.move_to_end(portfolio_id)
+                    return session
+
+            row = conn.execute(
+                """SELECT version, symbols, quantities, ledger_symbols, ledger_codes,
+                          ledger_dates, ledger_quantities, ledger_prices
+                   FROM portfolio_sessions WHERE portfolio_id = ?""",
+                (portfolio_id,)
+            ).fetchone()
+
+        if row is None:
+            self._discard(portfolio_id)
+            return None
+
+        session = self._decode(portfolio_id, row)
+        self._remember(session)
+        return session
+
+    def get_portfolio(self, portfolio_id: str) -> Optional[Portfolio]:
+        session = self.get(portfolio_id)
+        return session.to_portfolio() if session else None
+
+    def get_ledger(self, portfolio_id: str) -> Optional[TransactionLedger]:
+        session = self.get(portfolio_id)
+        return session.ledger if session else None
+
+    def save(self, portfolio_id: str, portfolio: Portfolio,
+             ledger: Optional[TransactionLedger] = None) -> PortfolioSession:
+        """Store a portfolio (and optionally the ledger it came from), replacing any previous one."""
+        self.validate_id(portfolio_id)
+        positions = portfolio.get_positions()
+        symbols = np.array([position.ticker.symbol for position in positions], dtype=str)
+        quantities = np.array([float(position.quantity) for position in positions], dtype=np.float64)
+
+        ledger_columns = (None,) * 5
+        if ledger is not None:
+            ledger_columns = (
+                "\n".join(ledger.unique_symbols),
+                ledger.symbol_codes.astype(np.int32).tobytes(),
+                ledger.dates.astype(np.int32).tobytes(),
+                ledger.quantities.astype(np.float64).tobytes(),
+                ledger.prices.astype(np.float64).tobytes()
+            )
+
+        # A fresh random version (not a counter) so a portfolio deleted and re-created
+        # elsewhere can never match a stale cached copy
+        version = secrets.randbits(62)
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                """INSERT OR REPLACE INTO portfolio_sessions
+                       (portfolio_id, version, symbols, quantities, ledger_symbols, ledger_codes,
+                        ledger_dates, ledger_quantities, ledger_prices, updated_at)
+                   VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)""",
+                (portfolio_id, version, "\n".join(symbols), quantities.tobytes(), *ledger_columns,
+                 datetime.now().isoformat())
+            )
+
+        session = PortfolioSession(portfolio_id, symbols, quantities, ledger, version)
+        self._remember(session)
+        return session
+
+    def delete(self, portfolio_id: str) -> bool:
+        """Remove a portfolio. Returns whether it existed."""
+        with closing(self._connect()) as conn, conn:
+            deleted = conn.execute(
+                "DELETE FROM portfolio_sessions WHERE portfolio_id = ?", (portfolio_id,)
+            ).rowcount
+        self._discard(portfolio_id)
+        return deleted > 0
+
+    def list_ids(self) -> List[str]:
+        """All stored portfolio IDs, most recently updated first."""
+        with closing(self._connect()) as conn:
+            rows = conn.execute(
+                "SELECT portfolio_id FROM portfolio_sessions ORDER BY updated_at DESC"
+            ).fetchall()
+        return [row[0] for row in rows]
+
+    @property
+    def cached_count(self) -> int:
+        """Sessions currently held in this process's memory."""
+        return len(self._cache)
+
+    def _remember(self, session: PortfolioSession) -> None:
+        with self._lock:
+            self._cache[session.portfolio_id] = session
+            self._cache.move_to_end(session.portfolio_id)
+            while len(self._cache) > self.cache_size:
+                self._cache.popitem(last=False)
+
+    def _discard(self, portfolio_id: str) -> None:
+        with self._lock:
+            self._cache.pop(portfolio_id, None)
+
+    @staticmethod
+    def _decode(portfolio_id: str, row: tuple) -> PortfolioSession:
+        version, symbols, quantities, ledger_symbols, codes, dates, ledger_quantities, prices = row
+
+        ledger = None
+        if ledger_symbols is not None:
+            unique_symbols = np.array(ledger_symbols.split("\n"), dtype=str)
+            ledger = TransactionLedger(
+                np.frombuffer(dates, dtype=np.int32).astype('datetime64[D]'),
+                unique_symbols[np.frombuffer(codes, dtype=np.int32)],
+                np.frombuffer(ledger_quantities, dtype=np.float64),
+                np.frombuffer(prices, dtype=np.float64)
+            )
+
+        return PortfolioSession(
+            portfolio_id=portfolio_id,
+            symbols=np.array(symbols.split("\n"), dtype=str),
+            quantities=np.frombuffer(quantities, dtype=np.float64),
+            ledger=ledger,
+            version=version
+        )
@@ -0,0 +1,110 @@
+"""
+Quote service for current prices across many symbols.
+
+Live prices come from one batched download per refresh and are kept in a
+short-TTL in-memory cache. Symbols the live source cannot price fall back
+to the last close stored in the warehouse.
+"""
+
+import threading
+import time
+from typing import Callable, Dict, List, Tuple
+
+from ...application.interfaces.repositories import MarketDataRepository
+from ...domain.entities.ticker import Ticker
+from ...domain.value_objects.money import Money
+
+
+class QuoteService:
+    """Current price lookups with TTL caching and warehouse fallback."""
+
+    def __init__(self,
+                 price_source: MarketDataRepository,
+                 warehouse_service=None,
+                 ttl_seconds: float = 60.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the quote service.
+
+        Args:
+            price_source: Repository whose ``get_current_prices`` fetches live quotes
+            warehouse_service: Warehouse used for last-close fallback (optional)
+            ttl_seconds: Seconds a live quote stays fresh in the cache
+            clock: Monotonic clock function
+        """
+        self.price_source = price_source
+        self.warehouse_service = warehouse_service
+        self.ttl_seconds = ttl_seconds
+        self._clock = clock
+        self._cache: Dict[str, Tuple[Money, float]] = {}
+        self._lock = threading.Lock()
+
+        # Observability counters
+        self.cache_hits = 0
+        self.live_quotes = 0
+        self.fallback_quotes = 0
+
+    def get_current_prices(self, tickers: List[Ticker]) -> Dict[Ticker, Money]:
+        """
+        Get current prices for tickers.
+
+        Args:
+            tickers: Tickers to price
+
+        Returns:
+            Prices keyed by ticker; tickers with no live quote and no stored
+            close are omitted
+        """
+        result = {}
+        stale = []
+        now = self._clock()
+
+        with self._lock:
+            for ticker in tickers:
+                entry = self._cache.get(ticker.symbol)
+                if entry is not None and now - entry[1] < self.ttl_seconds:
+                    result[ticker] = entry[0]
+                else:
+                    stale.append(ticker)
+            self.cache_hits += len(result)
+
+        if not stale:
+            return result
+
+        try:
+            live_prices = self.price_source.get_current_prices(stale)
+        except Exception:
+            live_prices = {}
+
+        with self._lock:
+            for ticker, price in live_prices.items():
+                self._cache[ticker.symbol] = (price, now)
+            self.live_quotes += len(live_prices)
+        result.update(live_prices)
+
+        missing = [ticker for ticker in stale if ticker not in live_prices]
+        if missing and self.warehouse_service is not None:
+            # Last close is not cached so the next refresh retries the live source
+            fallbacks = 0
+            for ticker, (_, close_price) in self.warehouse_service.get_latest_prices(missing).items():
+                if close_price and close_price > 0:
+                    result[ticker] = Money(close_price)
+                    fallbacks += 1
+            with self._lock:
+                self.fallback_quotes += fallbacks
+
+        return result
+
+    def clear(self) -> None:
+        """Drop all cached quotes."""
+        with self._lock:
+            self._cache.clear()
+
+    def get_metrics(self) -> Dict[str, int]:
+        """Get quote metrics for monitoring."""
+        return {
+            "quote_cache_hits": self.cache_hits,
+            "quote_live": self.live_quotes,
+            "quote_fallbacks": self.fallback_quotes,
+            "quote_cache_size": len(self._cache)
+        }
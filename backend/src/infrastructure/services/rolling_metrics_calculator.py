@@ -0,0 +1,194 @@
+"""
+Rolling-window metrics calculation service.
+
+Every statistic is computed for all columns (tickers) at once in O(n) time
+per column, independent of the window length: moments come from differences
+of cumulative sums, and the windowed max drawdown from prefix/suffix scans
+over fixed-size blocks.
+"""
+
+import numpy as np
+import pandas as pd
+from typing import Dict, Optional, Sequence
+
+
+class RollingMetricsCalculator:
+    """Service for calculating sliding-window financial metrics."""
+
+    METRICS = ('volatility', 'sharpe_ratio', 'sortino_ratio', 'beta', 'max_drawdown')
+
+    @staticmethod
+    def calculate(returns: pd.DataFrame,
+                  windows: Sequence[int],
+                  risk_free_rate: float = 0.03,
+                  benchmark_returns: Optional[pd.Series] = None,
+                  min_periods: Optional[float] = None) -> Dict[int, Dict[str, pd.DataFrame]]:
+        """
+        Calculate rolling metrics for every column of a returns frame.
+
+        Args:
+            returns: Daily returns, one column per series; NaN where a series has no data
+            windows: Window lengths in trading days
+            risk_free_rate: Annual risk-free rate
+            benchmark_returns: Benchmark daily returns for beta (optional)
+            min_periods: Fraction of a window that must hold valid returns (defaults to all of it)
+
+        Returns:
+            Frames keyed by window, then metric name, aligned to ``returns``.
+            Volatility and max drawdown are in percent; windows with too few
+            observations are NaN.
+        """
+        values = returns.to_numpy(dtype=float)
+        valid = ~np.isnan(values)
+        clean = np.where(valid, values, 0.0)
+        downside = clean < 0
+
+        # Cumulative sums are shared by every window; each window only takes differences
+        cumulative = {
+            'count': RollingMetricsCalculator._cumulative(valid.astype(float)),
+            'sum': RollingMetricsCalculator._cumulative(clean),
+            'squares': RollingMetricsCalculator._cumulative(clean * clean),
+            'downside_count': RollingMetricsCalculator._cumulative(downside.astype(float)),
+            'downside_squares': RollingMetricsCalculator._cumulative(np.where(downside, clean * clean, 0.0))
+        }
+        cumulative.update(RollingMetricsCalculator._benchmark_cumulative(clean, valid, benchmark_returns, returns.index))
+
+        # Log wealth with a leading zero so a window of w returns spans w + 1 wealth points
+        log_wealth = np.vstack([np.zeros((1, values.shape[1])), np.cumsum(np.log1p(clean), axis=0)])
+
+        result = {}
+        for window in windows:
+            window_sums = {
+                name: RollingMetricsCalculator._window_sum(total, window)
+                for name, total in cumulative.items()
+            }
+            required = window if min_periods is None else min_periods * window
+            metrics = RollingMetricsCalculator._window_metrics(window_sums, risk_free_rate, required)
+            max_drop = RollingMetricsCalculator._rolling_max_drop(log_wealth, window + 1)[1:]
+            metrics['max_drawdown'] = (np.exp(-max_drop) - 1) * 100
+
+            insufficient = ~(window_sums['count'] >= required)
+            result[window] = {
+                name: pd.DataFrame(
+                    np.where(insufficient, np.nan, metrics[name]),
+                    index=returns.index, columns=returns.columns
+                )
+                for name in RollingMetricsCalculator.METRICS
+            }
+
+        return result
+
+    @staticmethod
+    def _window_metrics(sums: Dict[str, np.ndarray], risk_free_rate: float, required: float) -> Dict[str, np.ndarray]:
+        """Turn windowed sums into volatility, Sharpe, Sortino and beta."""
+        with np.errstate(divide='ignore', invalid='ignore'):
+            count = sums['count']
+            mean = sums['sum'] / count
+            variance = np.maximum(sums['squares'] - sums['sum'] * mean, 0.0) / (count - 1)
+            std = np.sqrt(variance)
+
+            # Sharpe ratio (same definition as MetricsCalculator.calculate_risk_metrics)
+            excess_mean = mean - risk_free_rate / 252
+            sharpe_ratio = np.where(std > 0, np.sqrt(252) * excess_mean / std, 0.0)
+
+            # Sortino ratio with MAR = 0 (same definition as calculate_advanced_metrics)
+            downside_deviation = np.sqrt(sums['downside_squares'] / sums['downside_count'])
+            sortino_ratio = np.where(
+                sums['downside_squares'] > 0,
+                (mean * 252) / (downside_deviation * np.sqrt(252)),
+                0.0
+            )
+
+            if 'paired_count' in sums:
+                paired_count = sums['paired_count']
+                covariance = sums['paired_product'] - sums['paired_sum'] * sums['benchmark_sum'] / paired_count
+                benchmark_variance = sums['benchmark_squares'] - sums['benchmark_sum'] ** 2 / paired_count
+                # Same fallback as MetricsCalculator.calculate_beta when the benchmark is flat
+                beta = np.where(benchmark_variance > 1e-18, covariance / benchmark_variance, 1.0)
+                beta = np.where(paired_count >= required, beta, np.nan)
+            else:
+                beta = np.full(count.shape, np.nan)
+
+        return {
+            'volatility': std * np.sqrt(252) * 100,
+            'sharpe_ratio': sharpe_ratio,
+            'sortino_ratio': sortino_ratio,
+            'beta': beta
+        }
+
+    @staticmethod
+    def _benchmark_cumulative(clean: np.ndarray, valid: np.ndarray, benchmark_returns: Optional[pd.Series],
+                              index: pd.Index) -> Dict[str, np.ndarray]:
+        """Cumulative sums for windowed covariance against the benchmark, over dates both have data."""
+        if benchmark_returns is None or benchmark_returns.empty:
+            return {}
+
+        benchmark = benchmark_returns.reindex(index).to_numpy(dtype=float)[:, None]
+        paired = valid & ~np.isnan(benchmark)
+        x = np.where(paired, clean, 0.0)
+        y = np.where(paired, benchmark, 0.0)
+
+        return {
+            'paired_count': RollingMetricsCalculator._cumulative(paired.astype(float)),
+            'paired_sum': RollingMetricsCalculator._cumulative(x),
+            'paired_product': RollingMetricsCalculator._cumulative(x * y),
+            'benchmark_sum': RollingMetricsCalculator._cumulative(y),
+            'benchmark_squares': RollingMetricsCalculator._cumulative(y * y)
+        }
+
+    @staticmethod
+    def _cumulative(values: np.ndarray) -> np.ndarray:
+        """Cumulative sum along time with a leading zero row."""
+        cumulative = np.empty((values.shape[0] + 1, values.shape[1]))
+        cumulative[0] = 0.0
+        np.cumsum(values, axis=0, out=cumulative[1:])
+        return cumulative
+
+    @staticmethod
+    def _window_sum(cumulative: np.ndarray, window: int) -> np.ndarray:
+        """Sum over trailing windows from a cumulative sum; rows before the first full window are NaN."""
+        result = np.full((cumulative.shape[0] - 1, cumulative.shape[1]), np.nan)
+        if window < cumulative.shape[0]:
+            result[window - 1:] = cumulative[window:] - cumulative[:-window]
+        return result
+
+    @staticmethod
+    def _rolling_max_drop(values: np.ndarray, length: int) -> np.ndarray:
+        """
+        Largest fall ``values[s] - values[t]`` with ``s <= t`` inside each trailing window.
+
+        The series is cut into blocks of ``length`` rows. A window either is a
+        whole block or spans the suffix of one block and the prefix of the next,
+        so combining per-block suffix and prefix aggregates (max, min, largest
+        drop) answers every window in O(1) after O(n) scans.
+        """
+        rows, columns = values.shape
+        result = np.full(values.shape, np.nan)
+        if rows < length:
+            return result
+
+        blocks = -(-rows // length)
+        padded = np.vstack([values, np.repeat(values[-1:], blocks * length - rows, axis=0)])
+        blocked = padded.reshape(blocks, length, columns)
+
+        prefix_max = np.maximum.accumulate(blocked, axis=1)
+        prefix_min = np.minimum.accumulate(blocked, axis=1)
+        prefix_drop = np.maximum.accumulate(prefix_max - blocked, axis=1)
+
+        reverse = blocked[:, ::-1]
+        reverse_min = np.minimum.accumulate(reverse, axis=1)
+        suffix_max = np.maximum.accumulate(reverse, axis=1)[:, ::-1]
+        suffix_drop = np.maximum.accumulate(reverse - reverse_min, axis=1)[:, ::-1]
+
+        prefix_min, prefix_drop = prefix_min.reshape(-1, columns), prefix_drop.reshape(-1, columns)
+        suffix_max, suffix_drop = suffix_max.reshape(-1, columns), suffix_drop.reshape(-1, columns)
+
+        starts = np.arange(rows - length + 1)
+        ends = starts + length - 1
+        spanning = np.maximum(
+            np.maximum(suffix_drop[starts], prefix_drop[ends]),
+            suffix_max[starts] - prefix_min[ends]
+        )
+        aligned = (starts % length == 0)[:, None]
+        result[ends] = np.where(aligned, suffix_drop[starts], spanning)
+        return result
@@ -0,0 +1,243 @@
+"""
+Slow-query log for pooled warehouse connections.
+
+``ConnectionPool`` hands out ``TimedConnection`` wrappers when a log is
+configured. Every statement is timed from ``execute`` until its rows are
+fetched (SQLite does most of a query's work while stepping through rows, not
+in ``execute``). A statement under the threshold costs a few ``perf_counter``
+calls and a comparison; only slow statements are normalized and aggregated.
+
+Statements are grouped by shape: literals become ``?`` and placeholder lists
+collapse, so ``IN (?,?,?)`` with any number of symbols is one entry. Each
+shape keeps its slowest sample's SQL and, at most once per
+``plan_interval_seconds``, the ``EXPLAIN QUERY PLAN`` of a slow execution,
+which shows the index SQLite chose.
+"""
+
+import re
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+_LITERALS = re.compile(r"'(?:[^']|'')*'|\b\d+(?:\.\d+)?\b")
+_PLACEHOLDER_LISTS = re.compile(r"\?(?:\s*,\s*\?)+")
+_WHITESPACE = re.compile(r"\s+")
+
+# Statements EXPLAIN QUERY PLAN accepts
+_EXPLAINABLE = ("SELECT", "WITH", "INSERT", "REPLACE", "UPDATE", "DELETE")
+
+_clock = time.perf_counter
+
+# Characters of SQL kept per sample
+MAX_SAMPLE_CHARS = 2000
+
+
+def normalize_sql(sql: str) -> str:
+    """SQL shape: literals replaced by ``?``, placeholder lists collapsed, whitespace squeezed."""
+    shape = _LITERALS.sub("?", sql)
+    shape = _PLACEHOLDER_LISTS.sub("?, ...", shape)
+    return _WHITESPACE.sub(" ", shape).strip()
+
+
+@dataclass
+class SlowQueryStats:
+    """Slow executions of one SQL shape."""
+    shape: str
+    count: int = 0
+    total_seconds: float = 0.0
+    max_seconds: float = 0.0
+    sample_sql: str = ""  # SQL of the slowest execution
+    plan: List[str] = field(default_factory=list)  # EXPLAIN QUERY PLAN lines, indented by depth
+    plan_captured_at: Optional[float] = None  # time.monotonic() of the last capture
+
+    @property
+    def mean_seconds(self) -> float:
+        return self.total_seconds / self.count if self.count else 0.0
+
+
+class SlowQueryLog:
+    """Aggregates statements slower than ``threshold_seconds`` by SQL shape."""
+
+    def __init__(self, threshold_seconds: float, plan_interval_seconds: float = 60.0, max_shapes: int = 500):
+        self.threshold_seconds = threshold_seconds
+        self.plan_interval_seconds = plan_interval_seconds
+        self.max_shapes = max_shapes
+        self._shapes: Dict[str, SlowQueryStats] = {}
+        self._shape_cache: Dict[str, str] = {}
+        self._lock = threading.Lock()
+        self.slow_statements = 0
+        self.dropped_shapes = 0
+
+    def record(self, conn: sqlite3.Connection, sql: str, parameters: Any, seconds: float) -> None:
+        """Add one slow statement; captures its plan when the shape's last capture is old enough."""
+        shape = self._shape_cache.get(sql)
+        if shape is None:
+            shape = normalize_sql(sql)
+            if len(self._shape_cache) < self.max_shapes * 4:
+                self._shape_cache[sql] = shape
+
+        with self._lock:
+            self.slow_statements += 1
+            stats = self._shapes.get(shape)
+            if stats is None:
+                if len(self._shapes) >= self.max_shapes:
+                    self.dropped_shapes += 1
+                    return
+                stats = self._shapes[shape] = SlowQueryStats(shape)
+            stats.count += 1
+            stats.total_seconds += seconds
+            if seconds >= stats.max_seconds:
+                stats.max_seconds = seconds
+                stats.sample_sql = sql.strip()[:MAX_SAMPLE_CHARS]
+            now = time.monotonic()
+            capture = parameters is not None and (
+                stats.plan_captured_at is None or now - stats.plan_captured_at >= self.plan_interval_seconds
+            )
+            if capture:
+                stats.plan_captured_at = now
+
+        if capture:
+            plan = self._explain(conn, sql, parameters)
+            if plan is not None:
+                with self._lock:
+                    stats.plan = plan
+
+    def top(self, limit: int = 20) -> List[SlowQueryStats]:
+        """Shapes with the most total slow time first."""
+        with self._lock:
+            return sorted(self._shapes.values(), key=lambda stats: stats.total_seconds, reverse=True)[:limit]
+
+    def stats(self) -> Dict[str, float]:
+        """Threshold and counters."""
+        with self._lock:
+            return {
+                "slow_query_threshold_ms": self.threshold_seconds * 1000,
+                "slow_statements": self.slow_statements,
+                "slow_query_shapes": len(self._shapes),
+                "slow_query_dropped_shapes": self.dropped_shapes,
+            }
+
+    def reset(self) -> None:
+        """Forget every recorded shape."""
+        with self._lock:
+            self._shapes.clear()
+            self.slow_statements = 0
+            self.dropped_shapes = 0
+
+    @staticmethod
+    def _explain(conn: sqlite3.Connection, sql: str, parameters: Any) -> Optional[List[str]]:
+        if not sql.lstrip().upper().startswith(_EXPLAINABLE):
+            return None
+        try:
+            rows = conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()
+        except sqlite3.Error:
+            return None
+        depths = {0: -1}
+        plan = []
+        for node_id, parent_id, _, detail in rows:
+            depths[node_id] = depths.get(parent_id, -1) + 1
+            plan.append("  " * depths[node_id] + detail)
+        return plan
+
+
+class TimedCursor:
+    """
+    Cursor proxy that records its statement once: after ``fetchall``, the first
+    ``fetchone``, an exhausted ``fetchmany`` or loop, or when it is dropped.
+    """
+
+    __slots__ = ("_cursor", "_log", "_conn", "_sql", "_parameters", "_seconds", "_pending")
+
+    def __init__(self, cursor: sqlite3.Cursor, log: SlowQueryLog, conn: sqlite3.Connection,
+                 sql: str, parameters: Any, seconds: float):
+        self._cursor = cursor
+        self._log = log
+        self._conn = conn
+        self._sql = sql
+        self._parameters = parameters
+        self._seconds = seconds
+        self._pending = True
+
+    def fetchone(self):
+        start = _clock()
+        row = self._cursor.fetchone()
+        self._seconds += _clock() - start
+        self._finish()
+        return row
+
+    def fetchmany(self, size: int = None):
+        start = _clock()
+        rows = self._cursor.fetchmany(self._cursor.arraysize if size is None else size)
+        self._seconds += _clock() - start
+        if not rows:
+            self._finish()
+        return rows
+
+    def fetchall(self):
+        start = _clock()
+        rows = self._cursor.fetchall()
+        self._seconds += _clock() - start
+        self._finish()
+        return rows
+
+    def __iter__(self):
+        while True:
+            start = _clock()
+            row = self._cursor.fetchone()
+            self._seconds += _clock() - start
+            if row is None:
+                self._finish()
+                return
+            yield row
+
+    def __getattr__(self, name: str):
+        return getattr(self._cursor, name)
+
+    def __del__(self):
+        self._finish()
+
+    def _finish(self) -> None:
+        if self._pending:
+            self._pending = False
+            if self._seconds >= self._log.threshold_seconds:
+                self._log.record(self._conn, self._sql, self._parameters, self._seconds)
+
+
+class TimedConnection:
+    """Connection proxy timing ``execute`` and ``executemany``; everything else is the connection's own."""
+
+    __slots__ = ("_conn", "_log")
+
+    def __init__(self, conn: sqlite3.Connection, log: SlowQueryLog):
+        self._conn = conn
+        self._log = log
+
+    def execute(self, sql: str, parameters: Any = ()) -> TimedCursor:
+        start = _clock()
+        cursor = self._conn.execute(sql, parameters)
+        seconds = _clock() - start
+        timed = TimedCursor(cursor, self._log, self._conn, sql, parameters, seconds)
+        if cursor.description is None:
+            # No result rows: execute did all the work
+            timed._finish()
+        return timed
+
+    def executemany(self, sql: str, seq_of_parameters: Any) -> sqlite3.Cursor:
+        start = _clock()
+        cursor = self._conn.executemany(sql, seq_of_parameters)
+        seconds = _clock() - start
+        if seconds >= self._log.threshold_seconds:
+            self._log.record(self._conn, sql, None, seconds)
+        return cursor
+
+    def __getattr__(self, name: str):
+        return getattr(self._conn, name)
+
+    def __enter__(self):
+        self._conn.__enter__()
+        return self
+
+    def __exit__(self, *exc_info):
+        return self._conn.__exit__(*exc_info)
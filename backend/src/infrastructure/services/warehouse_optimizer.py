@@ -10,15 +10,27 @@ import threading
 import time
 from typing import Dict, List, Any, Optional, Tuple
 from contextlib import contextmanager
-from datetime import datetime
+
+import numpy as np
+import pandas as pd
+
+from ..warehouse.corporate_actions import adjust, read_factors_many
+from ..warehouse.keys import ensure_symbol_id, new_batch, record_changes, to_dates, to_epoch_day, to_epoch_days
+from ..warehouse.price_cache import PriceCache
+from .slow_query_log import SlowQueryLog, TimedConnection
 
 
 class ConnectionPool:
-    """Connection pool for SQLite connections."""
+    """Connection pool for SQLite connections.
+    
+    With a ``query_log``, connections are handed out wrapped so every
+    statement is timed and slow ones are recorded.
+    """
     
-    def __init__(self, db_path: str, max_connections: int = 10):
+    def __init__(self, db_path: str, max_connections: int = 10, query_log: Optional[SlowQueryLog] = None):
         self.db_path = db_path
         self.max_connections = max_connections
+        self.query_log = query_log
         self._pool = []
         self._lock = threading.Lock()
         
@@ -47,7 +59,7 @@ class ConnectionPool:
                     conn.execute("PRAGMA cache_size=10000")
                     conn.execute("PRAGMA temp_store=MEMORY")
             
-            yield conn
+            yield TimedConnection(conn, self.query_log) if self.query_log else conn
         finally:
             if conn:
                 with self._lock:
@@ -67,185 +79,164 @@ class ConnectionPool:
 class WarehouseOptimizer:
     """Service for optimizing warehouse database operations."""
     
-    def __init__(self, db_path: str, max_connections: int = 10):
+    ANALYSIS_LIMIT = 1000
+    
+    def __init__(self, db_path: str, max_connections: int = 10, price_cache_bytes: int = 0,
+                 slow_query_seconds: float = 0.0):
         self.db_path = db_path
-        self.connection_pool = ConnectionPool(db_path, max_connections)
+        # Statements on pooled connections slower than this are aggregated by shape; 0 disables timing
+        self.slow_query_log = SlowQueryLog(slow_query_seconds) if slow_query_seconds > 0 else None
+        self.connection_pool = ConnectionPool(db_path, max_connections, self.slow_query_log)
+        
+        # Hot close history shared by every reader of this warehouse in the process
+        self.price_cache = PriceCache(price_cache_bytes)
         
         # Query cache for frequently used queries
         self._query_cache = {}
         self._cache_lock = threading.Lock()
+        
+        # Background planner statistics refresh
+        self._optimize_lock = threading.Lock()
+        self._optimize_thread: Optional[threading.Thread] = None
+        self.last_optimize_seconds: Optional[float] = None
     
-    def optimize_database(self):
-        """Optimize database settings and indexes."""
+    def optimize_database(self, full_analyze: bool = False):
+        """Refresh query planner statistics.
+        
+        ``PRAGMA optimize`` only re-analyzes tables whose statistics are stale.
+        A full ``ANALYZE`` (sampled via ``analysis_limit``) runs when requested,
+        e.g. after a schema migration, or when no statistics exist yet.
+        """
+        start_time = time.perf_counter()
         
         with self.connection_pool.get_connection() as conn:
-            # Enable WAL mode for better concurrency
-            conn.execute("PRAGMA journal_mode=WAL")
+            has_statistics = conn.execute(
+                "SELECT 1 FROM sqlite_master WHERE name = 'sqlite_stat1'"
+            ).fetchone() is not None
             
-            # Optimize synchronous mode
-            conn.execute("PRAGMA synchronous=NORMAL")
-            
-            # Increase cache size
-            conn.execute("PRAGMA cache_size=10000")
-            
-            # Use memory for temp tables
-            conn.execute("PRAGMA temp_store=MEMORY")
-            
-            # Analyze tables for better query planning
-            conn.execute("ANALYZE")
-            
-            # Create additional indexes for better performance
-            self._create_performance_indexes(conn)
+            if full_analyze or not has_statistics:
+                # Sample at most this many index rows per index; exact counts are unnecessary for planning
+                conn.execute(f"PRAGMA analysis_limit={self.ANALYSIS_LIMIT}")
+                conn.execute("ANALYZE")
+            else:
+                conn.execute("PRAGMA optimize")
             
             conn.commit()
+        
+        self.last_optimize_seconds = time.perf_counter() - start_time
     
-    def _create_performance_indexes(self, conn: sqlite3.Connection):
-        """Create additional indexes for better query performance."""
-        indexes = [
-            "CREATE INDEX IF NOT EXISTS idx_market_data_ticker_date ON market_data (ticker, date DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_market_data_date_ticker ON market_data (date, ticker)",
-            "CREATE INDEX IF NOT EXISTS idx_dividend_data_ticker_date ON dividend_data (ticker, date DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_dividend_data_date_ticker ON dividend_data (date, ticker)",
-            "CREATE INDEX IF NOT EXISTS idx_benchmark_data_symbol_date ON benchmark_data (symbol, date DESC)",
-            "CREATE INDEX IF NOT EXISTS idx_benchmark_data_date_symbol ON benchmark_data (date, symbol)",
-            "CREATE INDEX IF NOT EXISTS idx_dividend_coverage_ticker_dates ON dividend_coverage (ticker, start_date, end_date)",
-            "CREATE INDEX IF NOT EXISTS idx_benchmark_coverage_symbol_dates ON benchmark_coverage (symbol, start_date, end_date)"
-        ]
+    def schedule_optimize(self, full_analyze: bool = False) -> threading.Thread:
+        """Run optimize_database on a daemon thread so startup does not wait for it.
         
-        for index_sql in indexes:
-            try:
-                conn.execute(index_sql)
-                pass
-            except sqlite3.Error as e:
-                pass
+        Only one run is in flight at a time; later requests while it runs reuse it.
+        """
+        with self._optimize_lock:
+            if self._optimize_thread is not None and self._optimize_thread.is_alive():
+                return self._optimize_thread
+            
+            self._optimize_thread = threading.Thread(
+                target=self._run_optimize, args=(full_analyze,), name="warehouse-optimize", daemon=True
+            )
+            self._optimize_thread.start()
+            return self._optimize_thread
+    
+    def _run_optimize(self, full_analyze: bool) -> None:
+        try:
+            self.optimize_database(full_analyze)
+        except sqlite3.Error as e:
+            print(f"Background warehouse optimization failed: {e}")
     
     def get_price_history_optimized(self, tickers: List[Any], date_range: Any) -> Dict[Any, Any]:
-        """Get price history with optimized queries and connection pooling."""
+        """Get price history with optimized queries and connection pooling, through the price cache."""
+        if not self.price_cache.enabled:
+            return self._get_history(tickers, date_range, "market_data", "close_price", 'Close')
         if not tickers:
             return {}
         
-        
-        ticker_symbols = [t.symbol for t in tickers]
-        placeholders = ','.join(['?'] * len(ticker_symbols))
-        
-        # Use prepared statement for better performance
-        query = f"""
-            SELECT ticker, date, close_price 
-            FROM market_data 
-            WHERE ticker IN ({placeholders}) 
-            AND date >= ? AND date <= ?
-            ORDER BY ticker, date
-        """
-        
         with self.connection_pool.get_connection() as conn:
-            cursor = conn.execute(query, ticker_symbols + [date_range.start.strftime('%Y-%m-%d'), date_range.end.strftime('%Y-%m-%d')])
-            
-            # Process results into ticker-indexed dictionary
-            result = {}
-            for ticker in tickers:
-                result[ticker] = []
-            
-            for row in cursor.fetchall():
-                ticker_symbol, date_str, price = row
-                # Find the ticker object
-                ticker_obj = next((t for t in tickers if t.symbol == ticker_symbol), None)
-                if ticker_obj is not None:
-                    result[ticker_obj].append((date_str, price))
-        
-        # Convert to pandas Series
-        import pandas as pd
-        for ticker in result:
-            if result[ticker]:
-                dates, prices = zip(*result[ticker])
-                result[ticker] = pd.Series(prices, index=pd.DatetimeIndex(dates), name='Close')
-            else:
-                result[ticker] = pd.Series(dtype='float64', name='Close')
-        
-        return result
+            series = self.price_cache.get_many(
+                conn, [t.symbol for t in tickers], to_epoch_day(date_range.start), to_epoch_day(date_range.end), 'Close'
+            )
+        return {ticker: series[ticker.symbol] for ticker in tickers}
     
     def get_dividend_history_optimized(self, tickers: List[Any], date_range: Any) -> Dict[Any, Any]:
         """Get dividend history with optimized queries and connection pooling."""
+        return self._get_history(tickers, date_range, "dividend_data", "dividend_amount", 'Dividends')
+    
+    def _get_history(self, tickers: List[Any], date_range: Any, table: str, value_column: str,
+                     name: str) -> Dict[Any, Any]:
+        """Read many tickers in one query: a primary-key range scan per symbol ID."""
         if not tickers:
             return {}
         
+        tickers_by_symbol = {t.symbol: t for t in tickers}
+        placeholders = ','.join(['?'] * len(tickers_by_symbol))
         
-        ticker_symbols = [t.symbol for t in tickers]
-        placeholders = ','.join(['?'] * len(ticker_symbols))
-        
-        # Use prepared statement for better performance
         query = f"""
-            SELECT ticker, date, dividend_amount 
-            FROM dividend_data 
-            WHERE ticker IN ({placeholders}) 
-            AND date >= ? AND date <= ?
-            ORDER BY ticker, date
+            SELECT s.symbol, v.day, v.{value_column}
+            FROM symbols s JOIN {table} v ON v.symbol_id = s.symbol_id
+            WHERE s.symbol IN ({placeholders}) 
+            AND v.day >= ? AND v.day <= ?
+            ORDER BY s.symbol, v.day
         """
         
         with self.connection_pool.get_connection() as conn:
-            cursor = conn.execute(query, ticker_symbols + [date_range.start.strftime('%Y-%m-%d'), date_range.end.strftime('%Y-%m-%d')])
-            
-            # Process results into ticker-indexed dictionary
-            result = {}
-            for ticker in tickers:
-                result[ticker] = []
-            
-            for row in cursor.fetchall():
-                ticker_symbol, date_str, dividend = row
-                # Find the ticker object
-                ticker_obj = next((t for t in tickers if t.symbol == ticker_symbol), None)
-                if ticker_obj is not None:
-                    result[ticker_obj].append((date_str, dividend))
+            rows = conn.execute(
+                query, list(tickers_by_symbol) + [to_epoch_day(date_range.start), to_epoch_day(date_range.end)]
+            ).fetchall()
+            # Prices are stored raw; closes are adjusted with the corporate-action factors on read
+            actions = read_factors_many(conn, tickers_by_symbol) if rows and table == "market_data" else {}
         
-        # Convert to pandas Series
-        import pandas as pd
-        for ticker in result:
-            if result[ticker]:
-                dates, dividends = zip(*result[ticker])
-                result[ticker] = pd.Series(dividends, index=pd.DatetimeIndex(dates), name='Dividends')
-            else:
-                result[ticker] = pd.Series(dtype='float64', name='Dividends')
+        result = {ticker: pd.Series(dtype='float64', name=name) for ticker in tickers}
+        if not rows:
+            return result
+        
+        # Rows arrive grouped by symbol; split the columns at each symbol boundary
+        symbols, days, values = zip(*rows)
+        days = np.array(days, dtype=np.int64)
+        values = np.array(values, dtype=float)
+        boundaries = [0] + [i for i in range(1, len(symbols)) if symbols[i] != symbols[i - 1]] + [len(symbols)]
+        for start, end in zip(boundaries[:-1], boundaries[1:]):
+            symbol_values = values[start:end]
+            if symbols[start] in actions:
+                symbol_values = adjust(days[start:end], symbol_values, *actions[symbols[start]])
+            result[tickers_by_symbol[symbols[start]]] = pd.Series(
+                symbol_values, index=to_dates(days[start:end]), name=name
+            )
         
         return result
     
     def store_dividend_history(self, ticker: Any, dividend_data: Any) -> None:
-        """Store dividend history data in the warehouse."""
+        """Store dividend history data and its coverage in the warehouse as one ingest batch."""
         if dividend_data is None or dividend_data.empty:
             return
         
-        # Prepare data for insertion
-        data_to_insert = []
-        for date, dividend in dividend_data.items():
-            data_to_insert.append((
-                ticker.symbol,
-                date.strftime('%Y-%m-%d'),
-                float(dividend),
-                datetime.now().isoformat()
-            ))
-        
-        # Batch insert
-        self.batch_insert_optimized("dividend_data", data_to_insert)
+        days = to_epoch_days(dividend_data.index)
         
-        # Update coverage
-        self._update_dividend_coverage(ticker, dividend_data)
+        with self.connection_pool.get_connection() as conn:
+            symbol_id = ensure_symbol_id(conn, ticker.symbol)
+            batch_id = new_batch(conn, "dividends")
+            conn.executemany(
+                "INSERT OR REPLACE INTO dividend_data (symbol_id, day, dividend_amount, batch_id) VALUES (?, ?, ?, ?)",
+                zip([symbol_id] * len(days), days.tolist(),
+                    dividend_data.to_numpy(dtype=float).tolist(), [batch_id] * len(days))
+            )
+            record_changes(conn, "dividend_data", batch_id, [(symbol_id, int(days.min()), int(days.max()))])
+            
+            # Update coverage
+            self._update_dividend_coverage(conn, symbol_id, days, batch_id)
+            conn.commit()
     
-    def _update_dividend_coverage(self, ticker: Any, dividend_data: Any) -> None:
+    def _update_dividend_coverage(self, conn: sqlite3.Connection, symbol_id: int, days: Any, batch_id: int) -> None:
         """Update dividend coverage information."""
-        if dividend_data is None or dividend_data.empty:
+        if len(days) == 0:
             return
         
-        min_date = dividend_data.index.min().strftime('%Y-%m-%d')
-        max_date = dividend_data.index.max().strftime('%Y-%m-%d')
-        record_count = len(dividend_data)
-        
-        coverage_data = [(
-            ticker.symbol,
-            min_date,
-            max_date,
-            record_count,
-            datetime.now().isoformat()
-        )]
-        
-        self.batch_insert_optimized("dividend_coverage", coverage_data)
+        conn.execute(
+            "INSERT OR REPLACE INTO dividend_coverage (symbol_id, start_day, end_day, has_dividends, batch_id) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (symbol_id, int(days.min()), int(days.max()), len(days), batch_id)
+        )
     
     def batch_insert_optimized(self, table_name: str, data: List[Tuple], batch_size: int = 1000):
         """Insert data in optimized batches with connection pooling."""
@@ -275,17 +266,22 @@ class WarehouseOptimizer:
         self.connection_pool.close_all()
 
 
-# Global instance
-_warehouse_optimizer: Optional[WarehouseOptimizer] = None
+# One optimizer (and connection pool) per warehouse file
+_warehouse_optimizers: Dict[str, WarehouseOptimizer] = {}
+_warehouse_optimizers_lock = threading.Lock()
 
 
 def get_warehouse_optimizer(db_path: str = None) -> WarehouseOptimizer:
-    """Get or create the global warehouse optimizer service instance."""
-    global _warehouse_optimizer
-    if _warehouse_optimizer is None:
-        if db_path is None:
-            from ..config.warehouse_config import WarehouseConfig
+    """Get or create the warehouse optimizer service instance for a database."""
+    from ..config.warehouse_config import WarehouseConfig
+    if db_path is None:
+        config = WarehouseConfig()
+        db_path = config.get_db_path()
+    with _warehouse_optimizers_lock:
+        if db_path not in _warehouse_optimizers:
             config = WarehouseConfig()
-            db_path = config.get_db_path()
-        _warehouse_optimizer = WarehouseOptimizer(db_path)
-    return _warehouse_optimizer
+            _warehouse_optimizers[db_path] = WarehouseOptimizer(
+                db_path, price_cache_bytes=config.get_price_cache_bytes(),
+                slow_query_seconds=config.get_slow_query_seconds()
+            )
+        return _warehouse_optimizers[db_path]
@@ -0,0 +1,442 @@
+"""
+Yahoo Finance fetch client with rate limiting, retries and circuit breaking.
+
+All network calls to Yahoo Finance go through one shared client so that
+concurrent fetchers draw from a single request budget. The transport is
+injectable: any object exposing ``download(tickers, **kwargs)`` and
+``Ticker(symbol)`` (the ``yfinance`` module itself, or a test fake) works.
+"""
+
+import random
+import threading
+import time
+from collections import deque
+from typing import Any, Callable, Dict, List, Optional
+
+import pandas as pd
+
+
+class CircuitOpenError(Exception):
+    """Raised when the circuit breaker rejects a call."""
+
+
+class MissingDataError(Exception):
+    """Raised when a download returns no rows for any requested symbol.
+
+    yfinance catches per-symbol failures, rate limiting included, and returns
+    empty or all-NaN columns instead of raising, so the client checks the frame.
+    """
+
+
+class TokenBucket:
+    """Token bucket rate limiter shared across threads."""
+
+    def __init__(self, rate: float, capacity: float,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep):
+        """
+        Initialize the token bucket.
+
+        Args:
+            rate: Tokens added per second
+            capacity: Maximum number of tokens (burst size)
+            clock: Monotonic clock function
+            sleep: Sleep function used while waiting for tokens
+        """
+        self.rate = rate
+        self.capacity = capacity
+        self._tokens = capacity
+        self._clock = clock
+        self._sleep = sleep
+        self._updated = clock()
+        self._lock = threading.Lock()
+
+    def try_acquire(self, tokens: float = 1.0) -> float:
+        """Take tokens if available. Returns 0 on success, otherwise seconds to wait."""
+        tokens = min(tokens, self.capacity)
+        with self._lock:
+            now = self._clock()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+
+            # Tolerance absorbs float rounding after sleeping exactly the wait time
+            if self._tokens >= tokens - 1e-9:
+                self._tokens = max(0.0, self._tokens - tokens)
+                return 0.0
+            return (tokens - self._tokens) / self.rate
+
+    def acquire(self, tokens: float = 1.0) -> None:
+        """Block until the requested tokens are available."""
+        while True:
+            wait = self.try_acquire(tokens)
+            if wait <= 0:
+                return
+            self._sleep(wait)
+
+
+class CircuitBreaker:
+    """Circuit breaker that stops calls after repeated failures."""
+
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, failure_threshold: int = 5, reset_timeout: float = 30.0,
+                 clock: Callable[[], float] = time.monotonic):
+        """
+        Initialize the circuit breaker.
+
+        Args:
+            failure_threshold: Consecutive failures that open the circuit
+            reset_timeout: Seconds to stay open before allowing a trial call
+            clock: Monotonic clock function
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self._clock = clock
+        self._state = self.CLOSED
+        self._consecutive_failures = 0
+        self._opened_at = 0.0
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    @property
+    def state(self) -> str:
+        """Get the current circuit state."""
+        with self._lock:
+            if self._state == self.OPEN and self._clock() - self._opened_at >= self.reset_timeout:
+                return self.HALF_OPEN
+            return self._state
+
+    def allow(self) -> bool:
+        """Check whether a call may proceed."""
+        with self._lock:
+            if self._state == self.CLOSED:
+                return True
+
+            if self._state == self.OPEN:
+                if self._clock() - self._opened_at < self.reset_timeout:
+                    return False
+                self._state = self.HALF_OPEN
+                self._trial_in_flight = False
+
+            # Half-open: let a single trial call through
+            if self._trial_in_flight:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record_success(self) -> None:
+        """Record a successful call."""
+        with self._lock:
+            self._state = self.CLOSED
+            self._consecutive_failures = 0
+            self._trial_in_flight = False
+
+    def record_failure(self) -> None:
+        """Record a failed call."""
+        with self._lock:
+            self._consecutive_failures += 1
+            self._trial_in_flight = False
+            if self._state == self.HALF_OPEN or self._consecutive_failures >= self.failure_threshold:
+                self._state = self.OPEN
+                self._opened_at = self._clock()
+
+
+class AdaptiveBatchSizer:
+    """Batch size controller driven by observed latency and error rate."""
+
+    def __init__(self, initial: int = 20, minimum: int = 1, maximum: int = 50,
+                 target_latency: float = 5.0, max_error_rate: float = 0.2, window: int = 10):
+        """
+        Initialize the batch sizer.
+
+        Args:
+            initial: Starting batch size
+            minimum: Smallest allowed batch size
+            maximum: Largest allowed batch size
+            target_latency: Batch latency in seconds above which the size is halved
+            max_error_rate: Error rate over the window above which growth stops
+            window: Number of recent batches used for the error rate
+        """
+        self.minimum = minimum
+        self.maximum = maximum
+        self.target_latency = target_latency
+        self.max_error_rate = max_error_rate
+        self._size = max(minimum, min(initial, maximum))
+        self._outcomes = deque(maxlen=window)
+        self._lock = threading.Lock()
+
+    @property
+    def size(self) -> int:
+        """Get the current batch size."""
+        return self._size
+
+    @property
+    def error_rate(self) -> float:
+        """Get the error rate over the recent window."""
+        with self._lock:
+            if not self._outcomes:
+                return 0.0
+            return self._outcomes.count(False) / len(self._outcomes)
+
+    def record(self, latency: float, success: bool) -> None:
+        """Adjust the batch size using additive increase, multiplicative decrease."""
+        with self._lock:
+            self._outcomes.append(success)
+            error_rate = self._outcomes.count(False) / len(self._outcomes)
+
+            if not success or latency > self.target_latency:
+                self._size = max(self.minimum, self._size // 2)
+            elif error_rate <= self.max_error_rate and latency < self.target_latency / 2:
+                self._size = min(self.maximum, self._size + 1)
+
+
+class YahooFetchClient:
+    """Client for Yahoo Finance calls with throttling, retries and circuit breaking."""
+
+    def __init__(self,
+                 transport: Any = None,
+                 rate_limiter: Optional[TokenBucket] = None,
+                 circuit_breaker: Optional[CircuitBreaker] = None,
+                 batch_sizer: Optional[AdaptiveBatchSizer] = None,
+                 max_retries: int = 3,
+                 backoff_base: float = 0.5,
+                 backoff_max: float = 8.0,
+                 clock: Callable[[], float] = time.monotonic,
+                 sleep: Callable[[float], None] = time.sleep,
+                 rng: Optional[random.Random] = None):
+        """
+        Initialize the fetch client.
+
+        Args:
+            transport: Object with ``download`` and ``Ticker``. Defaults to ``yfinance``.
+            rate_limiter: Token bucket shared by all calls
+            circuit_breaker: Circuit breaker shared by all calls
+            batch_sizer: Controller for multi-symbol download batch size
+            max_retries: Retries per call after the first attempt
+            backoff_base: Base delay in seconds for exponential backoff
+            backoff_max: Maximum backoff delay in seconds
+            clock: Monotonic clock function
+            sleep: Sleep function used for backoff
+            rng: Random generator used for jitter
+        """
+        self._transport = transport
+        self.rate_limiter = rate_limiter or TokenBucket(rate=4.0, capacity=10.0, clock=clock, sleep=sleep)
+        self.circuit_breaker = circuit_breaker or CircuitBreaker(clock=clock)
+        self.batch_sizer = batch_sizer or AdaptiveBatchSizer()
+        self.max_retries = max_retries
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self._clock = clock
+        self._sleep = sleep
+        self._rng = rng or random.Random()
+
+        # Observability counters
+        self._lock = threading.Lock()
+        self.calls = 0
+        self.retries = 0
+        self.failures = 0
+        self.rejected_calls = 0
+
+    @property
+    def transport(self) -> Any:
+        """Get the transport, importing yfinance on first use."""
+        if self._transport is None:
+            import yfinance
+            self._transport = yfinance
+        return self._transport
+
+    def call(self, func: Callable, *args, cost: float = 1.0, **kwargs) -> Any:
+        """Execute a transport call with rate limiting, retries and circuit breaking."""
+        attempt = 0
+        while True:
+            if not self.circuit_breaker.allow():
+                self._increment('rejected_calls')
+                raise CircuitOpenError("Yahoo Finance circuit is open - skipping request")
+
+            self.rate_limiter.acquire(cost)
+            self._increment('calls')
+
+            try:
+                result = func(*args, **kwargs)
+            except Exception:
+                self.circuit_breaker.record_failure()
+                self._increment('failures')
+                if attempt >= self.max_retries:
+                    raise
+                self._sleep(self._backoff_delay(attempt))
+                self._increment('retries')
+                attempt += 1
+                continue
+
+            self.circuit_breaker.record_success()
+            return result
+
+    def download(self, symbols: List[str], **kwargs) -> pd.DataFrame:
+        """
+        Download price data for symbols in adaptively sized batches.
+
+        Batches are joined on the date index with symbols as the first column
+        level. Symbols that come back empty or all-NaN count as failures: they
+        are retried and reported to the circuit breaker and the batch sizer.
+        A batch that still fails after retries is skipped; if every batch
+        fails, the last error is raised, except that symbols which never
+        returned data give an empty frame.
+        """
+        if len(symbols) <= 1:
+            try:
+                return self._download_batch(symbols, **kwargs)
+            except MissingDataError:
+                return pd.DataFrame()
+
+        frames = []
+        last_error = None
+        position = 0
+
+        while position < len(symbols):
+            batch = symbols[position:position + self.batch_sizer.size]
+            position += len(batch)
+
+            try:
+                data = self._download_batch(batch, **kwargs)
+            except CircuitOpenError:
+                raise
+            except Exception as e:
+                last_error = e
+                continue
+
+            if not data.empty:
+                frames.append(data)
+
+        if not frames:
+            if last_error is not None and not isinstance(last_error, MissingDataError):
+                raise last_error
+            return pd.DataFrame()
+
+        if len(frames) == 1:
+            return frames[0]
+        return pd.concat(frames, axis=1).sort_index()
+
+    def get_ticker_attribute(self, symbol: str, attribute: str) -> Any:
+        """Read a lazily fetched ``Ticker`` attribute such as ``info`` or ``dividends``."""
+        return self.call(lambda: getattr(self.transport.Ticker(symbol), attribute))
+
+    def get_metrics(self) -> Dict[str, Any]:
+        """Get client metrics for monitoring."""
+        return {
+            "yahoo_requests": self.calls,
+            "yahoo_retries": self.retries,
+            "yahoo_failures": self.failures,
+            "yahoo_rejected_calls": self.rejected_calls,
+            "yahoo_circuit_state": self.circuit_breaker.state,
+            "yahoo_batch_size": self.batch_sizer.size,
+            "yahoo_error_rate": self.batch_sizer.error_rate
+        }
+
+    def _download_batch(self, batch: List[str], **kwargs) -> pd.DataFrame:
+        """Download one batch, retry the symbols it came back without, and feed the outcome into the batch sizer."""
+        start_time = self._clock()
+        try:
+            data = self.call(self._download_checked, batch, cost=max(len(batch), 1), **kwargs)
+        except Exception:
+            self.batch_sizer.record(self._clock() - start_time, False)
+            raise
+
+        missing = _missing_symbols(data, batch)
+        if missing:
+            # A partly rate-limited batch: ask again for just the symbols it dropped
+            try:
+                retried = self.call(self._download_checked, missing, cost=len(missing), **kwargs)
+            except MissingDataError:
+                pass
+            else:
+                data = pd.concat([_drop_symbols(data, missing), _drop_symbols(retried, _missing_symbols(retried, missing))],
+                                 axis=1).sort_index()
+                missing = _missing_symbols(data, batch)
+
+        self.batch_sizer.record(self._clock() - start_time, not missing)
+        return data
+
+    def _download_checked(self, batch: List[str], **kwargs) -> pd.DataFrame:
+        """One transport download; raises MissingDataError when no requested symbol has data."""
+        data = self.transport.download(batch, **kwargs)
+
+        # Keep symbols on the first column level so batches can be joined
+        if (len(batch) == 1 and kwargs.get('group_by') == 'ticker'
+                and not data.empty and not isinstance(data.columns, pd.MultiIndex)):
+            data = pd.concat({batch[0]: data}, axis=1)
+
+        if batch and len(_missing_symbols(data, batch)) == len(batch):
+            raise MissingDataError(f"No data returned for {', '.join(batch)}")
+        return data
+
+    def _backoff_delay(self, attempt: int) -> float:
+        """Exponential backoff with full jitter."""
+        ceiling = min(self.backoff_max, self.backoff_base * (2 ** attempt))
+        return self._rng.uniform(0, ceiling)
+
+    def _increment(self, counter: str) -> None:
+        """Increment an observability counter."""
+        with self._lock:
+            setattr(self, counter, getattr(self, counter) + 1)
+
+
+def _symbol_level(data: pd.DataFrame, symbols: List[str]) -> Optional[int]:
+    """Column level holding the symbols (0 with ``group_by='ticker'``, 1 otherwise), None for single-level columns."""
+    if not isinstance(data.columns, pd.MultiIndex):
+        return None
+    return 0 if set(symbols) & set(data.columns.get_level_values(0)) else 1
+
+
+def _missing_symbols(data: pd.DataFrame, symbols: List[str]) -> List[str]:
+    """Requested symbols without a single non-NaN value in the frame."""
+    if data.empty:
+        return list(symbols)
+
+    level = _symbol_level(data, symbols)
+    if level is None:
+        # One symbol with plain columns
+        return [] if data.notna().to_numpy().any() else list(symbols)
+
+    present = data.notna().any().groupby(level=level).any()
+    return [symbol for symbol in symbols if not present.get(symbol, False)]
+
+
+def _drop_symbols(data: pd.DataFrame, symbols: List[str]) -> pd.DataFrame:
+    """The frame without the columns of these symbols."""
+    if not symbols or data.empty:
+        return data
+    level = _symbol_level(data, symbols)
+    if level is None:
+        # Plain columns hold one symbol
+        return pd.DataFrame()
+    return data.drop(columns=symbols, level=level, errors='ignore')
+
+
+# Global instance
+_yahoo_fetch_client: Optional[YahooFetchClient] = None
+
+
+def get_yahoo_fetch_client() -> YahooFetchClient:
+    """Get or create the global Yahoo fetch client instance."""
+    global _yahoo_fetch_client
+    if _yahoo_fetch_client is None:
+        from ..config.yahoo_config import YahooConfig
+        config = YahooConfig()
+        _yahoo_fetch_client = YahooFetchClient(
+            rate_limiter=TokenBucket(rate=config.rate_per_second, capacity=config.burst),
+            circuit_breaker=CircuitBreaker(
+                failure_threshold=config.circuit_failure_threshold,
+                reset_timeout=config.circuit_reset_seconds
+            ),
+            batch_sizer=AdaptiveBatchSizer(
+                initial=config.batch_size_initial,
+                maximum=config.batch_size_max,
+                target_latency=config.batch_target_latency_seconds
+            ),
+            max_retries=config.max_retries,
+            backoff_base=config.backoff_base_seconds,
+            backoff_max=config.backoff_max_seconds
+        )
+    return _yahoo_fetch_client
@@ -0,0 +1,149 @@
+"""
+Serialization helpers for time-series API payloads
+Columnar encoding stores a base date, integer day offsets and a value array
+instead of one 'YYYY-MM-DD' key per point
+"""
+import base64
+import json
+import math
+from decimal import Decimal
+from typing import Any, Dict
+
+import numpy as np
+import pandas as pd
+
+try:
+    import orjson
+except ImportError:  # Listed in requirements.txt; stdlib json is the fallback
+    orjson = None
+
+
+HAS_ORJSON = orjson is not None
+
+
+def series_to_date_dict(series: pd.Series) -> Dict[str, float]:
+    """
+    Converts a date-indexed series to a {'YYYY-MM-DD': value} dictionary.
+
+    Args:
+        series: Series with a DatetimeIndex
+
+    Returns:
+        Dictionary keyed by ISO date string
+    """
+    if series.empty:
+        return {}
+    dates = pd.DatetimeIndex(series.index).strftime('%Y-%m-%d')
+    return dict(zip(dates, series.to_numpy(dtype=float).tolist()))
+
+
+def series_to_columnar(series: pd.Series, binary: bool = False) -> Dict[str, Any]:
+    """
+    Converts a date-indexed series to columnar form.
+
+    Args:
+        series: Series with a DatetimeIndex
+        binary: Encode offsets as base64 little-endian int32 and values as
+            base64 little-endian float32 instead of JSON arrays
+
+    Returns:
+        Dictionary with baseDate, offsets (days since baseDate) and values
+    """
+    if series.empty:
+        return {"baseDate": None, "encoding": "base64" if binary else "json", "length": 0,
+                "offsets": "" if binary else [], "values": "" if binary else []}
+
+    index = pd.DatetimeIndex(series.index).normalize()
+    base_date = index[0]
+    offsets = ((index - base_date) // pd.Timedelta(days=1)).to_numpy(dtype=np.int32)
+    values = series.to_numpy(dtype=float)
+
+    if binary:
+        return {
+            "baseDate": base_date.strftime('%Y-%m-%d'),
+            "encoding": "base64",
+            "length": len(values),
+            "offsetsDtype": "<i4",
+            "valuesDtype": "<f4",
+            "offsets": base64.b64encode(offsets.astype('<i4').tobytes()).decode('ascii'),
+            "values": base64.b64encode(values.astype('<f4').tobytes()).decode('ascii')
+        }
+
+    return {
+        "baseDate": base_date.strftime('%Y-%m-%d'),
+        "encoding": "json",
+        "length": len(values),
+        "offsets": offsets,
+        "values": values
+    }
+
+
+def columnar_to_series(payload: Dict[str, Any]) -> pd.Series:
+    """
+    Rebuilds a date-indexed series from columnar form.
+
+    Args:
+        payload: Output of series_to_columnar (after a JSON round trip)
+
+    Returns:
+        Series with a DatetimeIndex
+    """
+    if not payload.get("length"):
+        return pd.Series(dtype=float)
+
+    if payload["encoding"] == "base64":
+        offsets = np.frombuffer(base64.b64decode(payload["offsets"]), dtype=payload["offsetsDtype"])
+        values = np.frombuffer(base64.b64decode(payload["values"]), dtype=payload["valuesDtype"])
+    else:
+        offsets = np.asarray(payload["offsets"], dtype=np.int64)
+        values = np.asarray(payload["values"], dtype=float)
+
+    index = pd.Timestamp(payload["baseDate"]) + pd.to_timedelta(offsets.astype(np.int64), unit='D')
+    return pd.Series(values.astype(float), index=index)
+
+
+def _default(value: Any) -> Any:
+    """Fallback encoder for NumPy and Decimal values."""
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, np.ndarray):
+        return value.tolist()
+    if isinstance(value, np.generic):
+        return value.item()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
+
+
+def _without_non_finite(value: Any) -> Any:
+    """Copy of a payload with NaN and infinite floats replaced by None, as orjson writes them."""
+    if isinstance(value, float):
+        return value if math.isfinite(value) else None
+    if isinstance(value, dict):
+        return {key: _without_non_finite(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_without_non_finite(item) for item in value]
+    if isinstance(value, (np.ndarray, np.generic, Decimal)):
+        return _without_non_finite(_default(value))
+    return value
+
+
+def dumps(payload: Any) -> bytes:
+    """
+    Serializes a payload to JSON bytes, using orjson when it is installed.
+
+    Both paths write NaN and infinite values as null, so the output is valid
+    JSON and does not depend on which encoder is installed.
+
+    Args:
+        payload: JSON-compatible structure; NumPy arrays and scalars are allowed
+
+    Returns:
+        UTF-8 encoded JSON
+    """
+    if HAS_ORJSON:
+        return orjson.dumps(payload, default=_default, option=orjson.OPT_SERIALIZE_NUMPY | orjson.OPT_NON_STR_KEYS)
+    try:
+        return json.dumps(payload, default=_default, separators=(',', ':'), allow_nan=False).encode('utf-8')
+    except ValueError:
+        # Only payloads holding non-finite values pay for the copy
+        return json.dumps(_without_non_finite(payload), default=_default, separators=(',', ':'),
+                          allow_nan=False).encode('utf-8')
@@ -0,0 +1,313 @@
+"""
+Online full and delta backups of the warehouse, and atomic restores.
+
+Full backups use SQLite's online backup API: ``pages_per_step`` pages are
+copied per step with a short sleep in between, so API workers keep getting
+the database between steps. A write from another connection restarts the
+copy, so the backup is always a consistent snapshot, unlike a file copy of a
+live WAL database.
+
+Every warehouse write records an ingest batch and stamps its rows with the
+``batch_id``, so a delta backup holds only the rows of the batches written
+since a base backup (full or delta), read in one transaction:
+
+    backup_info     kind, base_generation, generation, schema_version, created_at, epoch
+    symbols         the whole symbol dictionary (IDs are kept)
+    ingest_batches  batches after the base
+    <table>         rows of each batch-stamped table written after the base
+
+A delta cannot carry deletes: one is refused once a ``clear`` batch was
+recorded since its base, so take a full backup after clearing data. Every
+backup also records the warehouse's epoch, the creation time of its first
+ingest batch, and deltas are neither taken nor applied across a different
+epoch (a warehouse recreated since the base). A restore stages the full
+backup and its deltas in a side file, checks it, and copies it into the live
+database with the backup API in one write transaction, so readers see either
+the old or the restored warehouse.
+"""
+
+import os
+import sqlite3
+import time
+from contextlib import closing
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, Iterable, List, Optional
+
+from .keys import CLEAR_BATCH_SOURCE, RESTORE_BATCH_SOURCE
+from .migrations import LATEST_SCHEMA_VERSION, get_schema_version, migrate
+from .prefix_sums import PrefixSumIndex
+from .snapshot import get_ingest_generation
+
+# Tables whose rows carry the batch that wrote them
+BATCH_TABLES = ("market_data", "dividend_data", "dividend_coverage", "benchmark_data", "benchmark_coverage",
+                "corporate_actions")
+
+
+@dataclass(frozen=True)
+class BackupInfo:
+    """What a backup file holds: a full copy or the batches between two generations."""
+    path: str
+    kind: str  # "full" or "delta"
+    base_generation: Optional[int]  # None for full backups
+    generation: int  # Last ingest batch included
+    schema_version: int
+    epoch: Optional[str] = None  # Creation time of the warehouse's first ingest batch
+
+
+def get_warehouse_epoch(conn: sqlite3.Connection) -> Optional[str]:
+    """When the warehouse's first ingest batch was recorded; batches are never deleted, so it identifies the warehouse."""
+    row = conn.execute("SELECT created_at FROM ingest_batches ORDER BY batch_id LIMIT 1").fetchone()
+    return row[0] if row else None
+
+
+@dataclass
+class BackupResult:
+    """Outcome of a backup or restore."""
+    info: BackupInfo
+    rows: int  # Delta rows written or applied; 0 for full copies
+    size_bytes: int
+    seconds: float
+
+
+def read_backup_info(path: str) -> BackupInfo:
+    """Kind and generations of a backup file."""
+    if not os.path.exists(path):
+        raise ValueError(f"Backup file not found: {path}")
+    with closing(sqlite3.connect(f"file:{path}?mode=ro", uri=True)) as conn:
+        tables = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'table'")}
+        if "backup_info" in tables:
+            # Deltas written before epochs were recorded have no epoch column
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(backup_info)")}
+            epoch_column = "epoch" if "epoch" in columns else "NULL"
+            kind, base_generation, generation, schema_version, epoch = conn.execute(
+                f"SELECT kind, base_generation, generation, schema_version, {epoch_column} FROM backup_info"
+            ).fetchone()
+            return BackupInfo(path, kind, base_generation, generation, schema_version, epoch)
+        if "ingest_batches" not in tables:
+            raise ValueError(f"Not a warehouse backup: {path}")
+        return BackupInfo(path, "full", None, get_ingest_generation(conn), get_schema_version(conn),
+                          get_warehouse_epoch(conn))
+
+
+class WarehouseBackup:
+    """Takes online full and delta backups of one warehouse and restores them into it."""
+
+    def __init__(self, db_path: str, pages_per_step: int = 1024, step_sleep: float = 0.005,
+                 symbols_per_step: int = 200):
+        """
+        Args:
+            db_path: Live warehouse database
+            pages_per_step: Pages copied per backup step (-1 copies everything in one step)
+            step_sleep: Seconds slept between steps so concurrent queries get the database
+            symbols_per_step: Symbols whose delta rows are copied between sleeps
+        """
+        self.db_path = db_path
+        self.pages_per_step = pages_per_step
+        self.step_sleep = step_sleep
+        self.symbols_per_step = symbols_per_step
+
+    def backup(self, target_path: str,
+               progress: Optional[Callable[[int, int], None]] = None) -> BackupResult:
+        """
+        Copy the whole warehouse to ``target_path`` with the online backup API.
+
+        The copy is written next to the target and renamed into place, so an
+        interrupted backup never leaves a partial file under the target name.
+
+        Args:
+            target_path: Backup file to create
+            progress: Called with (pages remaining, total pages) after each step
+        """
+        start = time.perf_counter()
+        partial_path = self._fresh_side_file(target_path + ".partial")
+
+        def after_step(status: int, remaining: int, total: int) -> None:
+            if progress:
+                progress(remaining, total)
+            # The backup API only sleeps on SQLITE_BUSY; pausing here lets queries in between steps
+            if remaining:
+                time.sleep(self.step_sleep)
+
+        with closing(sqlite3.connect(self.db_path, timeout=30.0)) as source, \
+                closing(sqlite3.connect(partial_path)) as target:
+            source.backup(target, pages=self.pages_per_step, progress=after_step, sleep=self.step_sleep)
+        os.replace(partial_path, target_path)
+
+        return BackupResult(read_backup_info(target_path), 0, os.path.getsize(target_path),
+                            time.perf_counter() - start)
+
+    def backup_delta(self, target_path: str, base_path: str) -> BackupResult:
+        """
+        Write the rows of the ingest batches recorded since ``base_path`` to ``target_path``.
+
+        Raises:
+            ValueError: If data was cleared since the base backup or the warehouse is not the one it was taken of
+        """
+        start = time.perf_counter()
+        base = read_backup_info(base_path)
+        partial_path = self._fresh_side_file(target_path + ".partial")
+        rows = 0
+
+        with closing(sqlite3.connect(self.db_path, timeout=30.0)) as conn:
+            conn.execute("ATTACH DATABASE ? AS delta", (partial_path,))
+            # One read transaction: the delta is a consistent snapshot even while batches are written
+            conn.execute("BEGIN")
+            generation = get_ingest_generation(conn)
+            epoch = get_warehouse_epoch(conn)
+            if generation < base.generation or (base.epoch is not None and epoch != base.epoch):
+                raise ValueError(f"The warehouse was recreated since the base backup {base_path}; take a full backup")
+            if conn.execute("SELECT 1 FROM ingest_batches WHERE source = ? AND batch_id > ? LIMIT 1",
+                            (CLEAR_BATCH_SOURCE, base.generation)).fetchone():
+                raise ValueError(f"Data was cleared since the base backup {base_path}; take a full backup")
+            last_symbol_id = conn.execute("SELECT MAX(symbol_id) FROM symbols").fetchone()[0] or 0
+
+            for table in BATCH_TABLES:
+                conn.execute(f"CREATE TABLE delta.{table} AS SELECT * FROM main.{table} WHERE 0")
+                # Primary-key ranges of a few symbols at a time, sleeping between them
+                for first_id in range(1, last_symbol_id + 1, self.symbols_per_step):
+                    rows += conn.execute(f"""
+                        INSERT INTO delta.{table} SELECT * FROM main.{table}
+                        WHERE symbol_id BETWEEN ? AND ? AND batch_id > ? AND batch_id <= ?
+                    """, (first_id, first_id + self.symbols_per_step - 1, base.generation, generation)).rowcount
+                    time.sleep(self.step_sleep)
+
+            conn.execute("CREATE TABLE delta.symbols AS SELECT * FROM main.symbols")
+            conn.execute("CREATE TABLE delta.ingest_batches AS SELECT * FROM main.ingest_batches "
+                         "WHERE batch_id > ? AND batch_id <= ?", (base.generation, generation))
+            conn.execute("""
+                CREATE TABLE delta.backup_info (
+                    kind TEXT NOT NULL, base_generation INTEGER, generation INTEGER NOT NULL,
+                    schema_version INTEGER NOT NULL, created_at TEXT NOT NULL, epoch TEXT
+                )
+            """)
+            conn.execute("INSERT INTO delta.backup_info VALUES ('delta', ?, ?, ?, ?, ?)",
+                         (base.generation, generation, get_schema_version(conn), datetime.now().isoformat(), epoch))
+            conn.commit()
+            conn.execute("DETACH DATABASE delta")
+        os.replace(partial_path, target_path)
+
+        return BackupResult(read_backup_info(target_path), rows, os.path.getsize(target_path),
+                            time.perf_counter() - start)
+
+    def restore(self, backup_path: str, deltas: Iterable[str] = ()) -> BackupResult:
+        """
+        Replace the live warehouse with a full backup plus a chain of deltas.
+
+        The restored warehouse is staged in a side file, migrated to the
+        current schema, delta-applied and integrity-checked before it is
+        copied into the live database in one write transaction.
+
+        Raises:
+            ValueError: If ``backup_path`` is not a full backup or a delta does not follow the one before it
+                (including deltas of another warehouse epoch)
+        """
+        start = time.perf_counter()
+        info = read_backup_info(backup_path)
+        if info.kind != "full":
+            raise ValueError(f"Restores start from a full backup, not a {info.kind} backup: {backup_path}")
+        chain = [read_backup_info(path) for path in deltas]
+
+        staging_path = self._fresh_side_file(self.db_path + ".restore")
+        rows = 0
+        try:
+            with closing(sqlite3.connect(backup_path)) as source, closing(sqlite3.connect(staging_path)) as staged:
+                source.backup(staged)
+                migrate(staged)
+                generation = info.generation
+                for delta in chain:
+                    if delta.kind != "delta" or delta.base_generation != generation:
+                        raise ValueError(f"{delta.path} does not follow generation {generation}")
+                    if delta.epoch is not None and info.epoch is not None and delta.epoch != info.epoch:
+                        raise ValueError(f"{delta.path} does not follow generation {generation} of this warehouse")
+                    rows += self._apply_delta(staged, delta.path)
+                    generation = delta.generation
+
+                check = staged.execute("PRAGMA quick_check").fetchone()[0]
+                if check != "ok":
+                    raise ValueError(f"Restored warehouse failed its integrity check: {check}")
+
+                os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+                with closing(sqlite3.connect(self.db_path, timeout=30.0)) as live:
+                    # Batch IDs after a restore stay above every generation caches may have seen
+                    restore_batch = max(generation, get_ingest_generation(live) if self._has_batches(live) else 0) + 1
+                    staged.execute("INSERT INTO ingest_batches (batch_id, source, created_at) VALUES (?, ?, ?)",
+                                   (restore_batch, RESTORE_BATCH_SOURCE, datetime.now().isoformat()))
+                    staged.commit()
+                    epoch = get_warehouse_epoch(staged)
+                    staged.backup(live)
+        finally:
+            if os.path.exists(staging_path):
+                os.remove(staging_path)
+
+        restored = BackupInfo(self.db_path, "full", None, restore_batch, LATEST_SCHEMA_VERSION, epoch)
+        return BackupResult(restored, rows, os.path.getsize(self.db_path), time.perf_counter() - start)
+
+    def _apply_delta(self, conn: sqlite3.Connection, path: str) -> int:
+        """Upsert a delta's rows and rebuild prefix sums from each symbol's first changed day."""
+        rows = 0
+        conn.execute("ATTACH DATABASE ? AS delta", (path,))
+        try:
+            conn.execute("INSERT OR IGNORE INTO main.symbols (symbol_id, symbol) SELECT symbol_id, symbol FROM delta.symbols")
+            conn.execute("INSERT OR IGNORE INTO main.ingest_batches (batch_id, source, created_at) "
+                         "SELECT batch_id, source, created_at FROM delta.ingest_batches")
+            for table in BATCH_TABLES:
+                columns = ", ".join(row[1] for row in conn.execute(f"PRAGMA main.table_info({table})"))
+                rows += conn.execute(
+                    f"INSERT OR REPLACE INTO main.{table} ({columns}) SELECT {columns} FROM delta.{table}"
+                ).rowcount
+
+            first_days: Dict[str, Dict[int, int]] = {}
+            for key, tables in (("prices", ("market_data", "corporate_actions")), ("dividends", ("dividend_data",))):
+                for table in tables:
+                    for symbol_id, day in conn.execute(f"SELECT symbol_id, MIN(day) FROM delta.{table} GROUP BY symbol_id"):
+                        days = first_days.setdefault(key, {})
+                        days[symbol_id] = min(day, days.get(symbol_id, day))
+            conn.commit()
+        finally:
+            conn.execute("DETACH DATABASE delta")
+
+        prefix_sums = PrefixSumIndex()
+        for symbol_id, day in first_days.get("prices", {}).items():
+            prefix_sums.update_prices(conn, symbol_id, day)
+        for symbol_id, day in first_days.get("dividends", {}).items():
+            prefix_sums.update_dividends(conn, symbol_id, day)
+        conn.commit()
+        return rows
+
+    @staticmethod
+    def _has_batches(conn: sqlite3.Connection) -> bool:
+        return conn.execute(
+            "SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = 'ingest_batches'"
+        ).fetchone() is not None
+
+    @staticmethod
+    def _fresh_side_file(path: str) -> str:
+        """``path`` with the leftovers of an interrupted run removed."""
+        for suffix in ("", "-journal", "-wal", "-shm"):
+            if os.path.exists(path + suffix):
+                os.remove(path + suffix)
+        return path
+
+
+def list_backup_chain(directory: str, full_backup: str) -> List[str]:
+    """Delta files in ``directory`` that extend ``full_backup`` one after another, in order."""
+    deltas = {}
+    for name in os.listdir(directory):
+        path = os.path.join(directory, name)
+        if path == full_backup or not name.endswith(".sqlite"):
+            continue
+        try:
+            info = read_backup_info(path)
+        except (ValueError, sqlite3.DatabaseError):
+            continue
+        # Of deltas taken from the same base, the one reaching furthest is used
+        if info.kind == "delta" and info.generation > max(info.base_generation, deltas.get(info.base_generation, ("", 0))[1]):
+            deltas[info.base_generation] = (path, info.generation)
+
+    chain = []
+    generation = read_backup_info(full_backup).generation
+    while generation in deltas:
+        path, generation = deltas.pop(generation)
+        chain.append(path)
+    return chain
@@ -0,0 +1,549 @@
+"""
+Bulk export and import of warehouse tables.
+
+An export is a directory with one sub-directory of part files per table and a
+``manifest.json`` written last, so an interrupted export is never imported:
+
+    <export>/manifest.json
+    <export>/market_data/part-00000.csv.gz
+    <export>/dividend_data/part-00000.csv.gz
+    ...
+
+Part files hold at most ``rows_per_file`` rows in ``(symbol, date)`` order and
+carry symbols and calendar dates rather than the warehouse's dictionary IDs and
+epoch days, so they load into any warehouse and read like a vendor dump.
+Gzip-compressed CSV is the default and always works; Parquet needs pyarrow or
+fastparquet and Arrow (Feather) needs pyarrow, neither of which is required.
+
+Imports insert whole arrays per part file or CSV chunk with ``executemany``
+and commit every ``transaction_rows`` rows, then rebuild the prefix sums of
+the symbols they touched once at the end rather than per chunk.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import time
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import BinaryIO, Callable, Dict, Iterable, Iterator, List, Optional, Tuple, Union
+
+import numpy as np
+import pandas as pd
+
+from .keys import new_batch, record_changes, to_dates, to_epoch_days
+from .migrations import LATEST_SCHEMA_VERSION, get_schema_version, migrate
+from .prefix_sums import PrefixSumIndex
+
+EXPORT_FORMAT_VERSION = 1
+MANIFEST_FILE = "manifest.json"
+
+# Import sources recorded in ingest_batches
+EXPORT_BATCH_SOURCE = "bulk-import"
+VENDOR_BATCH_SOURCE = "vendor-csv"
+
+GZIP_MAGIC = b'\x1f\x8b'
+
+# Export names are single directory names below the configured export directory
+EXPORT_NAME_PATTERN = re.compile(r'^[A-Za-z0-9_-][A-Za-z0-9_.-]{0,63}$')
+
+
+@dataclass(frozen=True)
+class _TransferTable:
+    """Columns of one table as they appear in export files."""
+    name: str
+    date_columns: Tuple[str, ...]
+    value_column: str
+    positive_values: bool  # Prices must be > 0; coverage flags and dividends only finite
+    coverage_table: Optional[str] = None  # Coverage derived for vendor imports
+
+
+TABLES: Dict[str, _TransferTable] = {table.name: table for table in (
+    _TransferTable("market_data", ("date",), "close_price", True),
+    _TransferTable("dividend_data", ("date",), "dividend_amount", False, "dividend_coverage"),
+    _TransferTable("dividend_coverage", ("start_date", "end_date"), "has_dividends", False),
+    _TransferTable("benchmark_data", ("date",), "close_price", True, "benchmark_coverage"),
+    _TransferTable("benchmark_coverage", ("start_date", "end_date"), "has_data", False),
+    _TransferTable("corporate_actions", ("date",), "factor", True),
+)}
+
+# File extension per export format
+FORMATS = {"parquet": ".parquet", "arrow": ".arrow", "csv": ".csv.gz"}
+
+# Vendor CSV header aliases per export column, matched case-insensitively in order.
+# Warehouse closes (prices and benchmarks) are raw and adjusted on read by corporate_actions
+# factors, so imports take the raw close; a vendor adjusted close would be adjusted twice.
+VENDOR_COLUMN_ALIASES = {
+    "symbol": ("symbol", "ticker", "sym", "code"),
+    "date": ("date", "timestamp", "datetime", "trade_date", "day"),
+}
+VENDOR_VALUE_ALIASES = {
+    "market_data": ("close_price", "close"),
+    "dividend_data": ("dividend_amount", "dividend", "dividends", "amount", "value"),
+    "benchmark_data": ("close_price", "close"),
+    "corporate_actions": ("factor", "adjustment_factor", "adj_factor"),
+}
+# Adjusted close headers: a price file with only these is refused unless mapped explicitly
+VENDOR_ADJUSTED_CLOSE_ALIASES = ("adj_close", "adj close", "adjclose", "adjusted_close")
+
+
+@dataclass
+class TransferResult:
+    """Rows written per table by an export or import."""
+    rows: Dict[str, int] = field(default_factory=dict)
+    skipped_rows: int = 0  # Import rows without a symbol, a valid date or a valid value
+    files: List[str] = field(default_factory=list)
+    seconds: float = 0.0
+
+    @property
+    def total_rows(self) -> int:
+        return sum(self.rows.values())
+
+    @property
+    def rows_per_minute(self) -> float:
+        return self.total_rows * 60 / self.seconds if self.seconds > 0 else 0.0
+
+
+class WarehouseBulkTransfer:
+    """Exports warehouse tables to partitioned files and bulk-imports them or vendor CSV dumps."""
+
+    def __init__(self, db_path: str, transaction_rows: int = 500_000):
+        self.db_path = db_path
+        self.transaction_rows = transaction_rows
+        self._prefix_sums = PrefixSumIndex()
+
+    def export(self, directory: str, tables: Optional[Iterable[str]] = None, file_format: str = "csv",
+               rows_per_file: int = 1_000_000) -> TransferResult:
+        """
+        Export tables to ``directory`` in one consistent read snapshot.
+
+        Args:
+            directory: Target directory; must not already hold an export
+            tables: Table names (default: all of ``TABLES``)
+            file_format: ``csv`` (gzip), ``parquet`` or ``arrow``
+            rows_per_file: Maximum rows per part file
+
+        Raises:
+            ValueError: Unknown table or format, missing engine, existing export or missing warehouse
+        """
+        tables = self._resolve_tables(tables)
+        if file_format not in FORMATS:
+            raise ValueError(f"Unsupported export format: {file_format}. Use one of {sorted(FORMATS)}")
+        if rows_per_file <= 0:
+            raise ValueError("rows_per_file must be positive")
+        _require_engine(file_format)
+        if not os.path.exists(self.db_path):
+            raise ValueError(f"Warehouse database does not exist: {self.db_path}")
+        if os.path.exists(os.path.join(directory, MANIFEST_FILE)):
+            raise ValueError(f"Export directory already contains an export: {directory}")
+
+        start = time.perf_counter()
+        result = TransferResult()
+        manifest_tables = {}
+
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            # One read transaction keeps all tables on the same WAL snapshot while servers write
+            conn.execute("BEGIN")
+            schema_version = get_schema_version(conn)
+            for table in tables:
+                files = []
+                rows = 0
+                for part, frame in enumerate(self._read_table(conn, table, rows_per_file)):
+                    relative_path = os.path.join(table.name, f"part-{part:05d}{FORMATS[file_format]}")
+                    path = os.path.join(directory, relative_path)
+                    os.makedirs(os.path.dirname(path), exist_ok=True)
+                    _write_frame(frame, path, file_format)
+                    files.append(relative_path)
+                    rows += len(frame)
+                manifest_tables[table.name] = {"rows": rows, "files": files}
+                result.rows[table.name] = rows
+                result.files.extend(files)
+            conn.execute("COMMIT")
+        finally:
+            conn.close()
+
+        os.makedirs(directory, exist_ok=True)
+        with open(os.path.join(directory, MANIFEST_FILE), "w") as manifest:
+            json.dump({
+                "format_version": EXPORT_FORMAT_VERSION,
+                "schema_version": schema_version,
+                "format": file_format,
+                "exported_at": datetime.now().isoformat(),
+                "tables": manifest_tables,
+            }, manifest, indent=2)
+
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def import_export(self, directory: str, tables: Optional[Iterable[str]] = None,
+                      progress: Optional[Callable[[str, int], None]] = None) -> TransferResult:
+        """
+        Import an export directory, replacing rows with the same keys.
+
+        Args:
+            directory: Directory written by ``export``
+            tables: Subset of the exported tables (default: all of them)
+            progress: Called with the table name and its rows imported so far
+
+        Raises:
+            ValueError: Missing or unsupported manifest, unknown table or missing engine
+        """
+        manifest_path = os.path.join(directory, MANIFEST_FILE)
+        if not os.path.exists(manifest_path):
+            raise ValueError(f"No warehouse export found in {directory}")
+        with open(manifest_path) as manifest_file:
+            manifest = json.load(manifest_file)
+        if manifest.get("format_version") != EXPORT_FORMAT_VERSION:
+            raise ValueError(f"Unsupported export format version: {manifest.get('format_version')}")
+
+        exported = manifest["tables"]
+        names = list(exported) if tables is None else list(tables)
+        missing = [name for name in names if name not in exported]
+        if missing:
+            raise ValueError(f"Tables not in export: {missing}")
+        selected = self._resolve_tables(names)
+        _require_engine(manifest["format"])
+
+        def frames() -> Iterator[Tuple[_TransferTable, pd.DataFrame]]:
+            for table in selected:
+                for relative_path in exported[table.name]["files"]:
+                    yield table, _read_frame(os.path.join(directory, relative_path))
+
+        return self._import(frames(), EXPORT_BATCH_SOURCE, derive_coverage=False, progress=progress)
+
+    def import_csv(self, source: Union[str, BinaryIO], table: str = "market_data", symbol: Optional[str] = None,
+                   columns: Optional[Dict[str, str]] = None, normalize_symbols: bool = True,
+                   chunk_rows: int = 500_000, progress: Optional[Callable[[str, int], None]] = None) -> TransferResult:
+        """
+        Import a vendor CSV dump (optionally gzipped) of prices, dividends or benchmarks.
+
+        Headers are matched case-insensitively against ``VENDOR_COLUMN_ALIASES``
+        and ``VENDOR_VALUE_ALIASES``; ``columns`` maps export column names
+        (``symbol``, ``date`` and the table's value column) to other headers.
+        Price imports read the raw close; a file with only adjusted closes is
+        refused, and mapping ``close_price`` to its adjusted column is an
+        explicit opt-in for symbols without corporate-action factors.
+        Rows without a symbol, a parseable date or a valid value are skipped
+        and counted. Dividend and benchmark imports also record coverage from
+        each symbol's first to last imported date.
+
+        Args:
+            source: File path or binary stream
+            table: ``market_data``, ``dividend_data`` or ``benchmark_data``
+            symbol: Symbol for every row of a single-symbol file without a symbol column
+            columns: Header overrides, e.g. ``{"close_price": "PX_LAST"}``
+            normalize_symbols: Upper-case symbols and use Yahoo's ``-`` for class shares (BRK.B -> BRK-B)
+            chunk_rows: CSV rows parsed per chunk
+            progress: Called with the table name and its rows imported so far
+
+        Raises:
+            ValueError: Unsupported table or missing columns (including adjusted-only price files)
+        """
+        if table not in VENDOR_VALUE_ALIASES:
+            raise ValueError(f"Vendor CSV imports support {sorted(VENDOR_VALUE_ALIASES)}, not {table}")
+        spec = TABLES[table]
+
+        if isinstance(source, str):
+            compression = 'infer'
+        else:
+            compression = 'gzip' if source.read(2) == GZIP_MAGIC else None
+            source.seek(0)
+
+        # Parse only candidate columns, everything as text so symbols such as "NA" are kept verbatim
+        overrides = columns or {}
+        candidates = {alias for aliases in (*VENDOR_COLUMN_ALIASES.values(), VENDOR_VALUE_ALIASES[table])
+                      for alias in aliases}
+        headers = []
+
+        def parsed(header: str) -> bool:
+            headers.append(header)
+            return header.strip().lower() in candidates or header in overrides.values()
+
+        reader = pd.read_csv(source, dtype=str, keep_default_na=False, compression=compression, chunksize=chunk_rows,
+                             usecols=parsed)
+
+        def frames() -> Iterator[Tuple[_TransferTable, pd.DataFrame]]:
+            mapping = None
+            for chunk in reader:
+                if mapping is None:
+                    # Every header, parsed or not, so adjusted-only price files are recognized
+                    mapping = _vendor_mapping(headers, spec, symbol, overrides)
+                frame = pd.DataFrame({name: chunk[header] for name, header in mapping.items()})
+                if "symbol" not in mapping:
+                    frame["symbol"] = symbol
+                yield spec, frame
+
+        with reader:
+            return self._import(frames(), VENDOR_BATCH_SOURCE, derive_coverage=True,
+                                normalize_symbols=normalize_symbols, progress=progress)
+
+    def _import(self, frames: Iterable[Tuple[_TransferTable, pd.DataFrame]], source: str, derive_coverage: bool,
+                normalize_symbols: bool = False,
+                progress: Optional[Callable[[str, int], None]] = None) -> TransferResult:
+        """Insert frames in large transactions, then rebuild touched prefix sums and coverage."""
+        start = time.perf_counter()
+        result = TransferResult()
+        # Per table: symbol_id -> (first day, last day) written
+        touched: Dict[str, Dict[int, Tuple[int, int]]] = {}
+
+        os.makedirs(os.path.dirname(os.path.abspath(self.db_path)), exist_ok=True)
+        conn = sqlite3.connect(self.db_path, timeout=30.0)
+        try:
+            if get_schema_version(conn) < LATEST_SCHEMA_VERSION:
+                conn.execute("PRAGMA journal_mode=WAL")
+                migrate(conn)
+            conn.execute("PRAGMA cache_size = -65536")  # 64 MB of pages for the inserts
+            symbol_ids = dict(conn.execute("SELECT symbol, symbol_id FROM symbols").fetchall())
+            batch_id = new_batch(conn, source)
+            pending_rows = 0
+
+            for table, frame in frames:
+                ids, keys, values, skipped = self._prepare_rows(conn, table, frame, symbol_ids, normalize_symbols)
+                result.skipped_rows += skipped
+                if len(ids) == 0:
+                    continue
+
+                day_columns = ", ".join(column.replace("date", "day") for column in table.date_columns)
+                placeholders = ", ".join(["?"] * (len(table.date_columns) + 3))
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {table.name} (symbol_id, {day_columns}, {table.value_column}, batch_id) "
+                    f"VALUES ({placeholders})",
+                    zip(ids.tolist(), *[column.tolist() for column in keys], values.tolist(),
+                        [batch_id] * len(ids))
+                )
+                day_ranges = touched.setdefault(table.name, {})
+                _merge_day_ranges(day_ranges, ids, keys[0], keys[-1])
+                if table.name in ("market_data", "dividend_data"):
+                    # Logged in the rows' transaction, with the spans imported so far
+                    record_changes(conn, table.name, batch_id,
+                                   [(symbol_id, *day_ranges[symbol_id]) for symbol_id in np.unique(ids).tolist()])
+
+                result.rows[table.name] = result.rows.get(table.name, 0) + len(ids)
+                pending_rows += len(ids)
+                if pending_rows >= self.transaction_rows:
+                    conn.commit()
+                    pending_rows = 0
+                if progress:
+                    progress(table.name, result.rows[table.name])
+            conn.commit()
+
+            self._finish(conn, touched, batch_id, derive_coverage)
+            conn.execute("PRAGMA optimize")
+            # Fold the imported pages into the main file so later opens do not replay a large WAL
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        finally:
+            conn.close()
+
+        result.seconds = time.perf_counter() - start
+        return result
+
+    def _prepare_rows(self, conn: sqlite3.Connection, table: _TransferTable, frame: pd.DataFrame,
+                      symbol_ids: Dict[str, int],
+                      normalize_symbols: bool) -> Tuple[np.ndarray, List[np.ndarray], np.ndarray, int]:
+        """Symbol IDs, epoch-day key columns and values of the valid rows, sorted by key."""
+        # Clean each distinct symbol once, then map back to the rows; missing symbols get code -1
+        codes, raw_symbols = pd.factorize(frame["symbol"])
+        names = [str(symbol).strip() for symbol in raw_symbols.tolist()]
+        if normalize_symbols:
+            # Yahoo Finance form, e.g. brk.b -> BRK-B
+            names = [name.upper().replace('.', '-') for name in names]
+        names = np.array(names + [""], dtype=object)
+        valid = names[codes] != ""
+
+        keys = []
+        for column in table.date_columns:
+            dates = pd.DatetimeIndex(pd.to_datetime(frame[column], errors="coerce"))
+            valid = valid & ~dates.isna()
+            keys.append(dates)
+
+        values = pd.to_numeric(frame[table.value_column], errors="coerce").to_numpy(dtype=float, na_value=np.nan)
+        valid = valid & np.isfinite(values)
+        if table.positive_values:
+            valid = valid & (values > 0)
+
+        skipped = int(len(valid) - valid.sum())
+        used_codes = np.unique(codes[valid])
+        ids_by_code = np.zeros(len(names), dtype=np.int64)
+        ids_by_code[used_codes] = self._ensure_symbol_ids(conn, names[used_codes].tolist(), symbol_ids)
+        ids = ids_by_code[codes[valid]]
+        keys = [to_epoch_days(dates[valid]) for dates in keys]
+        values = values[valid]
+        if table.value_column.startswith("has_"):
+            values = values.astype(np.int64)
+
+        # Insert in primary-key order so each B-tree page is written once per chunk
+        order = np.lexsort(keys[::-1] + [ids])
+        return ids[order], [column[order] for column in keys], values[order], skipped
+
+    @staticmethod
+    def _ensure_symbol_ids(conn: sqlite3.Connection, symbols: List[str], symbol_ids: Dict[str, int]) -> np.ndarray:
+        """Dictionary IDs for ``symbols``, adding new ones in one statement (the caller commits)."""
+        new_symbols = [symbol for symbol in symbols if symbol not in symbol_ids]
+        if new_symbols:
+            last_id = max(symbol_ids.values(), default=0)
+            conn.executemany("INSERT OR IGNORE INTO symbols (symbol) VALUES (?)", [(symbol,) for symbol in new_symbols])
+            # Added symbols take IDs above the previous maximum
+            symbol_ids.update(conn.execute(
+                "SELECT symbol, symbol_id FROM symbols WHERE symbol_id > ?", (last_id,)
+            ).fetchall())
+        return np.array([symbol_ids[symbol] for symbol in symbols], dtype=np.int64)
+
+    def _finish(self, conn: sqlite3.Connection, touched: Dict[str, Dict[int, Tuple[int, int]]],
+                batch_id: int, derive_coverage: bool) -> None:
+        """Rebuild prefix sums from each symbol's first imported day and record derived coverage."""
+        price_days = {symbol_id: first for symbol_id, (first, _) in touched.get("market_data", {}).items()}
+        # An imported factor changes the adjusted returns from its ex-date on
+        for symbol_id, (first_day, _) in touched.get("corporate_actions", {}).items():
+            price_days[symbol_id] = min(first_day, price_days.get(symbol_id, first_day))
+        dividend_days = {symbol_id: first for symbol_id, (first, _) in touched.get("dividend_data", {}).items()}
+
+        for first_days, update in ((price_days, self._prefix_sums.update_prices),
+                                   (dividend_days, self._prefix_sums.update_dividends)):
+            for count, (symbol_id, first_day) in enumerate(first_days.items(), 1):
+                update(conn, symbol_id, first_day)
+                if count % 100 == 0:
+                    conn.commit()
+            conn.commit()
+
+        if derive_coverage:
+            for table_name, day_ranges in touched.items():
+                coverage_table = TABLES[table_name].coverage_table
+                if coverage_table is None:
+                    continue
+                flag = "has_dividends" if coverage_table == "dividend_coverage" else "has_data"
+                conn.executemany(
+                    f"INSERT OR REPLACE INTO {coverage_table} (symbol_id, start_day, end_day, {flag}, batch_id) "
+                    "VALUES (?, ?, ?, 1, ?)",
+                    [(symbol_id, first, last, batch_id) for symbol_id, (first, last) in day_ranges.items()]
+                )
+            conn.commit()
+
+    @staticmethod
+    def _read_table(conn: sqlite3.Connection, table: _TransferTable, rows_per_file: int) -> Iterator[pd.DataFrame]:
+        """Frames of at most ``rows_per_file`` rows with symbols and dates, in primary-key order."""
+        day_columns = [column.replace("date", "day") for column in table.date_columns]
+        cursor = conn.execute(f"""
+            SELECT s.symbol, {', '.join('t.' + column for column in day_columns)}, t.{table.value_column}
+            FROM {table.name} t JOIN symbols s ON s.symbol_id = t.symbol_id
+            ORDER BY t.symbol_id, {', '.join('t.' + column for column in day_columns)}
+        """)
+        columns = ["symbol", *table.date_columns, table.value_column]
+        while True:
+            rows = cursor.fetchmany(rows_per_file)
+            if not rows:
+                return
+            frame = pd.DataFrame.from_records(rows, columns=columns)
+            for column in table.date_columns:
+                frame[column] = to_dates(frame[column].to_numpy())
+            yield frame
+
+    @staticmethod
+    def _resolve_tables(tables: Optional[Iterable[str]]) -> List[_TransferTable]:
+        if tables is None:
+            return list(TABLES.values())
+        tables = list(tables)
+        unknown = [name for name in tables if name not in TABLES]
+        if unknown:
+            raise ValueError(f"Unknown warehouse tables: {unknown}. Use any of {list(TABLES)}")
+        return [TABLES[name] for name in tables]
+
+
+def export_path(export_dir: str, name: str) -> str:
+    """Directory of a named export, rejecting names that could leave ``export_dir``."""
+    if not isinstance(name, str) or not EXPORT_NAME_PATTERN.match(name):
+        raise ValueError(f"Invalid export name: {name!r}. Use 1-64 letters, digits, '.', '_' or '-', "
+                         "not starting with '.'")
+    return os.path.join(export_dir, name)
+
+
+def list_exports(directory: str) -> List[Dict]:
+    """Manifests of the exports directly below ``directory``, newest first."""
+    if not os.path.isdir(directory):
+        return []
+    exports = []
+    for name in os.listdir(directory):
+        manifest_path = os.path.join(directory, name, MANIFEST_FILE)
+        if os.path.exists(manifest_path):
+            with open(manifest_path) as manifest_file:
+                manifest = json.load(manifest_file)
+            exports.append({
+                "name": name,
+                "format": manifest["format"],
+                "exported_at": manifest["exported_at"],
+                "rows": {table: entry["rows"] for table, entry in manifest["tables"].items()},
+            })
+    return sorted(exports, key=lambda export: export["exported_at"], reverse=True)
+
+
+def _require_engine(file_format: str) -> None:
+    """Raise a ValueError naming the missing package when a format's engine is not installed."""
+    if file_format == "parquet":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            try:
+                import fastparquet  # noqa: F401
+            except ImportError:
+                raise ValueError("Parquet files require pyarrow or fastparquet to be installed")
+    elif file_format == "arrow":
+        try:
+            import pyarrow  # noqa: F401
+        except ImportError:
+            raise ValueError("Arrow files require pyarrow to be installed")
+
+
+def _write_frame(frame: pd.DataFrame, path: str, file_format: str) -> None:
+    if file_format == "parquet":
+        frame.to_parquet(path, index=False)
+    elif file_format == "arrow":
+        frame.to_feather(path)
+    else:
+        # Fast gzip level: exports are mostly dates and repeated symbols, which compress well anyway
+        frame.to_csv(path, index=False, compression={"method": "gzip", "compresslevel": 1})
+
+
+def _read_frame(path: str) -> pd.DataFrame:
+    if path.endswith(FORMATS["parquet"]):
+        return pd.read_parquet(path)
+    if path.endswith(FORMATS["arrow"]):
+        return pd.read_feather(path)
+    return pd.read_csv(path, dtype={"symbol": str}, keep_default_na=False)
+
+
+def _vendor_mapping(headers: Iterable[str], table: _TransferTable, symbol: Optional[str],
+                    overrides: Dict[str, str]) -> Dict[str, str]:
+    """Export column name -> CSV header for a vendor file."""
+    by_name = {str(header).strip().lower(): header for header in headers}
+    aliases = {**VENDOR_COLUMN_ALIASES, table.value_column: VENDOR_VALUE_ALIASES[table.name]}
+    mapping = {}
+    for name, candidates in aliases.items():
+        if name in overrides:
+            if overrides[name] not in headers:
+                raise ValueError(f"Column not found in CSV: {overrides[name]}")
+            mapping[name] = overrides[name]
+            continue
+        header = next((by_name[alias] for alias in candidates if alias in by_name), None)
+        if header is not None:
+            mapping[name] = header
+        elif name == "close_price" and table.name in ("market_data", "benchmark_data") and \
+                any(alias in by_name for alias in VENDOR_ADJUSTED_CLOSE_ALIASES):
+            raise ValueError("The CSV has adjusted closes only; the warehouse stores raw closes and adjusts them with "
+                             "corporate-action factors. Map close_price to the adjusted column explicitly only for "
+                             "symbols without factors")
+        elif not (name == "symbol" and symbol):
+            raise ValueError(f"Missing {name} column; expected one of {list(candidates)}")
+    return mapping
+
+
+def _merge_day_ranges(ranges: Dict[int, Tuple[int, int]], ids: np.ndarray, first_days: np.ndarray,
+                      last_days: np.ndarray) -> None:
+    """Widen each symbol's (first day, last day) with the rows just written."""
+    frame = pd.DataFrame({"symbol_id": ids, "first": first_days, "last": last_days})
+    grouped = frame.groupby("symbol_id", sort=False).agg({"first": "min", "last": "max"})
+    for symbol_id, first, last in zip(grouped.index.tolist(), grouped["first"].tolist(), grouped["last"].tolist()):
+        if symbol_id in ranges:
+            previous_first, previous_last = ranges[symbol_id]
+            first, last = min(first, previous_first), max(last, previous_last)
+        ranges[symbol_id] = (first, last)
@@ -0,0 +1,347 @@
+"""
+Conversion of the warehouse to the compact (v2) layout.
+
+Version 1 tables repeat the ticker and a date string in every row, carry a
+per-row ``created_at`` timestamp and keep up to four secondary indexes that
+every insert has to maintain. The compact layout stores ``(symbol_id, day)``
+integer keys (see ``keys``) in ``WITHOUT ROWID`` tables clustered on their
+primary key, which is the only index the warehouse queries need.
+
+Schema migration 4 converts inline with its own frozen copy of the layout.
+This module converts online, against a warehouse that a server keeps
+reading and writing:
+
+1. ``prepare`` creates the ``*_v2`` tables, fills the symbol dictionary and
+   adds triggers that mirror every write to a v1 table into its v2 table.
+2. ``copy_symbols`` backfills a few symbols per short transaction.
+3. ``cutover`` drops the triggers, renames the v1 tables aside and the v2
+   tables into place, which is quick because everything has been copied.
+4. the renamed v1 tables are dropped, one index or table per transaction.
+
+Servers still running v1 code must be restarted after the cutover.
+"""
+
+import sqlite3
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, List, Optional, Tuple
+
+from .keys import EPOCH_DAY_SQL, new_batch
+from .migrations import COMPACT_SCHEMA_VERSION, MIGRATIONS, backfill_prefix_sums, get_schema_version, migrate
+
+
+@dataclass(frozen=True)
+class _TableSpec:
+    """How one v1 table maps onto its v2 layout."""
+    name: str
+    symbol_column: str
+    date_columns: Tuple[str, ...]
+    value_columns: Tuple[str, ...]
+    batched: bool  # v1 created_at becomes a batch_id
+    ddl: str
+
+
+def _day_column(date_column: str) -> str:
+    return date_column.replace('date', 'day')
+
+
+TABLES: Tuple[_TableSpec, ...] = (
+    _TableSpec("market_data", "ticker", ("date",), ("close_price",), True, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    _TableSpec("dividend_data", "ticker", ("date",), ("dividend_amount",), True, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            dividend_amount REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    _TableSpec("dividend_coverage", "ticker", ("start_date", "end_date"), ("has_dividends",), True, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            start_day INTEGER NOT NULL,
+            end_day INTEGER NOT NULL,
+            has_dividends INTEGER NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, start_day, end_day)
+        ) WITHOUT ROWID
+    """),
+    _TableSpec("benchmark_data", "symbol", ("date",), ("close_price",), True, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    _TableSpec("benchmark_coverage", "symbol", ("start_date", "end_date"), ("has_data",), True, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            start_day INTEGER NOT NULL,
+            end_day INTEGER NOT NULL,
+            has_data INTEGER NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, start_day, end_day)
+        ) WITHOUT ROWID
+    """),
+    _TableSpec(
+        "price_prefix_sums", "ticker", ("date",),
+        ("row_number", "close_price", "cum_log_return", "cum_return", "cum_squared_return"), False, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            row_number INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            cum_log_return REAL NOT NULL,
+            cum_return REAL NOT NULL,
+            cum_squared_return REAL NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    _TableSpec("dividend_prefix_sums", "ticker", ("date",), ("cum_dividend",), False, """
+        CREATE TABLE IF NOT EXISTS {table} (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            cum_dividend REAL NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+)
+
+MIGRATION_BATCH_SOURCE = "schema-v2-migration"
+
+
+def create_dictionary_tables(conn: sqlite3.Connection) -> None:
+    """Create the symbol dictionary and ingest batch tables."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS symbols (
+            symbol_id INTEGER PRIMARY KEY,
+            symbol TEXT NOT NULL UNIQUE
+        )
+    """)
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_batches (
+            batch_id INTEGER PRIMARY KEY,
+            source TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+
+
+class CompactSchemaMigrator:
+    """Converts v1 warehouse tables to the compact layout online."""
+
+    PROGRESS_TABLE = "schema_v2_progress"
+    RETIRED_SUFFIX = "_v1_retired"
+
+    def prepare(self, conn: sqlite3.Connection) -> None:
+        """Create the v2 tables, fill the symbol dictionary and start mirroring v1 writes (idempotent)."""
+        create_dictionary_tables(conn)
+        conn.execute(f"CREATE TABLE IF NOT EXISTS {self.PROGRESS_TABLE} (symbol_id INTEGER PRIMARY KEY)")
+
+        # Assign IDs in symbol order so each symbol's rows sit together in every table.
+        # Every v1 primary key starts with the symbol, so each distinct value is one index seek.
+        for spec in TABLES:
+            conn.execute(f"""
+                WITH RECURSIVE distinct_symbols(symbol) AS (
+                    SELECT MIN({spec.symbol_column}) FROM {spec.name}
+                    UNION ALL
+                    SELECT (SELECT MIN({spec.symbol_column}) FROM {spec.name} WHERE {spec.symbol_column} > symbol)
+                    FROM distinct_symbols WHERE symbol IS NOT NULL
+                )
+                INSERT OR IGNORE INTO symbols (symbol)
+                SELECT symbol FROM distinct_symbols WHERE symbol IS NOT NULL ORDER BY symbol
+            """)
+
+        batch_id = self._migration_batch(conn)
+        for spec in TABLES:
+            conn.execute(spec.ddl.format(table=f"{spec.name}_v2"))
+            self._create_triggers(conn, spec, batch_id)
+
+    def pending_symbols(self, conn: sqlite3.Connection) -> List[int]:
+        """Symbol IDs whose v1 rows have not been copied yet."""
+        return [row[0] for row in conn.execute(f"""
+            SELECT symbol_id FROM symbols
+            WHERE symbol_id NOT IN (SELECT symbol_id FROM {self.PROGRESS_TABLE})
+            ORDER BY symbol_id
+        """).fetchall()]
+
+    def copy_symbols(self, conn: sqlite3.Connection, symbol_ids: List[int]) -> None:
+        """Copy the v1 rows of these symbols into the v2 tables.
+
+        Rows already mirrored by the triggers are at least as new as the v1
+        copy, so existing v2 rows are kept.
+        """
+        if not symbol_ids:
+            return
+
+        batch_id = self._migration_batch(conn)
+        placeholders = ','.join(['?'] * len(symbol_ids))
+        for spec in TABLES:
+            columns, values = self._v2_columns(spec, "v1", batch_id)
+            conn.execute(f"""
+                INSERT OR IGNORE INTO {spec.name}_v2 ({columns})
+                SELECT {values}
+                FROM symbols s JOIN {spec.name} v1 ON v1.{spec.symbol_column} = s.symbol
+                WHERE s.symbol_id IN ({placeholders})
+            """, symbol_ids)
+
+        conn.executemany(
+            f"INSERT OR IGNORE INTO {self.PROGRESS_TABLE} (symbol_id) VALUES (?)",
+            [(symbol_id,) for symbol_id in symbol_ids]
+        )
+
+    def cutover(self, conn: sqlite3.Connection) -> None:
+        """Put the copied v2 tables in place of the v1 tables, which are renamed aside (``retired_tables``).
+
+        Dropping a large table has to free every page, so it is kept out of this step.
+        """
+        for spec in TABLES:
+            for event in ("insert", "update", "delete"):
+                conn.execute(f"DROP TRIGGER IF EXISTS {spec.name}_v2_{event}")
+            conn.execute(f"ALTER TABLE {spec.name} RENAME TO {spec.name}{self.RETIRED_SUFFIX}")
+            conn.execute(f"ALTER TABLE {spec.name}_v2 RENAME TO {spec.name}")
+        conn.execute(f"DROP TABLE {self.PROGRESS_TABLE}")
+
+        # Warehouses adopted from before the prefix-sum tables existed have none yet
+        backfill_prefix_sums(conn)
+
+    def retired_tables(self, conn: sqlite3.Connection) -> List[str]:
+        """v1 tables left by the cutover (their indexes go with them)."""
+        return [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE ?", (f"%{self.RETIRED_SUFFIX}",)
+        ).fetchall()]
+
+    def run_online(self, conn: sqlite3.Connection, chunk_size: int = 20, pause_seconds: float = 0.0,
+                   progress: Optional[Callable[[int, int], None]] = None) -> List:
+        """
+        Migrate a live warehouse, holding the write lock only briefly at a time.
+
+        Earlier migrations are applied first; then the v2 tables are filled
+        ``chunk_size`` symbols per transaction, sleeping ``pause_seconds``
+        between chunks so other writers get the lock. The cutover records
+        migration 4, and the v1 tables are dropped afterwards one per
+        transaction. Interrupted runs resume where they stopped.
+
+        Args:
+            conn: Warehouse connection (WAL mode recommended)
+            chunk_size: Symbols copied per transaction
+            pause_seconds: Pause between chunks
+            progress: Called with (symbols copied, symbols total) after each chunk
+
+        Returns:
+            The migrations that were applied
+        """
+        applied = migrate(conn, target=COMPACT_SCHEMA_VERSION - 1)
+        if get_schema_version(conn) < COMPACT_SCHEMA_VERSION:
+            with _write_transaction(conn):
+                self.prepare(conn)
+
+            pending = self.pending_symbols(conn)
+            for start in range(0, len(pending), chunk_size):
+                with _write_transaction(conn):
+                    self.copy_symbols(conn, pending[start:start + chunk_size])
+                if progress:
+                    progress(min(start + chunk_size, len(pending)), len(pending))
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+
+            with _write_transaction(conn):
+                # Another process may have finished the migration meanwhile
+                if get_schema_version(conn) < COMPACT_SCHEMA_VERSION:
+                    self.copy_symbols(conn, self.pending_symbols(conn))
+                    self.cutover(conn)
+                    conn.execute(f"PRAGMA user_version = {COMPACT_SCHEMA_VERSION}")
+                    applied += [migration for migration in MIGRATIONS if migration.version == COMPACT_SCHEMA_VERSION]
+
+        # Freeing pages takes the write lock for as long as the pages take to walk,
+        # so each secondary index is dropped in its own transaction before its table
+        for table in self.retired_tables(conn):
+            for name in self._secondary_indexes(conn, table) + [None]:
+                with _write_transaction(conn):
+                    conn.execute(f"DROP INDEX IF EXISTS {name}" if name else f"DROP TABLE IF EXISTS {table}")
+                if pause_seconds:
+                    time.sleep(pause_seconds)
+
+        return applied + migrate(conn)
+
+    @staticmethod
+    def _secondary_indexes(conn: sqlite3.Connection, table: str) -> List[str]:
+        return [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'index' AND tbl_name = ? AND sql IS NOT NULL", (table,)
+        ).fetchall()]
+
+    def _migration_batch(self, conn: sqlite3.Connection) -> int:
+        """The ingest batch that copied and mirrored rows are recorded under."""
+        row = conn.execute(
+            "SELECT batch_id FROM ingest_batches WHERE source = ?", (MIGRATION_BATCH_SOURCE,)
+        ).fetchone()
+        if row:
+            return row[0]
+        # Microsecond timestamps like every other batch: the first batch's time identifies the warehouse
+        return new_batch(conn, MIGRATION_BATCH_SOURCE)
+
+    @staticmethod
+    def _v2_columns(spec: _TableSpec, alias: str, batch_id: int) -> Tuple[str, str]:
+        """v2 column list and the matching expressions over a v1 row ``alias``."""
+        columns = ["symbol_id"] + [_day_column(column) for column in spec.date_columns] + list(spec.value_columns)
+        values = (
+            ["s.symbol_id" if alias == "v1" else f"(SELECT symbol_id FROM symbols WHERE symbol = {alias}.{spec.symbol_column})"]
+            + [EPOCH_DAY_SQL.format(column=f"{alias}.{column}") for column in spec.date_columns]
+            + [f"{alias}.{column}" for column in spec.value_columns]
+        )
+        if spec.batched:
+            columns.append("batch_id")
+            values.append(str(batch_id))
+        return ', '.join(columns), ', '.join(values)
+
+    def _create_triggers(self, conn: sqlite3.Connection, spec: _TableSpec, batch_id: int) -> None:
+        columns, values = self._v2_columns(spec, "NEW", batch_id)
+
+        def remove(alias: str) -> str:
+            key = ' AND '.join(
+                [f"symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = {alias}.{spec.symbol_column})"]
+                + [f"{_day_column(column)} = {EPOCH_DAY_SQL.format(column=f'{alias}.{column}')}"
+                   for column in spec.date_columns]
+            )
+            return f"DELETE FROM {spec.name}_v2 WHERE {key};"
+
+        # No conflict clauses in the bodies: an outer INSERT OR REPLACE would override them
+        # (and replacing a symbols row would give the symbol a new ID)
+        upsert = f"""
+            INSERT INTO symbols (symbol) SELECT NEW.{spec.symbol_column}
+            WHERE NOT EXISTS (SELECT 1 FROM symbols WHERE symbol = NEW.{spec.symbol_column});
+            {remove("NEW")}
+            INSERT INTO {spec.name}_v2 ({columns}) VALUES ({values});
+        """
+
+        # INSERT OR REPLACE on a v1 table fires only the insert trigger, which replaces the v2 row
+        for event, body in (("insert", upsert), ("update", remove("OLD") + upsert), ("delete", remove("OLD"))):
+            conn.execute(f"""
+                CREATE TRIGGER IF NOT EXISTS {spec.name}_v2_{event}
+                AFTER {event.upper()} ON {spec.name}
+                BEGIN {body} END
+            """)
+
+
+@contextmanager
+def _write_transaction(conn: sqlite3.Connection):
+    """One ``BEGIN IMMEDIATE`` transaction, committed on success."""
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        yield
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
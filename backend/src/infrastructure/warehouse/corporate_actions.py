@@ -0,0 +1,159 @@
+"""
+Raw closes with a corporate-action factor table; adjusted closes derived on read.
+
+Yahoo's adjusted closes are rewritten for the whole history by every split
+and dividend, so stored adjusted segments silently stop matching newly
+fetched ones. The warehouse instead stores raw closes, which never change,
+and one ``corporate_actions`` row per ex-date with the factor that action
+applies to every earlier close:
+
+    split of ratio r (2.0 for 2-for-1)       factor = 1 / r
+    dividend D, previous raw close P         factor = 1 - D / P
+
+(both on the same ex-date multiply). The adjusted close of day ``t`` is its
+raw close times the product of the factors of all actions after ``t``, and
+the adjusted return of day ``t`` only involves the actions between the
+previous close and ``t``. A new split or dividend therefore adds one factor
+row; stored closes and the returns of every other day stay valid.
+
+Closes stored before the factor table existed were adjusted when fetched;
+schema migration 5 drops them so they are fetched again raw.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .keys import to_epoch_days
+
+_NO_ACTIONS = (np.empty(0, dtype=np.int64), np.empty(0, dtype=np.float64))
+
+
+@dataclass
+class RawPriceHistory:
+    """Raw closes of one ticker and the factors of its corporate actions, both indexed by date."""
+    closes: pd.Series
+    factors: pd.Series
+
+
+def raw_closes(split_adjusted: pd.Series, splits: pd.Series) -> pd.Series:
+    """Undo the split adjustment of closes, given every split (ratio by date) after their first day."""
+    splits = splits[splits > 0]
+    if splits.empty or split_adjusted.empty:
+        return split_adjusted
+    later_splits = suffix_products(to_epoch_days(split_adjusted.index), to_epoch_days(splits.index),
+                                   splits.to_numpy(dtype=float))
+    return split_adjusted * later_splits
+
+
+def action_factors(closes: pd.Series, dividends: pd.Series, splits: pd.Series) -> pd.Series:
+    """
+    Factor per ex-date for splits and dividends.
+
+    ``closes`` and ``dividends`` must be on the same basis (both raw, or both
+    split-adjusted as Yahoo reports them); the ratio is the same either way.
+    A dividend needs the close before its ex-date, so dividends on or before
+    the first close are left out.
+
+    Returns:
+        Factors in (0, 1] for dividends and 1/ratio for splits, indexed by ex-date
+    """
+    factors = pd.Series(1.0 / splits[splits > 0].to_numpy(dtype=float),
+                        index=pd.DatetimeIndex(splits[splits > 0].index), dtype=float)
+
+    dividends = dividends[dividends > 0]
+    if not dividends.empty and not closes.empty:
+        close_days = to_epoch_days(closes.index)
+        positions = np.searchsorted(close_days, to_epoch_days(dividends.index), side='left') - 1
+        has_previous = positions >= 0
+        previous = closes.to_numpy(dtype=float)[positions[has_previous]]
+        dividend_factors = pd.Series(1.0 - dividends.to_numpy(dtype=float)[has_previous] / previous,
+                                     index=pd.DatetimeIndex(dividends.index[has_previous]))
+        # Guard against bad data; a dividend cannot exceed the price it is paid from
+        dividend_factors = dividend_factors[dividend_factors > 0]
+        factors = pd.concat([factors, dividend_factors]).groupby(level=0).prod()
+
+    return factors.sort_index()
+
+
+def suffix_products(days: np.ndarray, action_days: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Product of the factors of all actions after each day (1 where none follow)."""
+    if len(action_days) == 0:
+        return np.ones(len(days))
+    suffix = np.append(np.cumprod(factors[::-1])[::-1], 1.0)
+    return suffix[np.searchsorted(action_days, days, side='right')]
+
+
+def adjust(days: np.ndarray, closes: np.ndarray, action_days: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """Adjusted closes for raw closes on ascending epoch days."""
+    if len(action_days) == 0:
+        return closes
+    return closes * suffix_products(days, action_days, factors)
+
+
+def return_factors(days: np.ndarray, after_day: int, action_days: np.ndarray, factors: np.ndarray) -> np.ndarray:
+    """
+    Product of the factors of actions between each close and the one before it.
+
+    ``days`` are ascending and the close before ``days[0]`` is on ``after_day``.
+    The adjusted return of a day is ``close / (previous_close * factor) - 1``.
+    """
+    if len(action_days) == 0:
+        return np.ones(len(days))
+    suffix = suffix_products(np.concatenate([[after_day], days]), action_days, factors)
+    return suffix[:-1] / suffix[1:]
+
+
+def read_factors(conn: sqlite3.Connection, symbol_id: Optional[int]) -> Tuple[np.ndarray, np.ndarray]:
+    """Ex-dates (epoch days) and factors of a symbol's actions, ascending."""
+    if symbol_id is None:
+        return _NO_ACTIONS
+    rows = conn.execute(
+        "SELECT day, factor FROM corporate_actions WHERE symbol_id = ? ORDER BY day", (symbol_id,)
+    ).fetchall()
+    if not rows:
+        return _NO_ACTIONS
+    days, factors = zip(*rows)
+    return np.array(days, dtype=np.int64), np.array(factors, dtype=np.float64)
+
+
+def read_factors_many(conn: sqlite3.Connection, symbols: Iterable[str]) -> Dict[str, Tuple[np.ndarray, np.ndarray]]:
+    """Actions of many symbols in one query; symbols without actions are left out."""
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    placeholders = ','.join(['?'] * len(symbols))
+    rows = conn.execute(f"""
+        SELECT s.symbol, a.day, a.factor
+        FROM symbols s JOIN corporate_actions a ON a.symbol_id = s.symbol_id
+        WHERE s.symbol IN ({placeholders})
+        ORDER BY s.symbol, a.day
+    """, symbols).fetchall()
+    result = {}
+    for symbol, day, factor in rows:
+        result.setdefault(symbol, ([], []))
+        result[symbol][0].append(day)
+        result[symbol][1].append(factor)
+    return {symbol: (np.array(days, dtype=np.int64), np.array(factors, dtype=np.float64))
+            for symbol, (days, factors) in result.items()}
+
+
+def store_factors(conn: sqlite3.Connection, symbol_id: int, factors: Optional[pd.Series],
+                  batch_id: int) -> Optional[int]:
+    """
+    Record action factors (the caller commits).
+
+    Returns:
+        The earliest ex-date written as an epoch day, or None if there was nothing to write
+    """
+    if factors is None or factors.empty:
+        return None
+    days = to_epoch_days(factors.index)
+    conn.executemany(
+        "INSERT OR REPLACE INTO corporate_actions (symbol_id, day, factor, batch_id) VALUES (?, ?, ?, ?)",
+        zip([symbol_id] * len(days), days.tolist(), factors.to_numpy(dtype=float).tolist(), [batch_id] * len(days))
+    )
+    return int(days.min())
@@ -0,0 +1,103 @@
+"""
+Row keys for the compact warehouse layout.
+
+Rows are keyed by an integer ``symbol_id`` from the ``symbols`` dictionary and
+an integer ``day`` counted from 1970-01-01, instead of repeating the ticker and
+a 10-character date string in every row and index entry. Each write records
+one ``ingest_batches`` row rather than a timestamp per row, and writes to the
+price and dividend tables also log the symbols and days they touched in
+``series_changes``.
+"""
+
+import sqlite3
+from datetime import date, datetime
+from typing import Dict, Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+_EPOCH_ORDINAL = date(1970, 1, 1).toordinal()
+
+# SQL expressions converting between ISO date text and epoch days
+EPOCH_DAY_SQL = "CAST(julianday({column}) - 2440587.5 AS INTEGER)"
+ISO_DATE_SQL = "date({column} * 86400, 'unixepoch')"
+
+
+def to_epoch_day(value) -> int:
+    """Epoch day of a date, datetime, Timestamp or ISO string (time of day is ignored)."""
+    return pd.Timestamp(value).toordinal() - _EPOCH_ORDINAL
+
+
+def to_epoch_days(index) -> np.ndarray:
+    """Epoch days for a DatetimeIndex or any sequence of dates, keeping each timezone's calendar date."""
+    dates = pd.DatetimeIndex(index)
+    if dates.tz is not None:
+        dates = dates.tz_localize(None)
+    return dates.to_numpy(dtype='datetime64[D]').astype(np.int64)
+
+
+def to_dates(days) -> pd.DatetimeIndex:
+    """DatetimeIndex for epoch days, with the resolution pandas gives parsed date strings."""
+    return pd.DatetimeIndex(np.asarray(days, dtype=np.int64).astype('datetime64[D]').astype('datetime64[us]'))
+
+
+def to_iso_date(day: int) -> str:
+    """YYYY-MM-DD text for an epoch day."""
+    return str(np.datetime64(int(day), 'D'))
+
+
+def to_iso_dates(days) -> List[str]:
+    """YYYY-MM-DD text for each epoch day."""
+    return np.asarray(days, dtype=np.int64).astype('datetime64[D]').astype(str).tolist()
+
+
+def get_symbol_id(conn: sqlite3.Connection, symbol: str) -> Optional[int]:
+    """Dictionary ID of a symbol, or None if it was never stored."""
+    row = conn.execute("SELECT symbol_id FROM symbols WHERE symbol = ?", (symbol,)).fetchone()
+    return row[0] if row else None
+
+
+def get_symbol_ids(conn: sqlite3.Connection, symbols: Iterable[str]) -> Dict[str, int]:
+    """Dictionary IDs of the symbols that were stored, in one query."""
+    symbols = list(symbols)
+    if not symbols:
+        return {}
+    placeholders = ','.join(['?'] * len(symbols))
+    return dict(conn.execute(
+        f"SELECT symbol, symbol_id FROM symbols WHERE symbol IN ({placeholders})", symbols
+    ).fetchall())
+
+
+def ensure_symbol_id(conn: sqlite3.Connection, symbol: str) -> int:
+    """Dictionary ID of a symbol, adding it on first use (the caller commits)."""
+    conn.execute("INSERT OR IGNORE INTO symbols (symbol) VALUES (?)", (symbol,))
+    return get_symbol_id(conn, symbol)
+
+
+# Ingest batch recorded by deleting warehouse data
+CLEAR_BATCH_SOURCE = "clear"
+# Ingest batch recorded by replacing the whole warehouse with a backup
+RESTORE_BATCH_SOURCE = "restore"
+
+
+def new_batch(conn: sqlite3.Connection, source: str) -> int:
+    """Record one ingest batch and return its ID (the caller commits)."""
+    return conn.execute(
+        "INSERT INTO ingest_batches (source, created_at) VALUES (?, ?)",
+        (source, datetime.now().isoformat())
+    ).lastrowid
+
+
+def record_changes(conn: sqlite3.Connection, table: str, batch_id: int,
+                   day_ranges: Iterable[Tuple[int, Optional[int], Optional[int]]]) -> None:
+    """
+    Log the ``(symbol_id, first day, last day)`` spans a batch wrote to or deleted
+    from ``market_data`` or ``dividend_data`` (the caller commits).
+
+    A span of ``(None, None)`` stands for the symbol's whole history.
+    """
+    conn.executemany(
+        "INSERT OR REPLACE INTO series_changes (symbol_id, table_name, batch_id, first_day, last_day) "
+        "VALUES (?, ?, ?, ?, ?)",
+        [(symbol_id, table, batch_id, first_day, last_day) for symbol_id, first_day, last_day in day_ranges]
+    )
@@ -0,0 +1,289 @@
+"""
+Background WAL checkpoints, space reclamation and retention for the warehouse.
+
+Writers only append to the WAL; SQLite's auto-checkpoint copies frames back
+but never shrinks the file, and deleted rows (``clear_data``, expired
+coverage) leave free pages the main file keeps. Each maintenance tick runs
+on one short-lived connection:
+
+    retention    delete coverage rows whose ingest batch is older than the table's policy
+    vacuum       ``PRAGMA incremental_vacuum`` of free pages above the free-space budget
+    checkpoint   ``wal_checkpoint(PASSIVE)``, and ``TRUNCATE`` once the WAL exceeds its threshold
+    optimize     ``PRAGMA optimize`` every ``optimize_seconds``
+
+Deletes and vacuumed pages per tick are capped (``rows_per_tick``,
+``pages_per_tick``) so a tick never holds the write lock for long, and the
+truncate checkpoint gives up after a short busy timeout instead of stalling
+writers behind long readers. Passive checkpoints cannot be capped and copy
+whatever the auto-checkpoint left behind.
+
+Incremental vacuum needs ``auto_vacuum=INCREMENTAL``, which new warehouses
+get at creation. Existing ones switch with one offline ``VACUUM``
+(``enable_incremental_vacuum``); until then ticks only report free space.
+
+Expired coverage rows make the next read re-check the range upstream, which
+also picks up dividends announced since. Like other deletes they record no
+ingest batch, so delta backups do not carry them.
+"""
+
+import os
+import sqlite3
+import threading
+import time
+from contextlib import closing
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+# Tables with a retention policy and the primary key used to delete their rows in chunks
+RETENTION_TABLES = {
+    "dividend_coverage": ("symbol_id", "start_day", "end_day"),
+    "benchmark_coverage": ("symbol_id", "start_day", "end_day"),
+}
+
+AUTO_VACUUM_MODES = {0: "none", 1: "full", 2: "incremental"}
+INCREMENTAL_AUTO_VACUUM = 2
+
+# How long a truncate checkpoint waits for readers before leaving the WAL for the next tick
+TRUNCATE_BUSY_TIMEOUT_MS = 100
+
+ANALYSIS_LIMIT = 1000
+
+_MB = 1024 * 1024
+
+
+@dataclass(frozen=True)
+class MaintenancePolicy:
+    """How often maintenance runs and how much work one tick may do."""
+    tick_seconds: float = 60.0
+    wal_truncate_bytes: int = 64 * _MB  # Truncate the WAL once it grows past this
+    free_space_budget_bytes: int = 32 * _MB  # Free pages kept for reuse; the excess is vacuumed
+    pages_per_tick: int = 2048  # Pages released by one incremental vacuum
+    rows_per_tick: int = 5000  # Expired rows deleted per tick, across tables
+    retention_days: Dict[str, int] = field(default_factory=dict)  # Table -> max age; 0 keeps rows
+    optimize_seconds: float = 3600.0
+
+    def __post_init__(self):
+        unknown = set(self.retention_days) - set(RETENTION_TABLES)
+        if unknown:
+            raise ValueError(f"No retention policy for tables: {', '.join(sorted(unknown))}; "
+                             f"choose from {', '.join(RETENTION_TABLES)}")
+
+
+@dataclass
+class MaintenanceTick:
+    """Work done by one tick."""
+    retention_rows: Dict[str, int]
+    reclaimed_bytes: int  # Free pages returned to the file system by incremental vacuum
+    checkpointed_frames: int
+    truncated: bool
+    wal_reclaimed_bytes: int
+    optimized: bool
+    seconds: float
+
+
+class WarehouseMaintenance:
+    """Runs maintenance ticks against one warehouse, on demand or on a daemon thread."""
+
+    def __init__(self, db_path: str, policy: Optional[MaintenancePolicy] = None):
+        self.db_path = db_path
+        self.policy = policy or MaintenancePolicy()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._thread_lock = threading.Lock()
+        self._tick_lock = threading.Lock()
+        self._metrics_lock = threading.Lock()
+        # Startup already refreshes planner statistics (WarehouseService), so the first optimize waits an interval
+        self._last_optimize = time.monotonic()
+        self._totals = {
+            "maintenance_ticks": 0,
+            "checkpoints": 0,
+            "truncate_checkpoints": 0,
+            "busy_checkpoints": 0,
+            "reclaimed_bytes": 0,
+            "wal_reclaimed_bytes": 0,
+            "retention_rows_deleted": 0,
+            "optimize_runs": 0,
+        }
+        self.last_tick_seconds: Optional[float] = None
+        self.last_error: Optional[str] = None
+
+    @property
+    def wal_path(self) -> str:
+        return self.db_path + "-wal"
+
+    def run_once(self, optimize: Optional[bool] = None) -> MaintenanceTick:
+        """
+        Run one tick: retention, incremental vacuum, checkpoints and, when due, ``PRAGMA optimize``.
+
+        Args:
+            optimize: Force (True) or skip (False) ``PRAGMA optimize``; by default it runs every ``optimize_seconds``
+        """
+        with self._tick_lock:
+            start = time.perf_counter()
+            with closing(sqlite3.connect(self.db_path, timeout=1.0)) as conn:
+                retention_rows = self._expire(conn)
+                reclaimed_bytes = self._vacuum(conn)
+                checkpointed_frames, truncated, wal_reclaimed_bytes, busy = self._checkpoint(conn)
+                if optimize is None:
+                    optimize = time.monotonic() - self._last_optimize >= self.policy.optimize_seconds
+                if optimize:
+                    conn.execute(f"PRAGMA analysis_limit={ANALYSIS_LIMIT}")
+                    conn.execute("PRAGMA optimize")
+                    self._last_optimize = time.monotonic()
+            tick = MaintenanceTick(retention_rows, reclaimed_bytes, checkpointed_frames, truncated,
+                                   wal_reclaimed_bytes, optimize, time.perf_counter() - start)
+
+        with self._metrics_lock:
+            self._totals["maintenance_ticks"] += 1
+            self._totals["checkpoints"] += 1
+            self._totals["truncate_checkpoints"] += int(truncated)
+            self._totals["busy_checkpoints"] += int(busy)
+            self._totals["reclaimed_bytes"] += reclaimed_bytes
+            self._totals["wal_reclaimed_bytes"] += wal_reclaimed_bytes
+            self._totals["retention_rows_deleted"] += sum(retention_rows.values())
+            self._totals["optimize_runs"] += int(optimize)
+            self.last_tick_seconds = tick.seconds
+        return tick
+
+    def start(self) -> threading.Thread:
+        """Run a tick every ``tick_seconds`` on a daemon thread; a running thread is reused."""
+        with self._thread_lock:
+            if self._thread is not None and self._thread.is_alive():
+                return self._thread
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="warehouse-maintenance", daemon=True)
+            self._thread.start()
+            return self._thread
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        """Stop the background thread after its current tick."""
+        self._stop.set()
+        with self._thread_lock:
+            thread = self._thread
+        if thread is not None:
+            thread.join(timeout)
+
+    @property
+    def running(self) -> bool:
+        return self._thread is not None and self._thread.is_alive()
+
+    def get_metrics(self) -> Dict[str, object]:
+        """Current WAL, file and free-space sizes plus totals of the work done so far."""
+        with closing(sqlite3.connect(self.db_path, timeout=1.0)) as conn:
+            page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+            free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+            auto_vacuum = conn.execute("PRAGMA auto_vacuum").fetchone()[0]
+        with self._metrics_lock:
+            return {
+                **self._totals,
+                "maintenance_running": self.running,
+                "database_bytes": _file_size(self.db_path),
+                "wal_bytes": _file_size(self.wal_path),
+                "free_bytes": free_pages * page_size,
+                "auto_vacuum": AUTO_VACUUM_MODES.get(auto_vacuum, str(auto_vacuum)),
+                "last_tick_seconds": self.last_tick_seconds,
+                "last_error": self.last_error,
+            }
+
+    def enable_incremental_vacuum(self) -> int:
+        """
+        Switch an existing warehouse to ``auto_vacuum=INCREMENTAL``.
+
+        Rewrites the whole file with ``VACUUM``, blocking writers meanwhile;
+        run it from the admin script, not while serving. Returns the bytes the
+        file shrank by.
+        """
+        size_before = _file_size(self.db_path)
+        with closing(sqlite3.connect(self.db_path, timeout=30.0)) as conn:
+            if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != INCREMENTAL_AUTO_VACUUM:
+                conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+                conn.execute("VACUUM")
+            # In WAL mode the rewritten pages reach the main file at checkpoint
+            conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+        return size_before - _file_size(self.db_path)
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.policy.tick_seconds):
+            try:
+                self.run_once()
+                self.last_error = None
+            except sqlite3.Error as e:
+                self.last_error = str(e)
+                print(f"Background warehouse maintenance failed: {e}")
+
+    def _expire(self, conn: sqlite3.Connection) -> Dict[str, int]:
+        """Delete up to ``rows_per_tick`` rows written by batches older than each table's retention."""
+        deleted = {}
+        budget = self.policy.rows_per_tick
+        for table, days in self.policy.retention_days.items():
+            if days <= 0 or budget <= 0:
+                continue
+            cutoff = (datetime.now() - timedelta(days=days)).isoformat()
+            # Batch IDs grow with created_at, so the newest expired batch bounds every expired row
+            last_expired = conn.execute(
+                "SELECT MAX(batch_id) FROM ingest_batches WHERE created_at < ?", (cutoff,)
+            ).fetchone()[0]
+            if last_expired is None:
+                continue
+            key = ", ".join(RETENTION_TABLES[table])
+            rows = conn.execute(f"""
+                DELETE FROM {table} WHERE ({key}) IN (
+                    SELECT {key} FROM {table} WHERE batch_id <= ? LIMIT ?
+                )
+            """, (last_expired, budget)).rowcount
+            conn.commit()
+            deleted[table] = rows
+            budget -= rows
+        return deleted
+
+    def _vacuum(self, conn: sqlite3.Connection) -> int:
+        """Release free pages above the free-space budget, at most ``pages_per_tick``."""
+        if conn.execute("PRAGMA auto_vacuum").fetchone()[0] != INCREMENTAL_AUTO_VACUUM:
+            return 0
+        page_size = conn.execute("PRAGMA page_size").fetchone()[0]
+        free_pages = conn.execute("PRAGMA freelist_count").fetchone()[0]
+        excess = free_pages - self.policy.free_space_budget_bytes // page_size
+        pages = min(excess, self.policy.pages_per_tick)
+        if pages <= 0:
+            return 0
+        # The pragma releases one page per step and execute() steps once; executescript runs it to completion
+        conn.executescript(f"PRAGMA incremental_vacuum({pages})")
+        return (free_pages - conn.execute("PRAGMA freelist_count").fetchone()[0]) * page_size
+
+    def _checkpoint(self, conn: sqlite3.Connection):
+        """Passive checkpoint, then truncate the WAL when it is over its threshold and readers allow."""
+        busy, _, checkpointed_frames = conn.execute("PRAGMA wal_checkpoint(PASSIVE)").fetchone()
+        wal_bytes = _file_size(self.wal_path)
+        if wal_bytes <= self.policy.wal_truncate_bytes:
+            return max(checkpointed_frames, 0), False, 0, bool(busy)
+        conn.execute(f"PRAGMA busy_timeout={TRUNCATE_BUSY_TIMEOUT_MS}")
+        busy = conn.execute("PRAGMA wal_checkpoint(TRUNCATE)").fetchone()[0]
+        if busy:
+            return max(checkpointed_frames, 0), False, 0, True
+        return max(checkpointed_frames, 0), True, wal_bytes - _file_size(self.wal_path), False
+
+
+def _file_size(path: str) -> int:
+    return os.path.getsize(path) if os.path.exists(path) else 0
+
+
+_warehouse_maintenance: Dict[str, WarehouseMaintenance] = {}
+_warehouse_maintenance_lock = threading.Lock()
+
+
+def get_warehouse_maintenance(db_path: str = None) -> WarehouseMaintenance:
+    """Get or create the maintenance service of a database, with the configured policy."""
+    from ..config.warehouse_config import WarehouseConfig
+    config = WarehouseConfig()
+    db_path = db_path or config.get_db_path()
+    with _warehouse_maintenance_lock:
+        if db_path not in _warehouse_maintenance:
+            retention_days = config.get_coverage_retention_days()
+            _warehouse_maintenance[db_path] = WarehouseMaintenance(db_path, MaintenancePolicy(
+                tick_seconds=config.get_maintenance_interval(),
+                wal_truncate_bytes=config.get_wal_truncate_bytes(),
+                free_space_budget_bytes=config.get_free_space_budget_bytes(),
+                retention_days={table: retention_days for table in RETENTION_TABLES},
+            ))
+        return _warehouse_maintenance[db_path]
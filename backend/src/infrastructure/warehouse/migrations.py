@@ -0,0 +1,399 @@
+"""
+Versioned schema migrations for the warehouse database.
+
+The applied version is kept in SQLite's ``PRAGMA user_version``. Opening an
+up-to-date warehouse costs one PRAGMA read; DDL and backfills run only when a
+migration newer than the stored version exists. Each migration uses
+``IF NOT EXISTS`` DDL, so warehouses created before versioning (version 0)
+are adopted in place.
+
+Migrations are frozen once released: they must not call code whose table
+layout moves on with later versions.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step; ``apply`` runs inside the migration transaction."""
+    version: int
+    description: str
+    apply: Callable[[sqlite3.Connection], None]
+
+
+def _create_core_tables(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS market_data (
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            close_price REAL NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (ticker, date)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dividend_data (
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            dividend_amount REAL NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (ticker, date)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dividend_coverage (
+            ticker TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            has_dividends INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (ticker, start_date, end_date)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS benchmark_data (
+            symbol TEXT NOT NULL,
+            date TEXT NOT NULL,
+            close_price REAL NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (symbol, date)
+        )
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS benchmark_coverage (
+            symbol TEXT NOT NULL,
+            start_date TEXT NOT NULL,
+            end_date TEXT NOT NULL,
+            has_data INTEGER NOT NULL,
+            created_at TEXT NOT NULL,
+            PRIMARY KEY (symbol, start_date, end_date)
+        )
+    """)
+
+    # Create index for efficient queries
+    for index_sql in (
+        "CREATE INDEX IF NOT EXISTS idx_ticker_date ON market_data (ticker, date)",
+        "CREATE INDEX IF NOT EXISTS idx_date ON market_data (date)",
+        "CREATE INDEX IF NOT EXISTS idx_dividend_ticker_date ON dividend_data (ticker, date)",
+        "CREATE INDEX IF NOT EXISTS idx_dividend_date ON dividend_data (date)",
+        "CREATE INDEX IF NOT EXISTS idx_dividend_coverage_ticker ON dividend_coverage (ticker, start_date, end_date)",
+        "CREATE INDEX IF NOT EXISTS idx_benchmark_symbol_date ON benchmark_data (symbol, date)",
+        "CREATE INDEX IF NOT EXISTS idx_benchmark_date ON benchmark_data (date)",
+        "CREATE INDEX IF NOT EXISTS idx_benchmark_coverage_symbol ON benchmark_coverage (symbol, start_date, end_date)",
+    ):
+        conn.execute(index_sql)
+
+
+def _create_prefix_sums(conn: sqlite3.Connection) -> None:
+    # Tickers stored before the tables existed are backfilled by the compact migration
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS price_prefix_sums (
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            row_number INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            cum_log_return REAL NOT NULL,
+            cum_return REAL NOT NULL,
+            cum_squared_return REAL NOT NULL,
+            PRIMARY KEY (ticker, date)
+        ) WITHOUT ROWID
+    """)
+
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS dividend_prefix_sums (
+            ticker TEXT NOT NULL,
+            date TEXT NOT NULL,
+            cum_dividend REAL NOT NULL,
+            PRIMARY KEY (ticker, date)
+        ) WITHOUT ROWID
+    """)
+
+
+def _create_performance_indexes(conn: sqlite3.Connection) -> None:
+    # Previously created by WarehouseOptimizer on every start
+    for index_sql in (
+        "CREATE INDEX IF NOT EXISTS idx_market_data_ticker_date ON market_data (ticker, date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_market_data_date_ticker ON market_data (date, ticker)",
+        "CREATE INDEX IF NOT EXISTS idx_dividend_data_ticker_date ON dividend_data (ticker, date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_dividend_data_date_ticker ON dividend_data (date, ticker)",
+        "CREATE INDEX IF NOT EXISTS idx_benchmark_data_symbol_date ON benchmark_data (symbol, date DESC)",
+        "CREATE INDEX IF NOT EXISTS idx_benchmark_data_date_symbol ON benchmark_data (date, symbol)",
+        "CREATE INDEX IF NOT EXISTS idx_dividend_coverage_ticker_dates ON dividend_coverage (ticker, start_date, end_date)",
+        "CREATE INDEX IF NOT EXISTS idx_benchmark_coverage_symbol_dates ON benchmark_coverage (symbol, start_date, end_date)",
+    ):
+        conn.execute(index_sql)
+
+
+# Compact (v2) layout as released with version 4: v1 table, its symbol column,
+# its date columns (epoch days in v2), its value columns and whether rows get a batch_id
+_V2_TABLES: Tuple[Tuple[str, str, Tuple[str, ...], Tuple[str, ...], bool, str], ...] = (
+    ("market_data", "ticker", ("date",), ("close_price",), True, """
+        CREATE TABLE IF NOT EXISTS market_data_v2 (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    ("dividend_data", "ticker", ("date",), ("dividend_amount",), True, """
+        CREATE TABLE IF NOT EXISTS dividend_data_v2 (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            dividend_amount REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    ("dividend_coverage", "ticker", ("start_date", "end_date"), ("has_dividends",), True, """
+        CREATE TABLE IF NOT EXISTS dividend_coverage_v2 (
+            symbol_id INTEGER NOT NULL,
+            start_day INTEGER NOT NULL,
+            end_day INTEGER NOT NULL,
+            has_dividends INTEGER NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, start_day, end_day)
+        ) WITHOUT ROWID
+    """),
+    ("benchmark_data", "symbol", ("date",), ("close_price",), True, """
+        CREATE TABLE IF NOT EXISTS benchmark_data_v2 (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    ("benchmark_coverage", "symbol", ("start_date", "end_date"), ("has_data",), True, """
+        CREATE TABLE IF NOT EXISTS benchmark_coverage_v2 (
+            symbol_id INTEGER NOT NULL,
+            start_day INTEGER NOT NULL,
+            end_day INTEGER NOT NULL,
+            has_data INTEGER NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, start_day, end_day)
+        ) WITHOUT ROWID
+    """),
+    ("price_prefix_sums", "ticker", ("date",),
+     ("row_number", "close_price", "cum_log_return", "cum_return", "cum_squared_return"), False, """
+        CREATE TABLE IF NOT EXISTS price_prefix_sums_v2 (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            row_number INTEGER NOT NULL,
+            close_price REAL NOT NULL,
+            cum_log_return REAL NOT NULL,
+            cum_return REAL NOT NULL,
+            cum_squared_return REAL NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+    ("dividend_prefix_sums", "ticker", ("date",), ("cum_dividend",), False, """
+        CREATE TABLE IF NOT EXISTS dividend_prefix_sums_v2 (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            cum_dividend REAL NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """),
+)
+
+
+def _create_compact_layout(conn: sqlite3.Connection) -> None:
+    # Also finishes an interrupted online conversion (``CompactSchemaMigrator.run_online``):
+    # its mirror triggers are dropped and rows it already copied are kept
+    conn.execute("CREATE TABLE IF NOT EXISTS symbols (symbol_id INTEGER PRIMARY KEY, symbol TEXT NOT NULL UNIQUE)")
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_batches (
+            batch_id INTEGER PRIMARY KEY,
+            source TEXT NOT NULL,
+            created_at TEXT NOT NULL
+        )
+    """)
+
+    # IDs in symbol order so each symbol's rows sit together in every table
+    for name, symbol_column, _, _, _, _ in _V2_TABLES:
+        conn.execute(f"""
+            WITH RECURSIVE distinct_symbols(symbol) AS (
+                SELECT MIN({symbol_column}) FROM {name}
+                UNION ALL
+                SELECT (SELECT MIN({symbol_column}) FROM {name} WHERE {symbol_column} > symbol)
+                FROM distinct_symbols WHERE symbol IS NOT NULL
+            )
+            INSERT OR IGNORE INTO symbols (symbol)
+            SELECT symbol FROM distinct_symbols WHERE symbol IS NOT NULL ORDER BY symbol
+        """)
+
+    # The first batch's time identifies the warehouse
+    row = conn.execute("SELECT batch_id FROM ingest_batches WHERE source = 'schema-v2-migration'").fetchone()
+    batch_id = row[0] if row else conn.execute(
+        "INSERT INTO ingest_batches (source, created_at) VALUES ('schema-v2-migration', ?)",
+        (datetime.now().isoformat(),)
+    ).lastrowid
+
+    for name, symbol_column, date_columns, value_columns, batched, ddl in _V2_TABLES:
+        for event in ("insert", "update", "delete"):
+            conn.execute(f"DROP TRIGGER IF EXISTS {name}_v2_{event}")
+        conn.execute(ddl)
+
+        columns = ["symbol_id"] + [column.replace('date', 'day') for column in date_columns] + list(value_columns)
+        values = (["s.symbol_id"] + [f"CAST(julianday(v1.{column}) - 2440587.5 AS INTEGER)" for column in date_columns]
+                  + [f"v1.{column}" for column in value_columns])
+        if batched:
+            columns.append("batch_id")
+            values.append(str(batch_id))
+        conn.execute(f"""
+            INSERT OR IGNORE INTO {name}_v2 ({', '.join(columns)})
+            SELECT {', '.join(values)}
+            FROM {name} v1 JOIN symbols s ON s.symbol = v1.{symbol_column}
+        """)
+        conn.execute(f"DROP TABLE {name}")
+        conn.execute(f"ALTER TABLE {name}_v2 RENAME TO {name}")
+
+    conn.execute("DROP TABLE IF EXISTS schema_v2_progress")
+    for (table,) in conn.execute(
+        "SELECT name FROM sqlite_master WHERE type = 'table' AND name LIKE '%_v1_retired'"
+    ).fetchall():
+        conn.execute(f"DROP TABLE {table}")
+
+    backfill_prefix_sums(conn)
+
+
+def backfill_prefix_sums(conn: sqlite3.Connection) -> None:
+    """
+    Build prefix sums for symbols that have closes or dividends but no prefix rows (schema version 4).
+
+    Warehouses adopted from before the prefix-sum tables existed have none. Returns
+    are plain close-to-close: the corporate-action factors only arrive with version 5.
+    """
+    for (symbol_id,) in conn.execute("""
+        SELECT symbol_id FROM symbols s
+        WHERE EXISTS (SELECT 1 FROM market_data WHERE symbol_id = s.symbol_id)
+        AND NOT EXISTS (SELECT 1 FROM price_prefix_sums WHERE symbol_id = s.symbol_id)
+    """).fetchall():
+        rows = conn.execute(
+            "SELECT day, close_price FROM market_data WHERE symbol_id = ? AND close_price > 0 ORDER BY day",
+            (symbol_id,)
+        ).fetchall()
+        if not rows:
+            continue
+        prices = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+        # The first stored close has no return
+        returns = np.concatenate([[0.0], prices[1:] / prices[:-1] - 1])
+        conn.executemany("""
+            INSERT INTO price_prefix_sums
+            (symbol_id, day, row_number, close_price, cum_log_return, cum_return, cum_squared_return)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, zip(
+            [symbol_id] * len(rows), [row[0] for row in rows], range(len(rows)), prices.tolist(),
+            np.cumsum(np.log1p(returns)).tolist(), np.cumsum(returns).tolist(), np.cumsum(returns * returns).tolist()
+        ))
+
+    for (symbol_id,) in conn.execute("""
+        SELECT symbol_id FROM symbols s
+        WHERE EXISTS (SELECT 1 FROM dividend_data WHERE symbol_id = s.symbol_id)
+        AND NOT EXISTS (SELECT 1 FROM dividend_prefix_sums WHERE symbol_id = s.symbol_id)
+    """).fetchall():
+        rows = conn.execute(
+            "SELECT day, dividend_amount FROM dividend_data WHERE symbol_id = ? ORDER BY day", (symbol_id,)
+        ).fetchall()
+        totals = np.cumsum(np.fromiter((row[1] for row in rows), dtype=float, count=len(rows)))
+        conn.executemany(
+            "INSERT INTO dividend_prefix_sums (symbol_id, day, cum_dividend) VALUES (?, ?, ?)",
+            zip([symbol_id] * len(rows), [row[0] for row in rows], totals.tolist())
+        )
+
+
+def _create_corporate_actions(conn: sqlite3.Connection) -> None:
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS corporate_actions (
+            symbol_id INTEGER NOT NULL,
+            day INTEGER NOT NULL,
+            factor REAL NOT NULL,
+            batch_id INTEGER NOT NULL,
+            PRIMARY KEY (symbol_id, day)
+        ) WITHOUT ROWID
+    """)
+
+    # Closes stored earlier were adjusted at fetch time. Factors recorded by a later
+    # fetch or backfill would adjust them a second time, so they are dropped (with
+    # their prefix sums and benchmark coverage) and the next read fetches them raw.
+    dropped = 0
+    for table in ("market_data", "price_prefix_sums", "benchmark_data", "benchmark_coverage"):
+        dropped += conn.execute(f"DELETE FROM {table}").rowcount
+    if dropped:
+        # Recorded like a clear, so snapshots, price caches and delta backups notice
+        conn.execute("INSERT INTO ingest_batches (source, created_at) VALUES ('clear', ?)",
+                     (datetime.now().isoformat(),))
+
+
+def _create_series_changes(conn: sqlite3.Connection) -> None:
+    # One row per symbol and batch that wrote or deleted prices or dividends, so
+    # snapshot readers can check a few symbols without scanning their history
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS series_changes (
+            symbol_id INTEGER NOT NULL,
+            table_name TEXT NOT NULL,
+            batch_id INTEGER NOT NULL,
+            first_day INTEGER,
+            last_day INTEGER,
+            PRIMARY KEY (symbol_id, table_name, batch_id)
+        ) WITHOUT ROWID
+    """)
+
+
+MIGRATIONS: List[Migration] = [
+    Migration(1, "Core price, dividend and benchmark tables", _create_core_tables),
+    Migration(2, "Prefix-sum tables for range statistics", _create_prefix_sums),
+    Migration(3, "Secondary indexes for date-ordered scans", _create_performance_indexes),
+    Migration(4, "Compact layout: symbol dictionary, epoch days, ingest batches", _create_compact_layout),
+    Migration(5, "Corporate-action factors for raw closes; adjusted closes dropped", _create_corporate_actions),
+    Migration(6, "Per-symbol change log of price and dividend writes", _create_series_changes),
+]
+
+LATEST_SCHEMA_VERSION = MIGRATIONS[-1].version
+COMPACT_SCHEMA_VERSION = 4
+
+
+def get_schema_version(conn: sqlite3.Connection) -> int:
+    """Schema version recorded in the database (0 for unversioned warehouses)."""
+    return conn.execute("PRAGMA user_version").fetchone()[0]
+
+
+def migrate(conn: sqlite3.Connection, target: Optional[int] = None) -> List[Migration]:
+    """
+    Apply pending migrations in order, up to ``target`` (default: all).
+
+    Runs under ``BEGIN IMMEDIATE`` and re-reads the version inside the
+    transaction, so when several workers start together one migrates and the
+    others find nothing left to do.
+
+    Returns:
+        The migrations that were applied (empty when already current)
+    """
+    target = LATEST_SCHEMA_VERSION if target is None else target
+    if get_schema_version(conn) >= target:
+        return []
+
+    conn.commit()
+    conn.execute("BEGIN IMMEDIATE")
+    try:
+        current = get_schema_version(conn)
+        applied = [migration for migration in MIGRATIONS if current < migration.version <= target]
+        for migration in applied:
+            migration.apply(conn)
+            conn.execute(f"PRAGMA user_version = {migration.version}")
+        conn.commit()
+    except Exception:
+        conn.rollback()
+        raise
+    return applied
@@ -0,0 +1,244 @@
+"""
+Per-ticker prefix-sum tables for constant-time range statistics.
+
+For every stored trading day the warehouse keeps running totals of log
+returns, simple returns and squared simple returns since the ticker's first
+stored close, plus a running dividend total per dividend date. Total return,
+annualized return, volatility and dividend sums for any date range are then
+differences of two rows instead of a scan over the price history.
+
+Returns are adjusted for corporate actions: a day's return divides out the
+factors of the actions since the previous close (see ``corporate_actions``),
+so recording an action only recomputes the rows from its ex-date onwards.
+Start and end prices are the stored raw closes.
+"""
+
+import sqlite3
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+import numpy as np
+
+from .corporate_actions import read_factors, return_factors
+from .keys import get_symbol_ids, to_epoch_day, to_iso_date
+
+# Lower bound below every stored epoch day
+_BEFORE_FIRST_DAY = -(2 ** 31)
+
+
+@dataclass
+class RangeStatistics:
+    """Statistics for one ticker over a date range, derived from prefix sums."""
+    start_date: str
+    end_date: str
+    start_price: float
+    end_price: float
+    trading_days: int  # Closes in range (returns + 1)
+    total_return: float  # Percent
+    annualized_return: float  # Percent
+    volatility: Optional[float]  # Annualized percent; None with fewer than two returns
+    dividend_amount: float
+
+
+class PrefixSumIndex:
+    """Maintains and queries the price and dividend prefix-sum tables.
+
+    Rows are keyed by ``(symbol_id, day)`` like the price and dividend tables
+    they index; the tables themselves are created by the schema migrations.
+    """
+
+    def backfill(self, conn: sqlite3.Connection) -> None:
+        """Fill prefix sums for symbols that have prices or dividends but no prefix rows yet."""
+        # Two primary-key probes per dictionary symbol rather than scans of the tables
+        for (symbol_id,) in conn.execute("""
+            SELECT symbol_id FROM symbols s
+            WHERE EXISTS (SELECT 1 FROM market_data WHERE symbol_id = s.symbol_id)
+            AND NOT EXISTS (SELECT 1 FROM price_prefix_sums WHERE symbol_id = s.symbol_id)
+        """).fetchall():
+            self.update_prices(conn, symbol_id)
+
+        for (symbol_id,) in conn.execute("""
+            SELECT symbol_id FROM symbols s
+            WHERE EXISTS (SELECT 1 FROM dividend_data WHERE symbol_id = s.symbol_id)
+            AND NOT EXISTS (SELECT 1 FROM dividend_prefix_sums WHERE symbol_id = s.symbol_id)
+        """).fetchall():
+            self.update_dividends(conn, symbol_id)
+
+    def update_prices(self, conn: sqlite3.Connection, symbol_id: int, from_day: Optional[int] = None) -> None:
+        """
+        Recompute price prefix sums from ``from_day`` onwards.
+
+        Rows before ``from_day`` are kept and the last of them seeds the running
+        totals, so appending new days only reads and writes the new days.
+
+        Args:
+            conn: Open warehouse connection (the caller commits)
+            symbol_id: Symbol dictionary ID
+            from_day: Earliest changed epoch day; None rebuilds the symbol
+        """
+        anchor = None
+        if from_day is not None:
+            anchor = conn.execute("""
+                SELECT day, row_number, close_price, cum_log_return, cum_return, cum_squared_return
+                FROM price_prefix_sums
+                WHERE symbol_id = ? AND day < ?
+                ORDER BY day DESC LIMIT 1
+            """, (symbol_id, from_day)).fetchone()
+
+        after_day = anchor[0] if anchor else _BEFORE_FIRST_DAY
+        rows = conn.execute("""
+            SELECT day, close_price FROM market_data
+            WHERE symbol_id = ? AND day > ? AND close_price > 0
+            ORDER BY day
+        """, (symbol_id, after_day)).fetchall()
+
+        conn.execute("DELETE FROM price_prefix_sums WHERE symbol_id = ? AND day > ?", (symbol_id, after_day))
+        if not rows:
+            return
+
+        days = [row[0] for row in rows]
+        prices = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+        actions = read_factors(conn, symbol_id)
+        factors = return_factors(np.array(days, dtype=np.int64), after_day, *actions)
+
+        if anchor:
+            _, row_number, previous_price, cum_log, cum_return, cum_squared = anchor
+            returns = prices / (np.concatenate([[previous_price], prices[:-1]]) * factors) - 1
+            row_numbers = np.arange(row_number + 1, row_number + 1 + len(rows))
+        else:
+            # The first stored close has no return
+            cum_log = cum_return = cum_squared = 0.0
+            returns = np.concatenate([[0.0], prices[1:] / (prices[:-1] * factors[1:]) - 1])
+            row_numbers = np.arange(len(rows))
+
+        cum_logs = cum_log + np.cumsum(np.log1p(returns))
+        cum_returns = cum_return + np.cumsum(returns)
+        cum_squares = cum_squared + np.cumsum(returns * returns)
+
+        conn.executemany("""
+            INSERT INTO price_prefix_sums
+            (symbol_id, day, row_number, close_price, cum_log_return, cum_return, cum_squared_return)
+            VALUES (?, ?, ?, ?, ?, ?, ?)
+        """, zip(
+            [symbol_id] * len(rows), days, row_numbers.tolist(), prices.tolist(),
+            cum_logs.tolist(), cum_returns.tolist(), cum_squares.tolist()
+        ))
+
+    def update_dividends(self, conn: sqlite3.Connection, symbol_id: int, from_day: Optional[int] = None) -> None:
+        """
+        Recompute dividend prefix sums from ``from_day`` onwards.
+
+        Args:
+            conn: Open warehouse connection (the caller commits)
+            symbol_id: Symbol dictionary ID
+            from_day: Earliest changed dividend epoch day; None rebuilds the symbol
+        """
+        anchor = None
+        if from_day is not None:
+            anchor = conn.execute("""
+                SELECT day, cum_dividend FROM dividend_prefix_sums
+                WHERE symbol_id = ? AND day < ?
+                ORDER BY day DESC LIMIT 1
+            """, (symbol_id, from_day)).fetchone()
+
+        after_day = anchor[0] if anchor else _BEFORE_FIRST_DAY
+        rows = conn.execute("""
+            SELECT day, dividend_amount FROM dividend_data
+            WHERE symbol_id = ? AND day > ?
+            ORDER BY day
+        """, (symbol_id, after_day)).fetchall()
+
+        conn.execute("DELETE FROM dividend_prefix_sums WHERE symbol_id = ? AND day > ?", (symbol_id, after_day))
+        if not rows:
+            return
+
+        amounts = np.fromiter((row[1] for row in rows), dtype=float, count=len(rows))
+        totals = (anchor[1] if anchor else 0.0) + np.cumsum(amounts)
+
+        conn.executemany(
+            "INSERT INTO dividend_prefix_sums (symbol_id, day, cum_dividend) VALUES (?, ?, ?)",
+            zip([symbol_id] * len(rows), [row[0] for row in rows], totals.tolist())
+        )
+
+    def delete(self, conn: sqlite3.Connection, symbol_id: Optional[int] = None) -> None:
+        """Delete prefix sums for one symbol, or for all symbols when ``symbol_id`` is None."""
+        if symbol_id is not None:
+            conn.execute("DELETE FROM price_prefix_sums WHERE symbol_id = ?", (symbol_id,))
+            conn.execute("DELETE FROM dividend_prefix_sums WHERE symbol_id = ?", (symbol_id,))
+        else:
+            conn.execute("DELETE FROM price_prefix_sums")
+            conn.execute("DELETE FROM dividend_prefix_sums")
+
+    def get_range_statistics(self, conn: sqlite3.Connection, symbols: Iterable[str],
+                             start_date: str, end_date: str) -> Dict[str, RangeStatistics]:
+        """
+        Range statistics for each ticker from two price lookups and two dividend lookups.
+
+        Args:
+            conn: Open warehouse connection
+            symbols: Ticker symbols
+            start_date: First date of the range (YYYY-MM-DD)
+            end_date: Last date of the range (YYYY-MM-DD)
+
+        Returns:
+            Statistics by symbol; tickers with fewer than two closes in range are omitted.
+            Annualized return follows MetricsCalculator.calculate_basic_metrics
+            (252 / closes in range) and volatility uses the sample standard deviation.
+        """
+        start_day, end_day = to_epoch_day(start_date), to_epoch_day(end_date)
+        result = {}
+        for symbol, symbol_id in get_symbol_ids(conn, symbols).items():
+            first = conn.execute("""
+                SELECT day, row_number, close_price, cum_log_return, cum_return, cum_squared_return
+                FROM price_prefix_sums
+                WHERE symbol_id = ? AND day >= ?
+                ORDER BY day LIMIT 1
+            """, (symbol_id, start_day)).fetchone()
+            last = conn.execute("""
+                SELECT day, row_number, close_price, cum_log_return, cum_return, cum_squared_return
+                FROM price_prefix_sums
+                WHERE symbol_id = ? AND day <= ?
+                ORDER BY day DESC LIMIT 1
+            """, (symbol_id, end_day)).fetchone()
+
+            if first is None or last is None or last[1] <= first[1]:
+                continue
+
+            returns_count = last[1] - first[1]
+            growth = np.exp(last[3] - first[3])
+
+            volatility = None
+            if returns_count > 1:
+                returns_sum = last[4] - first[4]
+                squares_sum = last[5] - first[5]
+                variance = max(squares_sum - returns_sum * returns_sum / returns_count, 0.0) / (returns_count - 1)
+                volatility = float(np.sqrt(variance * 252) * 100)
+
+            result[symbol] = RangeStatistics(
+                start_date=to_iso_date(first[0]),
+                end_date=to_iso_date(last[0]),
+                start_price=first[2],
+                end_price=last[2],
+                trading_days=returns_count + 1,
+                total_return=float((growth - 1) * 100),
+                annualized_return=float((growth ** (252 / (returns_count + 1)) - 1) * 100),
+                volatility=volatility,
+                dividend_amount=self._dividend_total(conn, symbol_id, start_day, end_day)
+            )
+
+        return result
+
+    def _dividend_total(self, conn: sqlite3.Connection, symbol_id: int, start_day: int, end_day: int) -> float:
+        """Dividends paid in [start_day, end_day] from two prefix lookups."""
+        before = conn.execute("""
+            SELECT cum_dividend FROM dividend_prefix_sums
+            WHERE symbol_id = ? AND day < ?
+            ORDER BY day DESC LIMIT 1
+        """, (symbol_id, start_day)).fetchone()
+        through = conn.execute("""
+            SELECT cum_dividend FROM dividend_prefix_sums
+            WHERE symbol_id = ? AND day <= ?
+            ORDER BY day DESC LIMIT 1
+        """, (symbol_id, end_day)).fetchone()
+
+        return (through[0] if through else 0.0) - (before[0] if before else 0.0)
@@ -0,0 +1,252 @@
+"""
+Per-process cache of hot tickers' full close history as contiguous NumPy arrays.
+
+Single-ticker reads and batch reads of the same tickers repeat constantly
+(every analysis reads the portfolio's tickers, often over overlapping
+ranges). Instead of re-running the range scan and rebuilding a Series from
+Python tuples each time, a symbol's whole history is loaded once into a
+sorted ``datetime64[us]`` date array and a float64 close array, and any date
+range is answered by two ``searchsorted`` calls and a zero-copy slice.
+
+Cached closes are adjusted (see ``corporate_actions``): raw closes times the
+factors of later actions. Entries are evicted least-recently-used once their
+arrays exceed the byte budget. Cached arrays are read-only and never modified in place; extending
+an entry replaces its arrays, so series already handed out stay valid.
+
+Other processes (API workers, admin imports) write to the same warehouse, so
+every lookup first reads the ingest generation (``MAX(batch_id)`` of
+``ingest_batches``). Entries validated at that generation are served as-is.
+Otherwise one primary-key scan per requested symbol finds whether rows were
+written by a later batch: rows only past the cached last day are appended,
+anything else, including a new corporate action or deleted cached rows,
+reloads the symbol. Clearing data records a batch too, so every process
+notices deleted rows.
+"""
+
+import sqlite3
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+import pandas as pd
+
+from .corporate_actions import adjust, read_factors
+from .keys import get_symbol_id, get_symbol_ids
+from .snapshot import get_ingest_generation
+
+# Bookkeeping per entry on top of its two arrays (dict slot, dataclass, array headers)
+ENTRY_OVERHEAD_BYTES = 256
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+@dataclass
+class _Entry:
+    dates: np.ndarray  # datetime64[us], ascending, read-only
+    closes: np.ndarray  # float64, read-only
+    batch_id: int  # Latest ingest batch among the cached rows
+    generation: int  # Ingest generation the entry was last known current at
+
+    @property
+    def nbytes(self) -> int:
+        return self.dates.nbytes + self.closes.nbytes + ENTRY_OVERHEAD_BYTES
+
+    @property
+    def last_day(self) -> int:
+        return int(self.dates[-1].astype('M8[D]').astype(np.int64))
+
+
+def _read_only(array: np.ndarray) -> np.ndarray:
+    array.flags.writeable = False
+    return array
+
+
+def _entry(days: np.ndarray, closes: np.ndarray, batch_id: int, generation: int) -> _Entry:
+    return _Entry(_read_only((days * _MICROSECONDS_PER_DAY).view('M8[us]')),
+                  _read_only(np.ascontiguousarray(closes, dtype=np.float64)), batch_id, generation)
+
+
+class PriceCache:
+    """Byte-bounded LRU cache of per-symbol close history in front of ``market_data``."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: "OrderedDict[str, _Entry]" = OrderedDict()
+        self._resident_bytes = 0
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0
+
+    def get_many(self, conn: sqlite3.Connection, symbols: Iterable[str], start_day: int, end_day: int,
+                 name: str) -> Dict[str, pd.Series]:
+        """
+        Closes of each symbol between two epoch days, loading uncached symbols in one query.
+
+        Symbols without stored rows get an empty float64 Series, like a range
+        without rows; they are not cached.
+        """
+        symbols = list(dict.fromkeys(symbols))
+        generation = get_ingest_generation(conn)
+        with self._lock:
+            entries = {symbol: self._entries.get(symbol) for symbol in symbols}
+        stale = {symbol: entry for symbol, entry in entries.items()
+                 if entry is not None and entry.generation != generation}
+        missing = [symbol for symbol, entry in entries.items() if entry is None]
+
+        refreshed = self._refresh(conn, stale, generation)
+        missing.extend(symbol for symbol in stale if symbol not in refreshed)
+        loaded = self._load(conn, missing, generation)
+
+        with self._lock:
+            self.hits += len(symbols) - len(missing)
+            self.misses += len(missing)
+            for symbol in missing:
+                if symbol not in loaded and symbol in self._entries:
+                    self._remove(symbol)
+            for symbol, entry in {**refreshed, **loaded}.items():
+                self._put(symbol, entry)
+            for symbol in symbols:
+                if symbol in self._entries:
+                    self._entries.move_to_end(symbol)
+
+        entries.update(refreshed)
+        entries.update({symbol: loaded.get(symbol) for symbol in missing})
+        return {symbol: self._slice(entries[symbol], start_day, end_day, name) for symbol in symbols}
+
+    def write_through(self, symbol: str, days: np.ndarray, closes: np.ndarray, batch_id: int) -> None:
+        """
+        Apply a committed write of ``days``/``closes`` as ingest batch ``batch_id``.
+
+        A cached symbol is extended when the write only appends days after its
+        last cached day and no other batch was written since the entry was
+        last current; any other write drops it, and the next read reloads it.
+        """
+        with self._lock:
+            entry = self._entries.get(symbol)
+            if entry is None:
+                return
+            days = np.asarray(days, dtype=np.int64)
+            appends = (entry.generation == batch_id - 1 and len(days) > 0
+                       and bool(np.all(np.diff(days) > 0)) and int(days[0]) > entry.last_day)
+            if not appends:
+                self._remove(symbol)
+                return
+            tail = _entry(days, closes, batch_id, batch_id)
+            self._put(symbol, _Entry(_read_only(np.concatenate([entry.dates, tail.dates])),
+                                     _read_only(np.concatenate([entry.closes, tail.closes])), batch_id, batch_id))
+
+    def invalidate(self, symbol: Optional[str] = None) -> None:
+        """Drop one symbol, or every entry."""
+        with self._lock:
+            if symbol is None:
+                self._entries.clear()
+                self._resident_bytes = 0
+            elif symbol in self._entries:
+                self._remove(symbol)
+
+    def stats(self) -> Dict[str, float]:
+        """Lookup counters, hit ratio and resident bytes."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "price_cache_hits": self.hits,
+                "price_cache_misses": self.misses,
+                "price_cache_evictions": self.evictions,
+                "price_cache_hit_ratio": self.hits / lookups if lookups else 0.0,
+                "price_cache_entries": len(self._entries),
+                "price_cache_resident_bytes": self._resident_bytes,
+                "price_cache_max_bytes": self.max_bytes,
+            }
+
+    def _refresh(self, conn: sqlite3.Connection, stale: Dict[str, _Entry], generation: int) -> Dict[str, _Entry]:
+        """Revalidate entries after other writes; symbols left out must be reloaded."""
+        refreshed = {}
+        for symbol, entry in stale.items():
+            symbol_id = get_symbol_id(conn, symbol)
+            # One primary-key scan: the latest batch, the first day written after the cached rows
+            # and how many of the cached rows are still stored
+            latest_batch, first_new_day, kept_rows = conn.execute("""
+                SELECT MAX(batch_id), MIN(CASE WHEN batch_id > ? THEN day END), COUNT(CASE WHEN batch_id <= ? THEN 1 END)
+                FROM market_data WHERE symbol_id = ?
+            """, (entry.batch_id, entry.batch_id, symbol_id)).fetchone()
+            # Fewer or older rows than cached (a delete, even one followed by new writes, or a restore)
+            # also reload the symbol
+            if latest_batch is None or latest_batch < entry.batch_id or kept_rows != len(entry.dates) or conn.execute(
+                "SELECT 1 FROM corporate_actions WHERE symbol_id = ? AND batch_id > ? LIMIT 1", (symbol_id, entry.batch_id)
+            ).fetchone():
+                continue
+            if first_new_day is None:
+                refreshed[symbol] = _Entry(entry.dates, entry.closes, entry.batch_id, generation)
+            elif first_new_day > entry.last_day:
+                rows = conn.execute("""
+                    SELECT day, close_price, batch_id FROM market_data
+                    WHERE symbol_id = ? AND day > ?
+                    ORDER BY day
+                """, (symbol_id, entry.last_day)).fetchall()
+                days, closes, batches = zip(*rows)
+                days = np.array(days, dtype=np.int64)
+                closes = adjust(days, np.array(closes, dtype=float), *read_factors(conn, symbol_id))
+                tail = _entry(days, closes, 0, generation)
+                refreshed[symbol] = _Entry(_read_only(np.concatenate([entry.dates, tail.dates])),
+                                           _read_only(np.concatenate([entry.closes, tail.closes])),
+                                           max(entry.batch_id, max(batches)), generation)
+        return refreshed
+
+    def _load(self, conn: sqlite3.Connection, symbols: List[str], generation: int) -> Dict[str, _Entry]:
+        """Full history of each symbol; symbols without rows are left out."""
+        loaded = {}
+        for symbol, symbol_id in get_symbol_ids(conn, symbols).items():
+            # Two narrow primary-key scans per symbol fetch far fewer Python objects than one wide join
+            rows = conn.execute(
+                "SELECT day, close_price FROM market_data WHERE symbol_id = ? ORDER BY day", (symbol_id,)
+            ).fetchall()
+            if not rows:
+                continue
+            batch_id = conn.execute(
+                "SELECT MAX(batch_id) FROM market_data WHERE symbol_id = ?", (symbol_id,)
+            ).fetchone()[0]
+            action_days, factors = read_factors(conn, symbol_id)
+            if len(action_days):
+                batch_id = max(batch_id, conn.execute(
+                    "SELECT MAX(batch_id) FROM corporate_actions WHERE symbol_id = ?", (symbol_id,)
+                ).fetchone()[0])
+            days, closes = zip(*rows)
+            days = np.array(days, dtype=np.int64)
+            loaded[symbol] = _entry(days, adjust(days, np.array(closes, dtype=float), action_days, factors),
+                                    batch_id, generation)
+        return loaded
+
+    def _put(self, symbol: str, entry: _Entry) -> None:
+        """Insert or replace an entry as most recently used and evict down to the budget (lock held)."""
+        if symbol in self._entries:
+            self._remove(symbol)
+        if entry.nbytes > self.max_bytes:
+            return
+        self._entries[symbol] = entry
+        self._resident_bytes += entry.nbytes
+        while self._resident_bytes > self.max_bytes:
+            _, evicted = self._entries.popitem(last=False)
+            self._resident_bytes -= evicted.nbytes
+            self.evictions += 1
+
+    def _remove(self, symbol: str) -> None:
+        self._resident_bytes -= self._entries.pop(symbol).nbytes
+
+    @staticmethod
+    def _slice(entry: Optional[_Entry], start_day: int, end_day: int, name: str) -> pd.Series:
+        if entry is None:
+            return pd.Series(dtype='float64', name=name)
+        bounds = np.array([start_day, end_day + 1], dtype=np.int64) * _MICROSECONDS_PER_DAY
+        start, end = np.searchsorted(entry.dates.view(np.int64), bounds)
+        if start == end:
+            return pd.Series(dtype='float64', name=name)
+        return pd.Series(entry.closes[start:end], index=pd.DatetimeIndex(entry.dates[start:end], copy=False),
+                         name=name, copy=False)
+
@@ -0,0 +1,299 @@
+"""
+Memory-mapped, read-only snapshots of hot tickers' price and dividend history.
+
+Every uvicorn worker otherwise keeps its own SQLite page cache and its own
+pandas copies of the same series. A snapshot file is mapped read-only by all
+workers, so the operating system keeps one copy in its page cache, and a
+lookup slices NumPy views out of the mapping without copying.
+
+File layout (little-endian, every array 64-byte aligned):
+
+    header    magic, format version, symbol count, ingest generation,
+              build time, the byte offset of each section and row counts
+    index     one record per symbol, sorted by symbol: name and the
+              (offset, count) of its price rows and of its dividend rows
+    arrays    price dates, price values, dividend dates, dividend values;
+              dates are datetime64[us] so they become a DatetimeIndex as-is,
+              prices are closes adjusted for corporate actions at build time
+
+The ingest generation is the warehouse's last ``ingest_batches`` ID when the
+snapshot was built; readers compare it with the live warehouse to find out
+whether anything was written since, and look up the batches after it in the
+``series_changes`` log for the symbols they read. ``SnapshotBuilder`` writes a new file next
+to the old one and renames it into place, and ``SnapshotStore`` notices the
+new file and maps it on a later lookup, so workers swap without a restart.
+"""
+
+import mmap
+import os
+import sqlite3
+import struct
+import threading
+import time
+from dataclasses import dataclass
+from typing import Iterable, List, Optional, Tuple
+
+import numpy as np
+import pandas as pd
+
+from .corporate_actions import adjust, read_factors
+from .keys import get_symbol_ids
+
+SNAPSHOT_MAGIC = b'PFWSNAP1'
+# Version 2: snapshots are checked against ``series_changes``, which older builds predate
+SNAPSHOT_FORMAT_VERSION = 2
+ALIGNMENT = 64
+
+# magic, version, symbol count, generation, built at (epoch seconds), the offsets of the
+# index, price dates, price values, dividend dates and dividend values, then the row counts
+_HEADER = struct.Struct('<8sIIqd' + 'Q' * 7)
+_HEADER_SIZE = ALIGNMENT * ((_HEADER.size + ALIGNMENT - 1) // ALIGNMENT)
+
+INDEX_DTYPE = np.dtype([
+    ('symbol', 'S16'),
+    ('price_offset', '<u8'), ('price_count', '<u8'),
+    ('dividend_offset', '<u8'), ('dividend_count', '<u8'),
+])
+
+# (table, value column, index field prefix) per snapshot series kind
+SERIES_TABLES = {
+    "prices": ("market_data", "close_price", "price"),
+    "dividends": ("dividend_data", "dividend_amount", "dividend"),
+}
+
+_MICROSECONDS_PER_DAY = 86_400_000_000
+
+
+def _aligned(offset: int) -> int:
+    return ALIGNMENT * ((offset + ALIGNMENT - 1) // ALIGNMENT)
+
+
+def get_ingest_generation(conn: sqlite3.Connection) -> int:
+    """Last ingest batch ID; every warehouse write records a new batch."""
+    return conn.execute("SELECT MAX(batch_id) FROM ingest_batches").fetchone()[0] or 0
+
+
+@dataclass(frozen=True)
+class SnapshotInfo:
+    """Header fields of a snapshot file."""
+    path: str
+    symbols: int
+    price_rows: int
+    dividend_rows: int
+    generation: int
+    built_at: float  # Epoch seconds
+    file_bytes: int
+
+
+class WarehouseSnapshot:
+    """One mapped snapshot file; series returned by ``get`` are read-only views into the mapping."""
+
+    def __init__(self, path: str):
+        self.path = path
+        with open(path, 'rb') as file:
+            self.file_id = _file_id(os.fstat(file.fileno()))
+            self._mmap = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        buffer = memoryview(self._mmap)
+        (magic, version, symbol_count, self.generation, self.built_at,
+         index_offset, price_dates_offset, price_values_offset, dividend_dates_offset, dividend_values_offset,
+         price_rows, dividend_rows) = _HEADER.unpack_from(buffer)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_FORMAT_VERSION:
+            raise ValueError(f"Not a version {SNAPSHOT_FORMAT_VERSION} warehouse snapshot: {path}")
+
+        self._index = np.frombuffer(buffer, INDEX_DTYPE, symbol_count, index_offset)
+        self._arrays = {
+            "prices": (np.frombuffer(buffer, 'M8[us]', price_rows, price_dates_offset),
+                       np.frombuffer(buffer, '<f8', price_rows, price_values_offset)),
+            "dividends": (np.frombuffer(buffer, 'M8[us]', dividend_rows, dividend_dates_offset),
+                          np.frombuffer(buffer, '<f8', dividend_rows, dividend_values_offset)),
+        }
+        self._positions = {symbol.decode(): position for position, symbol in enumerate(self._index['symbol'].tolist())}
+
+    def __contains__(self, symbol: str) -> bool:
+        return symbol in self._positions
+
+    def info(self) -> SnapshotInfo:
+        return SnapshotInfo(
+            path=self.path,
+            symbols=len(self._index),
+            price_rows=len(self._arrays["prices"][1]),
+            dividend_rows=len(self._arrays["dividends"][1]),
+            generation=self.generation,
+            built_at=self.built_at,
+            file_bytes=len(self._mmap)
+        )
+
+    def get(self, kind: str, symbol: str, start_day: int, end_day: int, name: str) -> Optional[pd.Series]:
+        """Rows of ``kind`` (``prices`` or ``dividends``) between two epoch days, or None if not in the snapshot."""
+        if symbol not in self._positions:
+            return None
+        dates, values = self._rows(kind, symbol)
+        bounds = np.array([start_day, end_day + 1], dtype=np.int64) * _MICROSECONDS_PER_DAY
+        start, end = np.searchsorted(dates.view(np.int64), bounds)
+        return pd.Series(values[start:end], index=pd.DatetimeIndex(dates[start:end], copy=False),
+                         name=name, copy=False)
+
+    def _rows(self, kind: str, symbol: str) -> Tuple[np.ndarray, np.ndarray]:
+        entry = self._index[self._positions[symbol]]
+        prefix = SERIES_TABLES[kind][2]
+        offset, count = int(entry[f'{prefix}_offset']), int(entry[f'{prefix}_count'])
+        dates, values = self._arrays[kind]
+        return dates[offset:offset + count], values[offset:offset + count]
+
+
+class SnapshotStore:
+    """The current snapshot at a path, remapped when a rebuild replaces the file.
+
+    The file is stat-ed at most every ``check_interval`` seconds. A replaced
+    file is mapped on the next lookup; the old mapping stays valid for series
+    still referencing it and is released with them.
+    """
+
+    def __init__(self, path: str, check_interval: float = 1.0):
+        self.path = path
+        self.check_interval = check_interval
+        self._snapshot: Optional[WarehouseSnapshot] = None
+        self._checked_at = float('-inf')
+        self._lock = threading.Lock()
+
+    def current(self) -> Optional[WarehouseSnapshot]:
+        """The mapped snapshot, or None if there is no valid snapshot file."""
+        now = time.monotonic()
+        if now - self._checked_at < self.check_interval:
+            return self._snapshot
+        with self._lock:
+            if now - self._checked_at >= self.check_interval:
+                self._snapshot = self._load()
+                self._checked_at = now
+        return self._snapshot
+
+    def _load(self) -> Optional[WarehouseSnapshot]:
+        try:
+            file_id = _file_id(os.stat(self.path))
+        except FileNotFoundError:
+            return None
+        if self._snapshot is not None and self._snapshot.file_id == file_id:
+            return self._snapshot
+        try:
+            return WarehouseSnapshot(self.path)
+        except (OSError, ValueError, struct.error) as e:
+            print(f"Ignoring warehouse snapshot {self.path}: {e}")
+            return None
+
+
+class SnapshotBuilder:
+    """Writes snapshot files from the warehouse."""
+
+    def build(self, conn: sqlite3.Connection, symbols: Iterable[str], path: str) -> SnapshotInfo:
+        """
+        Snapshot the full price and dividend history of ``symbols`` and atomically replace ``path``.
+
+        Symbols the warehouse has no rows for are left out, so lookups for them
+        fall back to SQLite.
+
+        Args:
+            conn: Warehouse connection; all rows are read in one snapshot transaction
+            symbols: Symbols to include (at most 16 bytes each)
+            path: Snapshot file to replace
+
+        Raises:
+            ValueError: A symbol longer than 16 bytes
+        """
+        symbols = sorted(set(symbols))
+        too_long = [symbol for symbol in symbols if len(symbol.encode()) > INDEX_DTYPE['symbol'].itemsize]
+        if too_long:
+            raise ValueError(f"Symbols too long for a snapshot: {too_long}")
+
+        conn.execute("BEGIN")
+        try:
+            generation = get_ingest_generation(conn)
+            symbol_ids = get_symbol_ids(conn, symbols)
+            included = [symbol for symbol in symbols if symbol in symbol_ids]
+            series = {kind: self._read(conn, table, column, [symbol_ids[symbol] for symbol in included],
+                                       adjusted=kind == "prices")
+                      for kind, (table, column, _) in SERIES_TABLES.items()}
+        finally:
+            conn.execute("COMMIT")
+
+        index = np.zeros(len(included), dtype=INDEX_DTYPE)
+        index['symbol'] = [symbol.encode() for symbol in included]
+        included_ids = np.array([symbol_ids[symbol] for symbol in included], dtype=np.int64)
+        arrays = {}
+        for kind, (symbol_id_column, days, values) in series.items():
+            # Rows are in symbol ID order, while the index is in symbol order
+            order = np.argsort(included_ids)
+            starts = np.empty(len(included), dtype=np.int64)
+            ends = np.empty(len(included), dtype=np.int64)
+            starts[order] = np.searchsorted(symbol_id_column, included_ids[order], side='left')
+            ends[order] = np.searchsorted(symbol_id_column, included_ids[order], side='right')
+            prefix = SERIES_TABLES[kind][2]
+            index[f'{prefix}_offset'] = starts
+            index[f'{prefix}_count'] = ends - starts
+            arrays[kind] = ((days * _MICROSECONDS_PER_DAY).view('M8[us]'), values)
+
+        sections = [index, arrays["prices"][0], arrays["prices"][1], arrays["dividends"][0], arrays["dividends"][1]]
+        offsets = []
+        offset = _HEADER_SIZE
+        for section in sections:
+            offsets.append(offset)
+            offset = _aligned(offset + section.nbytes)
+
+        built_at = time.time()
+        header = _HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_FORMAT_VERSION, len(included), generation, built_at,
+                              *offsets, len(arrays["prices"][1]), len(arrays["dividends"][1]))
+
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        temporary_path = f"{path}.{os.getpid()}.tmp"
+        try:
+            with open(temporary_path, 'wb') as file:
+                file.write(header)
+                for section, section_offset in zip(sections, offsets):
+                    file.write(b'\0' * (section_offset - file.tell()))
+                    file.write(np.ascontiguousarray(section).tobytes())
+                file.flush()
+                os.fsync(file.fileno())
+            # Readers holding the old file keep their mapping; new lookups see the new file
+            os.replace(temporary_path, path)
+        except BaseException:
+            if os.path.exists(temporary_path):
+                os.remove(temporary_path)
+            raise
+
+        return SnapshotInfo(path, len(included), len(arrays["prices"][1]), len(arrays["dividends"][1]), generation,
+                            built_at, os.path.getsize(path))
+
+    @staticmethod
+    def _read(conn: sqlite3.Connection, table: str, value_column: str, symbol_ids: List[int],
+              adjusted: bool = False) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Symbol IDs, epoch days and values of ``symbol_ids``' rows in primary-key order.
+
+        ``adjusted`` applies each symbol's corporate-action factors to raw closes.
+        """
+        columns = ([], [], [])
+        for symbol_id in sorted(symbol_ids):
+            rows = conn.execute(
+                f"SELECT symbol_id, day, {value_column} FROM {table} WHERE symbol_id = ? ORDER BY day", (symbol_id,)
+            ).fetchall()
+            if rows:
+                ids, days, values = zip(*rows)
+                if adjusted:
+                    values = adjust(np.array(days, dtype=np.int64), np.array(values, dtype=np.float64),
+                                    *read_factors(conn, symbol_id))
+                columns[0].extend(ids)
+                columns[1].extend(days)
+                columns[2].extend(values)
+        return (np.array(columns[0], dtype=np.int64), np.array(columns[1], dtype=np.int64),
+                np.array(columns[2], dtype=np.float64))
+
+
+def _file_id(stat: os.stat_result) -> Tuple[int, int, int]:
+    return stat.st_ino, stat.st_mtime_ns, stat.st_size
+
+
+def read_info(path: str) -> Optional[SnapshotInfo]:
+    """Header of the snapshot at ``path``, or None if there is none."""
+    if not os.path.exists(path):
+        return None
+    return WarehouseSnapshot(path).info()
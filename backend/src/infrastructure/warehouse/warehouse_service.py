@@ -1,145 +1,82 @@
 import sqlite3
+import numpy as np
 import pandas as pd
 import os
 from typing import List, Dict, Set, Optional, Tuple
-from datetime import datetime, date
 from ...domain.entities.ticker import Ticker
 from ...domain.value_objects.date_range import DateRange
 from ..config.warehouse_config import WarehouseConfig
 from ..services.warehouse_optimizer import get_warehouse_optimizer
-from ..services.parallel_data_fetcher import get_parallel_data_fetcher
+from ..services.async_fetch_pipeline import get_async_fetch_pipeline
+from .corporate_actions import RawPriceHistory, adjust, read_factors, store_factors
+from .prefix_sums import PrefixSumIndex, RangeStatistics
+from .snapshot import SERIES_TABLES, SnapshotStore, WarehouseSnapshot, get_ingest_generation
+from .keys import (CLEAR_BATCH_SOURCE, RESTORE_BATCH_SOURCE, ensure_symbol_id, get_symbol_id, new_batch,
+                   record_changes, to_dates, to_epoch_day, to_epoch_days, to_iso_date, to_iso_dates)
+from .migrations import LATEST_SCHEMA_VERSION, Migration, get_schema_version, migrate
 
 
 class WarehouseService:
-    """Warehouse service for persistent market data storage using SQLite."""
+    """Warehouse service for persistent market data storage using SQLite.
     
-    def __init__(self, db_path: Optional[str] = None):
-        # Use provided path or get from configuration
+    Rows are keyed by symbol dictionary ID and epoch day (see ``keys``); the
+    public methods keep taking tickers and dates and return ISO date strings.
+    Batch history reads are served from a memory-mapped snapshot (see
+    ``snapshot``) when one is configured and still current for a ticker.
+    """
+    
+    FETCH_BATCH_SIZE = 20  # Tickers per Yahoo download when filling misses
+    
+    def __init__(self, db_path: Optional[str] = None, snapshot_path: Optional[str] = None):
+        # Use provided path or get from configuration; an explicit database only uses an explicit snapshot
         if db_path is None:
             config = WarehouseConfig()
             self.db_path = config.get_db_path()
+            snapshot_path = snapshot_path or config.get_snapshot_path()
         else:
             self.db_path = db_path
+        self._snapshots = SnapshotStore(snapshot_path) if snapshot_path else None
             
+        self._prefix_sums = PrefixSumIndex()
+        self.applied_migrations = self._ensure_database_exists()
         self._warehouse_optimizer = get_warehouse_optimizer(self.db_path)
-        self._parallel_data_fetcher = get_parallel_data_fetcher()
-        self._ensure_database_exists()
-        # Optimize database on initialization
-        self._warehouse_optimizer.optimize_database()
+        self._fetch_pipeline = get_async_fetch_pipeline()
+        self._yahoo_repo = None
+        # Refresh planner statistics off the startup path; a full ANALYZE only after schema changes
+        self._warehouse_optimizer.schedule_optimize(full_analyze=bool(self.applied_migrations))
     
-    def _ensure_database_exists(self):
-        """Ensure the warehouse directory and database exist."""
+    def _ensure_database_exists(self) -> List[Migration]:
+        """Ensure the warehouse directory exists and the schema is current.
+        
+        DDL only runs when a migration is pending; an up-to-date warehouse
+        costs one ``PRAGMA user_version`` read.
+        """
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(self.db_path), exist_ok=True)
         
-        # Initialize database with schema
         with sqlite3.connect(self.db_path) as conn:
-            conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS market_data (
-                    ticker TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    close_price REAL NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (ticker, date)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS dividend_data (
-                    ticker TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    dividend_amount REAL NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (ticker, date)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS dividend_coverage (
-                    ticker TEXT NOT NULL,
-                    start_date TEXT NOT NULL,
-                    end_date TEXT NOT NULL,
-                    has_dividends INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (ticker, start_date, end_date)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS benchmark_data (
-                    symbol TEXT NOT NULL,
-                    date TEXT NOT NULL,
-                    close_price REAL NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (symbol, date)
-                )
-            """)
-            
-            conn.execute("""
-                CREATE TABLE IF NOT EXISTS benchmark_coverage (
-                    symbol TEXT NOT NULL,
-                    start_date TEXT NOT NULL,
-                    end_date TEXT NOT NULL,
-                    has_data INTEGER NOT NULL,
-                    created_at TEXT NOT NULL,
-                    PRIMARY KEY (symbol, start_date, end_date)
-                )
-            """)
+            if get_schema_version(conn) >= LATEST_SCHEMA_VERSION:
+                return []
             
-            # Create index for efficient queries
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_ticker_date 
-                ON market_data (ticker, date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_date 
-                ON market_data (date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_dividend_ticker_date 
-                ON dividend_data (ticker, date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_dividend_date 
-                ON dividend_data (date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_dividend_coverage_ticker 
-                ON dividend_coverage (ticker, start_date, end_date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_benchmark_symbol_date 
-                ON benchmark_data (symbol, date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_benchmark_date 
-                ON benchmark_data (date)
-            """)
-            
-            conn.execute("""
-                CREATE INDEX IF NOT EXISTS idx_benchmark_coverage_symbol 
-                ON benchmark_coverage (symbol, start_date, end_date)
-            """)
-            
-            conn.commit()
+            # Lets maintenance release free pages; only takes effect before the first table is created
+            conn.execute("PRAGMA auto_vacuum=INCREMENTAL")
+            conn.execute("PRAGMA journal_mode=WAL")  # Enable WAL mode
+            applied = migrate(conn)
+            if applied:
+                # Fold the migration's pages into the main file so later opens do not replay a large WAL
+                conn.execute("PRAGMA wal_checkpoint(TRUNCATE)")
+            return applied
     
     def get_coverage(self, ticker: Ticker, date_range: DateRange) -> Set[str]:
         """Get the set of trading days already stored for a ticker in the given range."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute("""
-                SELECT date FROM market_data 
-                WHERE ticker = ? AND date >= ? AND date <= ?
-                ORDER BY date
-            """, (ticker.symbol, date_range.start, date_range.end))
+                SELECT day FROM market_data 
+                WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?) AND day >= ? AND day <= ?
+                ORDER BY day
+            """, (ticker.symbol, to_epoch_day(date_range.start), to_epoch_day(date_range.end)))
             
-            return {row[0] for row in cursor.fetchall()}
+            return set(to_iso_dates([row[0] for row in cursor.fetchall()]))
     
     def get_missing_ranges(self, ticker: Ticker, date_range: DateRange, 
                           trading_days: Set[str]) -> List[Tuple[str, str]]:
@@ -178,63 +115,97 @@ class WarehouseService:
         
         return ranges
     
-    def store_price_data(self, ticker: Ticker, price_data: pd.Series) -> None:
-        """Store price data for a ticker in the warehouse."""
-        if price_data.empty:
+    def store_price_data(self, ticker: Ticker, price_data: pd.Series, factors: Optional[pd.Series] = None) -> None:
+        """Store raw closes for a ticker, with the factors of corporate actions in their range (see ``corporate_actions``)."""
+        if price_data.empty and (factors is None or factors.empty):
             return
         
+        days = to_epoch_days(price_data.index)
+        prices = price_data.to_numpy(dtype=float)
+        
         with sqlite3.connect(self.db_path) as conn:
-            # Prepare data for insertion
-            data_to_insert = []
-            created_at = datetime.now().isoformat()
-            
-            for date_str, price in price_data.items():
-                # Convert pandas Timestamp to string if needed
-                if hasattr(date_str, 'strftime'):
-                    date_str = date_str.strftime('%Y-%m-%d')
-                elif isinstance(date_str, str):
-                    # Already a string
-                    pass
-                else:
-                    date_str = str(date_str)
-                
-                data_to_insert.append((
-                    ticker.symbol,
-                    date_str,
-                    float(price),
-                    created_at
-                ))
+            symbol_id = ensure_symbol_id(conn, ticker.symbol)
+            batch_id = new_batch(conn, "prices")
             
             # Use INSERT OR REPLACE to handle duplicates
             conn.executemany("""
                 INSERT OR REPLACE INTO market_data 
-                (ticker, date, close_price, created_at)
+                (symbol_id, day, close_price, batch_id)
                 VALUES (?, ?, ?, ?)
-            """, data_to_insert)
+            """, zip([symbol_id] * len(days), days.tolist(), prices.tolist(), [batch_id] * len(days)))
+            if len(days):
+                record_changes(conn, "market_data", batch_id, [(symbol_id, int(days.min()), int(days.max()))])
+            first_action_day = store_factors(conn, symbol_id, factors, batch_id)
+            
+            # Extend prefix sums from the earliest changed day (appends touch only new days)
+            changed_days = [int(days.min())] if len(days) else []
+            if first_action_day is not None:
+                changed_days.append(first_action_day)
+            self._prefix_sums.update_prices(conn, symbol_id, min(changed_days))
+            
+            # Closes before a later action are adjusted on read, so only plain appends can be cached as stored
+            later_action = conn.execute(
+                "SELECT 1 FROM corporate_actions WHERE symbol_id = ? AND day > ? LIMIT 1", (symbol_id, int(days.min()))
+            ).fetchone() if len(days) else None
             
             conn.commit()
+        
+        # Appends extend the cached closes; other writes drop them
+        if first_action_day is None and not later_action:
+            self._warehouse_optimizer.price_cache.write_through(ticker.symbol, days, prices, batch_id)
+        else:
+            self._warehouse_optimizer.price_cache.invalidate(ticker.symbol)
     
     def get_price_data(self, ticker: Ticker, date_range: DateRange) -> pd.Series:
-        """Get price data for a ticker from the warehouse."""
+        """Get price data for a ticker from the warehouse (through the optimizer's price cache)."""
+        return self._warehouse_optimizer.get_price_history_optimized([ticker], date_range)[ticker]
+    
+    def _read_series(self, conn: sqlite3.Connection, table: str, value_column: str, symbol: str,
+                     date_range: DateRange, name: str, adjusted: bool = False) -> pd.Series:
+        """One symbol's values in a date range as a date-indexed Series (a single primary-key range scan).
+        
+        ``adjusted`` applies the symbol's corporate-action factors to raw closes.
+        """
+        rows = conn.execute(f"""
+            SELECT day, {value_column} FROM {table} 
+            WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?) AND day >= ? AND day <= ?
+            ORDER BY day
+        """, (symbol, to_epoch_day(date_range.start), to_epoch_day(date_range.end))).fetchall()
+        
+        if not rows:
+            return pd.Series(dtype='float64', name=name)
+        
+        days, values = zip(*rows)
+        values = np.array(values, dtype=float)
+        if adjusted:
+            values = adjust(np.array(days, dtype=np.int64), values, *read_factors(conn, get_symbol_id(conn, symbol)))
+        return pd.Series(values, index=to_dates(days), name=name)
+    
+    def get_price_cache_stats(self) -> Dict[str, float]:
+        """Hit ratio and resident bytes of this process's close history cache."""
+        return self._warehouse_optimizer.price_cache.stats()
+    
+    def get_latest_prices(self, tickers: List[Ticker]) -> Dict[Ticker, Tuple[str, float]]:
+        """Get the last stored close (date, price) for each ticker in one query."""
+        if not tickers:
+            return {}
+        
+        placeholders = ','.join(['?'] * len(tickers))
+        tickers_by_symbol = {ticker.symbol: ticker for ticker in tickers}
+        
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT date, close_price FROM market_data 
-                WHERE ticker = ? AND date >= ? AND date <= ?
-                ORDER BY date
-            """, (ticker.symbol, date_range.start, date_range.end))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
-                return pd.Series(dtype='float64', name='Close')
-            
-            # Convert to pandas Series
-            dates = [row[0] for row in rows]
-            prices = [row[1] for row in rows]
-            
-            # Create pandas Series with proper index
-            series = pd.Series(prices, index=pd.DatetimeIndex(dates), name='Close')
-            return series
+            # SQLite returns the bare columns from the row holding MAX(day)
+            cursor = conn.execute(f"""
+                SELECT s.symbol, MAX(m.day), m.close_price
+                FROM symbols s JOIN market_data m ON m.symbol_id = s.symbol_id
+                WHERE s.symbol IN ({placeholders})
+                GROUP BY s.symbol_id
+            """, list(tickers_by_symbol.keys()))
+            
+            return {
+                tickers_by_symbol[symbol]: (to_iso_date(day), price)
+                for symbol, day, price in cursor.fetchall()
+            }
     
     def get_database_size(self) -> int:
         """Get the size of the database file in bytes."""
@@ -245,83 +216,55 @@ class WarehouseService:
     def store_dividend_data(self, ticker: Ticker, dividend_data: pd.Series, date_range: DateRange) -> None:
         """Store dividend data in the warehouse, including coverage information for periods with no dividends."""
         with sqlite3.connect(self.db_path) as conn:
-            current_time = datetime.now().isoformat()
+            symbol_id = ensure_symbol_id(conn, ticker.symbol)
+            batch_id = new_batch(conn, "dividends")
             
             # Store actual dividend data if any exists
             if not dividend_data.empty:
-                data_to_insert = []
-                for date, dividend_amount in dividend_data.items():
-                    # Convert date to string if it's a Timestamp
-                    if hasattr(date, 'strftime'):
-                        date_str = date.strftime('%Y-%m-%d')
-                    else:
-                        date_str = str(date)
-                    
-                    data_to_insert.append((
-                        ticker.symbol,
-                        date_str,
-                        float(dividend_amount),
-                        current_time
-                    ))
+                days = to_epoch_days(dividend_data.index)
                 
                 # Insert actual dividend data
                 conn.executemany("""
                     INSERT OR REPLACE INTO dividend_data 
-                    (ticker, date, dividend_amount, created_at) 
+                    (symbol_id, day, dividend_amount, batch_id) 
                     VALUES (?, ?, ?, ?)
-                """, data_to_insert)
+                """, zip([symbol_id] * len(days), days.tolist(),
+                         dividend_data.to_numpy(dtype=float).tolist(), [batch_id] * len(days)))
+                record_changes(conn, "dividend_data", batch_id, [(symbol_id, int(days.min()), int(days.max()))])
+                
+                self._prefix_sums.update_dividends(conn, symbol_id, int(days.min()))
             
             # Store coverage information for the entire date range
             # This ensures we know we've checked this period, even if no dividends were found
             conn.execute("""
                 INSERT OR REPLACE INTO dividend_coverage 
-                (ticker, start_date, end_date, has_dividends, created_at) 
+                (symbol_id, start_day, end_day, has_dividends, batch_id) 
                 VALUES (?, ?, ?, ?, ?)
             """, (
-                ticker.symbol,
-                date_range.start.strftime('%Y-%m-%d'),
-                date_range.end.strftime('%Y-%m-%d'),
+                symbol_id,
+                to_epoch_day(date_range.start),
+                to_epoch_day(date_range.end),
                 1 if not dividend_data.empty else 0,  # 1 if dividends exist, 0 if none
-                current_time
+                batch_id
             ))
             conn.commit()
     
     def get_dividend_data(self, ticker: Ticker, date_range: DateRange) -> pd.Series:
         """Get dividend data from the warehouse."""
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT date, dividend_amount 
-                FROM dividend_data 
-                WHERE ticker = ? AND date >= ? AND date <= ?
-                ORDER BY date
-            """, (ticker.symbol, date_range.start.strftime('%Y-%m-%d'), 
-                  date_range.end.strftime('%Y-%m-%d')))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
-                return pd.Series(dtype='float64', name='Dividends')
-            
-            # Convert to pandas Series
-            dates = [row[0] for row in rows]
-            dividends = [row[1] for row in rows]
-            
-            # Create pandas Series with proper index
-            series = pd.Series(dividends, index=pd.DatetimeIndex(dates), name='Dividends')
-            return series
+            return self._read_series(conn, "dividend_data", "dividend_amount", ticker.symbol, date_range, 'Dividends')
     
     def get_dividend_coverage(self, ticker: Ticker, date_range: DateRange) -> Set[str]:
         """Get dividend coverage for a ticker in the given date range."""
         with sqlite3.connect(self.db_path) as conn:
             cursor = conn.execute("""
-                SELECT date 
+                SELECT day 
                 FROM dividend_data 
-                WHERE ticker = ? AND date >= ? AND date <= ?
-            """, (ticker.symbol, date_range.start.strftime('%Y-%m-%d'), 
-                  date_range.end.strftime('%Y-%m-%d')))
+                WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?) AND day >= ? AND day <= ?
+            """, (ticker.symbol, to_epoch_day(date_range.start), to_epoch_day(date_range.end)))
             
             rows = cursor.fetchall()
-            return {row[0] for row in rows}
+            return set(to_iso_dates([row[0] for row in rows]))
     
     def has_dividend_coverage(self, ticker: Ticker, date_range: DateRange) -> bool:
         """Check if we have dividend coverage information for a ticker in the given date range."""
@@ -329,16 +272,17 @@ class WarehouseService:
             cursor = conn.execute("""
                 SELECT 1 
                 FROM dividend_coverage 
-                WHERE ticker = ? AND start_date <= ? AND end_date >= ?
+                WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?) AND start_day <= ? AND end_day >= ?
                 LIMIT 1
             """, (ticker.symbol, 
-                  date_range.start.strftime('%Y-%m-%d'),
-                  date_range.end.strftime('%Y-%m-%d')))
+                  to_epoch_day(date_range.start),
+                  to_epoch_day(date_range.end)))
             
             return cursor.fetchone() is not None
     
-    def store_benchmark_data(self, symbol: str, benchmark_data, date_range: DateRange) -> None:
-        """Store benchmark data in the warehouse, including coverage information."""
+    def store_benchmark_data(self, symbol: str, benchmark_data, date_range: DateRange,
+                             factors: Optional[pd.Series] = None) -> None:
+        """Store raw benchmark closes and their corporate-action factors, including coverage information."""
         if benchmark_data.empty:
             return
         
@@ -355,78 +299,39 @@ class WarehouseService:
         if benchmark_data.empty:
             return
         
+        days = to_epoch_days(benchmark_data.index)
+        prices = benchmark_data.to_numpy(dtype=float)
+        
         with sqlite3.connect(self.db_path) as conn:
-            current_time = datetime.now().isoformat()
-            
-            # Store actual benchmark data
-            data_to_insert = []
-            # Use items() for pandas Series to get (index, value) pairs
-            for date, price in benchmark_data.items():
-                # Convert date to string if it's a Timestamp
-                if hasattr(date, 'strftime'):
-                    date_str = date.strftime('%Y-%m-%d')
-                else:
-                    date_str = str(date)
-                
-                # Handle price - it might be a scalar or a Series
-                if hasattr(price, 'iloc'):
-                    # If it's a Series, take the first value (usually Close price)
-                    price_value = float(price.iloc[0]) if not price.empty else 0.0
-                else:
-                    # If it's a scalar, convert to float
-                    price_value = float(price)
-                
-                data_to_insert.append((
-                    symbol,
-                    date_str,
-                    price_value,
-                    current_time
-                ))
+            symbol_id = ensure_symbol_id(conn, symbol)
+            batch_id = new_batch(conn, "benchmarks")
             
             # Insert benchmark data
             conn.executemany("""
                 INSERT OR REPLACE INTO benchmark_data 
-                (symbol, date, close_price, created_at) 
+                (symbol_id, day, close_price, batch_id) 
                 VALUES (?, ?, ?, ?)
-            """, data_to_insert)
+            """, zip([symbol_id] * len(days), days.tolist(), prices.tolist(), [batch_id] * len(days)))
             
             # Store coverage information for the entire date range
             conn.execute("""
                 INSERT OR REPLACE INTO benchmark_coverage 
-                (symbol, start_date, end_date, has_data, created_at) 
+                (symbol_id, start_day, end_day, has_data, batch_id) 
                 VALUES (?, ?, ?, ?, ?)
             """, (
-                symbol,
-                date_range.start.strftime('%Y-%m-%d'),
-                date_range.end.strftime('%Y-%m-%d'),
+                symbol_id,
+                to_epoch_day(date_range.start),
+                to_epoch_day(date_range.end),
                 1,  # 1 if data exists
-                current_time
+                batch_id
             ))
+            store_factors(conn, symbol_id, factors, batch_id)
             conn.commit()
     
     def get_benchmark_data(self, symbol: str, date_range: DateRange) -> pd.Series:
-        """Get benchmark data from the warehouse."""
+        """Get adjusted benchmark closes from the warehouse."""
         with sqlite3.connect(self.db_path) as conn:
-            cursor = conn.execute("""
-                SELECT date, close_price 
-                FROM benchmark_data 
-                WHERE symbol = ? AND date >= ? AND date <= ?
-                ORDER BY date
-            """, (symbol, date_range.start.strftime('%Y-%m-%d'), 
-                  date_range.end.strftime('%Y-%m-%d')))
-            
-            rows = cursor.fetchall()
-            
-            if not rows:
-                return pd.Series(dtype='float64', name='Close')
-            
-            # Convert to pandas Series
-            dates = [row[0] for row in rows]
-            prices = [row[1] for row in rows]
-            
-            # Create pandas Series with proper index
-            series = pd.Series(prices, index=pd.DatetimeIndex(dates), name='Close')
-            return series
+            return self._read_series(conn, "benchmark_data", "close_price", symbol, date_range, 'Close', adjusted=True)
     
     def has_benchmark_coverage(self, symbol: str, date_range: DateRange) -> bool:
         """Check if we have benchmark coverage information for a symbol in the given date range."""
@@ -434,21 +339,39 @@ class WarehouseService:
             cursor = conn.execute("""
                 SELECT 1 
                 FROM benchmark_coverage 
-                WHERE symbol = ? AND start_date <= ? AND end_date >= ?
+                WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?) AND start_day <= ? AND end_day >= ?
                 LIMIT 1
             """, (symbol, 
-                  date_range.start.strftime('%Y-%m-%d'),
-                  date_range.end.strftime('%Y-%m-%d')))
+                  to_epoch_day(date_range.start),
+                  to_epoch_day(date_range.end)))
             
             return cursor.fetchone() is not None
     
+    def get_range_statistics(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, RangeStatistics]:
+        """Get total/annualized return, volatility and dividends per ticker from prefix sums (no history scan)."""
+        if not tickers:
+            return {}
+        
+        tickers_by_symbol = {ticker.symbol: ticker for ticker in tickers}
+        with sqlite3.connect(self.db_path) as conn:
+            statistics = self._prefix_sums.get_range_statistics(
+                conn, list(tickers_by_symbol),
+                date_range.start.strftime('%Y-%m-%d'),
+                date_range.end.strftime('%Y-%m-%d')
+            )
+        
+        return {tickers_by_symbol[symbol]: stats for symbol, stats in statistics.items()}
+    
     def get_price_history_batch(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, pd.Series]:
         """Get price history for multiple tickers using optimized queries and parallel missing data fetching."""
         if not tickers:
             return {}
         
-        # Use optimized warehouse operations
-        result = self._warehouse_optimizer.get_price_history_optimized(tickers, date_range)
+        # Snapshot hits first, then optimized warehouse queries for the rest
+        result = self._read_snapshot(tickers, date_range, "prices", 'Close')
+        remaining = [ticker for ticker in tickers if ticker not in result]
+        if remaining:
+            result.update(self._warehouse_optimizer.get_price_history_optimized(remaining, date_range))
         
         # Check for missing data and fetch in parallel
         missing_tickers = []
@@ -468,8 +391,11 @@ class WarehouseService:
         if not tickers:
             return {}
         
-        # Use optimized warehouse operations
-        result = self._warehouse_optimizer.get_dividend_history_optimized(tickers, date_range)
+        # Snapshot hits first, then optimized warehouse queries for the rest
+        result = self._read_snapshot(tickers, date_range, "dividends", 'Dividends')
+        remaining = [ticker for ticker in tickers if ticker not in result]
+        if remaining:
+            result.update(self._warehouse_optimizer.get_dividend_history_optimized(remaining, date_range))
         
         # Check for missing data and fetch in parallel
         missing_tickers = []
@@ -484,88 +410,153 @@ class WarehouseService:
         
         return result
 
+    def _read_snapshot(self, tickers: List[Ticker], date_range: DateRange, kind: str,
+                       name: str) -> Dict[Ticker, pd.Series]:
+        """Zero-copy series for tickers the snapshot holds current, non-empty rows for."""
+        snapshot = self._snapshots.current() if self._snapshots else None
+        if snapshot is None:
+            return {}
+        
+        start_day, end_day = to_epoch_day(date_range.start), to_epoch_day(date_range.end)
+        hits = {}
+        for ticker in tickers:
+            series = snapshot.get(kind, ticker.symbol, start_day, end_day, name)
+            if series is not None and not series.empty:
+                hits[ticker] = series
+        if not hits:
+            return {}
+        
+        with sqlite3.connect(self.db_path) as conn:
+            generation = get_ingest_generation(conn)
+            if generation == snapshot.generation:
+                return hits
+            # A restore replaces every symbol's rows, and only a recreated warehouse goes back
+            if generation < snapshot.generation or conn.execute(
+                "SELECT 1 FROM ingest_batches WHERE source = ? AND batch_id > ? LIMIT 1",
+                (RESTORE_BATCH_SOURCE, snapshot.generation)
+            ).fetchone():
+                return {}
+            # Written to since the build: rows may have been added, rewritten or deleted
+            for ticker in self._changed_since(conn, snapshot, kind, list(hits), start_day, end_day):
+                del hits[ticker]
+            # A corporate action recorded since the build changes every earlier adjusted close
+            if kind == "prices":
+                for ticker in self._adjusted_since(conn, snapshot, list(hits)):
+                    del hits[ticker]
+        return hits
+    
+    def _changed_since(self, conn: sqlite3.Connection, snapshot: WarehouseSnapshot, kind: str,
+                       tickers: List[Ticker], start_day: int, end_day: int) -> List[Ticker]:
+        """Tickers with rows in the range written or deleted after the snapshot was built."""
+        if not tickers:
+            return []
+        tickers_by_symbol = {ticker.symbol: ticker for ticker in tickers}
+        placeholders = ','.join(['?'] * len(tickers_by_symbol))
+        # A probe of the change log per symbol for the batches since the build, instead of a scan
+        # of its rows. An append past the range or a backfill before it leaves the range as built
+        rows = conn.execute(f"""
+            SELECT DISTINCT s.symbol FROM symbols s JOIN series_changes c ON c.symbol_id = s.symbol_id
+            WHERE s.symbol IN ({placeholders}) AND c.table_name = ? AND c.batch_id > ?
+            AND (c.first_day IS NULL OR (c.first_day <= ? AND c.last_day >= ?))
+        """, list(tickers_by_symbol) + [SERIES_TABLES[kind][0], snapshot.generation, end_day, start_day]).fetchall()
+        return [tickers_by_symbol[symbol] for (symbol,) in rows]
+
+    def _adjusted_since(self, conn: sqlite3.Connection, snapshot: WarehouseSnapshot,
+                        tickers: List[Ticker]) -> List[Ticker]:
+        """Tickers with corporate actions recorded after the snapshot was built."""
+        if not tickers:
+            return []
+        tickers_by_symbol = {ticker.symbol: ticker for ticker in tickers}
+        placeholders = ','.join(['?'] * len(tickers_by_symbol))
+        rows = conn.execute(f"""
+            SELECT s.symbol FROM symbols s
+            WHERE s.symbol IN ({placeholders})
+            AND EXISTS (SELECT 1 FROM corporate_actions WHERE symbol_id = s.symbol_id AND batch_id > ?)
+        """, list(tickers_by_symbol) + [snapshot.generation]).fetchall()
+        return [tickers_by_symbol[symbol] for (symbol,) in rows]
+
+    @property
+    def yahoo_repo(self):
+        """Get the shared Yahoo repository used to fill warehouse misses."""
+        if self._yahoo_repo is None:
+            # Import here to avoid circular imports
+            from ..repositories.yfinance_market_repository import YFinanceMarketRepository
+            self._yahoo_repo = YFinanceMarketRepository()
+        return self._yahoo_repo
+
     def _fetch_missing_data_parallel(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, pd.Series]:
-        """Fetch missing data for multiple tickers in parallel using Yahoo Finance."""
+        """Fetch missing price data from Yahoo Finance in concurrent batches, storing each batch as it arrives."""
         if not tickers:
             return {}
         
-        # Create a function to fetch data for a single ticker
-        def fetch_ticker_data(ticker, date_range):
-            try:
-                # Import here to avoid circular imports
-                from ..repositories.yfinance_market_repository import YFinanceMarketRepository
-                yahoo_repo = YFinanceMarketRepository()
-                
-                # Fetch data from Yahoo Finance
-                data = yahoo_repo.get_price_history(ticker, date_range)
-                
-                # Store in warehouse for future use
-                if not data.empty:
-                    self.store_price_data(ticker, data)
-                
-                return data
-            except Exception as e:
-                return pd.Series(dtype='float64')
+        # One multi-symbol download per batch instead of one request per ticker
+        batches = [tuple(tickers[i:i + self.FETCH_BATCH_SIZE]) for i in range(0, len(tickers), self.FETCH_BATCH_SIZE)]
         
-        # Use parallel data fetcher
-        parallel_results = self._parallel_data_fetcher.fetch_price_data_parallel(
-            tickers, date_range, fetch_ticker_data
-        )
+        def fetch_batch(batch: Tuple[Ticker, ...]) -> Dict[Ticker, RawPriceHistory]:
+            return self.yahoo_repo.get_raw_price_history(list(batch), date_range)
         
-        # Convert results to ticker-indexed dictionary
-        result = {}
-        for ticker in tickers:
-            ticker_symbol = ticker.symbol
-            if ticker_symbol in parallel_results[0]:
-                result[ticker] = parallel_results[0][ticker_symbol]
-            else:
-                result[ticker] = pd.Series(dtype='float64')
+        def store_batch(batch: Tuple[Ticker, ...], data: Dict[Ticker, RawPriceHistory]) -> None:
+            for ticker, history in data.items():
+                self.store_price_data(ticker, history.closes, history.factors)
+        
+        fetched = [ticker for batch_data in self._fetch_pipeline.fetch_all(batches, fetch_batch, store_batch).values()
+                   for ticker, history in batch_data.items() if not history.closes.empty]
         
+        # Stored raw closes are read back adjusted
+        result = {ticker: pd.Series(dtype='float64') for ticker in tickers}
+        result.update(self._warehouse_optimizer.get_price_history_optimized(fetched, date_range))
         return result
 
     def _fetch_missing_dividend_data_parallel(self, tickers: List[Ticker], date_range: DateRange) -> Dict[Ticker, pd.Series]:
-        """Fetch missing dividend data for multiple tickers in parallel using Yahoo Finance."""
+        """Fetch missing dividend data from Yahoo Finance concurrently, storing each ticker as it arrives."""
         if not tickers:
             return {}
         
-        # Create a function to fetch dividend data for a single ticker
-        def fetch_ticker_dividend_data(ticker: Ticker, date_range: DateRange) -> pd.Series:
-            try:
-                # Import here to avoid circular imports
-                from ..repositories.yfinance_market_repository import YFinanceMarketRepository
-                yahoo_repo = YFinanceMarketRepository()
-                
-                data = yahoo_repo.get_dividend_history(ticker, date_range)
-                return data
-            except Exception as e:
-                return pd.Series(dtype='float64')
-        
-        # Use parallel data fetcher for Yahoo Finance calls
-        parallel_results = self._parallel_data_fetcher.fetch_dividend_data_parallel(
-            tickers, date_range, fetch_ticker_dividend_data
-        )
-        
-        # Aggregate results
-        aggregated_results = {}
-        for ticker_symbol, data in parallel_results[0].items():
-            ticker = Ticker(ticker_symbol)
-            aggregated_results[ticker] = data
+        def fetch_ticker_dividend_data(ticker: Ticker) -> pd.Series:
+            return self.yahoo_repo.get_dividend_history(ticker, date_range)
+        
+        def store_ticker_dividend_data(ticker: Ticker, data: pd.Series) -> None:
             if not data.empty:
                 self._warehouse_optimizer.store_dividend_history(ticker, data)
+                with sqlite3.connect(self.db_path) as conn:
+                    self._prefix_sums.update_dividends(
+                        conn, get_symbol_id(conn, ticker.symbol), to_epoch_day(data.index.min())
+                    )
+                    conn.commit()
         
-        return aggregated_results
+        return self._fetch_pipeline.fetch_all(tickers, fetch_ticker_dividend_data, store_ticker_dividend_data)
 
     def clear_data(self, ticker: Optional[Ticker] = None) -> None:
-        """Clear data for a specific ticker or all data."""
+        """
+        Clear data for a specific ticker or all data.
+        
+        Deletes are recorded as an ingest batch like any other write, and batch
+        history is kept, so snapshots, price caches in other processes and
+        delta backups see the generation move on and never see an ID reused.
+        """
         with sqlite3.connect(self.db_path) as conn:
             if ticker:
-                conn.execute("DELETE FROM market_data WHERE ticker = ?", (ticker.symbol,))
-                conn.execute("DELETE FROM dividend_data WHERE ticker = ?", (ticker.symbol,))
-                conn.execute("DELETE FROM dividend_coverage WHERE ticker = ?", (ticker.symbol,))
+                symbol_id = get_symbol_id(conn, ticker.symbol)
+                if symbol_id is None:
+                    return
+                batch_id = new_batch(conn, CLEAR_BATCH_SOURCE)
+                cleared = [(symbol_id, None, None)]
+                conn.execute("DELETE FROM market_data WHERE symbol_id = ?", (symbol_id,))
+                conn.execute("DELETE FROM dividend_data WHERE symbol_id = ?", (symbol_id,))
+                conn.execute("DELETE FROM dividend_coverage WHERE symbol_id = ?", (symbol_id,))
+                conn.execute("DELETE FROM corporate_actions WHERE symbol_id = ?", (symbol_id,))
+                self._prefix_sums.delete(conn, symbol_id)
             else:
+                batch_id = new_batch(conn, CLEAR_BATCH_SOURCE)
+                cleared = [(symbol_id, None, None) for (symbol_id,) in conn.execute("SELECT symbol_id FROM symbols")]
                 conn.execute("DELETE FROM market_data")
                 conn.execute("DELETE FROM dividend_data")
                 conn.execute("DELETE FROM dividend_coverage")
                 conn.execute("DELETE FROM benchmark_data")
                 conn.execute("DELETE FROM benchmark_coverage")
+                conn.execute("DELETE FROM corporate_actions")
+                self._prefix_sums.delete(conn)
+            for table in ("market_data", "dividend_data"):
+                record_changes(conn, table, batch_id, cleared)
             conn.commit()
+        self._warehouse_optimizer.price_cache.invalidate(ticker.symbol if ticker else None)
@@ -1,10 +1,20 @@
-from typing import Optional, List
+from typing import BinaryIO, Optional, List
 from ...application.use_cases.load_portfolio import LoadPortfolioUseCase, LoadPortfolioRequest
 from ...application.use_cases.analyze_portfolio import AnalyzePortfolioUseCase, AnalyzePortfolioRequest
 from ...application.use_cases.analyze_ticker import AnalyzeTickerUseCase, AnalyzeTickerRequest
 from ...application.use_cases.compare_tickers import CompareTickersUseCase, CompareTickersRequest
+from ...application.use_cases.get_quotes import GetQuotesUseCase, GetQuotesRequest, GetQuotesResponse
+from ...application.use_cases.analyze_rolling import AnalyzeRollingUseCase, AnalyzeRollingRequest, AnalyzeRollingResponse
+from ...application.use_cases.analyze_horizons import AnalyzeHorizonsUseCase, AnalyzeHorizonsRequest, AnalyzeHorizonsResponse
+from ...application.use_cases.screen_tickers import ScreenTickersUseCase, ScreenTickersRequest, ScreenTickersResponse
+from ...application.use_cases.simulate_portfolio import SimulatePortfolioUseCase, SimulatePortfolioRequest, SimulatePortfolioResponse
+from ...application.use_cases.optimize_portfolio import OptimizePortfolioUseCase, OptimizePortfolioRequest, OptimizePortfolioResponse
+from ...application.use_cases.evaluate_scenario import EvaluateScenarioUseCase, EvaluateScenarioRequest, EvaluateScenarioResponse, PositionChange
+from ...application.use_cases.load_ledger import LoadLedgerUseCase, LoadLedgerRequest, LoadLedgerResponse
+from ...application.use_cases.analyze_ledger import AnalyzeLedgerUseCase, AnalyzeLedgerRequest, AnalyzeLedgerResponse
 from ...domain.entities.portfolio import Portfolio
 from ...domain.entities.ticker import Ticker
+from ...domain.entities.transaction_ledger import TransactionLedger
 from ...domain.value_objects.date_range import DateRange
 from ...infrastructure.color_metrics_service import ColorMetricsService
 
@@ -17,12 +27,30 @@ class MainController:
                  analyze_portfolio_use_case: AnalyzePortfolioUseCase,
                  analyze_ticker_use_case: AnalyzeTickerUseCase,
                  compare_tickers_use_case: CompareTickersUseCase,
-                 color_service: ColorMetricsService = None):
+                 color_service: ColorMetricsService = None,
+                 get_quotes_use_case: Optional[GetQuotesUseCase] = None,
+                 analyze_rolling_use_case: Optional[AnalyzeRollingUseCase] = None,
+                 analyze_horizons_use_case: Optional[AnalyzeHorizonsUseCase] = None,
+                 screen_tickers_use_case: Optional[ScreenTickersUseCase] = None,
+                 simulate_portfolio_use_case: Optional[SimulatePortfolioUseCase] = None,
+                 optimize_portfolio_use_case: Optional[OptimizePortfolioUseCase] = None,
+                 evaluate_scenario_use_case: Optional[EvaluateScenarioUseCase] = None,
+                 load_ledger_use_case: Optional[LoadLedgerUseCase] = None,
+                 analyze_ledger_use_case: Optional[AnalyzeLedgerUseCase] = None):
         self._load_portfolio_use_case = load_portfolio_use_case
         self._analyze_portfolio_use_case = analyze_portfolio_use_case
         self._analyze_ticker_use_case = analyze_ticker_use_case
         self._compare_tickers_use_case = compare_tickers_use_case
         self._color_service = color_service or ColorMetricsService()
+        self._get_quotes_use_case = get_quotes_use_case
+        self._analyze_rolling_use_case = analyze_rolling_use_case
+        self._analyze_horizons_use_case = analyze_horizons_use_case
+        self._screen_tickers_use_case = screen_tickers_use_case
+        self._simulate_portfolio_use_case = simulate_portfolio_use_case
+        self._optimize_portfolio_use_case = optimize_portfolio_use_case
+        self._evaluate_scenario_use_case = evaluate_scenario_use_case
+        self._load_ledger_use_case = load_ledger_use_case
+        self._analyze_ledger_use_case = analyze_ledger_use_case
         self._current_portfolio: Optional[Portfolio] = None
         self._default_start_date = "2024-03-01"
         self._risk_free_rate = 0.03
@@ -90,4 +118,94 @@ class MainController:
         )
         
         return self._compare_tickers_use_case.execute(request)
-    
\ No newline at end of file
+    
+    def get_quotes(self, portfolio: Portfolio) -> GetQuotesResponse:
+        """Price portfolio positions at current quotes."""
+        request = GetQuotesRequest(portfolio=portfolio)
+        
+        return self._get_quotes_use_case.execute(request)
+    
+    def analyze_rolling(self, portfolio: Portfolio, date_range: DateRange, windows: tuple,
+                        risk_free_rate: float = 0.03) -> AnalyzeRollingResponse:
+        """Calculate rolling-window metrics for the portfolio and its tickers."""
+        request = AnalyzeRollingRequest(
+            portfolio=portfolio,
+            date_range=date_range,
+            windows=windows,
+            risk_free_rate=risk_free_rate
+        )
+        
+        return self._analyze_rolling_use_case.execute(request)
+    
+    def analyze_horizons(self, portfolio: Portfolio, end_date, horizons: tuple,
+                         risk_free_rate: float = 0.03) -> AnalyzeHorizonsResponse:
+        """Analyze the portfolio and its tickers over several horizons with one data load."""
+        request = AnalyzeHorizonsRequest(
+            portfolio=portfolio,
+            end_date=end_date,
+            horizons=horizons,
+            risk_free_rate=risk_free_rate
+        )
+        
+        return self._analyze_horizons_use_case.execute(request)
+    
+    def screen_tickers(self, tickers: List[Ticker], date_range: DateRange) -> ScreenTickersResponse:
+        """Screen stored tickers over a date range using warehouse prefix sums."""
+        request = ScreenTickersRequest(tickers=tickers, date_range=date_range)
+        
+        return self._screen_tickers_use_case.execute(request)
+    
+    def simulate_portfolio(self, portfolio: Portfolio, date_range: DateRange, paths: int, horizon_days: int,
+                           method: str = 'bootstrap', seed: Optional[int] = None) -> SimulatePortfolioResponse:
+        """Run a Monte Carlo simulation of forward portfolio value."""
+        request = SimulatePortfolioRequest(
+            portfolio=portfolio,
+            date_range=date_range,
+            paths=paths,
+            horizon_days=horizon_days,
+            method=method,
+            seed=seed
+        )
+        
+        return self._simulate_portfolio_use_case.execute(request)
+    
+    def optimize_portfolio(self, portfolio: Portfolio, date_range: DateRange, frontier_points: int,
+                           shrinkage: bool = True, risk_free_rate: float = 0.03) -> OptimizePortfolioResponse:
+        """Suggest minimum variance, maximum Sharpe and risk parity weights plus the efficient frontier."""
+        request = OptimizePortfolioRequest(
+            portfolio=portfolio,
+            date_range=date_range,
+            frontier_points=frontier_points,
+            shrinkage=shrinkage,
+            risk_free_rate=risk_free_rate
+        )
+        
+        return self._optimize_portfolio_use_case.execute(request)
+    
+    def evaluate_scenario(self, portfolio: Portfolio, date_range: DateRange, changes: List[PositionChange],
+                          risk_free_rate: float = 0.03) -> EvaluateScenarioResponse:
+        """Evaluate hypothetical position changes against the portfolio."""
+        request = EvaluateScenarioRequest(
+            portfolio=portfolio,
+            date_range=date_range,
+            changes=changes,
+            risk_free_rate=risk_free_rate
+        )
+        
+        return self._evaluate_scenario_use_case.execute(request)
+    
+    def load_ledger(self, file_path: str, stream: Optional[BinaryIO] = None) -> LoadLedgerResponse:
+        """Load a transaction ledger from file, or from ``stream`` when given."""
+        request = LoadLedgerRequest(file_path=file_path, stream=stream)
+        
+        return self._load_ledger_use_case.execute(request)
+    
+    def analyze_ledger(self, ledger: TransactionLedger, end_date, risk_free_rate: float = 0.03) -> AnalyzeLedgerResponse:
+        """Value a transaction ledger over time and compute its time-weighted return."""
+        request = AnalyzeLedgerRequest(
+            ledger=ledger,
+            end_date=end_date,
+            risk_free_rate=risk_free_rate
+        )
+        
+        return self._analyze_ledger_use_case.execute(request)
@@ -96,3 +96,38 @@ class TestPortfolioAnalysisIntegration:
                 repo.load(temp_file)
         finally:
             os.unlink(temp_file)
+    
+    def test_upload_stream_formats_and_duplicate_tickers(self):
+        """Test gzip CSV streams with mixed-case headers and repeated tickers."""
+        import gzip
+        import io
+        payload = gzip.compress(b"Ticker,Position\nbrk.b,1.5\nAAPL,10\nBRK.B,2\n")
+        
+        request = LoadPortfolioRequest(file_path="holdings.csv.gz", stream=io.BytesIO(payload))
+        response = LoadPortfolioUseCase(CsvPortfolioRepository()).execute(request)
+        
+        assert response.success
+        holdings = {pos.ticker.symbol: float(pos.quantity) for pos in response.portfolio.get_positions()}
+        assert holdings == {"BRK-B": 3.5, "AAPL": 10.0}
+    
+    def test_invalid_rows_are_reported_by_row_number(self):
+        """Test that validation errors name the first bad data row."""
+        import io
+        repo = CsvPortfolioRepository()
+        
+        with pytest.raises(ValueError, match="Invalid position value at row 3: -2"):
+            repo.load_stream(io.BytesIO(b"ticker,position\nAAPL,1\nMSFT,2\nGOOG,-2\nNVDA,x\n"), "a.csv")
+        with pytest.raises(ValueError, match="Empty ticker symbol at row 2"):
+            repo.load_stream(io.BytesIO(b"ticker,position\nAAPL,1\n ,2\n"), "a.csv")
+    
+    def test_parquet_upload(self):
+        """Test Parquet holdings files."""
+        pytest.importorskip("pyarrow")
+        import io
+        buffer = io.BytesIO()
+        pd.DataFrame({"ticker": ["AAPL", "MSFT"], "position": [3.0, 4.0]}).to_parquet(buffer)
+        buffer.seek(0)
+        
+        portfolio = CsvPortfolioRepository().load_stream(buffer, "holdings.parquet")
+        
+        assert [ticker.symbol for ticker in portfolio.get_tickers()] == ["AAPL", "MSFT"]
@@ -0,0 +1,177 @@
+"""
+Performance benchmark script for online warehouse backups.
+
+Builds a synthetic warehouse, keeps reader threads issuing batch price reads
+(price cache disabled, so every read hits SQLite), and times each backup
+method while measuring the readers' latency:
+- file copy (the previous ``shutil.copy2`` backup; not consistent under writes)
+- backup API in one step
+- backup API in paged steps with sleeps in between
+- delta backup of one appended day for every ticker
+
+Usage:
+    python tests/performance/benchmark_backup.py
+    python tests/performance/benchmark_backup.py --tickers 2000 --pages-per-step 512 --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Callable, Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.services.warehouse_optimizer import WarehouseOptimizer
+from src.infrastructure.warehouse.backup import WarehouseBackup
+from src.infrastructure.warehouse.bulk_transfer import WarehouseBulkTransfer
+
+
+@dataclass
+class BackupPhaseResult:
+    """One backup method: its runtime and the concurrent readers' latency in milliseconds."""
+    method: str
+    backup_seconds: float
+    size_bytes: int
+    reads: int
+    read_p50_ms: float
+    read_p99_ms: float
+
+
+def _write_csv(path: str, symbols: List[str], dates: pd.DatetimeIndex, seed: int) -> None:
+    rng = np.random.default_rng(seed)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (len(symbols), len(dates))), axis=1))
+    pd.DataFrame({
+        "symbol": np.repeat(symbols, len(dates)),
+        "date": np.tile(dates.strftime('%Y-%m-%d'), len(symbols)),
+        "close_price": closes.ravel(),
+    }).to_csv(path, index=False)
+
+
+def _build_warehouse(db_path: str, tickers: int, days: int) -> List[str]:
+    symbols = [f"T{number:05d}" for number in range(tickers)]
+    csv_path = db_path + ".csv"
+    _write_csv(csv_path, symbols, pd.bdate_range("2014-01-01", periods=days), seed=5)
+    WarehouseBulkTransfer(db_path).import_csv(csv_path)
+    os.remove(csv_path)
+    return symbols
+
+
+def _append_day(db_path: str, symbols: List[str]) -> None:
+    csv_path = db_path + ".append.csv"
+    _write_csv(csv_path, symbols, pd.bdate_range("2030-01-01", periods=1), seed=7)
+    WarehouseBulkTransfer(db_path).import_csv(csv_path)
+    os.remove(csv_path)
+
+
+def _measure(db_path: str, symbols: List[str], readers: int, method: str,
+             run: Callable[[], int]) -> BackupPhaseResult:
+    """Run ``run`` (returning the backup size) while reader threads time batch reads."""
+    optimizer = WarehouseOptimizer(db_path, price_cache_bytes=0)
+    stop = threading.Event()
+    latencies: List[float] = []
+    lock = threading.Lock()
+
+    def read_loop(seed: int) -> None:
+        rng = np.random.default_rng(seed)
+        while not stop.is_set():
+            batch = [Ticker(symbols[i]) for i in rng.choice(len(symbols), 10, replace=False)]
+            start = time.perf_counter()
+            optimizer.get_price_history_optimized(batch, DateRange("2018-01-01", "2019-12-31"))
+            with lock:
+                latencies.append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=read_loop, args=(seed,)) for seed in range(readers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.2)  # Readers warm up before the backup starts
+    start = time.perf_counter()
+    size = run()
+    seconds = time.perf_counter() - start
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    values = np.array(latencies) * 1000
+    return BackupPhaseResult(method, seconds, size, len(values),
+                             float(np.percentile(values, 50)) if len(values) else 0.0,
+                             float(np.percentile(values, 99)) if len(values) else 0.0)
+
+
+def run_benchmark(tickers: int, days: int, readers: int, pages_per_step: int,
+                  step_sleep: float) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "warehouse.sqlite")
+        symbols = _build_warehouse(db_path, tickers, days)
+        target = os.path.join(directory, "backup-{}.sqlite")
+
+        def copy_file() -> int:
+            shutil.copy2(db_path, target.format("copy"))
+            return os.path.getsize(target.format("copy"))
+
+        one_step = WarehouseBackup(db_path, pages_per_step=-1)
+        stepped = WarehouseBackup(db_path, pages_per_step=pages_per_step, step_sleep=step_sleep)
+
+        phases = [
+            _measure(db_path, symbols, readers, "idle", lambda: (time.sleep(1.0), 0)[1]),
+            _measure(db_path, symbols, readers, "file copy", copy_file),
+            _measure(db_path, symbols, readers, "backup API, one step",
+                     lambda: one_step.backup(target.format("one-step")).size_bytes),
+            _measure(db_path, symbols, readers, f"backup API, {pages_per_step} pages/step",
+                     lambda: stepped.backup(target.format("stepped")).size_bytes),
+        ]
+        _append_day(db_path, symbols)
+        phases.append(_measure(db_path, symbols, readers, "delta (one new day)",
+                               lambda: stepped.backup_delta(target.format("delta"),
+                                                            target.format("stepped")).size_bytes))
+
+        return {
+            "tickers": tickers,
+            "days": days,
+            "readers": readers,
+            "database_bytes": os.path.getsize(db_path),
+            "phases": [asdict(phase) for phase in phases],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark online warehouse backups against concurrent reads")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the warehouse")
+    parser.add_argument("--days", type=int, default=2520, help="Trading days per ticker")
+    parser.add_argument("--readers", type=int, default=4, help="Concurrent reader threads")
+    parser.add_argument("--pages-per-step", type=int, default=1024, help="Pages per stepped backup step")
+    parser.add_argument("--step-sleep", type=float, default=0.005, help="Seconds slept between steps")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days, args.readers, args.pages_per_step, args.step_sleep)
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    mb = 1024 * 1024
+    print("=" * 78)
+    print("WAREHOUSE BACKUP BENCHMARK")
+    print("=" * 78)
+    print(f"Tickers x days:  {result['tickers']:,} x {result['days']:,} "
+          f"({result['database_bytes'] / mb:.1f} MB), {result['readers']} reader threads")
+    print(f"{'Method':<32}{'Backup':>10}{'Size':>10}{'Reads':>8}{'p50':>9}{'p99':>9}")
+    for phase in result["phases"]:
+        print(f"{phase['method']:<32}{phase['backup_seconds']:>9.2f}s{phase['size_bytes'] / mb:>8.1f}MB"
+              f"{phase['reads']:>8,}{phase['read_p50_ms']:>7.1f}ms{phase['read_p99_ms']:>7.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
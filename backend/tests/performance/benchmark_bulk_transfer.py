@@ -0,0 +1,126 @@
+"""
+Performance benchmark script for warehouse bulk import and export.
+
+Writes a synthetic vendor CSV dump (one row per symbol and trading day, sorted
+by date like most vendor files) and measures:
+- vendor CSV import into an empty warehouse, including prefix sums
+- export to partitioned files in each available format
+- import of that export into a second empty warehouse
+
+Usage:
+    python tests/performance/benchmark_bulk_transfer.py
+    python tests/performance/benchmark_bulk_transfer.py --tickers 2000 --days 2520 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict, field
+from typing import Dict
+
+import numpy as np
+import pandas as pd
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.infrastructure.warehouse.bulk_transfer import FORMATS, WarehouseBulkTransfer, _require_engine
+
+
+@dataclass
+class BulkTransferBenchmarkResult:
+    """Throughput in rows per minute, times in seconds, sizes in bytes."""
+    rows: int
+    csv_bytes: int
+    vendor_import_seconds: float
+    vendor_import_rows_per_minute: float
+    export_seconds: Dict[str, float] = field(default_factory=dict)
+    export_bytes: Dict[str, int] = field(default_factory=dict)
+    import_seconds: Dict[str, float] = field(default_factory=dict)
+    import_rows_per_minute: Dict[str, float] = field(default_factory=dict)
+
+
+def _write_vendor_csv(path: str, tickers: int, days: int) -> int:
+    """A date-major vendor dump with open/high/low/close/adj close/volume columns."""
+    dates = pd.bdate_range("1995-01-02", periods=days).strftime('%Y-%m-%d')
+    symbols = [f"T{number:05d}" for number in range(tickers)]
+    rng = np.random.default_rng(11)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (days, tickers)), axis=0))
+    frame = pd.DataFrame({
+        "Date": np.repeat(dates, tickers),
+        "Ticker": np.tile(symbols, days),
+        "Open": closes.ravel(), "High": closes.ravel(), "Low": closes.ravel(), "Close": closes.ravel(),
+        "Adj Close": closes.ravel(),
+        "Volume": rng.integers(1_000, 1_000_000, days * tickers),
+    })
+    frame.to_csv(path, index=False, float_format="%.4f")
+    return len(frame)
+
+
+def _directory_bytes(directory: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(directory) for name in names)
+
+
+def run_benchmark(tickers: int, days: int) -> BulkTransferBenchmarkResult:
+    with tempfile.TemporaryDirectory() as directory:
+        csv_path = os.path.join(directory, "vendor.csv")
+        rows = _write_vendor_csv(csv_path, tickers, days)
+
+        seeded = WarehouseBulkTransfer(os.path.join(directory, "seeded.sqlite"))
+        vendor = seeded.import_csv(csv_path)
+        result = BulkTransferBenchmarkResult(
+            rows=rows,
+            csv_bytes=os.path.getsize(csv_path),
+            vendor_import_seconds=vendor.seconds,
+            vendor_import_rows_per_minute=vendor.rows_per_minute
+        )
+
+        for file_format in FORMATS:
+            try:
+                _require_engine(file_format)
+            except ValueError:
+                continue
+            export_path = os.path.join(directory, f"export-{file_format}")
+            start = time.perf_counter()
+            seeded.export(export_path, file_format=file_format)
+            result.export_seconds[file_format] = time.perf_counter() - start
+            result.export_bytes[file_format] = _directory_bytes(export_path)
+
+            imported = WarehouseBulkTransfer(os.path.join(directory, f"{file_format}.sqlite")).import_export(export_path)
+            result.import_seconds[file_format] = imported.seconds
+            result.import_rows_per_minute[file_format] = imported.rows_per_minute
+
+        return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark warehouse bulk import and export")
+    parser.add_argument("--tickers", type=int, default=500, help="Symbols in the vendor dump")
+    parser.add_argument("--days", type=int, default=2520, help="Trading days per symbol")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    mb = 1024 * 1024
+    print("=" * 60)
+    print("WAREHOUSE BULK TRANSFER BENCHMARK")
+    print("=" * 60)
+    print(f"Price rows:                  {result.rows:,} ({result.csv_bytes / mb:.1f} MB vendor CSV)")
+    print(f"Vendor CSV import:           {result.vendor_import_seconds:8.2f} s "
+          f"({result.vendor_import_rows_per_minute / 1e6:.1f}M rows/min)")
+    for file_format, seconds in result.export_seconds.items():
+        print(f"{file_format + ' export:':<29}{seconds:8.2f} s ({result.export_bytes[file_format] / mb:.1f} MB)")
+        print(f"{file_format + ' import:':<29}{result.import_seconds[file_format]:8.2f} s "
+              f"({result.import_rows_per_minute[file_format] / 1e6:.1f}M rows/min)")
+
+
+if __name__ == "__main__":
+    main()
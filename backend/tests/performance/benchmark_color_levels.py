@@ -0,0 +1,88 @@
+"""
+Performance benchmark script for metric level classification.
+
+Classifies a (tickers x metrics) matrix of ticker metrics two ways and checks
+they agree:
+- scalar: ``get_level_for_metric`` per value (the previous per-metric path)
+- batch: ``get_levels_for_metrics`` over the whole matrix
+
+Usage:
+    python tests/performance/benchmark_color_levels.py
+    python tests/performance/benchmark_color_levels.py --tickers 5000 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, asdict
+
+import numpy as np
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.application.interfaces.metrics_color_service import LEVEL_CODES
+from src.infrastructure.color_metrics_service import ColorMetricsService
+
+# Ticker-context metrics with thresholds, plus unthresholded ones a table also shows
+METRICS = ["annualized_return", "volatility", "sharpe_ratio", "max_drawdown", "sortino_ratio", "beta", "var_95",
+           "momentum_12_1", "dividend_yield", "current_yield", "average_yield", "maximum_yield", "calmar_ratio",
+           "ulcer_index", "cvar_95"]
+
+
+@dataclass
+class ColorLevelResult:
+    """Time to classify the whole matrix, in milliseconds."""
+    tickers: int
+    metrics: int
+    scalar_ms: float
+    batch_ms: float
+    speedup: float
+    identical: bool
+
+
+def run_benchmark(tickers: int, repeats: int) -> ColorLevelResult:
+    service = ColorMetricsService()
+    values = np.random.default_rng(7).normal(5, 30, (tickers, len(METRICS)))
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        scalar = [[LEVEL_CODES[service.get_level_for_metric(name, value, "ticker")]
+                   for name, value in zip(METRICS, row)] for row in values.tolist()]
+    scalar_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        batch = service.get_levels_for_metrics(METRICS, values, "ticker")
+    batch_ms = (time.perf_counter() - start) / repeats * 1000
+
+    return ColorLevelResult(tickers, len(METRICS), scalar_ms, batch_ms, scalar_ms / batch_ms,
+                            batch.tolist() == scalar)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark scalar vs batch metric level classification")
+    parser.add_argument("--tickers", type=int, default=1000, help="Rows of the metrics matrix")
+    parser.add_argument("--repeats", type=int, default=20, help="Classifications timed per method")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.repeats)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    print("=" * 60)
+    print("METRIC LEVEL CLASSIFICATION BENCHMARK")
+    print("=" * 60)
+    print(f"Matrix:     {result.tickers:,} tickers x {result.metrics} metrics")
+    print(f"Scalar:     {result.scalar_ms:.2f} ms")
+    print(f"Batch:      {result.batch_ms:.3f} ms ({result.speedup:.0f}x)")
+    print(f"Identical:  {result.identical}")
+
+
+if __name__ == "__main__":
+    main()
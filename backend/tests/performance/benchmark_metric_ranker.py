@@ -0,0 +1,119 @@
+"""
+Performance benchmark script for the compare leaderboards.
+
+Builds the 20 default compare leaderboards (top and bottom k of 11 metrics)
+over synthetic ticker metrics two ways and checks they agree:
+- sorted: one full ``sorted`` with a getattr key per leaderboard (the previous path)
+- ranker: ``MetricRanker`` matrix build once, then one argpartition pass
+
+Usage:
+    python tests/performance/benchmark_metric_ranker.py
+    python tests/performance/benchmark_metric_ranker.py --tickers 10000 --k 10 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from dataclasses import dataclass, asdict
+from types import SimpleNamespace
+
+import numpy as np
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from api import COMPARE_LEADERBOARDS, TICKER_RANKINGS
+from src.infrastructure.services.metric_ranker import MetricRanker
+
+NAMES = list(dict.fromkeys(name for name, _ in COMPARE_LEADERBOARDS.values()))
+PERCENTAGES = {"annualized_return", "volatility", "max_drawdown"}
+
+
+@dataclass
+class RankerResult:
+    """Time to build every compare leaderboard, in milliseconds."""
+    tickers: int
+    leaderboards: int
+    k: int
+    sorted_ms: float
+    matrix_ms: float
+    rank_ms: float
+    speedup: float
+    identical: bool
+
+
+def _ticker_metrics(tickers: int):
+    attributes = [TICKER_RANKINGS[name].attribute for name in NAMES]
+    values = np.random.default_rng(7).normal(0, 10, (tickers, len(attributes))).round(2).tolist()
+    return [SimpleNamespace(**{attribute: SimpleNamespace(value=value) if attribute in PERCENTAGES else value
+                               for attribute, value in zip(attributes, row)}) for row in values]
+
+
+def _metric_value(metric, item) -> float:
+    value = getattr(item, metric.attribute)
+    value = float(value.value if hasattr(value, 'value') else value)
+    return abs(value) if metric.absolute else value
+
+
+def _sorted_leaderboards(metrics_list, k: int):
+    leaderboards = {}
+    for key, (name, end) in COMPARE_LEADERBOARDS.items():
+        metric = TICKER_RANKINGS[name]
+        reverse = metric.higher_is_better == (end == "best")
+        leaderboards[key] = sorted(range(len(metrics_list)), key=lambda index: _metric_value(metric, metrics_list[index]),
+                                   reverse=reverse)[:k]
+    return leaderboards
+
+
+def run_benchmark(tickers: int, k: int, repeats: int) -> RankerResult:
+    metrics_list = _ticker_metrics(tickers)
+    ranker = MetricRanker([TICKER_RANKINGS[name] for name in NAMES])
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        expected = _sorted_leaderboards(metrics_list, k)
+    sorted_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        oriented = ranker.matrix(metrics_list)
+    matrix_ms = (time.perf_counter() - start) / repeats * 1000
+
+    start = time.perf_counter()
+    for _ in range(repeats):
+        rankings = ranker.rank_matrix(oriented, k)
+    rank_ms = (time.perf_counter() - start) / repeats * 1000
+
+    identical = all(getattr(rankings[name], end) == expected[key]
+                    for key, (name, end) in COMPARE_LEADERBOARDS.items())
+    return RankerResult(tickers, len(COMPARE_LEADERBOARDS), k, sorted_ms, matrix_ms, rank_ms,
+                        sorted_ms / (matrix_ms + rank_ms), identical)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark sorted vs single-pass compare leaderboards")
+    parser.add_argument("--tickers", type=int, default=5000, help="Tickers being compared")
+    parser.add_argument("--k", type=int, default=5, help="Entries per leaderboard")
+    parser.add_argument("--repeats", type=int, default=20, help="Leaderboard builds timed per method")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.k, args.repeats)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    print("=" * 60)
+    print("COMPARE LEADERBOARD BENCHMARK")
+    print("=" * 60)
+    print(f"Leaderboards: {result.leaderboards} x top {result.k} of {result.tickers:,} tickers")
+    print(f"Sorted:       {result.sorted_ms:.2f} ms")
+    print(f"Ranker:       {result.matrix_ms:.2f} ms matrix + {result.rank_ms:.3f} ms rank ({result.speedup:.1f}x)")
+    print(f"Identical:    {result.identical}")
+
+
+if __name__ == "__main__":
+    main()
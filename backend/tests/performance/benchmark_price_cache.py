@@ -0,0 +1,157 @@
+"""
+Performance benchmark script for the in-memory close history cache.
+
+Builds a synthetic warehouse and replays a skewed workload of single-ticker
+``get_price_data`` calls and portfolio-sized ``get_price_history_optimized``
+batches over random date ranges, once with the cache disabled and once with
+it enabled, and reports:
+- median latency of each call type
+- the cache's hit ratio, resident bytes and evictions after the run
+
+Usage:
+    python tests/performance/benchmark_price_cache.py
+    python tests/performance/benchmark_price_cache.py --tickers 1000 --cache-mb 16 --json
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List, Tuple
+
+import numpy as np
+import pandas as pd
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.services.warehouse_optimizer import WarehouseOptimizer
+from src.infrastructure.warehouse.bulk_transfer import WarehouseBulkTransfer
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+
+@dataclass
+class PriceCacheBenchmarkResult:
+    """Latencies in milliseconds (medians)."""
+    tickers: int
+    days: int
+    cache_bytes: int
+    sqlite_single_ms: float
+    cached_single_ms: float
+    sqlite_batch_ms: float
+    cached_batch_ms: float
+    hit_ratio: float
+    resident_bytes: int
+    evictions: int
+
+
+def _build_warehouse(db_path: str, tickers: int, days: int) -> pd.DatetimeIndex:
+    dates = pd.bdate_range("2014-01-01", periods=days)
+    rng = np.random.default_rng(5)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (tickers, days)), axis=1))
+    frame = pd.DataFrame({
+        "symbol": np.repeat([f"T{number:05d}" for number in range(tickers)], days),
+        "date": np.tile(dates.strftime('%Y-%m-%d'), tickers),
+        "close_price": closes.ravel(),
+    })
+    csv_path = db_path + ".csv"
+    frame.to_csv(csv_path, index=False)
+    WarehouseBulkTransfer(db_path).import_csv(csv_path)
+    os.remove(csv_path)
+    return dates
+
+
+def _workload(tickers: int, dates: pd.DatetimeIndex, batch_size: int,
+              samples: int) -> List[Tuple[List[Ticker], DateRange]]:
+    """Zipf-skewed ticker popularity, as a few portfolios' tickers dominate real traffic."""
+    rng = np.random.default_rng(3)
+    weights = 1.0 / np.arange(1, tickers + 1)
+    weights /= weights.sum()
+    calls = []
+    for _ in range(samples):
+        size = 1 if rng.random() < 0.5 else batch_size
+        batch = [Ticker(f"T{number:05d}") for number in rng.choice(tickers, size, replace=False, p=weights)]
+        start = int(rng.integers(0, len(dates) - 260))
+        end = int(rng.integers(start + 250, len(dates)))
+        calls.append((batch, DateRange(dates[start].strftime('%Y-%m-%d'), dates[end].strftime('%Y-%m-%d'))))
+    return calls
+
+
+def _replay(service: WarehouseService, calls: List[Tuple[List[Ticker], DateRange]]) -> Dict[str, float]:
+    timings = {"single": [], "batch": []}
+    for batch, date_range in calls:
+        start = time.perf_counter()
+        if len(batch) == 1:
+            service.get_price_data(batch[0], date_range)
+            timings["single"].append(time.perf_counter() - start)
+        else:
+            service._warehouse_optimizer.get_price_history_optimized(batch, date_range)
+            timings["batch"].append(time.perf_counter() - start)
+    return {kind: statistics.median(values) * 1000 for kind, values in timings.items()}
+
+
+def run_benchmark(tickers: int, days: int, batch_size: int, samples: int, cache_bytes: int) -> PriceCacheBenchmarkResult:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "warehouse.sqlite")
+        dates = _build_warehouse(db_path, tickers, days)
+        calls = _workload(tickers, dates, batch_size, samples)
+
+        service = WarehouseService(db_path)
+        service._warehouse_optimizer = WarehouseOptimizer(db_path, price_cache_bytes=0)
+        uncached = _replay(service, calls)
+
+        service._warehouse_optimizer = WarehouseOptimizer(db_path, price_cache_bytes=cache_bytes)
+        cached = _replay(service, calls)
+        stats = service.get_price_cache_stats()
+
+        return PriceCacheBenchmarkResult(
+            tickers=tickers,
+            days=days,
+            cache_bytes=cache_bytes,
+            sqlite_single_ms=uncached["single"],
+            cached_single_ms=cached["single"],
+            sqlite_batch_ms=uncached["batch"],
+            cached_batch_ms=cached["batch"],
+            hit_ratio=stats["price_cache_hit_ratio"],
+            resident_bytes=stats["price_cache_resident_bytes"],
+            evictions=stats["price_cache_evictions"]
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark cached against SQLite-backed close history reads")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the warehouse")
+    parser.add_argument("--days", type=int, default=2520, help="Trading days per ticker")
+    parser.add_argument("--batch-size", type=int, default=25, help="Tickers per batch call")
+    parser.add_argument("--samples", type=int, default=400, help="Calls replayed, half single-ticker, half batches")
+    parser.add_argument("--cache-mb", type=float, default=8.0, help="Cache budget in MB")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days, args.batch_size, args.samples, int(args.cache_mb * 1024 * 1024))
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    mb = 1024 * 1024
+    print("=" * 60)
+    print("PRICE CACHE BENCHMARK")
+    print("=" * 60)
+    print(f"Tickers x days:              {result.tickers:,} x {result.days:,}")
+    print(f"Single ticker:               SQLite {result.sqlite_single_ms:8.2f} ms   cached {result.cached_single_ms:8.2f} ms")
+    print(f"Batch of {args.batch_size} tickers:         SQLite {result.sqlite_batch_ms:8.2f} ms   "
+          f"cached {result.cached_batch_ms:8.2f} ms")
+    print(f"Hit ratio:                   {result.hit_ratio:.1%}")
+    print(f"Resident:                    {result.resident_bytes / mb:.1f} of {result.cache_bytes / mb:.1f} MB "
+          f"({result.evictions:,} evictions)")
+
+
+if __name__ == "__main__":
+    main()
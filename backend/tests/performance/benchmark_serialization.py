@@ -0,0 +1,125 @@
+"""
+Performance benchmark script for time-series payload serialization.
+
+This script compares the legacy date-keyed dict encoding with the vectorized
+dict and columnar encodings, under both stdlib json and orjson.
+"""
+
+import json
+import time
+import sys
+import os
+import numpy as np
+import pandas as pd
+from typing import Callable, Dict, List
+from dataclasses import dataclass
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from src.infrastructure.utils import serialization
+from src.infrastructure.utils.serialization import series_to_date_dict, series_to_columnar
+
+
+@dataclass
+class SerializationResult:
+    """Results of a serialization benchmark."""
+    test_name: str
+    execution_time_ms: float
+    payload_bytes: int
+
+
+class SerializationBenchmark:
+    """Benchmark for portfolio analysis time-series payloads."""
+
+    def __init__(self, years: int = 20, iterations: int = 20):
+        self.iterations = iterations
+
+        # Three series (portfolio, S&P 500, NASDAQ) over the full range, like /portfolio/analysis
+        index = pd.bdate_range("2005-01-03", periods=252 * years)
+        rng = np.random.default_rng(42)
+        self.series = {
+            name: pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index)))), index=index)
+            for name in ("portfolioValues", "sp500Values", "nasdaqValues")
+        }
+
+    def _legacy_dicts(self) -> Dict:
+        """Per-entry strftime comprehension (previous implementation)."""
+        return {
+            name: {date.strftime('%Y-%m-%d'): float(value) for date, value in series.items()}
+            for name, series in self.series.items()
+        }
+
+    def _time(self, test_name: str, build: Callable[[], Dict], encode: Callable[[Dict], bytes]) -> SerializationResult:
+        """Time building and encoding the payload."""
+        execution_times = []
+        payload = b""
+        for _ in range(self.iterations):
+            start_time = time.perf_counter()
+            payload = encode(build())
+            execution_times.append(time.perf_counter() - start_time)
+
+        return SerializationResult(
+            test_name=test_name,
+            execution_time_ms=float(np.median(execution_times)) * 1000,
+            payload_bytes=len(payload)
+        )
+
+    def run(self) -> List[SerializationResult]:
+        """Run all encodings."""
+        stdlib = lambda payload: json.dumps(payload, default=serialization._default).encode('utf-8')
+
+        cases = [
+            ("dict, per-entry strftime, json", self._legacy_dicts, stdlib),
+            ("dict, vectorized, json", lambda: {n: series_to_date_dict(s) for n, s in self.series.items()}, stdlib),
+            ("columnar, json", lambda: {n: series_to_columnar(s) for n, s in self.series.items()}, stdlib),
+            ("columnar-base64, json", lambda: {n: series_to_columnar(s, True) for n, s in self.series.items()}, stdlib),
+        ]
+
+        if serialization.HAS_ORJSON:
+            cases += [
+                ("dict, vectorized, orjson", lambda: {n: series_to_date_dict(s) for n, s in self.series.items()}, serialization.dumps),
+                ("columnar, orjson", lambda: {n: series_to_columnar(s) for n, s in self.series.items()}, serialization.dumps),
+                ("columnar-base64, orjson", lambda: {n: series_to_columnar(s, True) for n, s in self.series.items()}, serialization.dumps),
+            ]
+
+        return [self._time(name, build, encode) for name, build, encode in cases]
+
+    def generate_report(self, results: List[SerializationResult]) -> str:
+        """Generate a performance report."""
+        points = sum(len(series) for series in self.series.values())
+        baseline = results[0]
+
+        report = []
+        report.append("=" * 80)
+        report.append(f"TIME-SERIES SERIALIZATION BENCHMARK ({points} points, median of {self.iterations})")
+        report.append("=" * 80)
+        report.append(f"{'Encoding':<36} {'Time (ms)':<12} {'Speedup':<10} {'Size (KB)':<10}")
+        report.append("-" * 80)
+
+        for result in results:
+            speedup = baseline.execution_time_ms / result.execution_time_ms if result.execution_time_ms > 0 else 0
+            report.append(
+                f"{result.test_name:<36} "
+                f"{result.execution_time_ms:<12.2f} "
+                f"{speedup:<10.1f} "
+                f"{result.payload_bytes / 1024:<10.1f}"
+            )
+
+        if not serialization.HAS_ORJSON:
+            report.append("")
+            report.append("orjson not installed - fast path skipped")
+
+        report.append("=" * 80)
+        return "\n".join(report)
+
+
+def main():
+    """Main benchmark execution."""
+    benchmark = SerializationBenchmark()
+    print(benchmark.generate_report(benchmark.run()))
+    return 0
+
+
+if __name__ == "__main__":
+    exit(main())
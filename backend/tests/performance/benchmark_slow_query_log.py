@@ -0,0 +1,135 @@
+"""
+Performance benchmark script for the warehouse slow-query log.
+
+Builds a synthetic warehouse and times the same pooled reads with the log
+off, on with a threshold no statement reaches, and on with every statement
+recorded (plans sampled once per shape):
+- point lookups (one symbol's latest close; overhead dominates)
+- batch history reads (``get_price_history_optimized``, price cache disabled)
+
+Usage:
+    python tests/performance/benchmark_slow_query_log.py
+    python tests/performance/benchmark_slow_query_log.py --tickers 2000 --repeats 5000 --json
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.services.warehouse_optimizer import WarehouseOptimizer
+from src.infrastructure.warehouse.bulk_transfer import WarehouseBulkTransfer
+
+
+@dataclass
+class LogModeResult:
+    """Mean latency of each read in one slow-query log mode, in microseconds."""
+    mode: str
+    point_us: float
+    batch_us: float
+    slow_statements: int
+
+
+def _build_warehouse(db_path: str, tickers: int, days: int) -> List[str]:
+    symbols = [f"T{number:05d}" for number in range(tickers)]
+    dates = pd.bdate_range("2014-01-01", periods=days)
+    closes = 100 * np.exp(np.cumsum(np.random.default_rng(5).normal(0, 0.01, (tickers, days)), axis=1))
+    csv_path = db_path + ".csv"
+    pd.DataFrame({
+        "symbol": np.repeat(symbols, days),
+        "date": np.tile(dates.strftime('%Y-%m-%d'), tickers),
+        "close_price": closes.ravel(),
+    }).to_csv(csv_path, index=False)
+    WarehouseBulkTransfer(db_path).import_csv(csv_path)
+    os.remove(csv_path)
+    return symbols
+
+
+def _time_mode(db_path: str, symbols: List[str], mode: str, threshold: float, repeats: int,
+               batch_size: int) -> LogModeResult:
+    optimizer = WarehouseOptimizer(db_path, slow_query_seconds=threshold)
+    rng = np.random.default_rng(11)
+    date_range = DateRange("2018-01-01", "2018-12-31")
+
+    with optimizer.connection_pool.get_connection() as conn:
+        start = time.perf_counter()
+        for index in rng.integers(0, len(symbols), repeats):
+            conn.execute("""
+                SELECT day, close_price FROM market_data
+                WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?)
+                ORDER BY day DESC LIMIT 1
+            """, (symbols[index],)).fetchone()
+        point_us = (time.perf_counter() - start) / repeats * 1e6
+
+    batches = max(1, repeats // 100)
+    start = time.perf_counter()
+    for _ in range(batches):
+        batch = [Ticker(symbols[i]) for i in rng.choice(len(symbols), batch_size, replace=False)]
+        optimizer.get_price_history_optimized(batch, date_range)
+    batch_us = (time.perf_counter() - start) / batches * 1e6
+
+    slow = optimizer.slow_query_log.stats()["slow_statements"] if optimizer.slow_query_log else 0
+    optimizer.close()
+    return LogModeResult(mode, point_us, batch_us, slow)
+
+
+def run_benchmark(tickers: int, days: int, repeats: int, batch_size: int) -> Dict[str, object]:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "warehouse.sqlite")
+        symbols = _build_warehouse(db_path, tickers, days)
+        modes = [
+            _time_mode(db_path, symbols, "off", 0.0, repeats, batch_size),
+            _time_mode(db_path, symbols, "on, nothing slow", 3600.0, repeats, batch_size),
+            _time_mode(db_path, symbols, "on, everything slow", 1e-9, repeats, batch_size),
+        ]
+        return {
+            "tickers": tickers,
+            "days": days,
+            "repeats": repeats,
+            "batch_size": batch_size,
+            "modes": [asdict(mode) for mode in modes],
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the overhead of the warehouse slow-query log")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the warehouse")
+    parser.add_argument("--days", type=int, default=1260, help="Trading days per ticker")
+    parser.add_argument("--repeats", type=int, default=10000, help="Point lookups per mode (batch reads: 1/100)")
+    parser.add_argument("--batch-size", type=int, default=200, help="Tickers per batch history read")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days, args.repeats, args.batch_size)
+
+    if args.json:
+        print(json.dumps(result))
+        return
+
+    print("=" * 70)
+    print("WAREHOUSE SLOW-QUERY LOG BENCHMARK")
+    print("=" * 70)
+    print(f"Tickers x days:  {result['tickers']:,} x {result['days']:,}, "
+          f"batch reads of {result['batch_size']} tickers")
+    off = result["modes"][0]
+    print(f"{'Mode':<24}{'Point':>12}{'Overhead':>11}{'Batch':>13}{'Overhead':>11}{'Slow':>8}")
+    for mode in result["modes"]:
+        print(f"{mode['mode']:<24}{mode['point_us']:>10.2f}us{mode['point_us'] / off['point_us'] - 1:>+10.1%}"
+              f"{mode['batch_us']:>11.0f}us{mode['batch_us'] / off['batch_us'] - 1:>+10.1%}"
+              f"{mode['slow_statements']:>8,}")
+
+
+if __name__ == "__main__":
+    main()
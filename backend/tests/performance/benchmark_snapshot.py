@@ -0,0 +1,176 @@
+"""
+Performance benchmark script for the memory-mapped warehouse snapshot.
+
+Builds a synthetic warehouse and a snapshot of all its tickers, then compares
+SQLite-backed and snapshot-backed ``get_price_history_batch``:
+- batch latency for a portfolio-sized set of tickers over several years,
+  for the snapshot also after a write to a ticker outside it
+- private memory per worker process holding every ticker's full history,
+  as each uvicorn worker would (from /proc/self/smaps_rollup; Linux only)
+
+Usage:
+    python tests/performance/benchmark_snapshot.py
+    python tests/performance/benchmark_snapshot.py --tickers 1000 --workers 4 --json
+"""
+
+import argparse
+import json
+import multiprocessing
+import os
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.bulk_transfer import WarehouseBulkTransfer
+from src.infrastructure.warehouse.snapshot import SnapshotBuilder
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+FULL_RANGE = DateRange("2000-01-01", "2030-12-31")
+
+
+@dataclass
+class SnapshotBenchmarkResult:
+    """Latencies in milliseconds (medians), memory in bytes per worker."""
+    tickers: int
+    days: int
+    snapshot_bytes: int
+    build_seconds: float
+    sqlite_batch_ms: float
+    snapshot_batch_ms: float
+    snapshot_after_write_batch_ms: float
+    sqlite_worker_private_bytes: Optional[int]
+    snapshot_worker_private_bytes: Optional[int]
+
+
+def _build_warehouse(db_path: str, tickers: int, days: int) -> None:
+    dates = pd.bdate_range("2014-01-01", periods=days)
+    rng = np.random.default_rng(5)
+    closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, (tickers, days)), axis=1))
+    frame = pd.DataFrame({
+        "symbol": np.repeat([f"T{number:05d}" for number in range(tickers)], days),
+        "date": np.tile(dates.strftime('%Y-%m-%d'), tickers),
+        "close_price": closes.ravel(),
+    })
+    csv_path = db_path + ".csv"
+    frame.to_csv(csv_path, index=False)
+    WarehouseBulkTransfer(db_path).import_csv(csv_path)
+    os.remove(csv_path)
+
+
+def _time_batches(service: WarehouseService, tickers: int, batch_size: int, samples: int) -> float:
+    rng = np.random.default_rng(3)
+    date_range = DateRange("2016-01-01", "2020-12-31")
+    timings = []
+    for _ in range(samples):
+        batch = [Ticker(f"T{number:05d}") for number in rng.choice(tickers, batch_size, replace=False)]
+        start = time.perf_counter()
+        service.get_price_history_batch(batch, date_range)
+        timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _private_bytes() -> Optional[int]:
+    try:
+        with open("/proc/self/smaps_rollup") as smaps:
+            fields = dict(line.split(":", 1) for line in smaps if ":" in line)
+    except OSError:
+        return None
+    return sum(int(fields[name].split()[0]) * 1024 for name in ("Private_Clean", "Private_Dirty"))
+
+
+def _worker(db_path: str, snapshot_path: Optional[str], tickers: int, queue) -> None:
+    """Hold every ticker's history like a warm worker and report the private memory it added."""
+    service = WarehouseService(db_path, snapshot_path)
+    before = _private_bytes()
+    held = service.get_price_history_batch([Ticker(f"T{number:05d}") for number in range(tickers)], FULL_RANGE)
+    after = _private_bytes()
+    queue.put(None if before is None else after - before)
+    del held
+
+
+def _worker_private_bytes(db_path: str, snapshot_path: Optional[str], tickers: int, workers: int) -> Optional[int]:
+    context = multiprocessing.get_context("spawn")
+    queue = context.Queue()
+    processes = [context.Process(target=_worker, args=(db_path, snapshot_path, tickers, queue)) for _ in range(workers)]
+    for process in processes:
+        process.start()
+    results = [queue.get() for _ in processes]
+    for process in processes:
+        process.join()
+    return None if None in results else int(statistics.median(results))
+
+
+def run_benchmark(tickers: int, days: int, batch_size: int, samples: int, workers: int) -> SnapshotBenchmarkResult:
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "warehouse.sqlite")
+        snapshot_path = os.path.join(directory, "snapshot.bin")
+        _build_warehouse(db_path, tickers, days)
+
+        start = time.perf_counter()
+        with sqlite3.connect(db_path) as conn:
+            info = SnapshotBuilder().build(conn, [f"T{number:05d}" for number in range(tickers)], snapshot_path)
+        build_seconds = time.perf_counter() - start
+
+        sqlite_batch_ms = _time_batches(WarehouseService(db_path), tickers, batch_size, samples)
+        snapshot_service = WarehouseService(db_path, snapshot_path)
+        snapshot_batch_ms = _time_batches(snapshot_service, tickers, batch_size, samples)
+        # Every later read has to check its tickers against the batches written since the build
+        snapshot_service.store_price_data(Ticker("UNRELATED"), pd.Series([1.0], index=pd.DatetimeIndex(["2024-01-02"])))
+
+        return SnapshotBenchmarkResult(
+            tickers=tickers,
+            days=days,
+            snapshot_bytes=info.file_bytes,
+            build_seconds=build_seconds,
+            sqlite_batch_ms=sqlite_batch_ms,
+            snapshot_batch_ms=snapshot_batch_ms,
+            snapshot_after_write_batch_ms=_time_batches(snapshot_service, tickers, batch_size, samples),
+            sqlite_worker_private_bytes=_worker_private_bytes(db_path, None, tickers, workers),
+            snapshot_worker_private_bytes=_worker_private_bytes(db_path, snapshot_path, tickers, workers)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark snapshot-backed against SQLite-backed batch reads")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the warehouse and snapshot")
+    parser.add_argument("--days", type=int, default=2520, help="Trading days per ticker")
+    parser.add_argument("--batch-size", type=int, default=25, help="Tickers per timed batch")
+    parser.add_argument("--samples", type=int, default=50, help="Timed batches")
+    parser.add_argument("--workers", type=int, default=2, help="Worker processes for the memory measurement")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days, args.batch_size, args.samples, args.workers)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    mb = 1024 * 1024
+    print("=" * 60)
+    print("WAREHOUSE SNAPSHOT BENCHMARK")
+    print("=" * 60)
+    print(f"Tickers x days:              {result.tickers:,} x {result.days:,}")
+    print(f"Snapshot:                    {result.snapshot_bytes / mb:.1f} MB built in {result.build_seconds:.2f} s")
+    print(f"Batch of {args.batch_size} tickers, 5 years: SQLite {result.sqlite_batch_ms:8.2f} ms   "
+          f"snapshot {result.snapshot_batch_ms:8.2f} ms")
+    print(f"After an unrelated write:    snapshot {result.snapshot_after_write_batch_ms:8.2f} ms")
+    if result.sqlite_worker_private_bytes is not None:
+        print(f"Private memory per worker:   SQLite {result.sqlite_worker_private_bytes / mb:8.1f} MB   "
+              f"snapshot {result.snapshot_worker_private_bytes / mb:8.1f} MB")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,159 @@
+"""
+Performance benchmark script for server import time and warehouse startup.
+
+Measures, each in fresh interpreters where it matters:
+- ``import api`` wall time, and whether yfinance was imported (it should not be)
+- WarehouseService construction on a synthetic warehouse: the first boot of an
+  unversioned warehouse (runs all migrations) and warm boots (schema current)
+- the pre-migration boot cost for reference: all DDL plus a full ANALYZE
+
+Usage:
+    python tests/performance/benchmark_startup.py
+    python tests/performance/benchmark_startup.py --tickers 1000 --days 2520 --runs 7 --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import List
+
+import numpy as np
+import pandas as pd
+
+BACKEND_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, BACKEND_ROOT)
+
+from src.infrastructure.warehouse.migrations import COMPACT_SCHEMA_VERSION, MIGRATIONS
+
+
+IMPORT_PROBE = """
+import sys, time
+start = time.perf_counter()
+import api
+print(time.perf_counter() - start, 'yfinance' in sys.modules)
+"""
+
+WAREHOUSE_PROBE = """
+import sys, time
+sys.path.insert(0, {root!r})
+start = time.perf_counter()
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+imported = time.perf_counter()
+service = WarehouseService({db_path!r})
+print(imported - start, time.perf_counter() - imported, len(service.applied_migrations))
+"""
+
+
+@dataclass
+class StartupBenchmarkResult:
+    """Startup timings in seconds (medians over runs)."""
+    import_api: float
+    yfinance_imported: bool
+    warehouse_rows: int
+    first_boot: float
+    first_boot_migrations: int
+    warm_boot: float
+    legacy_boot: float
+
+
+def _run(code: str) -> List[str]:
+    output = subprocess.run(
+        [sys.executable, "-c", code], cwd=BACKEND_ROOT, capture_output=True, text=True, check=True
+    ).stdout
+    return output.strip().splitlines()[-1].split()
+
+
+def _build_warehouse(db_path: str, tickers: int, days: int) -> int:
+    """Write an unversioned warehouse (market_data only) with random closes."""
+    dates = pd.bdate_range("2015-01-01", periods=days).strftime('%Y-%m-%d').tolist()
+    rng = np.random.default_rng(7)
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("""CREATE TABLE market_data (ticker TEXT NOT NULL, date TEXT NOT NULL,
+                        close_price REAL NOT NULL, created_at TEXT NOT NULL, PRIMARY KEY (ticker, date))""")
+        for number in range(tickers):
+            closes = 100 * np.exp(np.cumsum(rng.normal(0, 0.01, days)))
+            conn.executemany(
+                "INSERT INTO market_data VALUES (?, ?, ?, '')",
+                zip([f"T{number:05d}"] * days, dates, closes.tolist())
+            )
+    return tickers * days
+
+
+def _legacy_boot(db_path: str) -> float:
+    """All v1 DDL plus a full ANALYZE, as every start did before schema versioning."""
+    with sqlite3.connect(db_path) as conn:
+        start = time.perf_counter()
+        for migration in MIGRATIONS:
+            if migration.version < COMPACT_SCHEMA_VERSION:
+                migration.apply(conn)
+        conn.execute("ANALYZE")
+        conn.commit()
+        return time.perf_counter() - start
+
+
+def run_benchmark(tickers: int, days: int, runs: int) -> StartupBenchmarkResult:
+    import_times, yfinance_imported = [], False
+    for _ in range(runs):
+        seconds, loaded = _run(IMPORT_PROBE)
+        import_times.append(float(seconds))
+        yfinance_imported |= loaded == "True"
+
+    with tempfile.TemporaryDirectory() as directory:
+        db_path = os.path.join(directory, "warehouse.sqlite")
+        legacy_path = os.path.join(directory, "legacy.sqlite")
+        rows = _build_warehouse(db_path, tickers, days)
+        shutil.copy(db_path, legacy_path)
+        _legacy_boot(legacy_path)  # Creates the v1 indexes; later boots measure the per-start cost
+
+        _, first_boot, first_migrations = _run(WAREHOUSE_PROBE.format(root=BACKEND_ROOT, db_path=db_path))
+        warm_boots = [float(_run(WAREHOUSE_PROBE.format(root=BACKEND_ROOT, db_path=db_path))[1]) for _ in range(runs)]
+        legacy_boots = [_legacy_boot(legacy_path) for _ in range(max(runs // 2, 1))]
+
+    return StartupBenchmarkResult(
+        import_api=statistics.median(import_times),
+        yfinance_imported=yfinance_imported,
+        warehouse_rows=rows,
+        first_boot=float(first_boot),
+        first_boot_migrations=int(first_migrations),
+        warm_boot=statistics.median(warm_boots),
+        legacy_boot=statistics.median(legacy_boots)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark server import and warehouse startup")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the synthetic warehouse")
+    parser.add_argument("--days", type=int, default=2520, help="Trading days per ticker")
+    parser.add_argument("--runs", type=int, default=5, help="Fresh interpreters per measurement")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days, args.runs)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    print("=" * 60)
+    print("SERVER STARTUP BENCHMARK")
+    print("=" * 60)
+    print(f"import api:                  {result.import_api * 1000:8.1f} ms"
+          f"  (yfinance imported: {result.yfinance_imported})")
+    print(f"Warehouse rows:              {result.warehouse_rows:,}")
+    print(f"First boot ({result.first_boot_migrations} migrations):   {result.first_boot * 1000:8.1f} ms")
+    print(f"Warm boot (schema current):  {result.warm_boot * 1000:8.1f} ms")
+    print(f"Legacy boot (DDL + ANALYZE): {result.legacy_boot * 1000:8.1f} ms")
+
+
+if __name__ == "__main__":
+    main()
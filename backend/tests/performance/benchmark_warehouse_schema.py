@@ -0,0 +1,238 @@
+"""
+Performance benchmark script for the compact (v2) warehouse layout.
+
+Builds a synthetic v1 warehouse (text ticker/date keys, per-row created_at and
+the v1 secondary indexes), converts a copy to the compact layout and compares:
+- file size after VACUUM, and bytes per table including its indexes (dbstat)
+- append latency: a few new days per ticker, one transaction per ticker
+- range read latency: one ticker's year of closes into a date-indexed Series
+- conversion time inline (one transaction) and online (longest write transaction)
+
+Usage:
+    python tests/performance/benchmark_warehouse_schema.py
+    python tests/performance/benchmark_warehouse_schema.py --tickers 1000 --days 2520 --json
+"""
+
+import argparse
+import json
+import os
+import shutil
+import sqlite3
+import statistics
+import sys
+import tempfile
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, List
+
+import numpy as np
+import pandas as pd
+
+# Add backend root to Python path so the src package resolves
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from src.infrastructure.warehouse.compaction import CompactSchemaMigrator
+from src.infrastructure.warehouse.keys import get_symbol_id, new_batch, to_dates, to_epoch_day
+from src.infrastructure.warehouse.migrations import COMPACT_SCHEMA_VERSION, migrate
+
+
+@dataclass
+class SchemaBenchmarkResult:
+    """Sizes in bytes, latencies in milliseconds (medians), conversion times in seconds."""
+    rows: int
+    v1_file_bytes: int
+    v2_file_bytes: int
+    v1_table_bytes: Dict[str, int]
+    v2_table_bytes: Dict[str, int]
+    v1_append_ms: float
+    v2_append_ms: float
+    v1_range_read_ms: float
+    v2_range_read_ms: float
+    inline_migration_seconds: float
+    online_migration_seconds: float
+    online_longest_transaction_seconds: float
+
+
+def _build_v1_warehouse(db_path: str, tickers: int, days: int) -> int:
+    """A v1 warehouse with prices and their prefix sums, one created_at per ticker as the old store path wrote."""
+    dates = pd.bdate_range("2014-01-01", periods=days).strftime('%Y-%m-%d').tolist()
+    rng = np.random.default_rng(7)
+    with sqlite3.connect(db_path) as conn:
+        migrate(conn, target=COMPACT_SCHEMA_VERSION - 1)
+        for number in range(tickers):
+            symbol = f"T{number:05d}"
+            returns = np.concatenate([[0.0], rng.normal(0, 0.01, days - 1)])
+            closes = 100 * np.exp(np.cumsum(returns))
+            created_at = pd.Timestamp.now().isoformat()
+            conn.executemany(
+                "INSERT INTO market_data VALUES (?, ?, ?, ?)",
+                zip([symbol] * days, dates, closes.tolist(), [created_at] * days)
+            )
+            conn.executemany(
+                "INSERT INTO price_prefix_sums VALUES (?, ?, ?, ?, ?, ?, ?)",
+                zip([symbol] * days, dates, range(days), closes.tolist(), np.cumsum(np.log1p(returns)).tolist(),
+                    np.cumsum(returns).tolist(), np.cumsum(returns * returns).tolist())
+            )
+    return tickers * days
+
+
+def _vacuum(db_path: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        conn.execute("VACUUM")
+    return os.path.getsize(db_path)
+
+
+def _table_bytes(db_path: str) -> Dict[str, int]:
+    """Bytes per table, including its indexes; empty if SQLite lacks the dbstat table."""
+    with sqlite3.connect(db_path) as conn:
+        try:
+            rows = conn.execute("""
+                SELECT m.tbl_name, SUM(d.pgsize) FROM dbstat d JOIN sqlite_master m ON m.name = d.name
+                WHERE m.tbl_name IN ('market_data', 'price_prefix_sums', 'symbols')
+                GROUP BY m.tbl_name
+            """).fetchall()
+        except sqlite3.OperationalError:
+            return {}
+    return dict(rows)
+
+
+def _append_v1(conn: sqlite3.Connection, symbol: str, dates: List[str], closes: List[float]) -> None:
+    created_at = pd.Timestamp.now().isoformat()
+    conn.executemany(
+        "INSERT OR REPLACE INTO market_data (ticker, date, close_price, created_at) VALUES (?, ?, ?, ?)",
+        [(symbol, date, close, created_at) for date, close in zip(dates, closes)]
+    )
+
+
+def _append_v2(conn: sqlite3.Connection, symbol: str, dates: List[str], closes: List[float]) -> None:
+    symbol_id, batch_id = get_symbol_id(conn, symbol), new_batch(conn, "prices")
+    conn.executemany(
+        "INSERT OR REPLACE INTO market_data (symbol_id, day, close_price, batch_id) VALUES (?, ?, ?, ?)",
+        [(symbol_id, to_epoch_day(date), close, batch_id) for date, close in zip(dates, closes)]
+    )
+
+
+def _read_v1(conn: sqlite3.Connection, symbol: str, start: str, end: str) -> pd.Series:
+    rows = conn.execute(
+        "SELECT date, close_price FROM market_data WHERE ticker = ? AND date >= ? AND date <= ? ORDER BY date",
+        (symbol, start, end)
+    ).fetchall()
+    return pd.Series([row[1] for row in rows], index=pd.DatetimeIndex([row[0] for row in rows]), name='Close')
+
+
+def _read_v2(conn: sqlite3.Connection, symbol: str, start: str, end: str) -> pd.Series:
+    rows = conn.execute("""
+        SELECT day, close_price FROM market_data
+        WHERE symbol_id = (SELECT symbol_id FROM symbols WHERE symbol = ?) AND day >= ? AND day <= ?
+        ORDER BY day
+    """, (symbol, to_epoch_day(start), to_epoch_day(end))).fetchall()
+    days, closes = zip(*rows)
+    return pd.Series(np.array(closes, dtype=float), index=to_dates(days), name='Close')
+
+
+def _time_appends(db_path: str, append, tickers: int, samples: int) -> float:
+    dates = pd.bdate_range("2030-01-01", periods=5).strftime('%Y-%m-%d').tolist()
+    timings = []
+    with sqlite3.connect(db_path) as conn:
+        for number in np.linspace(0, tickers - 1, samples).astype(int):
+            start = time.perf_counter()
+            append(conn, f"T{number:05d}", dates, [100.0] * len(dates))
+            conn.commit()
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def _time_reads(db_path: str, read, tickers: int, samples: int) -> float:
+    timings = []
+    with sqlite3.connect(db_path) as conn:
+        for number in np.linspace(0, tickers - 1, samples).astype(int):
+            start = time.perf_counter()
+            read(conn, f"T{number:05d}", "2016-01-01", "2016-12-31")
+            timings.append(time.perf_counter() - start)
+    return statistics.median(timings) * 1000
+
+
+def run_benchmark(tickers: int, days: int, samples: int, chunk_size: int) -> SchemaBenchmarkResult:
+    with tempfile.TemporaryDirectory() as directory:
+        v1_path = os.path.join(directory, "v1.sqlite")
+        inline_path = os.path.join(directory, "inline.sqlite")
+        online_path = os.path.join(directory, "online.sqlite")
+
+        rows = _build_v1_warehouse(v1_path, tickers, days)
+        v1_file_bytes = _vacuum(v1_path)
+        shutil.copy(v1_path, inline_path)
+        shutil.copy(v1_path, online_path)
+
+        with sqlite3.connect(inline_path) as conn:
+            start = time.perf_counter()
+            migrate(conn)
+            inline_seconds = time.perf_counter() - start
+
+        # Time every write transaction of the online run from BEGIN IMMEDIATE to COMMIT
+        transactions, began = [], []
+
+        def trace(sql: str) -> None:
+            if sql.startswith("BEGIN IMMEDIATE"):
+                began.append(time.perf_counter())
+            elif sql == "COMMIT" and began:
+                transactions.append(time.perf_counter() - began.pop())
+
+        conn = sqlite3.connect(online_path)
+        conn.set_trace_callback(trace)
+        start = time.perf_counter()
+        CompactSchemaMigrator().run_online(conn, chunk_size)
+        online_seconds = time.perf_counter() - start
+        conn.close()
+
+        v2_file_bytes = _vacuum(online_path)
+
+        return SchemaBenchmarkResult(
+            rows=rows,
+            v1_file_bytes=v1_file_bytes,
+            v2_file_bytes=v2_file_bytes,
+            v1_table_bytes=_table_bytes(v1_path),
+            v2_table_bytes=_table_bytes(online_path),
+            v1_append_ms=_time_appends(v1_path, _append_v1, tickers, samples),
+            v2_append_ms=_time_appends(online_path, _append_v2, tickers, samples),
+            v1_range_read_ms=_time_reads(v1_path, _read_v1, tickers, samples),
+            v2_range_read_ms=_time_reads(online_path, _read_v2, tickers, samples),
+            inline_migration_seconds=inline_seconds,
+            online_migration_seconds=online_seconds,
+            online_longest_transaction_seconds=max(transactions)
+        )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the compact warehouse layout against v1")
+    parser.add_argument("--tickers", type=int, default=500, help="Tickers in the synthetic warehouse")
+    parser.add_argument("--days", type=int, default=2520, help="Trading days per ticker")
+    parser.add_argument("--samples", type=int, default=200, help="Tickers sampled for latency")
+    parser.add_argument("--chunk-size", type=int, default=20, help="Symbols per online migration transaction")
+    parser.add_argument("--json", action="store_true", help="Print the result as JSON for tracking")
+    args = parser.parse_args()
+
+    result = run_benchmark(args.tickers, args.days, args.samples, args.chunk_size)
+
+    if args.json:
+        print(json.dumps(asdict(result)))
+        return
+
+    mb = 1024 * 1024
+    print("=" * 60)
+    print("WAREHOUSE SCHEMA BENCHMARK")
+    print("=" * 60)
+    print(f"Price rows:                  {result.rows:,}")
+    print(f"File size (after VACUUM):    v1 {result.v1_file_bytes / mb:8.1f} MB   v2 {result.v2_file_bytes / mb:8.1f} MB")
+    for table in ("market_data", "price_prefix_sums", "symbols"):
+        if table in result.v2_table_bytes:
+            print(f"  {table + ':':<26} v1 {result.v1_table_bytes.get(table, 0) / mb:8.1f} MB"
+                  f"   v2 {result.v2_table_bytes[table] / mb:8.1f} MB")
+    print(f"Append 5 days (per ticker):  v1 {result.v1_append_ms:8.3f} ms   v2 {result.v2_append_ms:8.3f} ms")
+    print(f"Read 1 year (per ticker):    v1 {result.v1_range_read_ms:8.3f} ms   v2 {result.v2_range_read_ms:8.3f} ms")
+    print(f"Inline migration:            {result.inline_migration_seconds:8.2f} s (one transaction)")
+    print(f"Online migration:            {result.online_migration_seconds:8.2f} s "
+          f"(longest write transaction {result.online_longest_transaction_seconds * 1000:.0f} ms)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,86 @@
+from datetime import date
+import numpy as np
+import pandas as pd
+from src.application.use_cases.analyze_horizons import AnalyzeHorizonsUseCase, AnalyzeHorizonsRequest
+from src.application.use_cases.analyze_portfolio import AnalyzePortfolioUseCase, AnalyzePortfolioRequest
+from src.application.use_cases.analyze_ticker import AnalyzeTickerUseCase
+from src.domain.entities.portfolio import Portfolio
+from src.domain.entities.position import Position
+from src.domain.entities.ticker import Ticker
+
+
+class FakeMarketDataRepository:
+    """Serves random-walk prices, cut to the requested range, and counts loads."""
+
+    def __init__(self):
+        index = pd.bdate_range("2018-01-02", "2024-06-28")
+        rng = np.random.default_rng(3)
+        self.prices = {
+            symbol: pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index)))), index=index)
+            for symbol in ("AAPL", "MSFT", "LATE")
+        }
+        self.prices["LATE"] = self.prices["LATE"].loc["2022-01-03":]
+        self.benchmark = pd.Series(4000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index)))), index=index)
+        self.price_loads = 0
+
+    @staticmethod
+    def _cut(series, date_range):
+        return series.loc[str(date_range.start):str(date_range.end)]
+
+    def get_price_history(self, tickers, date_range):
+        self.price_loads += 1
+        return {ticker: self._cut(self.prices[ticker.symbol], date_range) for ticker in tickers}
+
+    get_price_history_batch = get_price_history
+
+    def get_dividend_history(self, ticker, date_range):
+        return pd.Series(dtype=float)
+
+    def get_dividend_history_batch(self, tickers, date_range):
+        return {ticker: pd.Series(dtype=float) for ticker in tickers}
+
+    def get_benchmark_data(self, benchmark_symbol, date_range):
+        return self._cut(self.benchmark, date_range)
+
+
+class TestAnalyzeHorizons:
+    def _setup(self):
+        repo = FakeMarketDataRepository()
+        portfolio_use_case = AnalyzePortfolioUseCase(repo)
+        ticker_use_case = AnalyzeTickerUseCase(repo)
+        portfolio = Portfolio([Position(Ticker("AAPL"), 10), Position(Ticker("MSFT"), 5), Position(Ticker("LATE"), 2)])
+        return repo, portfolio_use_case, ticker_use_case, portfolio
+
+    def test_all_horizons_from_one_load(self):
+        repo, portfolio_use_case, ticker_use_case, portfolio = self._setup()
+        use_case = AnalyzeHorizonsUseCase(repo, portfolio_use_case, ticker_use_case)
+
+        response = use_case.execute(AnalyzeHorizonsRequest(portfolio=portfolio, end_date=date(2024, 6, 28)))
+
+        assert response.success
+        assert repo.price_loads == 1
+        assert list(response.horizons) == ['1M', '3M', 'YTD', '1Y', '3Y', '5Y', 'MAX']
+        assert response.horizons['YTD'].date_range.start == date(2024, 1, 1)
+        assert response.horizons['5Y'].tickers_without_start_data == ["LATE"]
+        # MAX covers the history common to every ticker
+        assert response.horizons['MAX'].date_range.start == date(2022, 1, 3)
+        assert response.horizons['MAX'].tickers_without_start_data == []
+
+    def test_metrics_match_single_range_analysis(self):
+        repo, portfolio_use_case, ticker_use_case, portfolio = self._setup()
+        use_case = AnalyzeHorizonsUseCase(repo, portfolio_use_case, ticker_use_case)
+
+        response = use_case.execute(AnalyzeHorizonsRequest(
+            portfolio=portfolio, end_date=date(2024, 6, 28), horizons=('1Y', '5Y')
+        ))
+
+        for analysis in response.horizons.values():
+            single = portfolio_use_case.execute(AnalyzePortfolioRequest(portfolio=portfolio, date_range=analysis.date_range))
+            assert analysis.portfolio_metrics == single.metrics
+
+            prices = repo.get_price_history([Ticker("AAPL")], analysis.date_range)[Ticker("AAPL")]
+            expected = ticker_use_case._calculate_metrics(
+                Ticker("AAPL"), prices, pd.Series(dtype=float), 0.03, analysis.date_range,
+                repo.get_benchmark_data("^GSPC", analysis.date_range)
+            )
+            assert analysis.ticker_metrics[0] == expected
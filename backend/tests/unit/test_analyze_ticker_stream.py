@@ -0,0 +1,57 @@
+import numpy as np
+import pandas as pd
+from src.application.use_cases.analyze_ticker import (
+    AnalyzeTickerUseCase, AnalyzeTickersRequest, AnalyzeTickersResponse, TickerMetrics
+)
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+
+
+class FakeMarketDataRepository:
+    """Serves deterministic prices for every ticker except MISSING."""
+
+    def __init__(self):
+        self.index = pd.bdate_range("2024-01-02", periods=60)
+
+    def get_price_history_batch(self, tickers, date_range):
+        return {
+            ticker: pd.Series(100 + np.linspace(0, 10, len(self.index)) + i, index=self.index)
+            for i, ticker in enumerate(tickers) if ticker.symbol != "MISSING"
+        }
+
+    def get_dividend_history_batch(self, tickers, date_range):
+        return {ticker: pd.Series(dtype=float) for ticker in tickers}
+
+    def get_benchmark_data(self, benchmark_symbol, date_range):
+        return pd.Series(np.linspace(4000, 4200, len(self.index)), index=self.index)
+
+
+class TestAnalyzeTickerStream:
+    def _request(self, symbols):
+        return AnalyzeTickersRequest(
+            tickers=[Ticker(symbol) for symbol in symbols],
+            date_range=DateRange("2024-01-02", "2024-03-29")
+        )
+
+    def test_stream_yields_metrics_then_summary(self):
+        use_case = AnalyzeTickerUseCase(FakeMarketDataRepository())
+
+        items = list(use_case.execute_stream(self._request(["AAPL", "MSFT", "MISSING"])))
+
+        assert all(isinstance(item, TickerMetrics) for item in items[:-1])
+        assert {item.ticker.symbol for item in items[:-1]} == {"AAPL", "MSFT"}
+        summary = items[-1]
+        assert isinstance(summary, AnalyzeTickersResponse)
+        assert summary.success
+        assert summary.ticker_metrics == []
+        assert summary.missing_tickers == ["MISSING"]
+        assert summary.failed_tickers == ["MISSING"]
+
+    def test_batch_collects_streamed_metrics(self):
+        use_case = AnalyzeTickerUseCase(FakeMarketDataRepository())
+
+        response = use_case.execute_batch(self._request(["AAPL", "MSFT"]))
+
+        assert response.success
+        assert len(response.ticker_metrics) == 2
+        assert response.processing_time_seconds >= response.fetch_time_seconds
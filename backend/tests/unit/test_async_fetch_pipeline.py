@@ -0,0 +1,77 @@
+import threading
+import time
+import pandas as pd
+from src.infrastructure.services.async_fetch_pipeline import AsyncFetchPipeline
+from src.infrastructure.warehouse.corporate_actions import RawPriceHistory
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+
+
+class FakeYahooRepository:
+    """Records price batches and serves fixed data."""
+
+    def __init__(self):
+        self.price_batches = []
+
+    def get_raw_price_history(self, tickers, date_range):
+        self.price_batches.append([ticker.symbol for ticker in tickers])
+        index = pd.DatetimeIndex(["2024-01-02", "2024-01-03"])
+        return {ticker: RawPriceHistory(pd.Series([10.0, 11.0], index=index), pd.Series(dtype=float))
+                for ticker in tickers if ticker.symbol != "GONE"}
+
+    def get_dividend_history(self, ticker, date_range):
+        return pd.Series([0.5], index=pd.DatetimeIndex(["2024-01-03"]), name="Dividends")
+
+
+class TestAsyncFetchPipeline:
+    def test_bounds_concurrency_and_pipelines_writes(self):
+        pipeline = AsyncFetchPipeline(max_concurrency=2)
+        lock = threading.Lock()
+        in_flight = [0, 0]  # current, peak
+        stored = []
+
+        def fetch(item):
+            with lock:
+                in_flight[0] += 1
+                in_flight[1] = max(in_flight[1], in_flight[0])
+            time.sleep(0.01)
+            with lock:
+                in_flight[0] -= 1
+            if item == 3:
+                raise ConnectionError("boom")
+            return item * 10
+
+        results = list(pipeline.fetch_iter(range(6), fetch, lambda item, data: stored.append(item)))
+
+        assert in_flight[1] <= 2
+        assert dict(results) == {0: 0, 1: 10, 2: 20, 3: None, 4: 40, 5: 50}
+        assert sorted(stored) == [0, 1, 2, 4, 5]
+        assert pipeline.get_metrics()["pipeline_fetch_failures"] == 1
+
+    def test_usable_from_running_event_loop(self):
+        import asyncio
+        pipeline = AsyncFetchPipeline(max_concurrency=2)
+
+        async def handler():
+            return pipeline.fetch_all(["a", "b"], str.upper)
+
+        assert asyncio.run(handler()) == {"a": "A", "b": "B"}
+
+
+class TestWarehouseMissHandling:
+    def test_batch_fills_misses_and_persists(self, tmp_path):
+        service = WarehouseService(str(tmp_path / "warehouse.sqlite"))
+        service._yahoo_repo = FakeYahooRepository()
+        tickers = [Ticker("AAPL"), Ticker("MSFT"), Ticker("GONE")]
+        date_range = DateRange("2024-01-01", "2024-01-31")
+
+        prices = service.get_price_history_batch(tickers, date_range)
+        dividends = service.get_dividend_history_batch(tickers[:1], date_range)
+
+        assert service._yahoo_repo.price_batches == [["AAPL", "MSFT", "GONE"]]
+        assert len(prices[Ticker("AAPL")]) == 2
+        assert prices[Ticker("GONE")].empty
+        assert len(service.get_price_data(Ticker("MSFT"), date_range)) == 2
+        assert dividends[Ticker("AAPL")].sum() == 0.5
+        assert len(service.get_dividend_data(Ticker("AAPL"), date_range)) == 1
@@ -0,0 +1,33 @@
+import numpy as np
+import pytest
+from src.application.interfaces.metrics_color_service import LEVEL_CODES
+from src.infrastructure.color_metrics_service import ColorMetricsService
+
+METRICS = ["annualized_return", "volatility", "beta", "max_drawdown", "var_95", "sharpe_ratio",
+           "dividend_yield", "ulcer_index"]
+
+
+class TestColorMetricsService:
+    @pytest.mark.parametrize("context", ["portfolio", "ticker"])
+    def test_batch_levels_match_the_scalar_path(self, context):
+        service = ColorMetricsService()
+        thresholds = service._portfolio_thresholds if context == "portfolio" else service._ticker_thresholds
+        values = np.random.default_rng(3).normal(0, 40, (200, len(METRICS)))
+        # Exact thresholds, non-finite values and signed zeros on top of random values
+        edges = [thresholds.get(name, (0.0, 0.0)) for name in METRICS]
+        values[0], values[1] = [bad for bad, _ in edges], [excellent for _, excellent in edges]
+        values[2], values[3], values[4], values[5] = np.nan, np.inf, -np.inf, -0.0
+
+        codes = service.get_levels_for_metrics(METRICS, values, context)
+
+        assert codes.dtype == np.int8 and codes.shape == values.shape
+        expected = [[LEVEL_CODES[service.get_level_for_metric(name, value, context)]
+                     for name, value in zip(METRICS, row)] for row in values.tolist()]
+        assert codes.tolist() == expected
+
+    def test_shape_must_match_the_metric_names(self):
+        service = ColorMetricsService()
+
+        assert service.get_levels_for_metrics(METRICS, np.empty((0, len(METRICS)))).shape == (0, len(METRICS))
+        with pytest.raises(ValueError, match="matrix"):
+            service.get_levels_for_metrics(METRICS, np.zeros((3, 2)))
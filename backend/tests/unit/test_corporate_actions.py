@@ -0,0 +1,94 @@
+import sqlite3
+import pandas as pd
+import pytest
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.repositories.yfinance_market_repository import YFinanceMarketRepository
+from src.infrastructure.services.yahoo_fetch_client import YahooFetchClient
+from src.infrastructure.warehouse.keys import to_epoch_day
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+
+
+class FakeTransport:
+    """Yahoo-style download over [start, end): closes and dividends adjusted for every split up to today."""
+
+    def __init__(self):
+        self.downloads = []
+
+    def download(self, tickers, **kwargs):
+        self.downloads.append((list(tickers), kwargs))
+        daily = pd.DataFrame(
+            [[50.0, 0.0, 0.0], [50.0, 0.0, 0.0], [51.0, 1.0, 0.0], [52.0, 0.0, 2.0], [26.0, 0.0, 2.0]],
+            index=pd.DatetimeIndex(["2023-12-29", "2024-01-02", "2024-01-03", "2024-01-04", "2024-06-10"]),
+            columns=["Close", "Dividends", "Stock Splits"]
+        )
+        frame = daily[(daily.index >= pd.Timestamp(kwargs["start"])) & (daily.index < pd.Timestamp(kwargs["end"]))]
+        if kwargs.get("interval") == "1mo":
+            # Events land on their month's bar
+            frame = frame.groupby(frame.index.to_period("M").to_timestamp()).agg(
+                {"Close": "last", "Dividends": "sum", "Stock Splits": lambda splits: splits[splits > 0].prod()})
+        return pd.concat({ticker: frame for ticker in tickers}, axis=1)
+
+    def Ticker(self, symbol: str):
+        raise AssertionError("Split history comes from the batched download")
+
+
+def _prefix_rows(db_path: str) -> list:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("SELECT day, cum_log_return, cum_return FROM price_prefix_sums ORDER BY day").fetchall()
+
+
+class TestCorporateActions:
+    def test_split_adds_one_factor_row_and_keeps_stored_closes(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        service.store_price_data(Ticker("AAPL"), pd.Series(
+            [100.0, 102.0, 104.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"])
+        ))
+        before = _prefix_rows(db_path)
+        assert service.get_price_data(Ticker("AAPL"), JANUARY).tolist() == [100.0, 102.0, 104.0]
+
+        # 2-for-1 split on the 5th: one new close and one factor row
+        service.store_price_data(Ticker("AAPL"), pd.Series([53.0], index=pd.DatetimeIndex(["2024-01-05"])),
+                                 pd.Series([0.5], index=pd.DatetimeIndex(["2024-01-05"])))
+
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT day, factor FROM corporate_actions").fetchall() == [(to_epoch_day("2024-01-05"), 0.5)]
+            assert [row[0] for row in conn.execute("SELECT close_price FROM market_data ORDER BY day")] == [
+                100.0, 102.0, 104.0, 53.0
+            ]
+        adjusted = service.get_price_data(Ticker("AAPL"), JANUARY)
+        assert adjusted.tolist() == [50.0, 51.0, 52.0, 53.0]
+        pd.testing.assert_series_equal(service.get_price_history_batch([Ticker("AAPL")], JANUARY)[Ticker("AAPL")], adjusted)
+        # Prefix sums before the ex-date are untouched and returns across it are adjusted
+        assert _prefix_rows(db_path)[:3] == before
+        statistics = service.get_range_statistics([Ticker("AAPL")], JANUARY)[Ticker("AAPL")]
+        assert statistics.total_return == pytest.approx(6.0)
+
+    def test_raw_history_undoes_yahoo_split_adjustment(self, tmp_path):
+        transport = FakeTransport()
+        repo = YFinanceMarketRepository(YahooFetchClient(transport=transport))
+        date_range = DateRange("2024-01-02", "2024-01-05")
+
+        histories = repo.get_raw_price_history([Ticker("AAPL"), Ticker("MSFT")], date_range)
+        history = histories[Ticker("AAPL")]
+
+        # Daily bars stop at the range end; later splits come from one batched monthly request
+        (daily_symbols, daily), (later_symbols, later) = transport.downloads
+        assert daily_symbols == later_symbols == ["AAPL", "MSFT"]
+        assert pd.Timestamp(daily["end"]) == pd.Timestamp(later["start"]) == pd.Timestamp("2024-01-05")
+        assert "interval" not in daily and later["interval"] == "1mo"
+        assert pd.Timestamp(later["end"]) > pd.Timestamp.today()
+        assert histories[Ticker("MSFT")].closes.tolist() == history.closes.tolist()
+
+        # Splits on the 4th and, after the range, in June are undone
+        assert history.closes.tolist() == [200.0, 204.0, 104.0]
+        # The June factor is recorded when June is fetched
+        assert history.factors.index.strftime('%Y-%m-%d').tolist() == ["2024-01-03", "2024-01-04"]
+        assert history.factors.tolist() == pytest.approx([0.98, 0.5])
+
+        service = WarehouseService(str(tmp_path / "warehouse.sqlite"))
+        service.store_price_data(Ticker("AAPL"), history.closes, history.factors)
+        assert service.get_price_data(Ticker("AAPL"), date_range).tolist() == pytest.approx([98.0, 102.0, 104.0])
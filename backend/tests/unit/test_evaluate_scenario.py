@@ -0,0 +1,112 @@
+import numpy as np
+import pandas as pd
+import pytest
+from src.application.use_cases.analyze_portfolio import AnalyzePortfolioUseCase, AnalyzePortfolioRequest
+from src.application.use_cases.evaluate_scenario import EvaluateScenarioUseCase, EvaluateScenarioRequest, PositionChange
+from src.domain.entities.portfolio import Portfolio
+from src.domain.entities.position import Position
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+
+
+class FakeMarketDataRepository:
+    """Serves random-walk prices and quarterly dividends, and counts price loads."""
+
+    def __init__(self):
+        index = pd.bdate_range("2022-01-03", "2024-06-28")
+        rng = np.random.default_rng(8)
+        self.prices = {
+            symbol: pd.Series(100 * np.exp(np.cumsum(rng.normal(0.0003, 0.012, len(index)))), index=index)
+            for symbol in ("AAPL", "MSFT", "LATE", "NVDA")
+        }
+        self.prices["LATE"] = self.prices["LATE"].loc["2023-06-01":]
+        self.dividends = pd.Series(0.25, index=pd.date_range("2022-02-15", "2024-06-28", freq="QS-FEB"))
+        self.benchmark = pd.Series(4000 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index)))), index=index)
+        self.price_loads = 0
+
+    @staticmethod
+    def _cut(series, date_range):
+        return series.loc[str(date_range.start):str(date_range.end)]
+
+    def get_price_history(self, tickers, date_range):
+        self.price_loads += 1
+        return {ticker: self._cut(self.prices[ticker.symbol], date_range) for ticker in tickers}
+
+    def get_dividend_history(self, ticker, date_range):
+        if ticker.symbol == "MSFT":
+            return self._cut(self.dividends, date_range)
+        return pd.Series(dtype=float)
+
+    def get_benchmark_data(self, benchmark_symbol, date_range):
+        return self._cut(self.benchmark, date_range)
+
+
+def _assert_same_metrics(actual, expected):
+    for name in ("total_return", "annualized_return", "volatility", "max_drawdown", "var_95",
+                 "annualized_dividend_yield", "total_dividend_yield"):
+        assert float(getattr(actual, name).value) == pytest.approx(float(getattr(expected, name).value), rel=1e-9, abs=1e-9)
+    for name in ("start_value", "end_value", "end_value_analysis", "end_value_missing", "dividend_amount"):
+        assert float(getattr(actual, name).amount) == pytest.approx(float(getattr(expected, name).amount), rel=1e-9)
+    for name in ("sharpe_ratio", "sortino_ratio", "calmar_ratio", "beta"):
+        assert getattr(actual, name) == pytest.approx(getattr(expected, name), rel=1e-9)
+
+
+class TestEvaluateScenario:
+    date_range = DateRange("2023-01-03", "2024-06-28")
+
+    def _setup(self):
+        repo = FakeMarketDataRepository()
+        portfolio_use_case = AnalyzePortfolioUseCase(repo)
+        portfolio = Portfolio([Position(Ticker("AAPL"), 10), Position(Ticker("MSFT"), 5), Position(Ticker("LATE"), 2)])
+        return repo, portfolio_use_case, EvaluateScenarioUseCase(repo, portfolio_use_case), portfolio
+
+    def _full_analysis(self, portfolio_use_case, positions):
+        portfolio = Portfolio([Position(Ticker(symbol), quantity) for symbol, quantity in positions.items()])
+        response = portfolio_use_case.execute(AnalyzePortfolioRequest(portfolio=portfolio, date_range=self.date_range))
+        assert response.success
+        return response.metrics
+
+    def test_scenario_matches_full_recomputation(self):
+        repo, portfolio_use_case, use_case, portfolio = self._setup()
+        changes = [
+            PositionChange(Ticker("AAPL"), 15),
+            PositionChange(Ticker("LATE"), -2),
+            PositionChange(Ticker("NVDA"), 4)
+        ]
+
+        response = use_case.execute(EvaluateScenarioRequest(portfolio, self.date_range, changes))
+
+        assert response.success
+        assert response.quantities == {"AAPL": 25.0, "MSFT": 5.0, "LATE": 0.0, "NVDA": 4.0}
+        assert response.tickers_without_start_data == []
+        _assert_same_metrics(
+            response.scenario_metrics,
+            self._full_analysis(portfolio_use_case, {"AAPL": 25, "MSFT": 5, "NVDA": 4})
+        )
+        _assert_same_metrics(
+            response.baseline_metrics,
+            self._full_analysis(portfolio_use_case, {"AAPL": 10, "MSFT": 5, "LATE": 2})
+        )
+
+    def test_repeated_scenarios_reuse_cached_baseline(self):
+        repo, portfolio_use_case, use_case, portfolio = self._setup()
+
+        first = use_case.execute(EvaluateScenarioRequest(portfolio, self.date_range, [PositionChange(Ticker("MSFT"), 1)]))
+        loads = repo.price_loads
+        second = use_case.execute(EvaluateScenarioRequest(portfolio, self.date_range, [PositionChange(Ticker("MSFT"), 7)]))
+
+        assert not first.baseline_cached and second.baseline_cached
+        assert repo.price_loads == loads
+        assert second.tickers_without_start_data == ["LATE"]
+        _assert_same_metrics(
+            second.scenario_metrics,
+            self._full_analysis(portfolio_use_case, {"AAPL": 10, "MSFT": 12, "LATE": 2})
+        )
+
+    def test_overselling_fails(self):
+        _, _, use_case, portfolio = self._setup()
+
+        response = use_case.execute(EvaluateScenarioRequest(portfolio, self.date_range, [PositionChange(Ticker("AAPL"), -11)]))
+
+        assert not response.success
+        assert "AAPL" in response.message
@@ -0,0 +1,124 @@
+import io
+
+import numpy as np
+import pandas as pd
+import pytest
+from src.application.use_cases.load_ledger import LoadLedgerRequest, LoadLedgerUseCase
+from src.domain.entities.transaction_ledger import TransactionLedger
+from src.infrastructure.repositories.csv_transaction_repository import CsvTransactionRepository
+from src.infrastructure.services.holdings_engine import HoldingsEngine
+
+
+def _prices() -> pd.DataFrame:
+    index = pd.bdate_range("2024-01-01", periods=60)
+    rng = np.random.default_rng(4)
+    return pd.DataFrame({
+        symbol: 50 * np.exp(np.cumsum(rng.normal(0, 0.01, len(index))))
+        for symbol in ("AAA", "BBB", "CCC")
+    }, index=index)
+
+
+class TestTransactionLedger:
+    def test_oversell_is_reported_with_row(self):
+        with pytest.raises(ValueError, match="Sell at row 3 exceeds AAA holdings"):
+            TransactionLedger(
+                ["2024-01-02", "2024-01-05", "2024-01-04"],
+                ["AAA", "AAA", "aaa"],
+                [10, 5, -12],
+                [10.0, 11.0, 12.0]
+            )
+
+    def test_net_holdings_portfolio(self):
+        ledger = TransactionLedger(
+            ["2024-01-02", "2024-01-03", "2024-01-04"], ["AAA", "BBB", "AAA"], [10, 5, -10], [1.0, 2.0, 3.0]
+        )
+
+        portfolio = ledger.to_portfolio()
+
+        assert [ticker.symbol for ticker in portfolio.get_tickers()] == ["BBB"]
+
+
+class TestHoldingsEngine:
+    def test_matches_day_by_day_replay(self):
+        prices = _prices()
+        rng = np.random.default_rng(9)
+        # Buys first, then random trades that never sell more than held
+        dates = list(rng.choice(pd.date_range("2024-01-01", "2024-03-20"), 200))
+        symbols = list(rng.choice(["AAA", "BBB", "CCC"], 200))
+        quantities = list(rng.integers(1, 20, 200).astype(float))
+        for i in range(0, 200, 3):
+            quantities[i] = -min(quantities[i], 1.0)
+        dates = [pd.Timestamp("2023-12-29")] * 3 + dates
+        symbols = ["AAA", "BBB", "CCC"] + symbols
+        quantities = [500.0, 500.0, 500.0] + quantities
+        trade_prices = list(rng.uniform(40, 60, len(dates)))
+
+        ledger = TransactionLedger(np.array(dates, dtype='datetime64[D]'), symbols, quantities, trade_prices)
+        result = HoldingsEngine().calculate(ledger, prices)
+
+        # Reference: replay each trading day over every transaction
+        trading_days = prices.index
+        settle = trading_days[np.searchsorted(trading_days, pd.DatetimeIndex(dates))
+                              .clip(max=len(trading_days) - 1)]
+        in_range = pd.DatetimeIndex(dates) <= trading_days[-1]
+        for day_number, day in enumerate(trading_days):
+            held = {symbol: 0.0 for symbol in prices.columns}
+            flow = 0.0
+            for i in np.nonzero(in_range)[0]:
+                if settle[i] <= day:
+                    held[symbols[i]] += quantities[i]
+                if settle[i] == day:
+                    flow += quantities[i] * trade_prices[i]
+            value = sum(held[symbol] * prices.loc[day, symbol] for symbol in held)
+            assert result.values.iloc[day_number] == pytest.approx(value)
+            assert result.cash_flows.iloc[day_number] == pytest.approx(flow)
+
+        assert result.transactions_applied == int(in_range.sum())
+
+    def test_time_weighted_return_ignores_contributions(self):
+        index = pd.bdate_range("2024-01-01", periods=4)
+        prices = pd.DataFrame({"AAA": [10.0, 11.0, 12.1, 13.31]}, index=index)
+        # Doubling the position mid-way must not change the 10% daily return
+        ledger = TransactionLedger(
+            ["2024-01-01", "2024-01-03"], ["AAA", "AAA"], [100, 100], [10.0, 12.1]
+        )
+
+        result = HoldingsEngine().calculate(ledger, prices)
+
+        assert result.time_weighted_return == pytest.approx((1.1 ** 3 - 1) * 100)
+        assert result.net_invested == pytest.approx(1000 + 1210)
+        assert result.values.iloc[-1] == pytest.approx(200 * 13.31)
+
+
+class TestCsvTransactionRepository:
+    def test_invalid_values_report_first_bad_row(self, tmp_path):
+        path = tmp_path / "ledger.csv"
+        path.write_text("date,ticker,quantity,price\n2024-01-02,AAPL,10,150\n2024-01-03,MSFT,abc,300\n2024-01-04,MSFT,5,x\n")
+
+        with pytest.raises(ValueError, match="Invalid quantity at row 2: abc"):
+            CsvTransactionRepository().load(str(path))
+
+    def test_round_trip(self, tmp_path):
+        path = tmp_path / "ledger.csv"
+        path.write_text("Date,Ticker,Quantity,Price\n2024-01-02,BRK.B,10,350.5\n2024-01-05,aapl,3,190\n")
+        repository = CsvTransactionRepository()
+
+        ledger = repository.load(str(path))
+        repository.save(ledger, str(tmp_path / "saved.csv"))
+        reloaded = repository.load(str(tmp_path / "saved.csv"))
+
+        assert ledger.unique_symbols == ["AAPL", "BRK-B"]
+        assert np.array_equal(reloaded.dates, ledger.dates)
+        assert list(reloaded.symbols) == list(ledger.symbols)
+        assert np.allclose(reloaded.quantities, [10, 3])
+
+    def test_uploads_are_read_from_the_stream(self, tmp_path):
+        # The upload name only labels the request; no file is opened or written under it
+        stream = io.BytesIO(b"date,ticker,quantity,price\n2024-01-02,AAPL,10,150\n2024-01-03,MSFT,4,300\n")
+        request = LoadLedgerRequest(file_path=str(tmp_path / "../../etc/ledger.csv"), stream=stream)
+
+        response = LoadLedgerUseCase(CsvTransactionRepository()).execute(request)
+
+        assert response.success
+        assert response.ledger.unique_symbols == ["AAPL", "MSFT"]
+        assert not (tmp_path / "../../etc/ledger.csv").exists()
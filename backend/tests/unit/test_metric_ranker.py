@@ -0,0 +1,72 @@
+from types import SimpleNamespace
+
+import numpy as np
+from src.application.use_cases.compare_tickers import CompareTickersUseCase
+from src.infrastructure.services.metric_ranker import MetricRanker, RankedMetric
+
+RANKER = MetricRanker([
+    RankedMetric("return", "annualized_return"),
+    RankedMetric("risk", "volatility", higher_is_better=False),
+    RankedMetric("correlation", "correlation_to_portfolio", higher_is_better=False, absolute=True),
+])
+
+
+def _items(count, seed=1):
+    # Rounded values so ties are common
+    rng = np.random.default_rng(seed)
+    return [SimpleNamespace(symbol=f"T{index}", annualized_return=SimpleNamespace(value=value),
+                            volatility=SimpleNamespace(value=risk), correlation_to_portfolio=correlation)
+            for index, (value, risk, correlation) in enumerate(rng.integers(-5, 6, (count, 3)).astype(float))]
+
+
+def _metric_value(metric, item) -> float:
+    value = getattr(item, metric.attribute)
+    value = float(value.value if hasattr(value, 'value') else value)
+    return abs(value) if metric.absolute else value
+
+
+def _sorted_indices(items, metric, reverse):
+    return sorted(range(len(items)), key=lambda index: _metric_value(metric, items[index]), reverse=reverse)
+
+
+class TestMetricRanker:
+    def test_leaderboards_match_a_stable_sort_including_ties(self):
+        items = _items(300)
+
+        for k in (1, 5, 299, 300, 1000):
+            rankings = RANKER.rank(items, k)
+            for metric in RANKER.metrics:
+                best = _sorted_indices(items, metric, metric.higher_is_better)[:k]
+                worst = _sorted_indices(items, metric, not metric.higher_is_better)[:k]
+                assert rankings[metric.name].best == best
+                assert rankings[metric.name].worst == worst
+
+    def test_nan_is_never_ranked_and_empty_input_ranks_nothing(self):
+        items = _items(4)
+        items[0].annualized_return.value = np.nan
+        items[2].annualized_return.value = np.nan
+
+        rankings = RANKER.rank(items, 3)
+
+        assert sorted(rankings["return"].best) == [1, 3]
+        assert sorted(rankings["return"].worst) == [1, 3]
+        assert len(rankings["risk"].best) == 3
+        assert RANKER.rank([], 5)["risk"].best == []
+
+    def test_comparison_picks_every_best_and_worst_in_one_pass(self):
+        metrics = [SimpleNamespace(ticker=SimpleNamespace(symbol=symbol), annualized_return=SimpleNamespace(value=ret),
+                                   volatility=SimpleNamespace(value=vol), max_drawdown=SimpleNamespace(value=-vol),
+                                   sharpe_ratio=ret / vol, calmar_ratio=ret, sortino_ratio=ret, ulcer_index=vol,
+                                   time_under_water=vol, cvar_95=-vol, correlation_to_portfolio=correlation,
+                                   risk_contribution_percent=vol)
+                   for symbol, ret, vol, correlation in [("KO", 5.0, 10.0, -0.9), ("MSFT", 20.0, 25.0, 0.5),
+                                                         ("AAPL", 15.0, 30.0, 0.2)]]
+
+        comparison = CompareTickersUseCase(analyze_ticker_use_case=None)._create_comparison(metrics)
+
+        assert [metric.ticker.symbol for metric in comparison.metrics] == ["AAPL", "KO", "MSFT"]
+        assert (comparison.best_performer.ticker.symbol, comparison.worst_performer.ticker.symbol) == ("MSFT", "KO")
+        assert comparison.lowest_risk.ticker.symbol == "KO"
+        assert comparison.best_max_drawdown.ticker.symbol == "KO"
+        assert (comparison.best_cvar.ticker.symbol, comparison.worst_cvar.ticker.symbol) == ("AAPL", "KO")
+        assert (comparison.best_correlation.ticker.symbol, comparison.worst_correlation.ticker.symbol) == ("AAPL", "KO")
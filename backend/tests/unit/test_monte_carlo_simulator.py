@@ -0,0 +1,59 @@
+import numpy as np
+import pytest
+from src.infrastructure.services.monte_carlo_simulator import MonteCarloSimulator
+
+
+def _history(days: int = 500, assets: int = 3) -> np.ndarray:
+    rng = np.random.default_rng(5)
+    return rng.normal(0.0004, 0.01, (days, assets))
+
+
+class TestMonteCarloSimulator:
+    def test_same_seed_reproduces_results(self):
+        simulator = MonteCarloSimulator()
+        history, values = _history(), np.array([100.0, 200.0, 50.0])
+
+        first = simulator.simulate(history, values, paths=2000, steps=30, method='mvn', seed=42)
+        second = simulator.simulate(history, values, paths=2000, steps=30, method='mvn', seed=42)
+
+        assert first.var == second.var
+        assert np.array_equal(first.fan_chart, second.fan_chart)
+
+    def test_bootstrap_of_constant_returns_is_deterministic(self):
+        history = np.full((50, 2), np.log(1.001))
+
+        result = MonteCarloSimulator().simulate(history, np.array([60.0, 40.0]), paths=500, steps=100, seed=1)
+
+        assert result.fan_chart.shape == (5, 101)
+        assert np.allclose(result.fan_chart[:, -1], 100 * 1.001 ** 100, rtol=1e-5)
+        assert result.var[0.95] == pytest.approx((1.001 ** 100 - 1) * 100, rel=1e-4)
+
+    def test_mvn_var_matches_lognormal_quantile(self):
+        mu, sigma, steps = 0.0003, 0.012, 252
+        rng = np.random.default_rng(9)
+        history = rng.normal(mu, sigma, (5000, 1))
+
+        result = MonteCarloSimulator(dtype=np.float64).simulate(
+            history, np.array([100.0]), paths=40000, steps=steps, method='mvn', seed=7
+        )
+
+        horizon_mu, horizon_sigma = history.mean() * steps, history.std(ddof=1) * np.sqrt(steps)
+        expected_var = (np.exp(horizon_mu - 1.6448536 * horizon_sigma) - 1) * 100
+        assert result.var[0.95] == pytest.approx(expected_var, abs=0.5)
+        assert result.expected_shortfall[0.95] < result.var[0.95]
+
+    def test_small_memory_cap_uses_more_chunks(self):
+        history, values = _history(assets=50), np.full(50, 10.0)
+        simulator = MonteCarloSimulator(memory_limit_bytes=4 * 1024 * 1024)
+
+        chunk_paths, block_steps = simulator._chunk_shape(5000, 63, 50)
+        result = simulator.simulate(history, values, paths=5000, steps=63, seed=3)
+
+        assert chunk_paths < 5000 and block_steps == 21
+        assert result.fan_chart[0, -1] < result.fan_chart[2, -1] < result.fan_chart[4, -1]
+
+    def test_rejects_requests_over_memory_cap(self):
+        simulator = MonteCarloSimulator(memory_limit_bytes=1024 * 1024)
+
+        with pytest.raises(ValueError, match="too small"):
+            simulator.simulate(_history(), np.ones(3), paths=100000, steps=252)
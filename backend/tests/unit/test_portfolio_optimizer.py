@@ -0,0 +1,78 @@
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+from src.infrastructure.services.portfolio_optimizer import PortfolioOptimizer
+
+
+def _uncorrelated_returns(volatilities, means, days: int = 4000) -> np.ndarray:
+    """Exactly uncorrelated returns with the given daily means and volatilities."""
+    rng = np.random.default_rng(3)
+    noise = rng.standard_normal((days, len(volatilities)))
+    noise -= noise.mean(axis=0)
+    # Whiten so the sample covariance is exactly diagonal
+    q, _ = np.linalg.qr(noise)
+    return q * np.sqrt(days) * np.array(volatilities) + np.array(means)
+
+
+class TestPortfolioOptimizer:
+    def test_closed_form_weights_for_uncorrelated_assets(self):
+        volatilities = np.array([0.01, 0.02, 0.03])
+        means = np.array([0.0004, 0.0006, 0.0008])
+        returns = _uncorrelated_returns(volatilities, means)
+
+        result = PortfolioOptimizer().optimize(returns, risk_free_rate=0.0, frontier_points=0, shrinkage=False)
+
+        inverse_variance = 1 / volatilities ** 2
+        assert np.allclose(result.min_variance.weights, inverse_variance / inverse_variance.sum(), atol=1e-6)
+        tangency = means / volatilities ** 2
+        assert np.allclose(result.max_sharpe.weights, tangency / tangency.sum(), atol=1e-4)
+        inverse_volatility = 1 / volatilities
+        assert np.allclose(result.risk_parity.weights, inverse_volatility / inverse_volatility.sum(), atol=1e-8)
+        assert np.allclose(result.risk_parity.risk_contributions, 1 / 3)
+
+    def test_frontier_is_long_only_and_monotone(self):
+        rng = np.random.default_rng(11)
+        market = rng.normal(0.0004, 0.01, (750, 1))
+        returns = market * rng.uniform(0.5, 1.5, 40) + rng.normal(0.0002, 0.015, (750, 40))
+
+        result = PortfolioOptimizer().optimize(returns, frontier_points=15)
+
+        weights = np.array([point.weights for point in result.frontier])
+        assert weights.shape == (15, 40)
+        assert np.all(weights >= 0)
+        assert np.allclose(weights.sum(axis=1), 1)
+
+        expected_returns = [point.expected_return for point in result.frontier]
+        volatilities = [point.volatility for point in result.frontier]
+        assert np.all(np.diff(expected_returns) >= -1e-6)
+        assert np.all(np.diff(volatilities) >= -1e-6)
+        assert result.frontier[0].volatility == pytest.approx(result.min_variance.volatility)
+        assert result.max_sharpe.sharpe_ratio >= max(point.sharpe_ratio for point in result.frontier) - 1e-6
+
+    def test_ledoit_wolf_shrinks_towards_scaled_identity(self):
+        rng = np.random.default_rng(2)
+        returns = rng.normal(0, 0.01, (60, 30))
+
+        shrunk, intensity = PortfolioOptimizer.ledoit_wolf(returns)
+
+        centered = returns - returns.mean(axis=0)
+        sample = centered.T @ centered / len(returns)
+        target = np.trace(sample) / 30 * np.eye(30)
+        assert 0 < intensity <= 1
+        assert np.allclose(shrunk, (1 - intensity) * sample + intensity * target)
+        # Few observations per asset: shrinkage should be strong and the estimate well conditioned
+        assert intensity > 0.5
+        assert np.linalg.cond(shrunk) < np.linalg.cond(sample)
+
+    def test_iteration_counts_are_per_call_on_a_shared_optimizer(self):
+        rng = np.random.default_rng(5)
+        inputs = [rng.normal(0.0004, 0.01, (250, assets)) for assets in (5, 20, 40, 5, 20, 40)]
+        optimizer = PortfolioOptimizer()
+        expected = [optimizer.optimize(returns, frontier_points=5).iterations for returns in inputs]
+
+        with ThreadPoolExecutor(max_workers=len(inputs)) as pool:
+            concurrent = list(pool.map(lambda returns: optimizer.optimize(returns, frontier_points=5).iterations, inputs))
+
+        assert all(count > 0 for count in expected)
+        assert concurrent == expected
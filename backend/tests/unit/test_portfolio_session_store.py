@@ -0,0 +1,65 @@
+import numpy as np
+import pytest
+from src.domain.entities.portfolio import Portfolio
+from src.domain.entities.position import Position
+from src.domain.entities.ticker import Ticker
+from src.domain.entities.transaction_ledger import TransactionLedger
+from src.infrastructure.services.portfolio_session_store import PortfolioSessionStore
+
+
+def _portfolio(**quantities) -> Portfolio:
+    return Portfolio([Position(Ticker(symbol), quantity) for symbol, quantity in quantities.items()])
+
+
+def _holdings(portfolio: Portfolio) -> dict:
+    return {position.ticker.symbol: float(position.quantity) for position in portfolio.get_positions()}
+
+
+class TestPortfolioSessionStore:
+    def test_round_trip_with_ledger_across_workers(self, tmp_path):
+        db_path = str(tmp_path / "sessions.sqlite")
+        ledger = TransactionLedger(
+            ["2024-01-02", "2024-02-01", "2024-03-01"], ["AAPL", "BRK-B", "AAPL"], [10, 2.5, -4], [150.0, 350.0, 170.0]
+        )
+        PortfolioSessionStore(db_path).save("alpha", ledger.to_portfolio(), ledger)
+        PortfolioSessionStore(db_path).save("beta", _portfolio(MSFT=3))
+
+        # A second process opening the same table sees both portfolios
+        other_worker = PortfolioSessionStore(db_path)
+        reloaded = other_worker.get_ledger("alpha")
+
+        assert _holdings(other_worker.get_portfolio("alpha")) == {"AAPL": 6.0, "BRK-B": 2.5}
+        assert _holdings(other_worker.get_portfolio("beta")) == {"MSFT": 3.0}
+        assert other_worker.get_ledger("beta") is None
+        assert np.array_equal(reloaded.dates, ledger.dates)
+        assert list(reloaded.symbols) == list(ledger.symbols)
+        assert np.array_equal(reloaded.quantities, ledger.quantities)
+        assert sorted(other_worker.list_ids()) == ["alpha", "beta"]
+
+    def test_cached_copy_is_refreshed_after_another_worker_writes(self, tmp_path):
+        db_path = str(tmp_path / "sessions.sqlite")
+        first, second = PortfolioSessionStore(db_path), PortfolioSessionStore(db_path)
+        first.save("shared", _portfolio(AAPL=1))
+        assert _holdings(second.get_portfolio("shared")) == {"AAPL": 1.0}
+
+        first.save("shared", _portfolio(AAPL=2, MSFT=1))
+        assert _holdings(second.get_portfolio("shared")) == {"AAPL": 2.0, "MSFT": 1.0}
+
+        first.delete("shared")
+        assert second.get_portfolio("shared") is None
+
+    def test_least_recently_used_sessions_are_evicted_from_memory(self, tmp_path):
+        store = PortfolioSessionStore(str(tmp_path / "sessions.sqlite"), cache_size=2)
+        for index, portfolio_id in enumerate(["a", "b", "c"]):
+            store.save(portfolio_id, _portfolio(AAPL=index + 1))
+
+        assert store.cached_count == 2
+        # Evicted sessions are still served from SQLite
+        assert _holdings(store.get_portfolio("a")) == {"AAPL": 1.0}
+        assert store.cached_count == 2
+
+    def test_invalid_id_is_rejected(self, tmp_path):
+        store = PortfolioSessionStore(str(tmp_path / "sessions.sqlite"))
+
+        with pytest.raises(ValueError, match="Invalid portfolio ID"):
+            store.save("../etc", _portfolio(AAPL=1))
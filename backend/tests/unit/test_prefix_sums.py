@@ -0,0 +1,75 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from src.infrastructure.warehouse.keys import ensure_symbol_id, to_epoch_day, to_epoch_days
+from src.infrastructure.warehouse.migrations import migrate
+from src.infrastructure.warehouse.prefix_sums import PrefixSumIndex
+
+
+def _connection() -> sqlite3.Connection:
+    conn = sqlite3.connect(":memory:")
+    migrate(conn)
+    return conn
+
+
+def _store_prices(conn, index: PrefixSumIndex, symbol: str, prices: pd.Series) -> None:
+    symbol_id, days = ensure_symbol_id(conn, symbol), to_epoch_days(prices.index)
+    conn.executemany("INSERT OR REPLACE INTO market_data VALUES (?, ?, ?, 0)",
+                     zip([symbol_id] * len(days), days.tolist(), prices.tolist()))
+    index.update_prices(conn, symbol_id, int(days.min()))
+
+
+def _prices() -> pd.Series:
+    dates = pd.bdate_range("2023-01-02", periods=400)
+    rng = np.random.default_rng(11)
+    return pd.Series(100 * np.exp(np.cumsum(rng.normal(0, 0.012, len(dates)))), index=dates)
+
+
+class TestPrefixSumIndex:
+    def test_range_statistics_match_full_scan(self):
+        conn, index, prices = _connection(), PrefixSumIndex(), _prices()
+        _store_prices(conn, index, "AAPL", prices)
+
+        stats = index.get_range_statistics(conn, ["AAPL"], "2023-03-04", "2023-11-15")["AAPL"]
+
+        window = prices.loc["2023-03-04":"2023-11-15"]
+        returns = window.pct_change().dropna()
+        assert stats.start_date == window.index[0].strftime('%Y-%m-%d')
+        assert stats.trading_days == len(window)
+        assert abs(stats.total_return - (window.iloc[-1] / window.iloc[0] - 1) * 100) < 1e-9
+        assert abs(stats.annualized_return - ((window.iloc[-1] / window.iloc[0]) ** (252 / len(window)) - 1) * 100) < 1e-9
+        assert abs(stats.volatility - returns.std() * np.sqrt(252) * 100) < 1e-8
+
+    def test_appends_and_backfills_match_full_rebuild(self):
+        conn, index, prices = _connection(), PrefixSumIndex(), _prices()
+
+        # Middle first, then an append, then a backfill before the first stored day
+        _store_prices(conn, index, "AAPL", prices.iloc[100:250])
+        _store_prices(conn, index, "AAPL", prices.iloc[250:])
+        _store_prices(conn, index, "AAPL", prices.iloc[:100])
+        incremental = conn.execute("SELECT * FROM price_prefix_sums ORDER BY day").fetchall()
+
+        index.update_prices(conn, ensure_symbol_id(conn, "AAPL"))
+        rebuilt = conn.execute("SELECT * FROM price_prefix_sums ORDER BY day").fetchall()
+
+        assert len(incremental) == len(prices)
+        assert [row[:4] for row in incremental] == [row[:4] for row in rebuilt]
+        assert np.allclose([row[4:] for row in incremental], [row[4:] for row in rebuilt])
+
+    def test_dividend_sums_and_schema_backfill(self):
+        conn, index = _connection(), PrefixSumIndex()
+        symbol_id = ensure_symbol_id(conn, "KO")
+        conn.executemany("INSERT INTO dividend_data VALUES (?, ?, ?, 0)", [
+            (symbol_id, to_epoch_day(date), 0.46) for date in ("2023-03-15", "2023-06-15", "2023-09-15", "2023-12-15")
+        ])
+        conn.executemany("INSERT INTO market_data VALUES (?, ?, ?, 0)", [
+            (symbol_id, to_epoch_day("2023-03-01"), 60.0), (symbol_id, to_epoch_day("2023-12-29"), 62.0)
+        ])
+
+        # Rows stored without prefix sums are indexed by the backfill
+        index.backfill(conn)
+        stats = index.get_range_statistics(conn, ["KO", "NONE"], "2023-06-15", "2023-12-29")
+
+        assert list(stats) == []  # Only one KO close in range
+        assert abs(index._dividend_total(conn, symbol_id, to_epoch_day("2023-06-15"), to_epoch_day("2023-09-30")) - 0.92) < 1e-12
+        assert index._dividend_total(conn, symbol_id, to_epoch_day("2024-01-01"), to_epoch_day("2024-12-31")) == 0.0
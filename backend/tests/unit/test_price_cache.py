@@ -0,0 +1,125 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.keys import to_epoch_day
+from src.infrastructure.warehouse.price_cache import ENTRY_OVERHEAD_BYTES, PriceCache
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+
+
+def _warehouse(db_path: str) -> WarehouseService:
+    service = WarehouseService(db_path)
+    service.store_price_data(Ticker("AAPL"), pd.Series(
+        [100.0, 101.0, 102.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"])
+    ))
+    service.store_price_data(Ticker("KO"), pd.Series([60.0, 61.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"])))
+    return service
+
+
+def _get(cache: PriceCache, db_path: str, symbols, date_range: DateRange = JANUARY):
+    with sqlite3.connect(db_path) as conn:
+        return cache.get_many(conn, symbols, to_epoch_day(date_range.start), to_epoch_day(date_range.end), 'Close')
+
+
+class TestPriceCache:
+    def test_ranges_are_sliced_from_cached_arrays(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        _warehouse(db_path)
+        cache = PriceCache(1024 * 1024)
+
+        first = _get(cache, db_path, ["AAPL", "KO", "MSFT"])
+        later = _get(cache, db_path, ["AAPL"], DateRange("2024-01-03", "2024-01-31"))["AAPL"]
+
+        assert first["AAPL"].tolist() == [100.0, 101.0, 102.0]
+        assert first["MSFT"].empty and first["MSFT"].dtype == 'float64'
+        assert later.tolist() == [101.0, 102.0]
+        assert np.shares_memory(later.to_numpy(), first["AAPL"].to_numpy())
+        assert not later.to_numpy().flags.writeable
+        stats = cache.stats()
+        assert (stats["price_cache_hits"], stats["price_cache_misses"], stats["price_cache_entries"]) == (1, 3, 2)
+        assert stats["price_cache_resident_bytes"] == 5 * 16 + 2 * ENTRY_OVERHEAD_BYTES
+
+    def test_service_reads_match_sqlite_and_writes_go_through(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = _warehouse(db_path)
+        cache = service._warehouse_optimizer.price_cache
+        cache.invalidate()
+
+        expected = service._warehouse_optimizer._get_history([Ticker("AAPL"), Ticker("KO")], JANUARY,
+                                                             "market_data", "close_price", 'Close')
+        pd.testing.assert_series_equal(service.get_price_data(Ticker("AAPL"), JANUARY), expected[Ticker("AAPL")])
+        pd.testing.assert_series_equal(service.get_price_history_batch([Ticker("KO")], JANUARY)[Ticker("KO")],
+                                       expected[Ticker("KO")])
+        pd.testing.assert_series_equal(service.get_price_data(Ticker("AAPL"), DateRange("2023-01-01", "2023-12-31")),
+                                       pd.Series(dtype='float64', name='Close'))
+
+        # An append extends the cached arrays; a rewrite of an earlier day drops them
+        held = service.get_price_data(Ticker("AAPL"), JANUARY)
+        service.store_price_data(Ticker("AAPL"), pd.Series([103.0], index=pd.DatetimeIndex(["2024-01-05"])))
+        assert "AAPL" in cache._entries
+        assert service.get_price_data(Ticker("AAPL"), JANUARY).tolist() == [100.0, 101.0, 102.0, 103.0]
+        assert held.tolist() == [100.0, 101.0, 102.0]
+        service.store_price_data(Ticker("AAPL"), pd.Series([99.0], index=pd.DatetimeIndex(["2024-01-02"])))
+        assert "AAPL" not in cache._entries
+        assert service.get_price_data(Ticker("AAPL"), JANUARY).tolist() == [99.0, 101.0, 102.0, 103.0]
+
+        service.clear_data(Ticker("AAPL"))
+        assert service.get_price_data(Ticker("AAPL"), JANUARY).empty
+
+    def test_writes_from_another_process_are_picked_up(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        _warehouse(db_path)
+        cache = PriceCache(1024 * 1024)
+        _get(cache, db_path, ["AAPL", "KO"])
+
+        # Writes through another service's cache reach this one only through SQLite
+        other = WarehouseService(db_path)
+        other.store_price_data(Ticker("AAPL"), pd.Series([103.0], index=pd.DatetimeIndex(["2024-01-05"])))
+        other.store_price_data(Ticker("KO"), pd.Series([59.0], index=pd.DatetimeIndex(["2024-01-02"])))
+        prices = _get(cache, db_path, ["AAPL", "KO"])
+
+        assert prices["AAPL"].tolist() == [100.0, 101.0, 102.0, 103.0]
+        assert prices["KO"].tolist() == [59.0, 61.0]
+        assert cache.stats()["price_cache_misses"] == 3  # KO was rewritten and reloaded
+
+    def test_clears_in_one_process_reach_every_other_cache(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = _warehouse(db_path)
+        first, second = PriceCache(1024 * 1024), PriceCache(1024 * 1024)
+        _get(first, db_path, ["AAPL", "KO"])
+        _get(second, db_path, ["AAPL", "KO"])
+
+        service.clear_data(Ticker("AAPL"))
+        assert _get(first, db_path, ["AAPL"])["AAPL"].empty
+        # Rows written after a clear are not appended to the deleted ones
+        service.store_price_data(Ticker("AAPL"), pd.Series([103.0], index=pd.DatetimeIndex(["2024-01-05"])))
+        assert _get(second, db_path, ["AAPL"])["AAPL"].tolist() == [103.0]
+        assert _get(first, db_path, ["AAPL"])["AAPL"].tolist() == [103.0]
+
+        service.clear_data()
+        service.store_price_data(Ticker("KO"), pd.Series([62.0], index=pd.DatetimeIndex(["2024-01-02"])))
+        for cache in (first, second):
+            prices = _get(cache, db_path, ["AAPL", "KO"])
+            assert prices["AAPL"].empty and prices["KO"].tolist() == [62.0]
+
+    def test_least_recently_used_entries_are_evicted_by_bytes(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = _warehouse(db_path)
+        service.store_price_data(Ticker("MSFT"), pd.Series(
+            [370.0, 371.0, 372.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"])
+        ))
+        # Room for two three-row entries
+        cache = PriceCache(2 * (3 * 16 + ENTRY_OVERHEAD_BYTES))
+        _get(cache, db_path, ["AAPL", "KO"])
+        _get(cache, db_path, ["AAPL"])
+        _get(cache, db_path, ["MSFT"])
+
+        stats = cache.stats()
+        assert list(cache._entries) == ["AAPL", "MSFT"]
+        assert stats["price_cache_evictions"] == 1
+        assert stats["price_cache_resident_bytes"] == cache.max_bytes
+        # Entries larger than the whole budget are served but not kept
+        assert _get(PriceCache(100), db_path, ["AAPL"])["AAPL"].tolist() == [100.0, 101.0, 102.0]
@@ -0,0 +1,57 @@
+import pandas as pd
+from src.infrastructure.services.quote_service import QuoteService
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.money import Money
+
+
+class FakeClock:
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakePriceSource:
+    """Live price source that only knows some symbols."""
+
+    def __init__(self, prices):
+        self.prices = prices
+        self.calls = []
+
+    def get_current_prices(self, tickers):
+        self.calls.append([ticker.symbol for ticker in tickers])
+        return {ticker: Money(self.prices[ticker.symbol]) for ticker in tickers if ticker.symbol in self.prices}
+
+
+class TestQuoteService:
+    def test_cached_quotes_skip_source_until_ttl_expires(self):
+        clock = FakeClock()
+        source = FakePriceSource({"AAPL": 190.0, "MSFT": 410.0})
+        service = QuoteService(source, ttl_seconds=30.0, clock=clock)
+        tickers = [Ticker("AAPL"), Ticker("MSFT")]
+
+        service.get_current_prices(tickers)
+        prices = service.get_current_prices(tickers)
+
+        assert source.calls == [["AAPL", "MSFT"]]
+        assert prices[Ticker("AAPL")] == Money(190.0)
+        assert service.get_metrics()["quote_cache_hits"] == 2
+
+        clock.now += 30.0
+        service.get_current_prices(tickers)
+        assert len(source.calls) == 2
+
+    def test_falls_back_to_warehouse_last_close(self, tmp_path):
+        warehouse = WarehouseService(str(tmp_path / "warehouse.sqlite"))
+        closes = pd.Series([50.0, 52.5], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"]))
+        warehouse.store_price_data(Ticker("XYZ"), closes)
+        source = FakePriceSource({"AAPL": 190.0})
+        service = QuoteService(source, warehouse_service=warehouse, clock=FakeClock())
+
+        prices = service.get_current_prices([Ticker("AAPL"), Ticker("XYZ"), Ticker("NONE")])
+
+        assert prices[Ticker("XYZ")] == Money(52.5)
+        assert Ticker("NONE") not in prices
+        assert service.get_metrics()["quote_fallbacks"] == 1
@@ -0,0 +1,63 @@
+import numpy as np
+import pandas as pd
+from src.infrastructure.services.rolling_metrics_calculator import RollingMetricsCalculator
+
+
+def _returns(rows: int = 300) -> pd.DataFrame:
+    index = pd.bdate_range("2022-01-03", periods=rows)
+    rng = np.random.default_rng(7)
+    returns = pd.DataFrame(rng.normal(0.0005, 0.015, (rows, 3)), index=index, columns=["AAPL", "MSFT", "NEW"])
+    returns.iloc[:40, 2] = np.nan  # Late listing
+    return returns
+
+
+def _naive_max_drawdown(window_returns: pd.Series) -> float:
+    wealth = np.concatenate([[1.0], np.cumprod(1 + window_returns.to_numpy())])
+    return float(np.min(wealth / np.maximum.accumulate(wealth) - 1) * 100)
+
+
+class TestRollingMetricsCalculator:
+    def test_moments_match_pandas_rolling(self):
+        returns = _returns()
+
+        metrics = RollingMetricsCalculator.calculate(returns, [20, 63], risk_free_rate=0.03)
+
+        for window in (20, 63):
+            rolling = returns.rolling(window)
+            expected_volatility = rolling.std() * np.sqrt(252) * 100
+            expected_sharpe = np.sqrt(252) * (rolling.mean() - 0.03 / 252) / rolling.std()
+
+            pd.testing.assert_frame_equal(metrics[window]['volatility'], expected_volatility, atol=1e-8)
+            pd.testing.assert_frame_equal(metrics[window]['sharpe_ratio'], expected_sharpe, atol=1e-8)
+
+    def test_late_listing_is_nan_until_window_is_full(self):
+        metrics = RollingMetricsCalculator.calculate(_returns(), [20])
+
+        volatility = metrics[20]['volatility']['NEW']
+        assert volatility.iloc[:59].isna().all()
+        assert volatility.iloc[59:].notna().all()
+
+    def test_max_drawdown_matches_brute_force(self):
+        returns = _returns()
+
+        for window in (5, 20, 63):
+            drawdown = RollingMetricsCalculator.calculate(returns, [window])[window]['max_drawdown']
+            for row in range(window - 1, len(returns), 7):
+                expected = _naive_max_drawdown(returns['AAPL'].iloc[row - window + 1:row + 1])
+                assert abs(drawdown['AAPL'].iloc[row] - expected) < 1e-9
+
+    def test_beta_matches_rolling_covariance(self):
+        returns = _returns()
+        benchmark = returns['MSFT'] * 0.5 + 0.001
+
+        beta = RollingMetricsCalculator.calculate(returns, [63], benchmark_returns=benchmark)[63]['beta']
+
+        expected = returns['AAPL'].rolling(63).cov(benchmark) / benchmark.rolling(63).var()
+        pd.testing.assert_series_equal(beta['AAPL'], expected, atol=1e-8, check_names=False)
+        assert np.allclose(beta['MSFT'].dropna(), 2.0)
+
+    def test_window_longer_than_history_is_all_nan(self):
+        metrics = RollingMetricsCalculator.calculate(_returns(30), [63])
+
+        for frame in metrics[63].values():
+            assert frame.isna().all().all()
@@ -0,0 +1,55 @@
+import json
+from decimal import Decimal
+import numpy as np
+import pandas as pd
+import pytest
+from src.infrastructure.utils import serialization
+from src.infrastructure.utils.serialization import (
+    series_to_date_dict, series_to_columnar, columnar_to_series, dumps
+)
+
+
+def _series() -> pd.Series:
+    index = pd.bdate_range("2024-01-02", periods=30)
+    return pd.Series(np.linspace(100.0, 130.0, 30), index=index)
+
+
+class TestTimeSeriesSerialization:
+    def test_date_dict_matches_strftime_comprehension(self):
+        series = _series()
+        expected = {date.strftime('%Y-%m-%d'): float(value) for date, value in series.items()}
+
+        assert series_to_date_dict(series) == expected
+        assert series_to_date_dict(pd.Series(dtype=float)) == {}
+
+    def test_columnar_json_round_trip(self):
+        series = _series()
+
+        payload = json.loads(dumps(series_to_columnar(series)))
+
+        assert payload["baseDate"] == "2024-01-02"
+        assert payload["offsets"][:6] == [0, 1, 2, 3, 6, 7]  # Weekend skipped
+        pd.testing.assert_series_equal(columnar_to_series(payload), series, check_freq=False)
+
+    def test_columnar_base64_round_trip_is_float32(self):
+        series = _series()
+
+        payload = json.loads(dumps(series_to_columnar(series, binary=True)))
+        restored = columnar_to_series(payload)
+
+        assert isinstance(payload["values"], str)
+        assert list(restored.index) == list(series.index)
+        assert restored.to_numpy() == pytest.approx(series.to_numpy(), rel=1e-6)
+
+    @pytest.mark.parametrize("use_orjson", [True, False])
+    def test_non_finite_values_are_written_as_null_by_both_encoders(self, monkeypatch, use_orjson):
+        if use_orjson and not serialization.HAS_ORJSON:
+            pytest.skip("orjson is not installed")
+        monkeypatch.setattr(serialization, "HAS_ORJSON", use_orjson)
+        payload = {"a": float("nan"), "b": [1.0, np.nan], "c": np.array([np.inf, 2.0]), "d": np.float64(-np.inf),
+                   "e": (Decimal("NaN"), 3)}
+
+        encoded = dumps(payload)
+
+        assert json.loads(encoded) == {"a": None, "b": [1.0, None], "c": [None, 2.0], "d": None, "e": [None, 3]}
+        assert json.loads(dumps({"a": 1.5, "b": np.array([1, 2])})) == {"a": 1.5, "b": [1, 2]}
@@ -0,0 +1,54 @@
+import pandas as pd
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.services.slow_query_log import normalize_sql
+from src.infrastructure.services.warehouse_optimizer import WarehouseOptimizer
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+
+
+def _warehouse(tmp_path, symbols) -> str:
+    db_path = str(tmp_path / "warehouse.sqlite")
+    service = WarehouseService(db_path)
+    for symbol in symbols:
+        service.store_price_data(Ticker(symbol), pd.Series(
+            [100.0, 101.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"])
+        ))
+    return db_path
+
+
+class TestSlowQueryLog:
+    def test_shapes_ignore_literals_and_placeholder_counts(self):
+        assert normalize_sql("SELECT * FROM t\n  WHERE symbol IN (?, ?,?) AND day >= 19723 AND s = 'A''B'") == \
+            "SELECT * FROM t WHERE symbol IN (?, ...) AND day >= ? AND s = ?"
+        assert normalize_sql("SELECT * FROM t WHERE symbol IN (?)") == "SELECT * FROM t WHERE symbol IN (?)"
+
+    def test_slow_batch_reads_aggregate_into_one_shape_with_their_plan(self, tmp_path):
+        db_path = _warehouse(tmp_path, ["AAPL", "KO", "MSFT"])
+        optimizer = WarehouseOptimizer(db_path, slow_query_seconds=1e-9)
+
+        optimizer.get_price_history_optimized([Ticker("AAPL"), Ticker("KO")], JANUARY)
+        history = optimizer.get_price_history_optimized([Ticker("AAPL"), Ticker("KO"), Ticker("MSFT")], JANUARY)
+
+        assert history[Ticker("MSFT")].tolist() == [100.0, 101.0]
+        batch_reads = [stats for stats in optimizer.slow_query_log.top(50) if "JOIN market_data v" in stats.shape]
+        assert len(batch_reads) == 1
+        assert batch_reads[0].count == 2
+        assert batch_reads[0].max_seconds >= batch_reads[0].mean_seconds > 0
+        assert any("USING PRIMARY KEY (symbol_id=? AND day>? AND day<?)" in line for line in batch_reads[0].plan)
+        assert optimizer.slow_query_log.stats()["slow_statements"] >= 2
+
+        optimizer.slow_query_log.reset()
+        assert optimizer.slow_query_log.top() == []
+
+    def test_statements_under_the_threshold_are_not_recorded(self, tmp_path):
+        db_path = _warehouse(tmp_path, ["AAPL"])
+        optimizer = WarehouseOptimizer(db_path, slow_query_seconds=60.0)
+
+        optimizer.store_dividend_history(Ticker("KO"), pd.Series([0.5], index=pd.DatetimeIndex(["2024-01-04"])))
+        dividends = optimizer.get_dividend_history_optimized([Ticker("KO")], JANUARY)
+
+        assert dividends[Ticker("KO")].tolist() == [0.5]
+        assert optimizer.slow_query_log.stats()["slow_statements"] == 0
+        assert WarehouseOptimizer(db_path).slow_query_log is None
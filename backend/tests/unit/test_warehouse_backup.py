@@ -0,0 +1,120 @@
+import sqlite3
+import pandas as pd
+import pytest
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.backup import WarehouseBackup, list_backup_chain, read_backup_info
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+
+
+def _store(service: WarehouseService, symbol: str, dates, closes, factors=None) -> None:
+    service.store_price_data(Ticker(symbol), pd.Series(closes, index=pd.DatetimeIndex(dates)), factors)
+
+
+class TestWarehouseBackup:
+    def test_full_backup_is_a_consistent_copy_taken_in_steps(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        _store(service, "AAPL", ["2024-01-02", "2024-01-03"], [100.0, 102.0])
+        steps = []
+
+        result = WarehouseBackup(db_path, pages_per_step=2, step_sleep=0).backup(
+            str(tmp_path / "full.sqlite"), progress=lambda remaining, total: steps.append(remaining)
+        )
+
+        assert len(steps) > 1 and steps[-1] == 0
+        assert result.info.kind == "full"
+        assert result.info.generation == read_backup_info(db_path).generation
+        assert not (tmp_path / "full.sqlite.partial").exists()
+        with sqlite3.connect(str(tmp_path / "full.sqlite")) as conn:
+            assert conn.execute("PRAGMA quick_check").fetchone()[0] == "ok"
+        assert WarehouseService(str(tmp_path / "full.sqlite")).get_price_data(Ticker("AAPL"), JANUARY).tolist() == [100.0, 102.0]
+
+    def test_deltas_hold_new_batches_and_restore_in_order(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        backup = WarehouseBackup(db_path, step_sleep=0, symbols_per_step=1)
+        _store(service, "AAPL", ["2024-01-02", "2024-01-03"], [100.0, 102.0])
+        full = backup.backup(str(tmp_path / "full.sqlite")).info
+
+        _store(service, "AAPL", ["2024-01-04"], [104.0])
+        _store(service, "KO", ["2024-01-04"], [60.0], pd.Series([0.5], index=pd.DatetimeIndex(["2024-01-04"])))
+        first = backup.backup_delta(str(tmp_path / "delta-1.sqlite"), full.path)
+        _store(service, "AAPL", ["2024-01-03"], [103.0])
+        second = backup.backup_delta(str(tmp_path / "delta-2.sqlite"), first.info.path)
+        expected = service.get_range_statistics([Ticker("AAPL")], JANUARY)
+
+        # Rows of later batches only: AAPL's new day, KO's close and its factor, then the rewrite
+        assert (first.rows, second.rows) == (3, 1)
+        assert (first.info.base_generation, second.info.base_generation) == (full.generation, first.info.generation)
+        assert list_backup_chain(str(tmp_path), full.path) == [first.info.path, second.info.path]
+
+        service.clear_data()
+        restored = backup.restore(full.path, [first.info.path, second.info.path])
+        reopened = WarehouseService(db_path)
+
+        assert restored.rows == 4
+        assert restored.info.generation > second.info.generation
+        assert reopened.get_price_data(Ticker("AAPL"), JANUARY).tolist() == [100.0, 103.0, 104.0]
+        assert reopened.get_price_data(Ticker("KO"), JANUARY).tolist() == [60.0]
+        assert reopened.get_range_statistics([Ticker("AAPL")], JANUARY) == expected
+        # The restoring process's own price cache sees the restore
+        assert service.get_price_data(Ticker("AAPL"), JANUARY).tolist() == [100.0, 103.0, 104.0]
+
+    def test_broken_chains_are_rejected(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        backup = WarehouseBackup(db_path, step_sleep=0)
+        _store(service, "AAPL", ["2024-01-02"], [100.0])
+        full = backup.backup(str(tmp_path / "full.sqlite")).info
+        _store(service, "AAPL", ["2024-01-03"], [101.0])
+        first = backup.backup_delta(str(tmp_path / "delta-1.sqlite"), full.path).info
+        _store(service, "AAPL", ["2024-01-04"], [102.0])
+        second = backup.backup_delta(str(tmp_path / "delta-2.sqlite"), first.path).info
+
+        with pytest.raises(ValueError, match="does not follow"):
+            backup.restore(full.path, [second.path])
+        with pytest.raises(ValueError, match="full backup"):
+            backup.restore(first.path)
+        service.clear_data()
+        with pytest.raises(ValueError, match="take a full backup"):
+            backup.backup_delta(str(tmp_path / "delta-3.sqlite"), second.path)
+        # The live warehouse is untouched by rejected restores
+        assert service.get_price_data(Ticker("AAPL"), JANUARY).empty
+
+    def test_deltas_are_refused_after_a_clear_or_across_warehouses(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        backup = WarehouseBackup(db_path, step_sleep=0)
+        _store(service, "AAPL", ["2024-01-02"], [100.0])
+        _store(service, "MSFT", ["2024-01-02"], [370.0])
+        full = backup.backup(str(tmp_path / "full.sqlite")).info
+
+        service.clear_data()
+        for symbol in ("KO", "PEP", "NVDA"):
+            _store(service, symbol, ["2024-01-02"], [50.0])
+        with pytest.raises(ValueError, match="cleared"):
+            backup.backup_delta(str(tmp_path / "delta.sqlite"), full.path)
+        assert not (tmp_path / "delta.sqlite").exists()
+
+        # A warehouse created from scratch at the same path is another epoch, whatever its generation
+        other_path = str(tmp_path / "other.sqlite")
+        other = WarehouseService(other_path)
+        for symbol in ("KO", "PEP", "NVDA", "XOM"):
+            _store(other, symbol, ["2024-01-02"], [50.0])
+        other_backup = WarehouseBackup(other_path, step_sleep=0)
+        with pytest.raises(ValueError, match="recreated"):
+            other_backup.backup_delta(str(tmp_path / "other-delta.sqlite"), full.path)
+        other_full = other_backup.backup(str(tmp_path / "other-full.sqlite")).info
+        _store(other, "KO", ["2024-01-03"], [51.0])
+        other_delta = other_backup.backup_delta(str(tmp_path / "other-delta.sqlite"), other_full.path).info
+        assert other_delta.epoch == other_full.epoch != full.epoch
+
+        # Deltas of another warehouse are not applied onto this one's full backup, even with matching generations
+        with sqlite3.connect(other_delta.path) as conn:
+            conn.execute("UPDATE backup_info SET base_generation = ?", (full.generation,))
+        with pytest.raises(ValueError, match="of this warehouse"):
+            backup.restore(full.path, [other_delta.path])
+        assert service.get_price_data(Ticker("KO"), JANUARY).tolist() == [50.0]
@@ -0,0 +1,115 @@
+import gzip
+import io
+import pandas as pd
+import pytest
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.bulk_transfer import WarehouseBulkTransfer, export_path, list_exports
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+
+
+def _seeded_warehouse(db_path: str) -> WarehouseService:
+    service = WarehouseService(db_path)
+    # A 2-for-1 split on the last day
+    service.store_price_data(Ticker("AAPL"), pd.Series(
+        [100.0, 101.0, 49.75], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"])
+    ), pd.Series([0.5], index=pd.DatetimeIndex(["2024-01-04"])))
+    service.store_price_data(Ticker("KO"), pd.Series([60.0, 61.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"])))
+    service.store_dividend_data(Ticker("KO"), pd.Series([0.46], index=pd.DatetimeIndex(["2024-01-03"])), JANUARY)
+    service.store_benchmark_data("^GSPC", pd.Series([4700.0], index=pd.DatetimeIndex(["2024-01-02"])), JANUARY)
+    return service
+
+
+class TestWarehouseBulkTransfer:
+    def test_csv_export_round_trip(self, tmp_path):
+        source = _seeded_warehouse(str(tmp_path / "source.sqlite"))
+        # Gzip CSV is the default format and needs no optional engine
+        exported = WarehouseBulkTransfer(source.db_path).export(str(tmp_path / "exports" / "snap"), rows_per_file=2)
+
+        imported = WarehouseBulkTransfer(str(tmp_path / "target.sqlite")).import_export(str(tmp_path / "exports" / "snap"))
+        target = WarehouseService(str(tmp_path / "target.sqlite"))
+
+        assert exported.rows == imported.rows == {
+            "market_data": 5, "dividend_data": 1, "dividend_coverage": 1, "benchmark_data": 1, "benchmark_coverage": 1,
+            "corporate_actions": 1
+        }
+        assert len([path for path in exported.files if path.startswith("market_data")]) == 3
+        assert all(path.endswith(".csv.gz") for path in exported.files)
+        assert target.get_price_data(Ticker("AAPL"), JANUARY).tolist() == [50.0, 50.5, 49.75]
+        assert target.get_dividend_data(Ticker("KO"), JANUARY).tolist() == [0.46]
+        assert target.has_dividend_coverage(Ticker("KO"), JANUARY)
+        assert target.has_benchmark_coverage("^GSPC", JANUARY)
+        # Prefix sums are rebuilt for imported symbols
+        tickers = [Ticker("AAPL"), Ticker("KO")]
+        assert target.get_range_statistics(tickers, JANUARY) == source.get_range_statistics(tickers, JANUARY)
+        assert [export["name"] for export in list_exports(str(tmp_path / "exports"))] == ["snap"]
+
+    def test_export_refuses_existing_export_and_unsafe_names(self, tmp_path):
+        source = _seeded_warehouse(str(tmp_path / "source.sqlite"))
+        transfer = WarehouseBulkTransfer(source.db_path)
+        transfer.export(str(tmp_path / "snap"), file_format="csv")
+
+        with pytest.raises(ValueError, match="already contains an export"):
+            transfer.export(str(tmp_path / "snap"), file_format="csv")
+        with pytest.raises(ValueError, match="Invalid export name"):
+            export_path(str(tmp_path), "..")
+        with pytest.raises(ValueError, match="Unknown warehouse tables"):
+            transfer.export(str(tmp_path / "other"), tables=["price_prefix_sums"], file_format="csv")
+
+    def test_vendor_csv_import(self, tmp_path):
+        transfer = WarehouseBulkTransfer(str(tmp_path / "warehouse.sqlite"))
+        dump = (
+            b"Date,Ticker,Open,Close,Adj Close\n"
+            b"2024-01-03,brk.b,1,410,405\n"
+            b"2024-01-02,brk.b,1,400,395\n"
+            b"2024-01-02,MSFT,1,370,368\n"
+            b"not a date,MSFT,1,371,369\n"
+            b"2024-01-04,,1,1,1\n"
+            b"2024-01-04,MSFT,1,0,0\n"
+        )
+
+        result = transfer.import_csv(io.BytesIO(gzip.compress(dump)), chunk_rows=2)
+        service = WarehouseService(transfer.db_path)
+
+        assert result.rows == {"market_data": 3}
+        assert result.skipped_rows == 3
+        # Raw closes (adjusted on read by factors), Yahoo-style symbols, calendar order
+        assert service.get_price_data(Ticker("BRK-B"), JANUARY).tolist() == [400.0, 410.0]
+        assert service.get_range_statistics([Ticker("BRK-B")], JANUARY)[Ticker("BRK-B")].end_price == 410.0
+
+    def test_adjusted_only_price_files_need_an_explicit_mapping(self, tmp_path):
+        transfer = WarehouseBulkTransfer(str(tmp_path / "warehouse.sqlite"))
+        dump = b"Date,Adj Close\n2024-01-02,395\n2024-01-03,405\n"
+
+        with pytest.raises(ValueError, match="adjusted closes only"):
+            transfer.import_csv(io.BytesIO(dump), symbol="KO")
+        with pytest.raises(ValueError, match="adjusted closes only"):
+            transfer.import_csv(io.BytesIO(b"Date,Adjusted_Close\n2024-01-02,4700\n"), table="benchmark_data",
+                                symbol="^GSPC")
+        transfer.import_csv(io.BytesIO(dump), symbol="KO", columns={"close_price": "Adj Close"})
+
+        assert WarehouseService(transfer.db_path).get_price_data(Ticker("KO"), JANUARY).tolist() == [395.0, 405.0]
+
+    def test_vendor_dividends_record_coverage(self, tmp_path):
+        transfer = WarehouseBulkTransfer(str(tmp_path / "warehouse.sqlite"))
+        dump = b"date,amount\n2024-01-05,0.5\n2024-04-05,0.5\n"
+
+        transfer.import_csv(io.BytesIO(dump), table="dividend_data", symbol="KO")
+        service = WarehouseService(transfer.db_path)
+
+        assert service.get_dividend_data(Ticker("KO"), DateRange("2024-01-01", "2024-12-31")).tolist() == [0.5, 0.5]
+        assert service.has_dividend_coverage(Ticker("KO"), DateRange("2024-01-05", "2024-04-05"))
+        with pytest.raises(ValueError, match="Missing symbol column"):
+            transfer.import_csv(io.BytesIO(dump), table="dividend_data")
+
+    def test_parquet_round_trip(self, tmp_path):
+        pytest.importorskip("pyarrow")
+        source = _seeded_warehouse(str(tmp_path / "source.sqlite"))
+        WarehouseBulkTransfer(source.db_path).export(str(tmp_path / "snap"), file_format="parquet")
+
+        WarehouseBulkTransfer(str(tmp_path / "target.sqlite")).import_export(str(tmp_path / "snap"))
+        target = WarehouseService(str(tmp_path / "target.sqlite"))
+
+        assert target.get_price_data(Ticker("KO"), JANUARY).tolist() == [60.0, 61.0]
@@ -0,0 +1,82 @@
+import sqlite3
+import pandas as pd
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.compaction import CompactSchemaMigrator
+from src.infrastructure.warehouse.keys import to_epoch_day
+from src.infrastructure.warehouse.migrations import COMPACT_SCHEMA_VERSION, LATEST_SCHEMA_VERSION, get_schema_version, migrate
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+
+def _v1_warehouse(db_path: str) -> sqlite3.Connection:
+    conn = sqlite3.connect(db_path)
+    migrate(conn, target=COMPACT_SCHEMA_VERSION - 1)
+    conn.executemany("INSERT INTO market_data VALUES (?, ?, ?, '2024-01-01T00:00:00')", [
+        ("AAPL", "2024-01-02", 100.0), ("AAPL", "2024-01-03", 101.0),
+        ("MSFT", "2024-01-02", 300.0), ("MSFT", "2024-01-03", 301.0),
+        ("KO", "2024-01-02", 60.0),
+    ])
+    conn.execute("INSERT INTO dividend_data VALUES ('KO', '2024-01-02', 0.46, '')")
+    conn.execute("INSERT INTO dividend_coverage VALUES ('KO', '2024-01-01', '2024-01-31', 1, '')")
+    conn.commit()
+    return conn
+
+
+def _prices(conn) -> list:
+    return conn.execute("""
+        SELECT s.symbol, m.day, m.close_price FROM market_data m JOIN symbols s ON s.symbol_id = m.symbol_id
+        ORDER BY s.symbol, m.day
+    """).fetchall()
+
+
+class TestCompactSchemaMigrator:
+    def test_writes_during_backfill_are_mirrored(self, tmp_path):
+        conn = _v1_warehouse(str(tmp_path / "warehouse.sqlite"))
+        migrator = CompactSchemaMigrator()
+        migrator.prepare(conn)
+        migrator.copy_symbols(conn, migrator.pending_symbols(conn)[:1])
+
+        # A v1 server keeps writing while the remaining symbols are copied
+        conn.execute("INSERT OR REPLACE INTO market_data VALUES ('AAPL', '2024-01-03', 105.0, '')")
+        conn.execute("INSERT INTO market_data VALUES ('NVDA', '2024-01-02', 50.0, '')")
+        conn.execute("DELETE FROM market_data WHERE ticker = 'MSFT' AND date = '2024-01-03'")
+        migrator.copy_symbols(conn, migrator.pending_symbols(conn))
+        applied = migrate(conn, target=COMPACT_SCHEMA_VERSION)
+
+        day = to_epoch_day("2024-01-02")
+        assert [migration.version for migration in applied] == [COMPACT_SCHEMA_VERSION]
+        assert _prices(conn) == [
+            ("AAPL", day, 100.0), ("AAPL", day + 1, 105.0), ("KO", day, 60.0), ("MSFT", day, 300.0), ("NVDA", day, 50.0)
+        ]
+        assert conn.execute("SELECT COUNT(*) FROM price_prefix_sums").fetchone()[0] == 5
+        assert conn.execute("SELECT COUNT(*) FROM dividend_coverage").fetchone()[0] == 1
+        # Only primary keys and the symbol dictionary's unique constraint remain
+        assert conn.execute("SELECT name FROM sqlite_master WHERE type IN ('index', 'trigger') AND sql IS NOT NULL").fetchall() == []
+
+    def test_online_run_copies_in_chunks(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        _v1_warehouse(db_path).close()
+        progress = []
+
+        conn = sqlite3.connect(db_path)
+        applied = CompactSchemaMigrator().run_online(conn, chunk_size=2, progress=lambda done, total: progress.append((done, total)))
+
+        assert [migration.version for migration in applied] == list(range(COMPACT_SCHEMA_VERSION, LATEST_SCHEMA_VERSION + 1))
+        assert progress == [(2, 3), (3, 3)]
+        assert get_schema_version(conn) == LATEST_SCHEMA_VERSION
+        # Migration 5 drops the adjusted closes the v1 tables held; dividends are kept
+        assert _prices(conn) == []
+        assert WarehouseService(db_path).get_dividend_data(Ticker("KO"), DateRange("2024-01-01", "2024-01-31")).tolist() == [0.46]
+
+    def test_service_round_trip_keeps_calendar_dates(self, tmp_path):
+        service = WarehouseService(str(tmp_path / "warehouse.sqlite"))
+        index = pd.DatetimeIndex(["2024-03-01", "2024-03-04"]).tz_localize("America/New_York")
+        service.store_price_data(Ticker("AAPL"), pd.Series([10.0, 11.0], index=index))
+
+        date_range = DateRange("2024-03-01", "2024-03-31")
+        prices = service.get_price_data(Ticker("AAPL"), date_range)
+
+        assert prices.index.equals(pd.DatetimeIndex(["2024-03-01", "2024-03-04"]))
+        assert prices.tolist() == [10.0, 11.0]
+        assert service.get_coverage(Ticker("AAPL"), date_range) == {"2024-03-01", "2024-03-04"}
+        assert service.get_latest_prices([Ticker("AAPL")]) == {Ticker("AAPL"): ("2024-03-04", 11.0)}
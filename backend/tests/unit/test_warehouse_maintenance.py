@@ -0,0 +1,88 @@
+import os
+import sqlite3
+import numpy as np
+import pandas as pd
+import time
+import pytest
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.maintenance import MaintenancePolicy, WarehouseMaintenance
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+FEBRUARY = DateRange("2024-02-01", "2024-02-29")
+
+
+def _fill(service: WarehouseService, tickers: int = 20, days: int = 500) -> None:
+    dates = pd.bdate_range("2020-01-01", periods=days)
+    for number in range(tickers):
+        service.store_price_data(Ticker(f"T{number:03d}"), pd.Series(np.linspace(100, 200, days), index=dates))
+
+
+def _free_pages(db_path: str) -> int:
+    with sqlite3.connect(db_path) as conn:
+        return conn.execute("PRAGMA freelist_count").fetchone()[0]
+
+
+class TestWarehouseMaintenance:
+    def test_cleared_space_is_released_in_capped_ticks(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        _fill(service)
+        service.clear_data()
+        maintenance = WarehouseMaintenance(db_path, MaintenancePolicy(free_space_budget_bytes=0, pages_per_tick=8))
+        free_pages = _free_pages(db_path)
+        assert free_pages > 8
+
+        tick = maintenance.run_once()
+
+        page_size = 4096
+        assert tick.reclaimed_bytes == 8 * page_size
+        assert _free_pages(db_path) == free_pages - 8
+        while _free_pages(db_path):
+            maintenance.run_once()
+        metrics = maintenance.get_metrics()
+        assert metrics["auto_vacuum"] == "incremental"
+        assert metrics["reclaimed_bytes"] == free_pages * page_size
+        assert metrics["free_bytes"] == 0
+        assert os.path.getsize(db_path) < free_pages * page_size
+
+    def test_old_coverage_rows_expire(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        for symbol in ("AAPL", "KO", "MSFT"):
+            service.store_dividend_data(Ticker(symbol), pd.Series(dtype=float), JANUARY)
+        service.store_dividend_data(Ticker("AAPL"), pd.Series(dtype=float), FEBRUARY)
+        with sqlite3.connect(db_path) as conn:
+            conn.execute("UPDATE ingest_batches SET created_at = '2020-01-01T00:00:00' WHERE batch_id <= 4")
+        maintenance = WarehouseMaintenance(db_path, MaintenancePolicy(
+            rows_per_tick=2, retention_days={"dividend_coverage": 30, "benchmark_coverage": 30}
+        ))
+
+        assert maintenance.run_once().retention_rows == {"dividend_coverage": 2}
+        assert maintenance.run_once().retention_rows["dividend_coverage"] == 1
+
+        assert not any(service.has_dividend_coverage(Ticker(symbol), JANUARY) for symbol in ("AAPL", "KO", "MSFT"))
+        assert service.has_dividend_coverage(Ticker("AAPL"), FEBRUARY)
+        assert maintenance.get_metrics()["retention_rows_deleted"] == 3
+        with pytest.raises(ValueError, match="No retention policy"):
+            MaintenancePolicy(retention_days={"market_data": 30})
+
+    def test_large_wal_is_truncated_on_the_background_thread(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        service = WarehouseService(db_path)
+        _fill(service, tickers=5)
+        assert os.path.getsize(db_path + "-wal") > 0
+        maintenance = WarehouseMaintenance(db_path, MaintenancePolicy(tick_seconds=0.01, wal_truncate_bytes=0))
+
+        maintenance.start()
+        while maintenance.get_metrics()["maintenance_ticks"] == 0:
+            time.sleep(0.01)
+        maintenance.stop()
+
+        metrics = maintenance.get_metrics()
+        assert not metrics["maintenance_running"]
+        assert metrics["truncate_checkpoints"] >= 1
+        assert metrics["wal_reclaimed_bytes"] > 0
+        assert metrics["wal_bytes"] == 0
+        assert len(service.get_price_data(Ticker("T000"), DateRange("2020-01-01", "2020-01-31"))) == 23
@@ -0,0 +1,76 @@
+import sqlite3
+import pandas as pd
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.compaction import CompactSchemaMigrator
+from src.infrastructure.warehouse.keys import to_epoch_day
+from src.infrastructure.warehouse.migrations import (
+    COMPACT_SCHEMA_VERSION, LATEST_SCHEMA_VERSION, get_schema_version, migrate
+)
+from src.infrastructure.warehouse.prefix_sums import PrefixSumIndex
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+
+def _live_code(*args, **kwargs):
+    raise AssertionError("a released migration called live warehouse code")
+
+
+class TestWarehouseMigrations:
+    def test_fresh_warehouse_is_migrated_once(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+
+        first = WarehouseService(db_path)
+        statements = []
+        conn = sqlite3.connect(db_path)
+        conn.set_trace_callback(statements.append)
+        applied_again = migrate(conn)
+
+        assert [migration.version for migration in first.applied_migrations] == list(range(1, LATEST_SCHEMA_VERSION + 1))
+        assert WarehouseService(db_path).applied_migrations == []
+        assert applied_again == []
+        assert not [sql for sql in statements if "CREATE" in sql.upper()]
+
+    def test_unversioned_warehouse_is_adopted_and_backfilled(self, tmp_path, monkeypatch):
+        # Released migrations carry their own DDL and backfill; live code may move on
+        monkeypatch.setattr(CompactSchemaMigrator, "cutover", _live_code)
+        monkeypatch.setattr(PrefixSumIndex, "update_prices", _live_code)
+        db_path = str(tmp_path / "warehouse.sqlite")
+        with sqlite3.connect(db_path) as conn:
+            # Layout written before schema versioning, without prefix-sum tables
+            conn.execute("""CREATE TABLE market_data (ticker TEXT NOT NULL, date TEXT NOT NULL,
+                            close_price REAL NOT NULL, created_at TEXT NOT NULL, PRIMARY KEY (ticker, date))""")
+            conn.executemany("INSERT INTO market_data VALUES (?, ?, ?, '')",
+                             [("AAPL", "2024-01-02", 100.0), ("AAPL", "2024-01-03", 101.0)])
+
+        with sqlite3.connect(db_path) as conn:
+            migrate(conn, target=COMPACT_SCHEMA_VERSION)
+            assert get_schema_version(conn) == COMPACT_SCHEMA_VERSION
+            assert conn.execute("SELECT COUNT(*) FROM market_data").fetchone()[0] == 2
+            assert conn.execute("""
+                SELECT COUNT(*) FROM price_prefix_sums p JOIN symbols s ON s.symbol_id = p.symbol_id
+                WHERE s.symbol = 'AAPL'
+            """).fetchone()[0] == 2
+
+    def test_adjusted_closes_stored_before_factors_are_not_adjusted_again(self, tmp_path):
+        db_path = str(tmp_path / "warehouse.sqlite")
+        with sqlite3.connect(db_path) as conn:
+            migrate(conn, target=COMPACT_SCHEMA_VERSION)
+            # Adjusted NVDA closes as fetched before raw closes were stored
+            conn.execute("INSERT INTO symbols (symbol) VALUES ('NVDA')")
+            conn.executemany("INSERT INTO market_data VALUES (1, ?, ?, 1)", [
+                (to_epoch_day(day), close) for day, close in (("2024-06-06", 100.0), ("2024-06-07", 101.0),
+                                                              ("2024-06-10", 102.0))
+            ])
+
+        service = WarehouseService(db_path)
+        june = DateRange("2024-06-05", "2024-06-10")
+        assert service.get_price_data(Ticker("NVDA"), june).empty
+
+        # The refetch stores raw closes across the 10-for-1 split, including a backfilled earlier day
+        raw = pd.Series([900.0, 1000.0, 1010.0, 102.0],
+                        index=pd.DatetimeIndex(["2024-06-05", "2024-06-06", "2024-06-07", "2024-06-10"]))
+        service.store_price_data(Ticker("NVDA"), raw, pd.Series([0.1], index=pd.DatetimeIndex(["2024-06-10"])))
+
+        assert service.get_price_data(Ticker("NVDA"), june).tolist() == [90.0, 100.0, 101.0, 102.0]
+        with sqlite3.connect(db_path) as conn:
+            assert conn.execute("SELECT source FROM ingest_batches WHERE source = 'clear'").fetchall() == [("clear",)]
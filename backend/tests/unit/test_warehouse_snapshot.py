@@ -0,0 +1,174 @@
+import sqlite3
+import numpy as np
+import pandas as pd
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+from src.infrastructure.warehouse.backup import WarehouseBackup
+from src.infrastructure.warehouse.bulk_transfer import WarehouseBulkTransfer
+from src.infrastructure.warehouse.keys import to_epoch_day
+from src.infrastructure.warehouse.price_cache import PriceCache
+from src.infrastructure.warehouse.snapshot import SnapshotBuilder, SnapshotStore, get_ingest_generation
+from src.infrastructure.warehouse.warehouse_service import WarehouseService
+
+JANUARY = DateRange("2024-01-01", "2024-01-31")
+
+
+def _warehouse(db_path: str) -> WarehouseService:
+    service = WarehouseService(db_path)
+    service.store_price_data(Ticker("AAPL"), pd.Series(
+        [100.0, 101.0, 102.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03", "2024-01-04"])
+    ))
+    service.store_price_data(Ticker("KO"), pd.Series([60.0, 61.0], index=pd.DatetimeIndex(["2024-01-02", "2024-01-03"])))
+    service.store_price_data(Ticker("MSFT"), pd.Series([370.0], index=pd.DatetimeIndex(["2024-01-02"])))
+    service.store_dividend_data(Ticker("KO"), pd.Series([0.46], index=pd.DatetimeIndex(["2024-01-03"])), JANUARY)
+    return service
+
+
+def _build(db_path: str, path: str, symbols) -> None:
+    with sqlite3.connect(db_path) as conn:
+        SnapshotBuilder().build(conn, symbols, path)
+
+
+def _snapshot_service(db_path: str, path: str) -> WarehouseService:
+    service = WarehouseService(db_path, path)
+    service._snapshots.check_interval = 0
+    return service
+
+
+class TestWarehouseSnapshot:
+    def test_batches_are_served_as_views_of_the_mapping(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        plain = _warehouse(db_path)
+        _build(db_path, path, ["AAPL", "KO", "NVDA"])
+        service = _snapshot_service(db_path, path)
+
+        tickers = [Ticker("AAPL"), Ticker("KO"), Ticker("MSFT")]
+        prices = service.get_price_history_batch(tickers, DateRange("2024-01-03", "2024-01-31"))
+        expected = plain.get_price_history_batch(tickers, DateRange("2024-01-03", "2024-01-31"))
+
+        mapped_closes = service._snapshots.current()._arrays["prices"][1]
+        assert np.shares_memory(prices[Ticker("AAPL")].to_numpy(), mapped_closes)
+        # MSFT is not in the snapshot and comes from SQLite
+        assert not np.shares_memory(prices[Ticker("MSFT")].to_numpy(), mapped_closes)
+        for ticker in tickers:
+            pd.testing.assert_series_equal(prices[ticker], expected[ticker])
+        assert service.get_dividend_history_batch([Ticker("KO")], JANUARY)[Ticker("KO")].tolist() == [0.46]
+
+    def test_tickers_appended_after_the_build_fall_back_to_sqlite(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        _warehouse(db_path)
+        _build(db_path, path, ["AAPL", "KO"])
+        service = _snapshot_service(db_path, path)
+
+        service.store_price_data(Ticker("AAPL"), pd.Series([103.0], index=pd.DatetimeIndex(["2024-01-05"])))
+        prices = service.get_price_history_batch([Ticker("AAPL"), Ticker("KO")], JANUARY)
+
+        assert prices[Ticker("AAPL")].tolist() == [100.0, 101.0, 102.0, 103.0]
+        assert np.shares_memory(prices[Ticker("KO")].to_numpy(), service._snapshots.current()._arrays["prices"][1])
+        # Ranges ending within the snapshot's rows cannot miss an append
+        early = service.get_price_history_batch([Ticker("AAPL")], DateRange("2024-01-01", "2024-01-03"))
+        assert np.shares_memory(early[Ticker("AAPL")].to_numpy(), service._snapshots.current()._arrays["prices"][1])
+
+    def test_writes_to_other_tickers_keep_the_snapshot_serving(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        _warehouse(db_path)
+        _build(db_path, path, ["AAPL", "KO"])
+        service = _snapshot_service(db_path, path)
+
+        service.store_price_data(Ticker("MSFT"), pd.Series([371.0], index=pd.DatetimeIndex(["2024-01-03"])))
+        service.store_dividend_data(Ticker("MSFT"), pd.Series([0.75], index=pd.DatetimeIndex(["2024-01-03"])), JANUARY)
+        prices = service._read_snapshot([Ticker("AAPL"), Ticker("KO")], JANUARY, "prices", 'Close')
+        dividends = service._read_snapshot([Ticker("KO")], JANUARY, "dividends", 'Dividends')
+
+        assert list(prices) == [Ticker("AAPL"), Ticker("KO")]
+        assert dividends[Ticker("KO")].tolist() == [0.46]
+        # A dividend rewrite of a snapshot ticker leaves its prices as built
+        service.store_dividend_data(Ticker("KO"), pd.Series([0.47], index=pd.DatetimeIndex(["2024-01-03"])), JANUARY)
+        assert list(service._read_snapshot([Ticker("KO")], JANUARY, "prices", 'Close')) == [Ticker("KO")]
+        assert service._read_snapshot([Ticker("KO")], JANUARY, "dividends", 'Dividends') == {}
+
+    def test_imports_and_restores_after_the_build_fall_back_to_sqlite(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        _warehouse(db_path)
+        WarehouseBackup(db_path, step_sleep=0).backup(str(tmp_path / "full.sqlite"))
+        _build(db_path, path, ["AAPL", "KO"])
+        service = _snapshot_service(db_path, path)
+        csv_path = tmp_path / "prices.csv"
+        csv_path.write_text("symbol,date,close_price\nKO,2024-01-03,59.0\n")
+
+        WarehouseBulkTransfer(db_path).import_csv(str(csv_path))
+        assert list(service._read_snapshot([Ticker("AAPL"), Ticker("KO")], JANUARY, "prices", 'Close')) == [Ticker("AAPL")]
+
+        WarehouseBackup(db_path, step_sleep=0).restore(str(tmp_path / "full.sqlite"))
+        assert service._read_snapshot([Ticker("AAPL"), Ticker("KO")], JANUARY, "prices", 'Close') == {}
+
+    def test_rebuilt_snapshot_is_swapped_in(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        _warehouse(db_path)
+        store = SnapshotStore(path, check_interval=0)
+        assert store.current() is None
+
+        _build(db_path, path, ["AAPL"])
+        first = store.current()
+        held = first.get("prices", "AAPL", 0, 100_000, "Close")
+        _build(db_path, path, ["AAPL", "KO"])
+        second = store.current()
+
+        assert second is not first and "KO" in second and "KO" not in first
+        # Series from the replaced file stay readable
+        assert held.tolist() == [100.0, 101.0, 102.0]
+        assert store.current() is second
+
+    def test_invalid_snapshot_file_is_ignored(self, tmp_path):
+        path = tmp_path / "snapshot.bin"
+        path.write_bytes(b"not a snapshot" * 10)
+
+        assert SnapshotStore(str(path), check_interval=0).current() is None
+
+    def test_backfills_and_rewrites_after_the_build_fall_back_to_sqlite(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        _warehouse(db_path)
+        _build(db_path, path, ["AAPL", "KO"])
+        service = _snapshot_service(db_path, path)
+
+        service.store_price_data(Ticker("AAPL"), pd.Series([98.0, 99.0], index=pd.DatetimeIndex(["2023-12-28", "2023-12-29"])))
+        service.store_price_data(Ticker("KO"), pd.Series([59.0], index=pd.DatetimeIndex(["2024-01-03"])))
+        prices = service.get_price_history_batch([Ticker("AAPL"), Ticker("KO")], DateRange("2023-12-01", "2024-01-31"))
+
+        assert prices[Ticker("AAPL")].tolist() == [98.0, 99.0, 100.0, 101.0, 102.0]
+        assert prices[Ticker("KO")].tolist() == [60.0, 59.0]
+        # A backfill before the range leaves the range as built
+        january = service.get_price_history_batch([Ticker("AAPL")], JANUARY)
+        assert np.shares_memory(january[Ticker("AAPL")].to_numpy(), service._snapshots.current()._arrays["prices"][1])
+
+    def test_cleared_data_is_not_served_from_the_snapshot_or_another_process_cache(self, tmp_path):
+        db_path, path = str(tmp_path / "warehouse.sqlite"), str(tmp_path / "snapshot.bin")
+        _warehouse(db_path)
+        _build(db_path, path, ["AAPL", "KO"])
+        service = _snapshot_service(db_path, path)
+        cache = PriceCache(1024 * 1024)
+        tickers = [Ticker("AAPL"), Ticker("KO")]
+
+        def cached_closes():
+            with sqlite3.connect(db_path) as conn:
+                prices = cache.get_many(conn, ["AAPL", "KO"], to_epoch_day(JANUARY.start), to_epoch_day(JANUARY.end), 'Close')
+                return {symbol: series.tolist() for symbol, series in prices.items()}
+
+        def generation():
+            with sqlite3.connect(db_path) as conn:
+                return get_ingest_generation(conn)
+
+        cached_closes()
+        WarehouseService(db_path).clear_data(Ticker("AAPL"))
+
+        assert list(service._read_snapshot(tickers, JANUARY, "prices", 'Close')) == [Ticker("KO")]
+        assert cached_closes() == {"AAPL": [], "KO": [60.0, 61.0]}
+
+        # A full clear moves the generation on instead of restarting batch IDs
+        before = generation()
+        WarehouseService(db_path).clear_data()
+        service.store_price_data(Ticker("KO"), pd.Series([62.0], index=pd.DatetimeIndex(["2024-01-02"])))
+
+        assert generation() == before + 2
+        assert service._read_snapshot(tickers, JANUARY, "prices", 'Close') == {}
+        assert cached_closes() == {"AAPL": [], "KO": [62.0]}
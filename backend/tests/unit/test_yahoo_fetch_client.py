@@ -0,0 +1,242 @@
+import pytest
+import pandas as pd
+from src.infrastructure.services.yahoo_fetch_client import (
+    YahooFetchClient, TokenBucket, CircuitBreaker, AdaptiveBatchSizer, CircuitOpenError
+)
+from src.infrastructure.repositories.yfinance_market_repository import YFinanceMarketRepository
+from src.domain.entities.ticker import Ticker
+from src.domain.value_objects.date_range import DateRange
+
+
+class FakeClock:
+    """Manually advanced clock; sleeping advances time."""
+
+    def __init__(self):
+        self.now = 0.0
+        self.sleeps = []
+
+    def __call__(self) -> float:
+        return self.now
+
+    def sleep(self, seconds: float) -> None:
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+class FakeTicker:
+    def __init__(self, symbol: str, transport):
+        self._symbol = symbol
+        self._transport = transport
+
+    @property
+    def dividends(self) -> pd.Series:
+        self._transport.ticker_calls.append(self._symbol)
+        return pd.Series([0.25], index=pd.DatetimeIndex(['2024-02-01']), name='Dividends')
+
+
+class FakeTransport:
+    """Stand-in for the yfinance module."""
+
+    def __init__(self, failures: int = 0):
+        self.failures = failures
+        self.download_calls = []
+        self.ticker_calls = []
+
+    def download(self, tickers, **kwargs):
+        self.download_calls.append(list(tickers) if isinstance(tickers, list) else [tickers])
+        if self.failures > 0:
+            self.failures -= 1
+            raise ConnectionError("Too Many Requests")
+        dates = pd.DatetimeIndex(['2024-01-02', '2024-01-03'])
+        columns = pd.MultiIndex.from_product([tickers, ['Close']])
+        return pd.DataFrame(100.0, index=dates, columns=columns)
+
+    def Ticker(self, symbol: str) -> FakeTicker:
+        return FakeTicker(symbol, self)
+
+
+class YFinanceStyleTransport(FakeTransport):
+    """Like yfinance: failed symbols come back as all-NaN columns (or an empty frame for one symbol), never raised."""
+
+    def __init__(self, failing_calls: int = 0, dropped: tuple = ()):
+        super().__init__()
+        self.failing_calls = failing_calls
+        self.dropped = set(dropped)  # Missing from the first call only
+
+    def download(self, tickers, **kwargs):
+        data = super().download(tickers, **kwargs)
+        failed = set(tickers) if self.failing_calls > 0 else self.dropped & set(tickers)
+        self.failing_calls -= 1
+        self.dropped = set()
+        if len(tickers) == 1 and failed:
+            return pd.DataFrame()
+        for symbol in failed:
+            data[(symbol, 'Close')] = float('nan')
+        return data
+
+
+def _make_client(transport, clock, **kwargs) -> YahooFetchClient:
+    return YahooFetchClient(
+        transport=transport,
+        rate_limiter=TokenBucket(rate=1.0, capacity=2.0, clock=clock, sleep=clock.sleep),
+        circuit_breaker=kwargs.pop('circuit_breaker', CircuitBreaker(failure_threshold=3, reset_timeout=10.0, clock=clock)),
+        clock=clock,
+        sleep=clock.sleep,
+        **kwargs
+    )
+
+
+class TestTokenBucket:
+    def test_waits_when_bucket_is_empty(self):
+        clock = FakeClock()
+        bucket = TokenBucket(rate=2.0, capacity=2.0, clock=clock, sleep=clock.sleep)
+
+        for _ in range(4):
+            bucket.acquire()
+
+        # Two burst tokens, then two more at 2 tokens/second
+        assert clock.now == pytest.approx(1.0)
+
+
+class TestCircuitBreaker:
+    def test_opens_after_threshold_and_recovers(self):
+        clock = FakeClock()
+        breaker = CircuitBreaker(failure_threshold=2, reset_timeout=5.0, clock=clock)
+
+        breaker.record_failure()
+        breaker.record_failure()
+        assert breaker.state == CircuitBreaker.OPEN
+        assert not breaker.allow()
+
+        clock.now += 5.0
+        assert breaker.allow()  # Single trial call
+        assert not breaker.allow()
+
+        breaker.record_success()
+        assert breaker.state == CircuitBreaker.CLOSED
+
+
+class TestAdaptiveBatchSizer:
+    def test_halves_on_failure_and_grows_when_fast(self):
+        sizer = AdaptiveBatchSizer(initial=20, maximum=21, target_latency=4.0)
+
+        sizer.record(latency=1.0, success=False)
+        assert sizer.size == 10
+
+        sizer.record(latency=5.0, success=True)
+        assert sizer.size == 5
+
+        sizer = AdaptiveBatchSizer(initial=20, maximum=21, target_latency=4.0)
+        sizer.record(latency=1.0, success=True)
+        sizer.record(latency=1.0, success=True)
+        assert sizer.size == 21
+
+
+class TestYahooFetchClient:
+    def test_retries_with_backoff_then_succeeds(self):
+        clock = FakeClock()
+        transport = FakeTransport(failures=2)
+        client = _make_client(transport, clock, max_retries=3)
+
+        data = client.download(['AAPL'], group_by='ticker')
+
+        assert not data.empty
+        assert len(transport.download_calls) == 3
+        assert client.retries == 2
+        assert client.failures == 2
+
+    def test_raises_after_max_retries(self):
+        clock = FakeClock()
+        transport = FakeTransport(failures=10)
+        client = _make_client(
+            transport, clock, max_retries=1,
+            circuit_breaker=CircuitBreaker(failure_threshold=10, clock=clock)
+        )
+
+        with pytest.raises(ConnectionError):
+            client.download(['AAPL'])
+        assert len(transport.download_calls) == 2
+
+    def test_open_circuit_rejects_without_calling_transport(self):
+        clock = FakeClock()
+        transport = FakeTransport(failures=10)
+        client = _make_client(transport, clock, max_retries=5)
+
+        with pytest.raises(CircuitOpenError):
+            client.download(['AAPL'])
+        assert len(transport.download_calls) == 3
+
+        with pytest.raises(CircuitOpenError):
+            client.get_ticker_attribute('AAPL', 'dividends')
+        assert transport.ticker_calls == []
+
+    def test_download_splits_symbols_into_batches(self):
+        clock = FakeClock()
+        transport = FakeTransport()
+        client = _make_client(transport, clock, batch_sizer=AdaptiveBatchSizer(initial=2, maximum=2))
+
+        data = client.download(['AAPL', 'MSFT', 'GOOGL'], group_by='ticker')
+
+        assert transport.download_calls == [['AAPL', 'MSFT'], ['GOOGL']]
+        assert set(data.columns.get_level_values(0)) == {'AAPL', 'MSFT', 'GOOGL'}
+
+
+    def test_rate_limited_batches_returned_as_nan_are_retried(self):
+        clock = FakeClock()
+        transport = YFinanceStyleTransport(failing_calls=2)
+        client = _make_client(transport, clock, max_retries=3)
+
+        data = client.download(['AAPL', 'MSFT'], group_by='ticker')
+
+        assert data.notna().all().all()
+        assert len(transport.download_calls) == 3
+        assert client.retries == client.failures == 2
+
+    def test_empty_results_open_the_circuit_and_shrink_batches(self):
+        clock = FakeClock()
+        transport = YFinanceStyleTransport(failing_calls=100)
+        client = _make_client(transport, clock, max_retries=5, batch_sizer=AdaptiveBatchSizer(initial=4, maximum=4))
+
+        with pytest.raises(CircuitOpenError):
+            client.download(['AAPL', 'MSFT', 'GOOGL', 'NVDA'], group_by='ticker')
+
+        assert len(transport.download_calls) == 3
+        assert client.circuit_breaker.state == CircuitBreaker.OPEN
+        assert client.batch_sizer.size == 2
+
+    def test_symbols_dropped_from_a_batch_are_retried_alone(self):
+        clock = FakeClock()
+        transport = YFinanceStyleTransport(dropped=('MSFT',))
+        client = _make_client(transport, clock)
+
+        data = client.download(['AAPL', 'MSFT', 'GOOGL'], group_by='ticker')
+
+        assert transport.download_calls == [['AAPL', 'MSFT', 'GOOGL'], ['MSFT']]
+        assert sorted(set(data.columns.get_level_values(0))) == ['AAPL', 'GOOGL', 'MSFT']
+        assert data.notna().all().all()
+
+    def test_symbols_without_data_after_retries_give_an_empty_frame(self):
+        clock = FakeClock()
+        transport = YFinanceStyleTransport(failing_calls=100)
+        client = _make_client(transport, clock, max_retries=1,
+                              circuit_breaker=CircuitBreaker(failure_threshold=10, clock=clock))
+
+        assert client.download(['AAPL'], group_by='ticker').empty
+        assert client.failures == 2
+        assert client.batch_sizer.error_rate == 1.0
+
+
+class TestYFinanceMarketRepositoryWithFakeTransport:
+    def test_price_and_dividend_history_use_fetch_client(self):
+        clock = FakeClock()
+        transport = FakeTransport()
+        repo = YFinanceMarketRepository(fetch_client=_make_client(transport, clock))
+        date_range = DateRange("2024-01-01", "2024-03-01")
+
+        prices = repo.get_price_history([Ticker("AAPL"), Ticker("MSFT")], date_range)
+        dividends = repo.get_dividend_history(Ticker("AAPL"), date_range)
+
+        assert set(t.symbol for t in prices) == {"AAPL", "MSFT"}
+        assert len(prices[Ticker("AAPL")]) == 2
+        assert dividends.sum() == pytest.approx(0.25)
+        assert repo.get_fetch_metrics()["yahoo_requests"] == 2